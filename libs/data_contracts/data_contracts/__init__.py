@@ -4,6 +4,8 @@ from .ticks import CleanedTick, TickRecord
 from .features import FeatureSnapshot
 from .signals import OpportunitySignal, OpportunityState, StrategySignal
 from .risk import RiskAlert, RiskSeverity
+from .sharding import shard_stream, symbol_shard
+from .signal_index import index_opportunity, index_signal
 
 __all__ = [
     "TickRecord",
@@ -14,4 +16,8 @@ __all__ = [
     "OpportunityState",
     "RiskAlert",
     "RiskSeverity",
+    "symbol_shard",
+    "shard_stream",
+    "index_signal",
+    "index_opportunity",
 ]
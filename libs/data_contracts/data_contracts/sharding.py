@@ -0,0 +1,17 @@
+"""Symbol sharding shared by stream producers and consumers."""
+
+from __future__ import annotations
+
+import zlib
+
+
+def symbol_shard(symbol: str, shards: int) -> int:
+    """Stable shard of a symbol (crc32, identical across processes and services)."""
+
+    return zlib.crc32(symbol.encode("utf-8")) % shards
+
+
+def shard_stream(stream: str, shard: int, shards: int) -> str:
+    """Name of one shard of a sharded stream; a single shard keeps the base name."""
+
+    return stream if shards <= 1 else f"{stream}:{shard}"
@@ -0,0 +1,108 @@
+"""Secondary indexes over the signal and opportunity streams.
+
+Writers (strategy-engine, opportunity-aggregator) update them next to
+their XADDs; readers (signal-api) use them instead of scanning streams:
+
+- ``<opportunity_stream>:latest``: hash symbol -> latest opportunity JSON
+- ``<signal_stream>:idx:strategy:<name>`` / ``:idx:symbol:<symbol>``:
+  sorted sets of signal stream IDs scored by their millisecond time
+- ``<signal_stream>:stats:<bucket>``: per-minute counter hashes that expire
+  after the rolling stats window
+- ``<stream>:index:ready``: set by the one-shot backfill once entries written
+  before the writers maintained the index are covered; until then readers
+  fall back to scanning the stream
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping
+
+# Members kept per sorted set; older IDs are trimmed on write
+SIGNAL_INDEX_MAX_ENTRIES = 5000
+STATS_BUCKET_SECONDS = 60
+STATS_WINDOW_BUCKETS = 60
+
+
+def latest_opportunity_key(stream: str) -> str:
+    return f"{stream}:latest"
+
+
+def strategy_index_key(stream: str, strategy: str) -> str:
+    return f"{stream}:idx:strategy:{strategy}"
+
+
+def symbol_index_key(stream: str, symbol: str) -> str:
+    return f"{stream}:idx:symbol:{symbol}"
+
+
+def stats_key(stream: str, bucket: int) -> str:
+    return f"{stream}:stats:{bucket}"
+
+
+def index_ready_key(stream: str) -> str:
+    return f"{stream}:index:ready"
+
+
+def stream_id_millis(message_id: str) -> int:
+    """Millisecond timestamp part of a stream ID such as ``1700000000000-3``."""
+
+    return int(str(message_id).split("-", 1)[0])
+
+
+def stats_bucket(millis: int) -> int:
+    return millis // 1000 // STATS_BUCKET_SECONDS
+
+
+def index_opportunity(pipe: Any, stream: str, symbol: str, payload: str) -> None:
+    """Queue the latest-opportunity update for ``symbol`` on a Redis pipeline."""
+
+    pipe.hset(latest_opportunity_key(stream), symbol, payload)
+
+
+def signal_counter_fields(signal: Mapping[str, Any]) -> Dict[str, float]:
+    """Stats counter increments contributed by one signal."""
+
+    return {
+        "total": 1,
+        "confidence": float(signal.get("confidence", 0) or 0),
+        f"strategy:{signal.get('strategy', 'unknown')}": 1,
+        f"type:{signal.get('signal_type', 'unknown')}": 1,
+        f"symbol:{signal.get('symbol', 'unknown')}": 1,
+    }
+
+
+def index_signal_id(
+    pipe: Any,
+    stream: str,
+    message_id: str,
+    signal: Mapping[str, Any],
+    max_entries: int = SIGNAL_INDEX_MAX_ENTRIES,
+) -> None:
+    """Queue the per-strategy and per-symbol sorted-set updates (idempotent)."""
+
+    millis = stream_id_millis(message_id)
+    for key in (
+        strategy_index_key(stream, signal.get("strategy", "unknown")),
+        symbol_index_key(stream, signal.get("symbol", "unknown")),
+    ):
+        pipe.zadd(key, {message_id: millis})
+        pipe.zremrangebyrank(key, 0, -max_entries - 1)
+
+
+def index_signal(
+    pipe: Any,
+    stream: str,
+    message_id: str,
+    signal: Mapping[str, Any],
+    max_entries: int = SIGNAL_INDEX_MAX_ENTRIES,
+) -> None:
+    """Queue the index and counter updates for one XADDed signal on a Redis pipeline."""
+
+    index_signal_id(pipe, stream, message_id, signal, max_entries)
+    key = stats_key(stream, stats_bucket(stream_id_millis(message_id)))
+    for field, amount in signal_counter_fields(signal).items():
+        if field == "confidence":
+            pipe.hincrbyfloat(key, field, amount)
+        else:
+            pipe.hincrby(key, field, int(amount))
+    pipe.expire(key, STATS_BUCKET_SECONDS * (STATS_WINDOW_BUCKETS + 1))
@@ -28,8 +28,10 @@ class CollectorSettings(BaseSettings):
     log_level: str = Field("INFO", alias="LOG_LEVEL")
     redis_url: str = Field("redis://localhost:6379/0", alias="REDIS_URL")
     stream_name: str = Field("dfp:raw_ticks", alias="STREAM_NAME")
-    batch_size: int = Field(100, ge=1)
-    flush_interval_seconds: float = Field(0.5, ge=0.01)
+    batch_size: int = Field(500, ge=1)
+    flush_interval_seconds: float = Field(0.05, ge=0.001)
+    stream_maxlen: Optional[int] = Field(1_000_000, ge=1)
+    max_queue_size: int = Field(50_000, ge=1)
     data_sources: List[DataSourceConfig] = Field(default_factory=list)
 
     class Config:
@@ -13,6 +13,7 @@ from data_contracts import TickRecord
 
 from .adapters.base import AdapterTick, DataSourceAdapter
 from .config import CollectorSettings
+from .writer import StreamBatchWriter
 
 logger = logging.getLogger(__name__)
 
@@ -33,11 +34,20 @@ class CollectorService:
         }
         self._tasks: MutableMapping[str, asyncio.Task[None]] = {}
         self._shutdown = asyncio.Event()
+        self.writer = StreamBatchWriter(
+            redis_client,
+            settings.stream_name,
+            batch_size=settings.batch_size,
+            flush_interval=settings.flush_interval_seconds,
+            maxlen=settings.stream_maxlen,
+            max_queue_size=settings.max_queue_size,
+        )
 
     async def start(self, symbols: List[str]) -> None:
         """Start streaming from all enabled adapters."""
 
         logger.info("Starting collector service with %d adapters", len(self.adapters))
+        await self.writer.start()
         for name, adapter in self.adapters.items():
             task = asyncio.create_task(self._pump_adapter(name, adapter, symbols))
             self._tasks[name] = task
@@ -57,6 +67,13 @@ class CollectorService:
                 self._tasks.pop(name, None)
 
         await asyncio.gather(*(adapter.stop() for adapter in self.adapters.values()), return_exceptions=True)
+        await self.writer.stop()
+        logger.info("Collector writer metrics: %s", self.writer.metrics())
+
+    def metrics(self) -> Dict[str, object]:
+        """Return stream writer metrics."""
+
+        return self.writer.metrics()
 
     async def _pump_adapter(
         self, name: str, adapter: DataSourceAdapter, symbols: List[str]
@@ -78,7 +95,7 @@ class CollectorService:
             logger.info("Adapter %s stopped", name)
 
     async def _write_tick(self, source: str, tick: AdapterTick) -> None:
-        """Serialize tick and append to Redis Stream."""
+        """Serialize tick and queue it for the batched Redis Stream writer."""
 
         record = TickRecord(
             source=source,
@@ -96,12 +113,7 @@ class CollectorService:
         )
         payload = record.model_dump_json()
 
-        await self.redis.xadd(
-            self.settings.stream_name,
-            {"payload": payload},
-            maxlen=None,
-            approximate=False,
-        )
+        await self.writer.write({"payload": payload})
 
 
 async def build_redis_client(settings: CollectorSettings) -> aioredis.Redis:
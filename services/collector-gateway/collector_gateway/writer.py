@@ -0,0 +1,194 @@
+"""Batched Redis Stream writer for collected ticks."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WriterMetrics:
+    """Backpressure and throughput metrics for the stream writer."""
+
+    queue_depth: int = 0
+    queue_capacity: int = 0
+    enqueued: int = 0
+    written: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    backpressure_waits: int = 0
+    dropped: int = 0
+    last_flush_size: int = 0
+    max_flush_size: int = 0
+    last_flush_latency_ms: float = 0.0
+    max_flush_latency_ms: float = 0.0
+    total_flush_seconds: float = 0.0
+    last_error: str | None = None
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "queue_depth": self.queue_depth,
+            "queue_capacity": self.queue_capacity,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "backpressure_waits": self.backpressure_waits,
+            "dropped": self.dropped,
+            "last_flush_size": self.last_flush_size,
+            "max_flush_size": self.max_flush_size,
+            "avg_flush_size": round(self.written / self.flushes, 2) if self.flushes else 0.0,
+            "last_flush_latency_ms": round(self.last_flush_latency_ms, 3),
+            "max_flush_latency_ms": round(self.max_flush_latency_ms, 3),
+            "avg_flush_latency_ms": (
+                round(self.total_flush_seconds / self.flushes * 1000, 3) if self.flushes else 0.0
+            ),
+            "last_error": self.last_error,
+        }
+
+
+class StreamBatchWriter:
+    """Groups stream entries into one non-transactional pipeline per flush.
+
+    A flush is triggered once ``batch_size`` entries are queued or
+    ``flush_interval`` seconds after the first entry of the batch arrived,
+    whichever comes first. Producers block on a bounded queue when Redis
+    falls behind, so memory stays capped and the stall is visible in
+    ``backpressure_waits``. Failed flushes are retried until ``stop``.
+    """
+
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        stream_name: str,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        maxlen: Optional[int] = None,
+        max_queue_size: int = 50_000,
+        retry_delay: float = 0.5,
+    ) -> None:
+        self.redis = redis_client
+        self.stream_name = stream_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.maxlen = maxlen
+        self.retry_delay = retry_delay
+        self._queue: asyncio.Queue[Dict[str, str]] = asyncio.Queue(maxsize=max_queue_size)
+        self._task: asyncio.Task[None] | None = None
+        self._closing = False
+        self._metrics = WriterMetrics(queue_capacity=max_queue_size)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Flush whatever is queued and stop the writer task."""
+
+        if self._task is None:
+            return
+        self._closing = True
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        finally:
+            self._task = None
+        self._metrics.dropped += self._queue.qsize()
+        if self._metrics.dropped:
+            logger.warning("Stream writer stopped with %d entries unwritten", self._metrics.dropped)
+
+    async def write(self, fields: Dict[str, str]) -> None:
+        """Queue one stream entry, waiting if the queue is full."""
+
+        try:
+            self._queue.put_nowait(fields)
+        except asyncio.QueueFull:
+            self._metrics.backpressure_waits += 1
+            await self._queue.put(fields)
+        self._metrics.enqueued += 1
+
+    async def _run(self) -> None:
+        while not (self._closing and self._queue.empty()):
+            batch = await self._collect()
+            if batch:
+                await self._flush_with_retry(batch)
+
+    async def _collect(self) -> List[Dict[str, str]]:
+        """Wait for the first entry, then gather until the size or latency cap."""
+
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout=self.flush_interval)
+        except asyncio.TimeoutError:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._closing:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush_with_retry(self, batch: List[Dict[str, str]]) -> None:
+        while True:
+            try:
+                await self._flush(batch)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                self._metrics.failed_flushes += 1
+                self._metrics.last_error = str(exc)
+                logger.error("Stream flush of %d entries failed: %s", len(batch), exc)
+                if self._closing:
+                    self._metrics.dropped += len(batch)
+                    return
+                await asyncio.sleep(self.retry_delay)
+
+    async def _flush(self, batch: List[Dict[str, str]]) -> None:
+        started = time.perf_counter()
+        pipe = self.redis.pipeline(transaction=False)
+        for fields in batch:
+            if self.maxlen is not None:
+                pipe.xadd(self.stream_name, fields, maxlen=self.maxlen, approximate=True)
+            else:
+                pipe.xadd(self.stream_name, fields)
+        await pipe.execute()
+        elapsed = time.perf_counter() - started
+
+        metrics = self._metrics
+        metrics.flushes += 1
+        metrics.written += len(batch)
+        metrics.last_flush_size = len(batch)
+        metrics.max_flush_size = max(metrics.max_flush_size, len(batch))
+        metrics.last_flush_latency_ms = elapsed * 1000
+        metrics.max_flush_latency_ms = max(metrics.max_flush_latency_ms, elapsed * 1000)
+        metrics.total_flush_seconds += elapsed
+
+    def metrics(self) -> Dict[str, object]:
+        """Return a snapshot of writer metrics."""
+
+        self._metrics.queue_depth = self._queue.qsize()
+        return self._metrics.as_dict()
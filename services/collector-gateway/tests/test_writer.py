@@ -0,0 +1,91 @@
+"""Tests for the batched stream writer."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from collector_gateway.writer import StreamBatchWriter
+
+
+class DummyPipeline:
+    def __init__(self, redis: "DummyRedis") -> None:
+        self.redis = redis
+        self.commands: List[Dict[str, object]] = []
+
+    def xadd(self, name: str, fields: Dict[str, str], **kwargs) -> None:
+        self.commands.append({"name": name, "fields": dict(fields), "kwargs": kwargs})
+
+    async def execute(self) -> List[str]:
+        if self.redis.fail_next:
+            self.redis.fail_next -= 1
+            raise ConnectionError("redis down")
+        self.redis.batches.append(self.commands)
+        return [f"{i}-0" for i in range(len(self.commands))]
+
+
+class DummyRedis:
+    def __init__(self) -> None:
+        self.batches: List[List[Dict[str, object]]] = []
+        self.fail_next = 0
+
+    def pipeline(self, transaction: bool = True) -> DummyPipeline:
+        assert transaction is False
+        return DummyPipeline(self)
+
+
+@pytest.mark.asyncio
+async def test_writer_batches_by_size_and_trims_approximately() -> None:
+    redis = DummyRedis()
+    writer = StreamBatchWriter(redis, "dfp:raw_ticks", batch_size=4, flush_interval=1.0, maxlen=1000)
+    await writer.start()
+
+    for i in range(10):
+        await writer.write({"payload": str(i)})
+    await writer.stop()
+
+    assert [len(batch) for batch in redis.batches] == [4, 4, 2]
+    assert [c["fields"]["payload"] for batch in redis.batches for c in batch] == [str(i) for i in range(10)]
+    assert redis.batches[0][0]["kwargs"] == {"maxlen": 1000, "approximate": True}
+
+    metrics = writer.metrics()
+    assert metrics["written"] == 10
+    assert metrics["flushes"] == 3
+    assert metrics["max_flush_size"] == 4
+    assert metrics["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_partial_batch_after_interval() -> None:
+    redis = DummyRedis()
+    writer = StreamBatchWriter(redis, "dfp:raw_ticks", batch_size=100, flush_interval=0.01)
+    await writer.start()
+
+    await writer.write({"payload": "a"})
+    await asyncio.sleep(0.05)
+
+    assert [len(batch) for batch in redis.batches] == [1]
+    assert redis.batches[0][0]["kwargs"] == {}
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_writer_applies_backpressure_and_retries_failed_flush() -> None:
+    redis = DummyRedis()
+    redis.fail_next = 1
+    writer = StreamBatchWriter(
+        redis, "dfp:raw_ticks", batch_size=2, flush_interval=0.01, max_queue_size=2, retry_delay=0.01
+    )
+    await writer.start()
+
+    for i in range(6):
+        await writer.write({"payload": str(i)})
+    await writer.stop()
+
+    metrics = writer.metrics()
+    assert metrics["written"] == 6
+    assert metrics["failed_flushes"] == 1
+    assert metrics["backpressure_waits"] > 0
+    assert metrics["dropped"] == 0
@@ -20,6 +20,9 @@ class CleanerSettings(BaseSettings):
     block_ms: int = Field(1000, ge=1, alias="BLOCK_MS")
     max_output_len: int | None = Field(None, alias="MAX_OUTPUT_LEN")
     approximate_trim: bool = Field(True, alias="APPROXIMATE_TRIM")
+    workers: int = Field(1, ge=1, alias="WORKERS")
+    claim_min_idle_ms: int = Field(30_000, ge=0, alias="CLAIM_MIN_IDLE_MS")
+    claim_interval_seconds: float = Field(5.0, gt=0, alias="CLAIM_INTERVAL_SECONDS")
 
     class Config:
         env_prefix = "CLEANER_"
@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+import time
+from datetime import datetime
 from typing import Any, Dict, List, Tuple
 
 import redis.asyncio as aioredis
@@ -23,6 +24,13 @@ class DataCleanerService:
         self.settings = settings
         self.redis = redis_client
         self._shutdown = asyncio.Event()
+        self._last_claim = 0.0
+        self.stats: Dict[str, int] = {
+            "processed": 0,
+            "published": 0,
+            "invalid": 0,
+            "reclaimed": 0,
+        }
 
     async def start(self) -> None:
         await self._ensure_consumer_group()
@@ -35,18 +43,21 @@ class DataCleanerService:
 
         while not self._shutdown.is_set():
             try:
+                if time.monotonic() - self._last_claim >= self.settings.claim_interval_seconds:
+                    self._last_claim = time.monotonic()
+                    await self._reclaim_pending()
+
                 entries = await self._read_batch()
                 if not entries:
                     continue
 
-                for message_id, payload in entries:
-                    await self._process_message(message_id, payload)
+                await self._process_batch(entries)
             except asyncio.CancelledError:
                 raise
             except Exception as exc:  # noqa: BLE001
                 logger.exception("Cleaner loop error: %s", exc)
 
-        logger.info("DataCleanerService shutting down")
+        logger.info("DataCleanerService shutting down (%s)", self.stats)
 
     async def stop(self) -> None:
         self._shutdown.set()
@@ -88,44 +99,98 @@ class DataCleanerService:
                 entries.append((message_id, payload))
         return entries
 
-    async def _process_message(self, message_id: str, payload: Dict[str, Any]) -> None:
+    async def _reclaim_pending(self) -> None:
+        """Take over entries left pending by dead consumers of the group."""
+
+        start_id = "0-0"
+        while not self._shutdown.is_set():
+            response = await self.redis.xautoclaim(
+                name=self.settings.input_stream,
+                groupname=self.settings.consumer_group,
+                consumername=self.settings.consumer_name,
+                min_idle_time=self.settings.claim_min_idle_ms,
+                start_id=start_id,
+                count=self.settings.read_count,
+            )
+            start_id, messages = response[0], response[1]
+
+            entries: List[Tuple[str, Dict[str, Any]]] = []
+            for message in messages:
+                if message is None:
+                    continue
+                message_id, payload = message
+                entries.append((message_id, payload or {}))
+            if entries:
+                self.stats["reclaimed"] += len(entries)
+                logger.info("Reclaimed %d pending entries", len(entries))
+                await self._process_batch(entries)
+
+            if start_id in ("0-0", b"0-0"):
+                break
+
+    async def _process_batch(self, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Clean a batch, publish it in one pipeline, then ack every id at once.
+
+        Entries that cannot be parsed are acknowledged without output so they
+        do not stay pending forever. The ack is only sent once the publish
+        pipeline succeeded, so a Redis failure leaves the batch pending for
+        redelivery or ``XAUTOCLAIM``.
+        """
+
+        cleaned_at = datetime.utcnow()
+        cleaned: List[CleanTick] = []
+        for message_id, payload in entries:
+            tick = self._clean_message(message_id, payload, cleaned_at)
+            if tick is not None:
+                cleaned.append(tick)
+
+        if cleaned:
+            await self._publish_many(cleaned)
+        await self._ack_many([message_id for message_id, _payload in entries])
+
+        self.stats["processed"] += len(entries)
+        self.stats["published"] += len(cleaned)
+        self.stats["invalid"] += len(entries) - len(cleaned)
+
+    def _clean_message(
+        self, message_id: str, payload: Dict[str, Any], cleaned_at: datetime
+    ) -> CleanTick | None:
         raw_json = payload.get("payload")
         if raw_json is None:
-            logger.warning("Received message without payload: %s", payload)
-            await self._ack(message_id)
-            return
+            logger.warning("Received message without payload: %s", message_id)
+            return None
 
         try:
-            raw_dict = json.loads(raw_json)
-            raw_tick = RawTick.model_validate(raw_dict)
+            raw_tick = RawTick.model_validate_json(raw_json)
         except Exception as exc:  # noqa: BLE001
-            logger.error("Failed to parse raw tick: %s", exc)
-            await self._ack(message_id)
-            return
+            logger.error("Failed to parse raw tick %s: %s", message_id, exc)
+            return None
 
-        cleaned = clean_tick(raw_tick)
-        await self._publish(cleaned)
-        await self._ack(message_id)
+        return clean_tick(raw_tick, cleaned_at=cleaned_at)
 
-    async def _publish(self, tick: CleanTick) -> None:
-        # 使用model_dump_json直接生成JSON字符串,自动处理datetime序列化
-        payload = tick.model_dump_json()
+    async def _publish_many(self, ticks: List[CleanTick]) -> None:
         kwargs = {}
         if self.settings.max_output_len is not None:
             kwargs["maxlen"] = self.settings.max_output_len
             kwargs["approximate"] = self.settings.approximate_trim
 
-        await self.redis.xadd(
-            name=self.settings.output_stream,
-            fields={"payload": payload},
-            **kwargs,
-        )
+        pipe = self.redis.pipeline(transaction=False)
+        for tick in ticks:
+            # 使用model_dump_json直接生成JSON字符串,自动处理datetime序列化
+            pipe.xadd(
+                name=self.settings.output_stream,
+                fields={"payload": tick.model_dump_json()},
+                **kwargs,
+            )
+        await pipe.execute()
 
-    async def _ack(self, message_id: str) -> None:
+    async def _ack_many(self, message_ids: List[str]) -> None:
+        if not message_ids:
+            return
         await self.redis.xack(
             self.settings.input_stream,
             self.settings.consumer_group,
-            message_id,
+            *message_ids,
         )
 
 
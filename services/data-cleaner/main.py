@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import multiprocessing
 import signal
 from contextlib import AsyncExitStack
 
@@ -11,8 +12,10 @@ from data_cleaner.config import CleanerSettings, get_settings
 from data_cleaner.service import DataCleanerService, build_redis_client
 
 
-async def main() -> None:
+async def main(consumer_name: str | None = None) -> None:
     settings: CleanerSettings = get_settings()
+    if consumer_name:
+        settings = settings.model_copy(update={"consumer_name": consumer_name})
     logging.basicConfig(level=settings.log_level)
 
     async with AsyncExitStack() as stack:
@@ -47,8 +50,49 @@ async def _cancel_task(task: asyncio.Task[None]) -> None:
         pass
 
 
-if __name__ == "__main__":
+def _run_worker(consumer_name: str | None = None) -> None:
     try:
-        asyncio.run(main())
+        asyncio.run(main(consumer_name))
     except KeyboardInterrupt:
         pass
+
+
+def run() -> None:
+    """Run one consumer, or ``workers`` consumer processes in the same group."""
+
+    settings = get_settings()
+    if settings.workers <= 1:
+        _run_worker()
+        return
+
+    logging.basicConfig(level=settings.log_level)
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=_run_worker,
+            args=(f"{settings.consumer_name}-{index}",),
+            name=f"data-cleaner-{index}",
+        )
+        for index in range(settings.workers)
+    ]
+    for process in processes:
+        process.start()
+    logging.getLogger(__name__).info("Started %d cleaner worker processes", len(processes))
+
+    def _terminate(_signum: int, _frame: object) -> None:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Workers receive SIGINT themselves and shut down gracefully
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,112 @@
+"""Tests for the cleaner batch path."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+
+import pytest
+
+from data_cleaner.config import CleanerSettings
+from data_cleaner.service import DataCleanerService
+
+
+class DummyPipeline:
+    def __init__(self, redis: "DummyRedis") -> None:
+        self.redis = redis
+        self.commands: List[Dict[str, Any]] = []
+
+    def xadd(self, name: str, fields: Dict[str, str], **kwargs) -> None:
+        self.commands.append({"name": name, "fields": fields, "kwargs": kwargs})
+
+    async def execute(self) -> List[str]:
+        if self.redis.fail_publish:
+            raise ConnectionError("redis down")
+        self.redis.pipelines.append(self.commands)
+        return ["0-1"] * len(self.commands)
+
+
+class DummyRedis:
+    def __init__(self) -> None:
+        self.pipelines: List[List[Dict[str, Any]]] = []
+        self.acks: List[tuple] = []
+        self.claims: List[list] = []
+        self.fail_publish = False
+
+    def pipeline(self, transaction: bool = True) -> DummyPipeline:
+        return DummyPipeline(self)
+
+    async def xack(self, name: str, groupname: str, *ids: str) -> int:
+        self.acks.append(ids)
+        return len(ids)
+
+    async def xautoclaim(self, **kwargs) -> list:
+        return self.claims.pop(0)
+
+
+def raw_payload(symbol: str = "sh600000", price: float = 10.0) -> Dict[str, str]:
+    now = datetime.utcnow().isoformat()
+    return {
+        "payload": json.dumps(
+            {
+                "source": "tencent",
+                "symbol": symbol,
+                "price": price,
+                "volume": 100,
+                "turnover": 0.0,
+                "timestamp": now,
+                "ingested_at": now,
+            }
+        )
+    }
+
+
+@pytest.mark.asyncio
+async def test_process_batch_publishes_once_and_acks_all_ids() -> None:
+    redis = DummyRedis()
+    service = DataCleanerService(CleanerSettings(max_output_len=1000), redis)
+
+    entries = [
+        ("1-0", raw_payload()),
+        ("1-1", {"payload": "not json"}),
+        ("1-2", {}),
+        ("1-3", raw_payload("SZ000001", 5.0)),
+    ]
+    await service._process_batch(entries)
+
+    assert len(redis.pipelines) == 1
+    published = [json.loads(c["fields"]["payload"]) for c in redis.pipelines[0]]
+    assert [p["symbol"] for p in published] == ["sh600000", "sz000001"]
+    assert "turnover_reconstructed" in published[0]["quality_flags"]
+    assert redis.pipelines[0][0]["kwargs"] == {"maxlen": 1000, "approximate": True}
+    assert redis.acks == [("1-0", "1-1", "1-2", "1-3")]
+    assert service.stats == {"processed": 4, "published": 2, "invalid": 2, "reclaimed": 0}
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_leaves_batch_pending() -> None:
+    redis = DummyRedis()
+    redis.fail_publish = True
+    service = DataCleanerService(CleanerSettings(), redis)
+
+    with pytest.raises(ConnectionError):
+        await service._process_batch([("1-0", raw_payload())])
+
+    assert redis.acks == []
+
+
+@pytest.mark.asyncio
+async def test_reclaim_pending_pages_through_xautoclaim() -> None:
+    redis = DummyRedis()
+    redis.claims = [
+        ["5-0", [("1-0", raw_payload()), None], []],
+        ["0-0", [("5-0", None)], []],
+    ]
+    service = DataCleanerService(CleanerSettings(), redis)
+
+    await service._reclaim_pending()
+
+    assert redis.acks == [("1-0",), ("5-0",)]
+    assert service.stats["reclaimed"] == 2
+    assert service.stats["published"] == 1
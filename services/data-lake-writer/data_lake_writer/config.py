@@ -25,6 +25,13 @@ class LakeWriterSettings(BaseSettings):
     file_format: Literal["parquet", "csv"] = Field("parquet", alias="FILE_FORMAT")
     flush_interval_seconds: int = Field(60, ge=1, alias="FLUSH_INTERVAL_SECONDS")
     max_buffer_size: int = Field(1000, ge=1, alias="MAX_BUFFER_SIZE")
+    symbol_buckets: int = Field(16, ge=1, alias="SYMBOL_BUCKETS")
+    row_group_size: int = Field(65_536, ge=1, alias="ROW_GROUP_SIZE")
+    max_rows_per_file: int = Field(1_000_000, ge=1, alias="MAX_ROWS_PER_FILE")
+    roll_interval_seconds: float = Field(300.0, gt=0, alias="ROLL_INTERVAL_SECONDS")
+    compression: str = Field("zstd", alias="COMPRESSION")
+    compaction_interval_seconds: float = Field(900.0, ge=0, alias="COMPACTION_INTERVAL_SECONDS")
+    compaction_min_files: int = Field(4, ge=2, alias="COMPACTION_MIN_FILES")
 
     class Config:
         env_prefix = "LAKE_WRITER_"
@@ -3,11 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import json
 import logging
-from dataclasses import dataclass
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Tuple
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 
 import redis.asyncio as aioredis
 
@@ -17,33 +22,124 @@ from .storage import DataLakeStorage
 
 logger = logging.getLogger(__name__)
 
+ROLL_CHECK_SECONDS = 1.0
+
 
 @dataclass
 class FlushState:
     buffer: List[CleanTickRecord]
     last_flush: datetime
+    message_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class StorageResult:
+    """Outcome of one job on the writer thread."""
+
+    records: int
+    committed: List[Path]
+    durable: List[Hashable]
+    bytes_written: int
+    latency: float
+
+
+@dataclass
+class LakeWriterMetrics:
+    """Flush, durability and ack metrics for the data lake writer."""
+
+    received: int = 0
+    invalid: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    records_written: int = 0
+    files_committed: int = 0
+    bytes_written: int = 0
+    acked: int = 0
+    backpressure_waits: int = 0
+    replays: int = 0
+    last_flush_size: int = 0
+    last_flush_latency_ms: float = 0.0
+    max_flush_latency_ms: float = 0.0
+    total_flush_seconds: float = 0.0
+    last_error: str | None = None
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "received": self.received,
+            "invalid": self.invalid,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "records_written": self.records_written,
+            "files_committed": self.files_committed,
+            "bytes_written": self.bytes_written,
+            "acked": self.acked,
+            "backpressure_waits": self.backpressure_waits,
+            "replays": self.replays,
+            "last_flush_size": self.last_flush_size,
+            "last_flush_latency_ms": round(self.last_flush_latency_ms, 3),
+            "max_flush_latency_ms": round(self.max_flush_latency_ms, 3),
+            "avg_flush_latency_ms": (
+                round(self.total_flush_seconds / self.flushes * 1000, 3) if self.flushes else 0.0
+            ),
+            "last_error": self.last_error,
+        }
 
 
 class DataLakeWriterService:
-    """Consume clean tick stream and persist to data lake."""
+    """Consume clean tick stream and persist to data lake.
+
+    Storage work runs on a single writer thread with a double buffer: the
+    loop keeps filling the active buffer while the previous one is being
+    written, and only waits when a second flush is due before the first
+    has finished. Messages are acked once the files holding their rows
+    have been rolled (fsynced and renamed), so a crash leaves them pending
+    and they are replayed from the PEL on the next start. A failed write
+    is handled the same way without restarting: open files are dropped
+    and the PEL is read again (``_replay_from_pel``).
+    """
 
     def __init__(self, settings: LakeWriterSettings, redis_client: aioredis.Redis) -> None:
         self.settings = settings
         self.redis = redis_client
-        self.storage = DataLakeStorage(settings.output_dir, settings.file_format)
+        self.storage = DataLakeStorage(
+            settings.output_dir,
+            settings.file_format,
+            symbol_buckets=settings.symbol_buckets,
+            row_group_size=settings.row_group_size,
+            max_rows_per_file=settings.max_rows_per_file,
+            roll_interval_seconds=settings.roll_interval_seconds,
+            compression=settings.compression,
+        )
         self._shutdown = asyncio.Event()
         self._flush_state = FlushState(buffer=[], last_flush=datetime.utcnow())
+        self._compaction_task: Optional[asyncio.Task[None]] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lake-writer")
+        self._inflight: Optional[asyncio.Task[None]] = None
+        self._unacked: Dict[int, List[str]] = {}
+        self._tokens = itertools.count(1)
+        self._last_roll_check = time.monotonic()
+        # Replay this consumer's pending entries first (left unacked by a previous run)
+        self._pending_cursor: Optional[str] = "0"
+        self._write_failed = False
+        self._metrics = LakeWriterMetrics()
 
     async def start(self) -> None:
         await self._ensure_consumer_group()
+        discarded = await self._run_storage(self.storage.discard_incomplete)
+        if discarded:
+            logger.warning("Discarded %d incomplete data lake files", discarded)
         logger.info(
             "DataLakeWriter started (stream=%s -> dir=%s)",
             self.settings.input_stream,
             self.settings.output_dir,
         )
+        if self.settings.compaction_interval_seconds > 0:
+            self._compaction_task = asyncio.create_task(self._compaction_loop())
 
         while not self._shutdown.is_set():
             try:
+                if self._write_failed:
+                    await self._replay_from_pel()
                 entries = await self._read_batch()
                 if entries:
                     for message_id, payload in entries:
@@ -56,11 +152,29 @@ class DataLakeWriterService:
                 await asyncio.sleep(1)
 
         await self._flush(force=True)
-        logger.info("DataLakeWriter stopped")
+        await self._dispatch(self._close_job)
+        await self._wait_inflight()
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            try:
+                await self._compaction_task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+        logger.info("DataLakeWriter stopped (%s)", self.metrics())
 
     async def stop(self) -> None:
         self._shutdown.set()
 
+    def metrics(self) -> Dict[str, object]:
+        """Return a snapshot of writer metrics."""
+
+        data = self._metrics.as_dict()
+        data["buffered"] = len(self._flush_state.buffer)
+        data["pending_acks"] = sum(len(ids) for ids in self._unacked.values())
+        data["open_files"] = self.storage.open_files
+        return data
+
     async def _ensure_consumer_group(self) -> None:
         try:
             await self.redis.xgroup_create(
@@ -74,10 +188,20 @@ class DataLakeWriterService:
                 raise
 
     async def _read_batch(self) -> List[Tuple[str, Dict[str, str]]]:
+        entries: List[Tuple[str, Dict[str, str]]] = []
+        if self._pending_cursor is not None:
+            entries = await self._xreadgroup(self._pending_cursor)
+            if entries:
+                self._pending_cursor = entries[-1][0]
+                return entries
+            self._pending_cursor = None
+        return await self._xreadgroup(">")
+
+    async def _xreadgroup(self, stream_id: str) -> List[Tuple[str, Dict[str, str]]]:
         result = await self.redis.xreadgroup(
             groupname=self.settings.consumer_group,
             consumername=self.settings.consumer_name,
-            streams={self.settings.input_stream: ">"},
+            streams={self.settings.input_stream: stream_id},
             count=self.settings.read_count,
             block=self.settings.block_ms,
         )
@@ -90,9 +214,12 @@ class DataLakeWriterService:
         return entries
 
     async def _handle_message(self, message_id: str, payload: Dict[str, str]) -> None:
+        self._metrics.received += 1
+        # Invalid entries are acked together with the batch they arrived in
+        self._flush_state.message_ids.append(message_id)
         raw_json = payload.get("payload")
         if raw_json is None:
-            await self._ack(message_id)
+            self._metrics.invalid += 1
             return
 
         try:
@@ -100,38 +227,161 @@ class DataLakeWriterService:
             record = CleanTickRecord.model_validate(data)
         except Exception as exc:  # noqa: BLE001
             logger.error("Failed to parse tick for data lake: %s", exc)
-            await self._ack(message_id)
+            self._metrics.invalid += 1
             return
 
         self._flush_state.buffer.append(record)
-        await self._ack(message_id)
 
         if len(self._flush_state.buffer) >= self.settings.max_buffer_size:
-            await self._flush(force=True)
+            await self._flush()
 
     async def _maybe_flush(self) -> None:
         elapsed = (datetime.utcnow() - self._flush_state.last_flush).total_seconds()
-        if elapsed >= self.settings.flush_interval_seconds and self._flush_state.buffer:
-            await self._flush(force=True)
+        if elapsed >= self.settings.flush_interval_seconds and self._flush_state.message_ids:
+            await self._flush()
+
+        now = time.monotonic()
+        if now - self._last_roll_check >= ROLL_CHECK_SECONDS and (
+            self._inflight is None or self._inflight.done()
+        ):
+            self._last_roll_check = now
+            await self._dispatch(self._roll_job)
 
     async def _flush(self, force: bool = False) -> None:
-        if not self._flush_state.buffer:
-            return
+        """Hand the active buffer to the writer thread; ``force`` waits for the write."""
+
+        state = self._flush_state
+        records, message_ids = state.buffer, state.message_ids
+        if records or message_ids:
+            state.buffer, state.message_ids = [], []
+            state.last_flush = datetime.utcnow()
+            if records:
+                token = next(self._tokens)
+                self._unacked[token] = message_ids
+                shard = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+                await self._dispatch(partial(self._write_job, records, shard, token))
+            else:
+                # Nothing to persist, only invalid entries
+                await self._ack(*message_ids)
+        if force:
+            await self._wait_inflight()
+
+    async def _dispatch(self, job: Callable[[], StorageResult]) -> None:
+        if self._inflight is not None and not self._inflight.done():
+            self._metrics.backpressure_waits += 1
+        await self._wait_inflight()
+        self._inflight = asyncio.create_task(self._run_job(job))
+
+    async def _wait_inflight(self) -> None:
+        if self._inflight is not None:
+            await self._inflight
+
+    async def _run_storage(self, fn: Callable[[], object]) -> object:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn)
 
+    async def _run_job(self, job: Callable[[], StorageResult]) -> None:
+        metrics = self._metrics
         try:
-            shard = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
-            path = self.storage.write_batch(self._flush_state.buffer, shard)
-            logger.info("Written %d records to %s", len(self._flush_state.buffer), path)
-        finally:
-            self._flush_state.buffer.clear()
-            self._flush_state.last_flush = datetime.utcnow()
-
-    async def _ack(self, message_id: str) -> None:
+            result: StorageResult = await self._run_storage(job)  # type: ignore[assignment]
+        except Exception as exc:  # noqa: BLE001
+            # The batch stays unacked; the loop replays it from the PEL
+            metrics.failed_flushes += 1
+            metrics.last_error = str(exc)
+            self._write_failed = True
+            logger.exception("Data lake write failed: %s", exc)
+            return
+
+        if result.records:
+            metrics.flushes += 1
+            metrics.records_written += result.records
+            metrics.last_flush_size = result.records
+            metrics.last_flush_latency_ms = result.latency * 1000
+            metrics.max_flush_latency_ms = max(metrics.max_flush_latency_ms, metrics.last_flush_latency_ms)
+            metrics.total_flush_seconds += result.latency
+        metrics.files_committed += len(result.committed)
+        metrics.bytes_written += result.bytes_written
+        for path in result.committed:
+            logger.info("Committed %s", path)
+
+        message_ids = [mid for token in result.durable for mid in self._unacked.pop(token, [])]
+        if message_ids:
+            await self._ack(*message_ids)
+
+    async def _replay_from_pel(self) -> None:
+        """Start over from this consumer's PEL after a failed write.
+
+        The failed job may have left rows of any batch that is not durable
+        yet half written, so rows already rolled are acked, every open file
+        is dropped and all other unacked entries (the active buffer
+        included) are read again, as after a restart.
+        """
+
+        await self._wait_inflight()
+        durable, discarded = await self._run_storage(self._abort_job)
+        message_ids = [mid for token in durable for mid in self._unacked.pop(token, [])]
+        self._unacked.clear()
+        self._flush_state = FlushState(buffer=[], last_flush=datetime.utcnow())
+        self._pending_cursor = "0"
+        self._write_failed = False
+        self._metrics.replays += 1
+        logger.warning("Replaying pending entries after a failed write (%d open files dropped)", discarded)
+        await self._ack(*message_ids)
+
+    def _abort_job(self) -> Tuple[List[Hashable], int]:
+        durable = self.storage.drain_durable()
+        return durable, self.storage.abort()
+
+    def _write_job(self, records: List[CleanTickRecord], shard: str, token: int) -> StorageResult:
+        started = time.perf_counter()
+        committed = self.storage.write_batch(records, shard, token=token)
+        return self._result(len(records), committed, started)
+
+    def _roll_job(self) -> StorageResult:
+        started = time.perf_counter()
+        return self._result(0, self.storage.roll(), started)
+
+    def _close_job(self) -> StorageResult:
+        started = time.perf_counter()
+        return self._result(0, self.storage.close(), started)
+
+    def _result(self, records: int, committed: List[Path], started: float) -> StorageResult:
+        return StorageResult(
+            records=records,
+            committed=committed,
+            durable=self.storage.drain_durable(),
+            bytes_written=sum(path.stat().st_size for path in committed),
+            latency=time.perf_counter() - started,
+        )
+
+    async def _compaction_loop(self) -> None:
+        """Periodically merge the small files of finished days."""
+
+        while True:
+            await asyncio.sleep(self.settings.compaction_interval_seconds)
+            try:
+                await asyncio.to_thread(self._compact_closed_days)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Data lake compaction failed: %s", exc)
+
+    def _compact_closed_days(self) -> None:
+        # Only days that can no longer receive new files. Partitions are keyed
+        # by the tick timestamp's date, so the newest partition (not the local
+        # clock) is the day still being rolled.
+        days = self.storage.partitions()
+        for day in days[:-1]:
+            self.storage.compact(day, min_files=self.settings.compaction_min_files)
+
+    async def _ack(self, *message_ids: str) -> None:
+        if not message_ids:
+            return
         await self.redis.xack(
             self.settings.input_stream,
             self.settings.consumer_group,
-            message_id,
+            *message_ids,
         )
+        self._metrics.acked += len(message_ids)
 
 
 async def build_redis_client(settings: LakeWriterSettings) -> aioredis.Redis:
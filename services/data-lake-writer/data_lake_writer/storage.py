@@ -2,37 +2,374 @@
 
 from __future__ import annotations
 
+import itertools
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
 from pathlib import Path
-from typing import Iterable, Literal
+from typing import Dict, Hashable, Iterable, List, Literal, Optional, Sequence, Tuple
 
-import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from data_contracts import symbol_shard
 
 from .models import CleanTickRecord
 
+logger = logging.getLogger(__name__)
+
+# Aware datetimes are stored as naive UTC, naive ones as-is
+TICK_SCHEMA = pa.schema(
+    [
+        pa.field("source", pa.string()),
+        pa.field("symbol", pa.string()),
+        pa.field("price", pa.float64()),
+        pa.field("volume", pa.int64()),
+        pa.field("turnover", pa.float64()),
+        pa.field("bid_price", pa.float64()),
+        pa.field("bid_volume", pa.int64()),
+        pa.field("ask_price", pa.float64()),
+        pa.field("ask_volume", pa.int64()),
+        pa.field("timestamp", pa.timestamp("us")),
+        pa.field("ingested_at", pa.timestamp("us")),
+        pa.field("cleaned_at", pa.timestamp("us")),
+        pa.field("quality_flags", pa.list_(pa.string())),
+        pa.field("raw", pa.string()),
+    ]
+)
+
+IN_PROGRESS_SUFFIX = ".inprogress"
+
+PartitionKey = Tuple[date, int]
+
+
+def records_to_batch(records: Sequence[CleanTickRecord]) -> pa.RecordBatch:
+    """Build an Arrow record batch straight from the models, column by column."""
+
+    columns = [
+        pa.array([r.source for r in records], pa.string()),
+        pa.array([r.symbol for r in records], pa.string()),
+        pa.array([r.price for r in records], pa.float64()),
+        pa.array([r.volume for r in records], pa.int64()),
+        pa.array([r.turnover for r in records], pa.float64()),
+        pa.array([r.bid_price for r in records], pa.float64()),
+        pa.array([r.bid_volume for r in records], pa.int64()),
+        pa.array([r.ask_price for r in records], pa.float64()),
+        pa.array([r.ask_volume for r in records], pa.int64()),
+        pa.array([r.timestamp for r in records], pa.timestamp("us")),
+        pa.array([r.ingested_at for r in records], pa.timestamp("us")),
+        pa.array([r.cleaned_at for r in records], pa.timestamp("us")),
+        pa.array([r.quality_flags for r in records], pa.list_(pa.string())),
+        pa.array([json.dumps(r.raw, default=str) if r.raw else None for r in records], pa.string()),
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=TICK_SCHEMA)
+
+
+@dataclass
+class _PartitionFile:
+    """An open Parquet file of one partition plus rows waiting for a full row group."""
+
+    path: Path
+    writer: pq.ParquetWriter
+    opened_at: float
+    rows_written: int = 0
+    pending: List[pa.RecordBatch] = field(default_factory=list)
+    pending_rows: int = 0
+    tokens: List[Hashable] = field(default_factory=list)
+
+
+def _fsync(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _commit(tmp_path: Path, path: Path) -> None:
+    """Make a finished file durable and visible under its final name."""
+
+    _fsync(tmp_path)
+    tmp_path.rename(path)
+    _fsync(path.parent)
+
 
 class DataLakeStorage:
-    """Persist batches of clean ticks to disk."""
+    """Persist clean ticks as a Hive-partitioned dataset.
+
+    Layout::
+
+        output_dir/date=2024-03-08/symbol_bucket=05/part-<ts>-<n>.parquet
+
+    Parquet output goes through one rolling ``ParquetWriter`` per partition:
+    rows are buffered until a full row group (``row_group_size``) is
+    available, and a file is rolled (closed and renamed from
+    ``*.parquet.inprogress`` to ``*.parquet``) once it holds
+    ``max_rows_per_file`` rows or has been open ``roll_interval_seconds``.
+    Only rolled files are visible to readers, and only rolled files are
+    durable (fsynced before the rename). ``compact`` merges a day's files
+    into a few large ones.
+
+    Callers that need to know when their rows are on disk pass a ``token``
+    to ``write_batch``; once every file that received rows for that token
+    has been rolled, the token shows up in ``drain_durable``. The class is
+    not thread-safe: writes, rolls and drains must come from one thread.
+    """
 
-    def __init__(self, output_dir: Path, file_format: Literal["parquet", "csv"] = "parquet") -> None:
+    def __init__(
+        self,
+        output_dir: Path,
+        file_format: Literal["parquet", "csv"] = "parquet",
+        symbol_buckets: int = 16,
+        row_group_size: int = 65_536,
+        max_rows_per_file: int = 1_000_000,
+        roll_interval_seconds: float = 300.0,
+        compression: str = "zstd",
+    ) -> None:
         self.output_dir = output_dir
         self.file_format = file_format
+        self.symbol_buckets = symbol_buckets
+        self.row_group_size = row_group_size
+        self.max_rows_per_file = max_rows_per_file
+        self.roll_interval_seconds = roll_interval_seconds
+        self.compression = compression
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._open: Dict[PartitionKey, _PartitionFile] = {}
+        # itertools.count is safe to share with the compaction thread
+        self._sequence = itertools.count(1)
+        self._token_refs: Dict[Hashable, int] = {}
+        self._durable: List[Hashable] = []
 
-    def write_batch(self, records: Iterable[CleanTickRecord], shard: str) -> Path:
-        frame = pd.DataFrame([record.model_dump() for record in records])
-        if frame.empty:
+    def write_batch(
+        self,
+        records: Iterable[CleanTickRecord],
+        shard: Optional[str] = None,
+        token: Optional[Hashable] = None,
+    ) -> List[Path]:
+        """Write records into their partitions.
+
+        Returns the files that became complete (rolled) during this call.
+        CSV output has no rolling writer, so every touched partition gets a
+        complete file immediately.
+        """
+
+        records = list(records)
+        if not records:
             raise ValueError("Cannot write empty dataset")
 
-        output_path = self._build_path(shard)
+        batch = records_to_batch(records)
+        groups: Dict[PartitionKey, List[int]] = {}
+        for index, record in enumerate(records):
+            key = (record.timestamp.date(), symbol_shard(record.symbol, self.symbol_buckets))
+            groups.setdefault(key, []).append(index)
+
+        # Pin the token so a roll half-way through the call cannot release it early
+        if token is not None:
+            self._token_refs[token] = self._token_refs.get(token, 0) + 1
+        completed: List[Path] = []
+        for key, indices in groups.items():
+            part = batch if len(indices) == len(records) else batch.take(pa.array(indices))
+            if self.file_format == "parquet":
+                completed.extend(self._append(key, part, token))
+            else:
+                completed.append(self._write_csv(key, part, shard))
+        if token is not None:
+            self._release(token)
+        return completed
+
+    def drain_durable(self) -> List[Hashable]:
+        """Tokens whose rows are all in rolled files, in the order they became durable."""
+
+        durable, self._durable = self._durable, []
+        return durable
+
+    def discard_incomplete(self) -> int:
+        """Delete ``.inprogress`` files left behind by a crashed writer.
+
+        Their rows were never reported durable, so they will be written again.
+        Only safe when this instance is the single writer of ``output_dir``.
+        """
+
+        stale = list(self.output_dir.rglob(f"*{IN_PROGRESS_SUFFIX}"))
+        for path in stale:
+            path.unlink()
+        return len(stale)
+
+    def abort(self) -> int:
+        """Drop every open file after a failed write, as a crash would.
+
+        Tokens that were not durable yet are forgotten and never show up in
+        ``drain_durable``; their rows have to be written again. Returns the
+        number of ``.inprogress`` files deleted.
+        """
+
+        for part in self._open.values():
+            try:
+                part.writer.close()
+            except Exception:  # noqa: BLE001
+                pass
+        self._open.clear()
+        self._token_refs.clear()
+        return self.discard_incomplete()
+
+    def roll(self, force: bool = False) -> List[Path]:
+        """Roll files open longer than the roll interval (all files when ``force``)."""
+
+        now = time.monotonic()
+        due = [
+            key for key, part in self._open.items()
+            if force or now - part.opened_at >= self.roll_interval_seconds
+        ]
+        return [self._roll(key) for key in due]
+
+    def close(self) -> List[Path]:
+        """Roll every open file."""
+
+        return self.roll(force=True)
+
+    @property
+    def open_files(self) -> int:
+        return len(self._open)
+
+    def _partition_dir(self, key: PartitionKey) -> Path:
+        day, bucket = key
+        return self.output_dir / f"date={day.isoformat()}" / f"symbol_bucket={bucket:02d}"
+
+    def _new_file_name(self, suffix: str) -> str:
+        return f"part-{datetime.utcnow():%Y%m%dT%H%M%S%f}-{next(self._sequence):05d}.{suffix}"
+
+    def _append(self, key: PartitionKey, batch: pa.RecordBatch, token: Optional[Hashable]) -> List[Path]:
+        completed: List[Path] = []
+        while batch.num_rows:
+            part = self._open.get(key)
+            if part is None:
+                part = self._open_file(key)
+            if token is not None and (not part.tokens or part.tokens[-1] != token):
+                part.tokens.append(token)
+                self._token_refs[token] = self._token_refs.get(token, 0) + 1
+
+            room = self.max_rows_per_file - part.rows_written - part.pending_rows
+            part.pending.append(batch.slice(0, room))
+            part.pending_rows += min(room, batch.num_rows)
+            batch = batch.slice(room)
+
+            if part.pending_rows >= self.row_group_size:
+                self._write_pending(part, full_groups_only=True)
+            if part.rows_written + part.pending_rows >= self.max_rows_per_file:
+                completed.append(self._roll(key))
+        return completed
+
+    def _open_file(self, key: PartitionKey) -> _PartitionFile:
+        directory = self._partition_dir(key)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / self._new_file_name("parquet")
+        writer = pq.ParquetWriter(str(path) + IN_PROGRESS_SUFFIX, TICK_SCHEMA, compression=self.compression)
+        part = self._open[key] = _PartitionFile(path=path, writer=writer, opened_at=time.monotonic())
+        return part
+
+    def _write_pending(self, part: _PartitionFile, full_groups_only: bool = False) -> None:
+        rows = part.pending_rows
+        if full_groups_only:
+            rows -= rows % self.row_group_size
+        if not rows:
+            return
+        table = pa.Table.from_batches(part.pending, schema=TICK_SCHEMA)
+        part.writer.write_table(table.slice(0, rows), row_group_size=self.row_group_size)
+        part.rows_written += rows
+        part.pending = table.slice(rows).to_batches()
+        part.pending_rows -= rows
+
+    def _roll(self, key: PartitionKey) -> Path:
+        part = self._open.pop(key)
+        self._write_pending(part)
+        part.writer.close()
+        _commit(Path(str(part.path) + IN_PROGRESS_SUFFIX), part.path)
+        for token in part.tokens:
+            self._release(token)
+        logger.debug("Rolled %s (%d rows)", part.path, part.rows_written)
+        return part.path
+
+    def _release(self, token: Hashable) -> None:
+        self._token_refs[token] -= 1
+        if not self._token_refs[token]:
+            del self._token_refs[token]
+            self._durable.append(token)
+
+    def _write_csv(self, key: PartitionKey, batch: pa.RecordBatch, shard: Optional[str]) -> Path:
+        directory = self._partition_dir(key)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / (f"ticks_{shard}.csv" if shard else self._new_file_name("csv"))
+        # CSV has no list type; store quality flags as a JSON string
+        table = pa.Table.from_batches([batch])
+        flags = pa.array([json.dumps(v) for v in batch.column("quality_flags").to_pylist()], pa.string())
+        table = table.set_column(table.schema.get_field_index("quality_flags"), "quality_flags", flags)
+        pacsv.write_csv(table, path)
+        _fsync(path)
+        return path
+
+    def compact(self, day: date, min_files: int = 2) -> List[Path]:
+        """Merge the small rolled Parquet files of each bucket of ``day``.
+
+        Files are streamed row group by row group into new files of up to
+        ``max_rows_per_file`` rows; sources are deleted after the merged
+        files are in place. A crash between those two steps can leave
+        duplicate rows, never missing ones.
+        """
+
+        day_dir = self.output_dir / f"date={day.isoformat()}"
+        if not day_dir.is_dir():
+            return []
+
+        created: List[Path] = []
+        for bucket_dir in sorted(p for p in day_dir.iterdir() if p.is_dir()):
+            # Files that already reached full size are left alone
+            sources = [
+                path for path in sorted(bucket_dir.glob("*.parquet"))
+                if pq.ParquetFile(path).metadata.num_rows < self.max_rows_per_file
+            ]
+            if len(sources) < min_files:
+                continue
+
+            outputs: List[Path] = []
+            writer: Optional[pq.ParquetWriter] = None
+            rows = 0
+            try:
+                for source in sources:
+                    for batch in pq.ParquetFile(source).iter_batches(batch_size=self.row_group_size):
+                        if writer is None or rows >= self.max_rows_per_file:
+                            if writer is not None:
+                                writer.close()
+                            outputs.append(bucket_dir / self._new_file_name("parquet"))
+                            writer = pq.ParquetWriter(
+                                str(outputs[-1]) + IN_PROGRESS_SUFFIX,
+                                TICK_SCHEMA,
+                                compression=self.compression,
+                            )
+                            rows = 0
+                        writer.write_batch(batch, row_group_size=self.row_group_size)
+                        rows += batch.num_rows
+            finally:
+                if writer is not None:
+                    writer.close()
 
-        if self.file_format == "parquet":
-            frame.to_parquet(output_path, index=False)
-        else:
-            frame.to_csv(output_path, index=False)
+            for output in outputs:
+                _commit(Path(str(output) + IN_PROGRESS_SUFFIX), output)
+            for source in sources:
+                source.unlink()
+            logger.info("Compacted %d files into %d in %s", len(sources), len(outputs), bucket_dir)
+            created.extend(outputs)
+        return created
 
-        return output_path
+    def partitions(self) -> List[date]:
+        """Dates present in the dataset."""
 
-    def _build_path(self, shard: str) -> Path:
-        suffix = "parquet" if self.file_format == "parquet" else "csv"
-        filename = f"ticks_{shard}.{suffix}"
-        return self.output_dir / filename
+        days = []
+        for path in self.output_dir.glob("date=*"):
+            try:
+                days.append(date.fromisoformat(path.name.split("=", 1)[1]))
+            except ValueError:
+                continue
+        return sorted(days)
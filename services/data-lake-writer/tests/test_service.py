@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
+import json
+from datetime import date, datetime
+from pathlib import Path
 from typing import Dict, List
 
 import pytest
@@ -23,8 +25,8 @@ class DummyRedis:
     async def xreadgroup(self, **kwargs):  # pragma: no cover - not used here
         return []
 
-    async def xack(self, stream, group, message_id):
-        self.acked.append(message_id)
+    async def xack(self, stream, group, *message_ids):
+        self.acked.extend(message_ids)
 
     async def close(self):  # pragma: no cover
         pass
@@ -33,10 +35,17 @@ class DummyRedis:
 class DummyStorage:
     def __init__(self) -> None:
         self.written_batches: List[int] = []
+        self.durable: List[int] = []
+        self.open_files = 0
 
-    def write_batch(self, records, shard):  # noqa: ANN001
+    def write_batch(self, records, shard, token=None):  # noqa: ANN001
         self.written_batches.append(len(list(records)))
-        return shard
+        self.durable.append(token)
+        return []
+
+    def drain_durable(self):
+        durable, self.durable = self.durable, []
+        return durable
 
 
 @pytest.mark.asyncio
@@ -46,7 +55,7 @@ async def test_flush_triggered_by_buffer(monkeypatch: pytest.MonkeyPatch) -> Non
 
     storage = DummyStorage()
     monkeypatch.setattr(service, "storage", storage)
-    async def fake_ack(message_id):  # noqa: ANN001
+    async def fake_ack(*message_ids):  # noqa: ANN001
         return None
 
     monkeypatch.setattr(service, "_ack", fake_ack)
@@ -76,3 +85,143 @@ async def test_flush_triggered_by_buffer(monkeypatch: pytest.MonkeyPatch) -> Non
     await service._flush(force=True)
 
     assert storage.written_batches == [2]
+
+
+def _payload(symbol: str) -> Dict[str, str]:
+    now = datetime(2024, 3, 8, 9, 30).isoformat()
+    return {
+        "payload": json.dumps(
+            {
+                "symbol": symbol,
+                "price": 10.0,
+                "volume": 100,
+                "turnover": 1000.0,
+                "source": "tencent",
+                "timestamp": now,
+                "ingested_at": now,
+                "cleaned_at": now,
+            }
+        )
+    }
+
+
+@pytest.mark.asyncio
+async def test_acks_wait_until_rows_are_durable(tmp_path: Path) -> None:
+    redis = DummyRedis()
+    settings = LakeWriterSettings(output_dir=tmp_path, max_buffer_size=2)
+    service = DataLakeWriterService(settings=settings, redis_client=redis)
+
+    await service._handle_message("1-0", _payload("sh600000"))
+    await service._handle_message("1-1", {"payload": "not json"})
+    await service._handle_message("1-2", _payload("sz000001"))
+    await service._flush(force=True)
+
+    # Rows sit in open .inprogress files, so nothing is acked yet
+    assert redis.acked == []
+    assert service.metrics()["pending_acks"] == 3
+    assert service.metrics()["records_written"] == 2
+
+    await service._dispatch(service._close_job)
+    await service._wait_inflight()
+
+    assert redis.acked == ["1-0", "1-1", "1-2"]
+    metrics = service.metrics()
+    assert metrics["pending_acks"] == 0
+    assert metrics["files_committed"] == len(list(tmp_path.rglob("*.parquet"))) > 0
+    assert metrics["bytes_written"] == sum(p.stat().st_size for p in tmp_path.rglob("*.parquet"))
+
+
+@pytest.mark.asyncio
+async def test_read_batch_replays_pending_entries_first() -> None:
+    redis = DummyRedis()
+    calls: List[str] = []
+    pages = {"0": [("1-0", {}), ("1-1", {})], "1-1": [], ">": [("2-0", {})]}
+
+    async def xreadgroup(**kwargs):  # noqa: ANN003
+        stream_id = kwargs["streams"]["dfp:clean_ticks"]
+        calls.append(stream_id)
+        return [("dfp:clean_ticks", pages[stream_id])]
+
+    redis.xreadgroup = xreadgroup
+    service = DataLakeWriterService(settings=LakeWriterSettings(), redis_client=redis)
+
+    assert [mid for mid, _ in await service._read_batch()] == ["1-0", "1-1"]
+    assert [mid for mid, _ in await service._read_batch()] == ["2-0"]
+    assert [mid for mid, _ in await service._read_batch()] == ["2-0"]
+    assert calls == ["0", "1-1", ">", ">"]
+
+
+@pytest.mark.asyncio
+async def test_failed_write_drops_open_files_and_replays_the_pel(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    redis = DummyRedis()
+    stream: Dict[str, Dict[str, str]] = {
+        "1-0": _payload("sh600000"),
+        "1-1": _payload("sz000001"),
+        "1-2": _payload("sh600001"),
+    }
+
+    async def xreadgroup(**kwargs):  # noqa: ANN003
+        stream_id = kwargs["streams"]["dfp:clean_ticks"]
+        if stream_id == ">":
+            return []
+        # The PEL: everything not acked, after the cursor
+        after = [mid for mid in stream if mid not in redis.acked and (stream_id == "0" or mid > stream_id)]
+        return [("dfp:clean_ticks", [(mid, stream[mid]) for mid in after])]
+
+    redis.xreadgroup = xreadgroup
+    settings = LakeWriterSettings(output_dir=tmp_path, max_buffer_size=10)
+    service = DataLakeWriterService(settings=settings, redis_client=redis)
+
+    for message_id, payload in await service._read_batch():
+        await service._handle_message(message_id, payload)
+        if message_id == "1-0":
+            await service._flush(force=True)
+    # The second batch fails half way; the first one sits in an open file
+    def disk_full(*args):  # noqa: ANN002
+        raise OSError("disk full")
+
+    monkeypatch.setattr(service.storage, "_append", disk_full)
+    await service._flush(force=True)
+    monkeypatch.undo()
+
+    assert service.metrics()["failed_flushes"] == 1
+    assert list(tmp_path.rglob("*.inprogress"))
+
+    await service._replay_from_pel()
+
+    assert not list(tmp_path.rglob("*.inprogress"))
+    assert service.metrics()["pending_acks"] == 0
+    assert service.metrics()["replays"] == 1
+    assert redis.acked == []
+
+    for message_id, payload in await service._read_batch():
+        await service._handle_message(message_id, payload)
+    await service._flush(force=True)
+    await service._dispatch(service._close_job)
+    await service._wait_inflight()
+
+    assert sorted(redis.acked) == ["1-0", "1-1", "1-2"]
+    pq = pytest.importorskip("pyarrow.parquet")
+    rows = sum(pq.ParquetFile(path).metadata.num_rows for path in tmp_path.rglob("*.parquet"))
+    assert rows == 3
+
+
+def test_closed_days_follow_tick_dates_not_the_local_clock() -> None:
+    service = DataLakeWriterService(settings=LakeWriterSettings(), redis_client=DummyRedis())
+    compacted: List[date] = []
+
+    class Storage:
+        def partitions(self) -> List[date]:
+            # Tick dates ahead of the local clock (e.g. UTC+8 ticks on a UTC host)
+            return [date(2099, 1, 1), date(2099, 1, 2), date(2099, 1, 5)]
+
+        def compact(self, day: date, min_files: int) -> List[Path]:
+            compacted.append(day)
+            return []
+
+    service.storage = Storage()
+    service._compact_closed_days()
+
+    assert compacted == [date(2099, 1, 1), date(2099, 1, 2)]
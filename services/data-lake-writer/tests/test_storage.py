@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from importlib.util import find_spec
 from pathlib import Path
 
 import pytest
+from data_contracts import symbol_shard
 
 from data_lake_writer.models import CleanTickRecord
 from data_lake_writer.storage import DataLakeStorage
@@ -15,14 +16,14 @@ from data_lake_writer.storage import DataLakeStorage
 HAS_PARQUET = find_spec("pyarrow") is not None
 
 
-def _record() -> CleanTickRecord:
+def _record(symbol: str = "sh600000", timestamp: datetime | None = None) -> CleanTickRecord:
     return CleanTickRecord(
-        symbol="sh600000",
+        symbol=symbol,
         price=10.0,
         volume=1000,
         turnover=10000.0,
         source="tencent",
-        timestamp=datetime.utcnow(),
+        timestamp=timestamp or datetime.utcnow(),
         ingested_at=datetime.utcnow(),
         cleaned_at=datetime.utcnow(),
     )
@@ -31,15 +32,77 @@ def _record() -> CleanTickRecord:
 @pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
 def test_write_batch_parquet(tmp_path: Path) -> None:
     storage = DataLakeStorage(output_dir=tmp_path, file_format="parquet")
-    path = storage.write_batch([_record()], shard="20240101T000000")
+    assert storage.write_batch([_record()], shard="20240101T000000") == []
 
+    [path] = storage.close()
     assert path.suffix == ".parquet"
     assert path.exists()
 
 
 def test_write_batch_csv(tmp_path: Path) -> None:
     storage = DataLakeStorage(output_dir=tmp_path, file_format="csv")
-    path = storage.write_batch([_record()], shard="20240101T000001")
+    [path] = storage.write_batch([_record()], shard="20240101T000001")
 
     assert path.suffix == ".csv"
     assert path.exists()
+
+
+@pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+def test_rolling_writer_partitions_and_row_groups(tmp_path: Path) -> None:
+    import pyarrow.parquet as pq
+
+    storage = DataLakeStorage(
+        output_dir=tmp_path, file_format="parquet", row_group_size=3, max_rows_per_file=6
+    )
+    day = datetime(2024, 3, 8, 9, 30)
+    records = [_record("sh600000", day + timedelta(seconds=i)) for i in range(8)]
+    records.append(_record("sh600000", day + timedelta(days=1)))
+
+    assert storage.write_batch(records[:2]) == []
+    assert list(tmp_path.rglob("*.parquet")) == []
+    [rolled] = storage.write_batch(records[2:])
+
+    bucket = symbol_shard("sh600000", storage.symbol_buckets)
+    assert rolled.parent == tmp_path / "date=2024-03-08" / f"symbol_bucket={bucket:02d}"
+    metadata = pq.ParquetFile(rolled).metadata
+    assert metadata.num_rows == 6
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [3, 3]
+
+    committed = storage.close()
+    assert sorted(p.parent.parent.name for p in committed) == ["date=2024-03-08", "date=2024-03-09"]
+    assert list(tmp_path.rglob("*.inprogress")) == []
+    assert storage.partitions() == [day.date(), (day + timedelta(days=1)).date()]
+
+
+@pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+def test_compact_merges_small_files(tmp_path: Path) -> None:
+    import pyarrow.parquet as pq
+
+    storage = DataLakeStorage(output_dir=tmp_path, file_format="parquet")
+    day = datetime(2024, 3, 8, 9, 30)
+    for i in range(3):
+        storage.write_batch([_record("sh600000", day + timedelta(seconds=i))])
+        storage.close()
+    bucket_dir = tmp_path / "date=2024-03-08"
+    assert len(list(bucket_dir.rglob("*.parquet"))) == 3
+
+    [merged] = storage.compact(day.date())
+
+    assert list(bucket_dir.rglob("*.parquet")) == [merged]
+    table = pq.read_table(merged)
+    assert table.column("timestamp").to_pylist() == [day + timedelta(seconds=i) for i in range(3)]
+    assert storage.compact(day.date()) == []
+
+
+@pytest.mark.skipif(not HAS_PARQUET, reason="pyarrow not installed")
+def test_token_is_durable_only_after_all_its_files_roll(tmp_path: Path) -> None:
+    storage = DataLakeStorage(output_dir=tmp_path, file_format="parquet", max_rows_per_file=2)
+    day = datetime(2024, 3, 8, 9, 30)
+
+    # Three rows of one partition: the first file rolls mid-call, the second stays open
+    storage.write_batch([_record("sh600000", day + timedelta(seconds=i)) for i in range(3)], token="a")
+    assert storage.drain_durable() == []
+
+    storage.write_batch([_record("sz000001", day)], token="b")
+    storage.close()
+    assert sorted(storage.drain_durable()) == ["a", "b"]
@@ -3,61 +3,326 @@
 from __future__ import annotations
 
 from collections import deque
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Deque, Dict, Iterable, List
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
 
 from .models import CleanTick, FeatureSnapshot
 
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(ts: datetime) -> int:
+    """Exact integer microseconds since the epoch (naive and aware both supported)."""
+
+    return (ts - (_EPOCH_UTC if ts.tzinfo else _EPOCH)) // _MICROSECOND
+
 
 @dataclass
 class RollingWindow:
+    """Time-based window with O(1) amortized updates.
+
+    Volume, turnover and price are kept as running sums, and the rolling
+    max/min come from monotonic deques of ``(sequence, price)`` pairs, so
+    neither ``add``/``trim`` nor ``stats`` walks the window.
+    """
+
     name: str
     duration: timedelta
     items: Deque[CleanTick]
+    volume_sum: int = 0
+    turnover_sum: float = 0.0
+    price_sum: float = 0.0
+    _max_prices: Deque[Tuple[int, float]] = field(default_factory=deque, repr=False)
+    _min_prices: Deque[Tuple[int, float]] = field(default_factory=deque, repr=False)
+    _added: int = field(default=0, repr=False)
+    _removed: int = field(default=0, repr=False)
+
+    def __post_init__(self) -> None:
+        initial = list(self.items)
+        self.items.clear()
+        for tick in initial:
+            self.add(tick)
 
     def add(self, tick: CleanTick) -> None:
+        sequence = self._added
+        self._added += 1
         self.items.append(tick)
 
+        price = tick.price
+        self.volume_sum += tick.volume
+        self.turnover_sum += tick.turnover
+        self.price_sum += price
+
+        while self._max_prices and self._max_prices[-1][1] <= price:
+            self._max_prices.pop()
+        self._max_prices.append((sequence, price))
+        while self._min_prices and self._min_prices[-1][1] >= price:
+            self._min_prices.pop()
+        self._min_prices.append((sequence, price))
+
     def trim(self, now: datetime) -> None:
         while self.items and (now - self.items[0].timestamp) > self.duration:
-            self.items.popleft()
+            self._evict()
+
+    def _evict(self) -> None:
+        tick = self.items.popleft()
+        sequence = self._removed
+        self._removed += 1
+
+        if not self.items:
+            # Reset instead of subtracting so float error never carries over
+            self.volume_sum = 0
+            self.turnover_sum = 0.0
+            self.price_sum = 0.0
+            self._max_prices.clear()
+            self._min_prices.clear()
+            return
+
+        self.volume_sum -= tick.volume
+        self.turnover_sum -= tick.turnover
+        self.price_sum -= tick.price
+        if self._max_prices[0][0] == sequence:
+            self._max_prices.popleft()
+        if self._min_prices[0][0] == sequence:
+            self._min_prices.popleft()
 
     def stats(self) -> FeatureSnapshot:
         if not self.items:
             raise ValueError("No data in rolling window")
 
-        prices = [item.price for item in self.items]
-        volumes = [item.volume for item in self.items]
-        turnovers = [item.turnover for item in self.items]
+        last = self.items[-1]
+        price = last.price
+        first_price = self.items[0].price
+        change_percent = ((price - first_price) / first_price * 100) if first_price else None
+        sample_size = len(self.items)
+
+        return FeatureSnapshot(
+            symbol=last.symbol,
+            window=self.name,
+            timestamp=last.timestamp,
+            price=price,
+            change_percent=change_percent,
+            volume_sum=self.volume_sum,
+            avg_price=max(self.price_sum / sample_size, 0.0),
+            max_price=self._max_prices[0][1],
+            min_price=self._min_prices[0][1],
+            turnover_sum=max(self.turnover_sum, 0.0),
+            sample_size=sample_size,
+        )
+
+
+class ColumnarWindowStore:
+    """One rolling window for many symbols backed by NumPy ring buffers.
 
-        price = prices[-1]
-        first_price = prices[0]
+    Each symbol owns a row of fixed ``capacity``; timestamps, prices,
+    volumes and turnovers live in 2-D arrays and the per-symbol sums are
+    1-D arrays, so ``columns()`` returns the window statistics of every
+    symbol without building per-tick objects. When a row is full the
+    oldest tick is evicted early. Rolling max/min use the same monotonic
+    deques as ``RollingWindow``.
+    """
+
+    def __init__(self, name: str, duration: timedelta, capacity: int = 4096, initial_rows: int = 256) -> None:
+        try:
+            import numpy as np
+        except ImportError as exc:  # pragma: no cover
+            raise ImportError("ColumnarWindowStore requires numpy") from exc
+
+        self._np = np
+        self.name = name
+        self.duration = duration
+        self.capacity = capacity
+        self._duration_us = duration // _MICROSECOND
+        self._rows: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self._last: List[Optional[CleanTick]] = []
+        self._max_prices: List[Deque[Tuple[int, float]]] = []
+        self._min_prices: List[Deque[Tuple[int, float]]] = []
+        self._allocate(initial_rows)
+
+    def _allocate(self, rows: int) -> None:
+        np = self._np
+        self._ts = np.zeros((rows, self.capacity), dtype=np.int64)
+        self._price = np.zeros((rows, self.capacity), dtype=np.float64)
+        self._volume = np.zeros((rows, self.capacity), dtype=np.int64)
+        self._turnover = np.zeros((rows, self.capacity), dtype=np.float64)
+        self._head = np.zeros(rows, dtype=np.int64)
+        self._added = np.zeros(rows, dtype=np.int64)
+        self.counts = np.zeros(rows, dtype=np.int64)
+        self.volume_sums = np.zeros(rows, dtype=np.int64)
+        self.turnover_sums = np.zeros(rows, dtype=np.float64)
+        self.price_sums = np.zeros(rows, dtype=np.float64)
+
+    def _grow(self) -> None:
+        old = len(self._head)
+        arrays = {
+            name: getattr(self, name)
+            for name in (
+                "_ts", "_price", "_volume", "_turnover", "_head", "_added",
+                "counts", "volume_sums", "turnover_sums", "price_sums",
+            )
+        }
+        self._allocate(old * 2)
+        for name, values in arrays.items():
+            getattr(self, name)[:old] = values
+
+    def row(self, symbol: str) -> int:
+        row = self._rows.get(symbol)
+        if row is None:
+            row = len(self.symbols)
+            if row == len(self._head):
+                self._grow()
+            self._rows[symbol] = row
+            self.symbols.append(symbol)
+            self._last.append(None)
+            self._max_prices.append(deque())
+            self._min_prices.append(deque())
+        return row
+
+    def add(self, tick: CleanTick) -> int:
+        """Append a tick and evict everything older than the window; returns the row."""
+
+        row = self.row(tick.symbol)
+        now = _to_micros(tick.timestamp)
+        if self.counts[row] == self.capacity:
+            self._evict(row)
+
+        sequence = int(self._added[row])
+        slot = (self._head[row] + self.counts[row]) % self.capacity
+        price = tick.price
+        self._ts[row, slot] = now
+        self._price[row, slot] = price
+        self._volume[row, slot] = tick.volume
+        self._turnover[row, slot] = tick.turnover
+        self.counts[row] += 1
+        self._added[row] += 1
+        self.volume_sums[row] += tick.volume
+        self.turnover_sums[row] += tick.turnover
+        self.price_sums[row] += price
+        self._last[row] = tick
+
+        max_prices = self._max_prices[row]
+        while max_prices and max_prices[-1][1] <= price:
+            max_prices.pop()
+        max_prices.append((sequence, price))
+        min_prices = self._min_prices[row]
+        while min_prices and min_prices[-1][1] >= price:
+            min_prices.pop()
+        min_prices.append((sequence, price))
+
+        self.trim(row, now)
+        return row
+
+    def trim(self, row: int, now_us: int) -> None:
+        while self.counts[row] and now_us - self._ts[row, self._head[row]] > self._duration_us:
+            self._evict(row)
+
+    def _evict(self, row: int) -> None:
+        head = self._head[row]
+        sequence = int(self._added[row] - self.counts[row])
+        self._head[row] = (head + 1) % self.capacity
+        self.counts[row] -= 1
+
+        if not self.counts[row]:
+            self.volume_sums[row] = 0
+            self.turnover_sums[row] = 0.0
+            self.price_sums[row] = 0.0
+            self._max_prices[row].clear()
+            self._min_prices[row].clear()
+            return
+
+        self.volume_sums[row] -= self._volume[row, head]
+        self.turnover_sums[row] -= self._turnover[row, head]
+        self.price_sums[row] -= self._price[row, head]
+        if self._max_prices[row][0][0] == sequence:
+            self._max_prices[row].popleft()
+        if self._min_prices[row][0][0] == sequence:
+            self._min_prices[row].popleft()
+
+    def stats(self, row: int) -> FeatureSnapshot:
+        count = int(self.counts[row])
+        if not count:
+            raise ValueError("No data in rolling window")
+
+        last = self._last[row]
+        price = last.price
+        first_price = float(self._price[row, self._head[row]])
         change_percent = ((price - first_price) / first_price * 100) if first_price else None
 
         return FeatureSnapshot(
-            symbol=self.items[-1].symbol,
+            symbol=last.symbol,
             window=self.name,
-            timestamp=self.items[-1].timestamp,
+            timestamp=last.timestamp,
             price=price,
             change_percent=change_percent,
-            volume_sum=sum(volumes),
-            avg_price=sum(prices) / len(prices),
-            max_price=max(prices),
-            min_price=min(prices),
-            turnover_sum=sum(turnovers),
-            sample_size=len(prices),
+            volume_sum=int(self.volume_sums[row]),
+            avg_price=max(float(self.price_sums[row]) / count, 0.0),
+            max_price=self._max_prices[row][0][1],
+            min_price=self._min_prices[row][0][1],
+            turnover_sum=max(float(self.turnover_sums[row]), 0.0),
+            sample_size=count,
         )
 
+    def columns(self) -> Dict[str, "np.ndarray"]:
+        """Window statistics of every symbol as column arrays (empty rows included)."""
+
+        np = self._np
+        n = len(self.symbols)
+        counts = self.counts[:n]
+        rows = np.arange(n)
+        last_slot = (self._head[:n] + counts - 1) % self.capacity
+        first_price = self._price[rows, self._head[:n]]
+        last_price = self._price[rows, last_slot]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change_percent = np.where(first_price != 0, (last_price - first_price) / first_price * 100, np.nan)
+            avg_price = np.where(counts > 0, self.price_sums[:n] / counts, np.nan)
+
+        return {
+            "symbol": np.array(self.symbols, dtype=object),
+            "timestamp_us": self._ts[rows, last_slot],
+            "price": last_price,
+            "change_percent": change_percent,
+            "volume_sum": self.volume_sums[:n].copy(),
+            "avg_price": avg_price,
+            "max_price": np.array([d[0][1] if d else np.nan for d in self._max_prices]),
+            "min_price": np.array([d[0][1] if d else np.nan for d in self._min_prices]),
+            "turnover_sum": self.turnover_sums[:n].copy(),
+            "sample_size": counts.copy(),
+        }
+
 
 class FeatureCalculator:
-    """Compute rolling statistics for each symbol."""
+    """Compute rolling statistics for each symbol.
 
-    def __init__(self, window_configs: Dict[str, timedelta]) -> None:
+    With ``columnar=True`` every window is a single ``ColumnarWindowStore``
+    shared by all symbols instead of one ``RollingWindow`` per symbol.
+    """
+
+    def __init__(
+        self,
+        window_configs: Dict[str, timedelta],
+        columnar: bool = False,
+        columnar_capacity: int = 4096,
+    ) -> None:
         self.window_configs = window_configs
         self.windows: Dict[str, Dict[str, RollingWindow]] = {}
+        self.stores: Dict[str, ColumnarWindowStore] = {}
+        if columnar:
+            self.stores = {
+                name: ColumnarWindowStore(name, duration, capacity=columnar_capacity)
+                for name, duration in window_configs.items()
+            }
 
     def update(self, tick: CleanTick) -> List[FeatureSnapshot]:
+        if self.stores:
+            return [store.stats(store.add(tick)) for store in self.stores.values()]
+
         symbol_windows = self.windows.setdefault(tick.symbol, {})
         snapshots: List[FeatureSnapshot] = []
 
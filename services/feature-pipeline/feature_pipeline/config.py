@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import List
+from typing import List, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -28,6 +28,13 @@ class FeaturePipelineSettings(BaseSettings):
     read_count: int = Field(500, ge=1, alias="READ_COUNT")
     block_ms: int = Field(1000, ge=1, alias="BLOCK_MS")
     publish_channel: str = Field("dfp:features", alias="PUBLISH_CHANNEL")
+    publish_interval_ms: int = Field(200, ge=0, alias="PUBLISH_INTERVAL_MS")
+    publish_batch_size: int = Field(500, ge=1, alias="PUBLISH_BATCH_SIZE")
+    feature_stream: Optional[str] = Field("dfp:features:stream", alias="FEATURE_STREAM")
+    feature_stream_shards: int = Field(1, ge=1, alias="FEATURE_STREAM_SHARDS")
+    feature_stream_maxlen: Optional[int] = Field(100_000, alias="FEATURE_STREAM_MAXLEN")
+    columnar_store: bool = Field(False, alias="COLUMNAR_STORE")
+    columnar_capacity: int = Field(4096, ge=1, alias="COLUMNAR_CAPACITY")
 
     windows: List[WindowConfig] = Field(default_factory=lambda: [WindowConfig(name="5s", window_size=5, window_unit="seconds")])
 
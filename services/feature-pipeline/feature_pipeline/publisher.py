@@ -0,0 +1,179 @@
+"""Coalescing publisher for feature snapshots."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+from data_contracts import shard_stream, symbol_shard
+
+from .models import FeatureSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PublisherMetrics:
+    """Conflation and flush metrics for the snapshot publisher."""
+
+    received: int = 0
+    conflated: int = 0
+    published: int = 0
+    messages: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    last_flush_size: int = 0
+    last_flush_latency_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "received": self.received,
+            "conflated": self.conflated,
+            "published": self.published,
+            "messages": self.messages,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "conflation_ratio": round(self.conflated / self.received, 4) if self.received else 0.0,
+            "last_flush_size": self.last_flush_size,
+            "last_flush_latency_ms": round(self.last_flush_latency_ms, 3),
+        }
+
+
+class SnapshotPublisher:
+    """Keeps only the latest snapshot per (symbol, window) and publishes on a timer.
+
+    Every ``interval`` seconds the pending snapshots are split into
+    messages of at most ``max_batch`` snapshots (JSON lists, the format
+    strategy-engine already accepts) and sent in one Redis pipeline.
+    Snapshots replaced before a flush are counted as ``conflated``; a
+    failed flush keeps its snapshots pending for the next attempt.
+    With ``interval <= 0`` nothing runs in the background and the caller
+    is expected to ``flush`` explicitly.
+
+    When ``stream`` is set the same snapshots are also appended (XADD, in
+    the same pipeline) to ``stream_shards`` streams keyed by symbol hash,
+    so stream consumers can replay them and shard work by symbol.
+    """
+
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        channel: str,
+        interval: float = 0.2,
+        max_batch: int = 500,
+        stream: Optional[str] = None,
+        stream_shards: int = 1,
+        stream_maxlen: Optional[int] = None,
+    ) -> None:
+        self.redis = redis_client
+        self.channel = channel
+        self.interval = interval
+        self.max_batch = max_batch
+        self.stream = stream
+        self.stream_shards = stream_shards
+        self.stream_maxlen = stream_maxlen
+        self._pending: Dict[Tuple[str, str], FeatureSnapshot] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._metrics = PublisherMetrics()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def offer(self, snapshots: Iterable[FeatureSnapshot]) -> None:
+        """Replace the pending snapshot of each (symbol, window)."""
+
+        pending = self._pending
+        metrics = self._metrics
+        for snapshot in snapshots:
+            key = (snapshot.symbol, snapshot.window)
+            if key in pending:
+                metrics.conflated += 1
+            pending[key] = snapshot
+            metrics.received += 1
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Feature publish failed: %s", exc)
+
+    async def flush(self) -> int:
+        """Publish everything pending; returns the number of snapshots sent."""
+
+        if not self._pending:
+            return 0
+
+        flushing = self._pending
+        self._pending = {}
+        snapshots = list(flushing.values())
+        dumped = [snapshot.model_dump(mode="json") for snapshot in snapshots]
+        messages: List[str] = [
+            json.dumps(dumped[i:i + self.max_batch]) for i in range(0, len(dumped), self.max_batch)
+        ]
+
+        started = time.perf_counter()
+        pipe = self.redis.pipeline(transaction=False)
+        for message in messages:
+            pipe.publish(self.channel, message)
+        if self.stream:
+            self._add_stream_entries(pipe, dumped)
+        try:
+            await pipe.execute()
+        except Exception:
+            self._metrics.failed_flushes += 1
+            # Keep failed snapshots for the next flush unless a newer one arrived meanwhile
+            for key, snapshot in flushing.items():
+                self._pending.setdefault(key, snapshot)
+            raise
+
+        metrics = self._metrics
+        metrics.flushes += 1
+        metrics.published += len(snapshots)
+        metrics.messages += len(messages)
+        metrics.last_flush_size = len(snapshots)
+        metrics.last_flush_latency_ms = (time.perf_counter() - started) * 1000
+        return len(snapshots)
+
+    def _add_stream_entries(self, pipe: aioredis.client.Pipeline, dumped: List[Dict[str, object]]) -> None:
+        shards: Dict[int, List[Dict[str, object]]] = {}
+        for item in dumped:
+            shards.setdefault(symbol_shard(str(item["symbol"]), self.stream_shards), []).append(item)
+
+        kwargs: Dict[str, object] = {}
+        if self.stream_maxlen is not None:
+            kwargs = {"maxlen": self.stream_maxlen, "approximate": True}
+        for shard, items in sorted(shards.items()):
+            name = shard_stream(self.stream, shard, self.stream_shards)
+            for i in range(0, len(items), self.max_batch):
+                pipe.xadd(name, {"payload": json.dumps(items[i:i + self.max_batch])}, **kwargs)
+
+    def metrics(self) -> Dict[str, object]:
+        """Return a snapshot of publisher metrics."""
+
+        data = self._metrics.as_dict()
+        data["pending"] = len(self._pending)
+        return data
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 from datetime import timedelta
 from typing import Dict, List, Tuple
@@ -13,6 +12,7 @@ import redis.asyncio as aioredis
 from .calculators import FeatureCalculator
 from .config import FeaturePipelineSettings
 from .models import CleanTick
+from .publisher import SnapshotPublisher
 
 logger = logging.getLogger(__name__)
 
@@ -24,11 +24,25 @@ class FeaturePipelineService:
         self.settings = settings
         self.redis = redis_client
         window_configs = self._build_window_config(settings)
-        self.calculator = FeatureCalculator(window_configs)
+        self.calculator = FeatureCalculator(
+            window_configs,
+            columnar=settings.columnar_store,
+            columnar_capacity=settings.columnar_capacity,
+        )
+        self.publisher = SnapshotPublisher(
+            redis_client,
+            settings.publish_channel,
+            interval=settings.publish_interval_ms / 1000,
+            max_batch=settings.publish_batch_size,
+            stream=settings.feature_stream,
+            stream_shards=settings.feature_stream_shards,
+            stream_maxlen=settings.feature_stream_maxlen,
+        )
         self._shutdown = asyncio.Event()
 
     async def start(self) -> None:
         await self._ensure_consumer_group()
+        await self.publisher.start()
         logger.info(
             "Feature pipeline started (stream=%s channel=%s)",
             self.settings.input_stream,
@@ -40,13 +54,17 @@ class FeaturePipelineService:
                 entries = await self._read_batch()
                 if not entries:
                     continue
-                for message_id, payload in entries:
-                    await self._process_message(message_id, payload)
+                await self._process_batch(entries)
+                if self.publisher.interval <= 0:
+                    await self.publisher.flush()
             except asyncio.CancelledError:
                 raise
             except Exception as exc:  # noqa: BLE001
                 logger.exception("Feature pipeline loop error: %s", exc)
 
+        await self.publisher.stop()
+        logger.info("Feature pipeline stopped (publisher=%s)", self.publisher.metrics())
+
     async def stop(self) -> None:
         self._shutdown.set()
 
@@ -79,38 +97,30 @@ class FeaturePipelineService:
             entries.extend(messages)
         return entries
 
-    async def _process_message(self, message_id: str, payload: Dict[str, str]) -> None:
-        raw_json = payload.get("payload")
-        if raw_json is None:
-            await self._ack(message_id)
-            return
+    async def _process_batch(self, entries: List[Tuple[str, Dict[str, str]]]) -> None:
+        """Update windows for a batch, hand snapshots to the publisher, ack all ids once."""
 
-        try:
-            tick_dict = json.loads(raw_json)
-            tick = CleanTick.model_validate(tick_dict)
-            logger.info("Processing tick %s: %s @ %s", message_id, tick.symbol, tick.price)
-        except Exception as exc:  # noqa: BLE001
-            logger.error("Failed to parse clean tick: %s", exc)
-            await self._ack(message_id)
-            return
-
-        snapshots = self.calculator.update(tick)
-        logger.info("Generated %d feature snapshots for %s", len(snapshots), tick.symbol)
-        await self._publish(snapshots)
-        logger.info("Published %d snapshots to %s", len(snapshots), self.settings.publish_channel)
-        await self._ack(message_id)
-
-    async def _publish(self, snapshots) -> None:  # noqa: ANN001 - snapshots is list of FeatureSnapshot
-        if not snapshots:
-            return
-        payload = json.dumps([snapshot.model_dump(mode='json') for snapshot in snapshots])
-        await self.redis.publish(self.settings.publish_channel, payload)
-
-    async def _ack(self, message_id: str) -> None:
+        for message_id, payload in entries:
+            raw_json = payload.get("payload")
+            if raw_json is None:
+                continue
+
+            try:
+                tick = CleanTick.model_validate_json(raw_json)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Failed to parse clean tick %s: %s", message_id, exc)
+                continue
+
+            self.publisher.offer(self.calculator.update(tick))
+
+        logger.debug("Processed %d ticks (%d snapshots pending)", len(entries), self.publisher.pending)
+        await self._ack([message_id for message_id, _payload in entries])
+
+    async def _ack(self, message_ids: List[str]) -> None:
         await self.redis.xack(
             self.settings.input_stream,
             self.settings.consumer_group,
-            message_id,
+            *message_ids,
         )
 
     def _build_window_config(self, settings: FeaturePipelineSettings) -> Dict[str, timedelta]:
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 
+import pytest
+
 from feature_pipeline.calculators import FeatureCalculator
 from feature_pipeline.models import CleanTick
 
@@ -45,3 +47,44 @@ def test_calculator_trims_old_ticks():
 
     assert snapshots[0].sample_size == 1
     assert snapshots[0].volume_sum == 200
+
+
+def test_rolling_max_min_follow_evictions():
+    calculator = FeatureCalculator({"5s": timedelta(seconds=5)})
+
+    calculator.update(_tick("sh600000", 12.0, 100, -8))
+    calculator.update(_tick("sh600000", 9.0, 100, -4))
+    snapshots = calculator.update(_tick("sh600000", 10.0, 100, 0))
+
+    assert snapshots[0].sample_size == 2
+    assert snapshots[0].max_price == 10.0
+    assert snapshots[0].min_price == 9.0
+    assert snapshots[0].avg_price == 9.5
+    assert snapshots[0].turnover_sum == 1900.0
+
+
+def test_columnar_store_matches_rolling_windows():
+    pytest.importorskip("numpy")
+    windows = {"3s": timedelta(seconds=3), "1m": timedelta(minutes=1)}
+    rolling = FeatureCalculator(windows)
+    columnar = FeatureCalculator(windows, columnar=True, columnar_capacity=8)
+
+    prices = [10.0, 10.4, 9.8, 10.1, 10.6, 10.2, 9.9, 10.3, 10.5, 10.0]
+    for offset, price in enumerate(prices):
+        for symbol in ("sh600000", "sz000001"):
+            tick = _tick(symbol, price, 100 + offset, offset)
+            expected = rolling.update(tick)
+            actual = columnar.update(tick)
+            for exp, act in zip(expected, actual):
+                if exp.window == "1m" and offset >= 8:
+                    # capacity 8 evicts the oldest ticks before the 1m window would
+                    assert act.sample_size == 8
+                    continue
+                assert act == exp
+
+    columns = columnar.stores["3s"].columns()
+    last = [rolling.windows[symbol]["3s"].stats() for symbol in ("sh600000", "sz000001")]
+    assert list(columns["symbol"]) == ["sh600000", "sz000001"]
+    assert list(columns["sample_size"]) == [s.sample_size for s in last]
+    assert list(columns["max_price"]) == [s.max_price for s in last]
+    assert list(columns["volume_sum"]) == [s.volume_sum for s in last]
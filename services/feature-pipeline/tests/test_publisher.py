@@ -0,0 +1,134 @@
+"""Tests for the coalescing snapshot publisher."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import pytest
+
+from feature_pipeline.models import FeatureSnapshot
+from feature_pipeline.publisher import SnapshotPublisher
+
+
+class DummyPipeline:
+    def __init__(self, redis: "DummyRedis") -> None:
+        self.redis = redis
+        self.commands: List[Tuple[str, str]] = []
+
+    def publish(self, channel: str, message: str) -> None:
+        self.commands.append((channel, message))
+
+    def xadd(self, name: str, fields: Dict[str, str], **kwargs) -> None:
+        assert kwargs == {"maxlen": 1000, "approximate": True}
+        self.commands.append((name, fields["payload"]))
+
+    async def execute(self) -> List[int]:
+        if self.redis.fail_next:
+            self.redis.fail_next = False
+            raise ConnectionError("redis down")
+        self.redis.executed.append(self.commands)
+        return [1] * len(self.commands)
+
+
+class DummyRedis:
+    def __init__(self) -> None:
+        self.executed: List[List[Tuple[str, str]]] = []
+        self.fail_next = False
+
+    def pipeline(self, transaction: bool = True) -> DummyPipeline:
+        return DummyPipeline(self)
+
+
+def _snapshot(symbol: str, window: str, price: float) -> FeatureSnapshot:
+    return FeatureSnapshot(
+        symbol=symbol,
+        window=window,
+        timestamp=datetime.utcnow(),
+        price=price,
+        volume_sum=100,
+        avg_price=price,
+        max_price=price,
+        min_price=price,
+        turnover_sum=price * 100,
+        sample_size=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_flush_keeps_latest_per_symbol_and_window() -> None:
+    redis = DummyRedis()
+    publisher = SnapshotPublisher(redis, "dfp:features", interval=0, max_batch=2)
+
+    publisher.offer([_snapshot("sh600000", "5s", 10.0), _snapshot("sh600000", "1m", 10.0)])
+    publisher.offer([_snapshot("sh600000", "5s", 10.5), _snapshot("sh600000", "1m", 10.5)])
+    publisher.offer([_snapshot("sz000001", "5s", 8.0)])
+    sent = await publisher.flush()
+
+    assert sent == 3
+    assert len(redis.executed) == 1
+    messages = [json.loads(message) for _channel, message in redis.executed[0]]
+    assert [len(m) for m in messages] == [2, 1]
+    latest = {(s["symbol"], s["window"]): s["price"] for m in messages for s in m}
+    assert latest == {("sh600000", "5s"): 10.5, ("sh600000", "1m"): 10.5, ("sz000001", "5s"): 8.0}
+
+    metrics = publisher.metrics()
+    assert metrics["received"] == 5
+    assert metrics["conflated"] == 2
+    assert metrics["published"] == 3
+    assert metrics["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_retains_snapshots_unless_superseded() -> None:
+    redis = DummyRedis()
+    redis.fail_next = True
+    publisher = SnapshotPublisher(redis, "dfp:features", interval=0)
+
+    publisher.offer([_snapshot("sh600000", "5s", 10.0)])
+    with pytest.raises(ConnectionError):
+        await publisher.flush()
+    assert publisher.pending == 1
+
+    await publisher.flush()
+    assert json.loads(redis.executed[0][0][1])[0]["price"] == 10.0
+    assert publisher.metrics()["failed_flushes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_background_task_publishes_on_interval() -> None:
+    redis = DummyRedis()
+    publisher = SnapshotPublisher(redis, "dfp:features", interval=0.01)
+    await publisher.start()
+
+    publisher.offer([_snapshot("sh600000", "5s", 10.0)])
+    await asyncio.sleep(0.05)
+    publisher.offer([_snapshot("sh600000", "5s", 11.0)])
+    await publisher.stop()
+
+    prices = [json.loads(message)[0]["price"] for batch in redis.executed for _c, message in batch]
+    assert prices == [10.0, 11.0]
+
+
+@pytest.mark.asyncio
+async def test_flush_also_appends_sharded_stream_entries() -> None:
+    from data_contracts import shard_stream, symbol_shard
+
+    redis = DummyRedis()
+    publisher = SnapshotPublisher(
+        redis, "dfp:features", interval=0, stream="dfp:features:stream", stream_shards=4, stream_maxlen=1000
+    )
+    symbols = ["sh600000", "sz000001", "sh600519", "sz300750"]
+    publisher.offer([_snapshot(symbol, "5s", 10.0) for symbol in symbols])
+    await publisher.flush()
+
+    [commands] = redis.executed
+    assert commands[0][0] == "dfp:features"
+    entries = commands[1:]
+    expected = {shard_stream("dfp:features:stream", symbol_shard(s, 4), 4) for s in symbols}
+    assert {name for name, _payload in entries} == expected
+    for name, payload in entries:
+        for item in json.loads(payload):
+            assert name == shard_stream("dfp:features:stream", symbol_shard(item["symbol"], 4), 4)
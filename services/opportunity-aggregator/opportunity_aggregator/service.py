@@ -9,6 +9,7 @@ from datetime import timedelta
 from typing import Dict, List, Tuple
 
 import redis.asyncio as aioredis
+from data_contracts import index_opportunity
 
 from .config import AggregatorSettings
 from .models import Opportunity, OpportunityState, StrategySignal
@@ -98,11 +99,11 @@ class OpportunityAggregatorService:
         if self.settings.max_stream_length is not None:
             kwargs["maxlen"] = self.settings.max_stream_length
             kwargs["approximate"] = self.settings.approximate_trim
-        await self.redis.xadd(
-            name=self.settings.opportunity_stream,
-            fields={"payload": payload},
-            **kwargs,
-        )
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xadd(self.settings.opportunity_stream, {"payload": payload}, **kwargs)
+        # Latest opportunity per symbol, read by signal-api without scanning the stream
+        index_opportunity(pipe, self.settings.opportunity_stream, opportunity.symbol, payload)
+        await pipe.execute()
 
         if self.settings.opportunity_channel:
             message = json.dumps({
@@ -11,7 +11,7 @@ import uvicorn
 
 from signal_api.app import create_app
 from signal_api.config import SignalApiSettings, get_settings
-from signal_api.dependencies import get_redis_client
+from signal_api.data.redis_pool import close_redis_pool, get_redis_pool
 
 
 @asynccontextmanager
@@ -19,12 +19,12 @@ async def lifespan(app):  # type: ignore[override]
     # Startup
     settings: SignalApiSettings = get_settings()
     logging.basicConfig(level=settings.log_level)
-    redis_client = get_redis_client()
+    get_redis_pool().start()
 
     yield
 
     # Shutdown
-    await redis_client.close()
+    await close_redis_pool()
 
 
 def run() -> None:
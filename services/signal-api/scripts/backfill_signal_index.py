@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+信号 / 机会索引回填 - 一次性补齐写入端升级前的 Stream 条目
+
+strategy-engine / opportunity-aggregator 只为升级后写入的条目维护索引，
+回填完成前 signal-api 对对应 Stream 回退为有界扫描。可重复执行。
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+
+import redis.asyncio as aioredis
+
+from signal_api.config import get_settings
+from signal_api.index_backfill import backfill_opportunity_index, backfill_signal_index
+
+
+async def main(args):
+    redis = aioredis.from_url(args.redis_url, encoding="utf-8", decode_responses=True)
+    try:
+        signals = await backfill_signal_index(redis, args.signal_stream, args.page_size)
+        print(f"✅ {args.signal_stream}: 已索引 {signals:,} 条信号")
+        symbols = await backfill_opportunity_index(redis, args.opportunity_stream, args.page_size)
+        print(f"✅ {args.opportunity_stream}: 新增 {symbols:,} 个 symbol 的最新机会")
+    finally:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description='回填信号 / 机会 Stream 的二级索引')
+    parser.add_argument('--redis-url', default=settings.redis_url, help='Redis 连接串')
+    parser.add_argument('--signal-stream', default='dfp:strategy_signals', help='信号 Stream')
+    parser.add_argument('--opportunity-stream', default=settings.opportunity_stream, help='机会 Stream')
+    parser.add_argument('--page-size', type=int, default=1000, help='每次读取的条目数')
+    asyncio.run(main(parser.parse_args()))
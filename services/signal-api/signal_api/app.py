@@ -37,6 +37,12 @@ def create_app(lifespan=None) -> FastAPI:
     @app.get("/health")
     async def health() -> dict[str, str]:
         return {"status": "ok"}
+    @app.get("/health/redis")
+    async def redis_health() -> dict:
+        """Shared Redis pool size and parsed stream entry cache stats."""
+        from .data.redis_pool import get_redis_pool
+        from .dependencies import get_entry_cache
+        return {"pool": get_redis_pool().get_stats(), "entry_cache": get_entry_cache().get_stats()}
     @app.get("/metrics")
     async def metrics() -> Response:
         """Prometheus metrics endpoint."""
@@ -102,6 +108,14 @@ async def app_lifespan(app: FastAPI):
     # Startup
     logger.info("Application starting up...")
     
+    # Shared HTTP client pool for upstream quote APIs
+    from .data.http_client import get_http_client, close_http_client
+    await get_http_client().start()
+    
+    # Shared Redis pool for the opportunity / signal repositories
+    from .data.redis_pool import get_redis_pool, close_redis_pool
+    get_redis_pool().start()
+    
     # Start scheduler (optional - can be disabled for testing)
     try:
         from .core.quant.scheduler import start_scheduler, stop_scheduler
@@ -129,6 +143,10 @@ async def app_lifespan(app: FastAPI):
     
     # Close pipeline client
     await close_pipeline_client()
+    
+    # Release pooled upstream connections
+    await close_http_client()
+    await close_redis_pool()
 
 
 # Module-level app instance for uvicorn (with lifespan)
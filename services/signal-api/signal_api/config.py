@@ -13,6 +13,9 @@ class SignalApiSettings(BaseSettings):
     redis_url: str = Field("redis://localhost:6379/0", alias="REDIS_URL")
     opportunity_stream: str = Field("dfp:opportunities", alias="OPPORTUNITY_STREAM")
     max_records: int = Field(200, ge=1, alias="MAX_RECORDS")
+    redis_max_connections: int = Field(50, ge=1, alias="REDIS_MAX_CONNECTIONS")
+    redis_pool_timeout: float = Field(5.0, gt=0, alias="REDIS_POOL_TIMEOUT")
+    stream_entry_cache_size: int = Field(10000, ge=1, alias="STREAM_ENTRY_CACHE_SIZE")
 
     class Config:
         env_prefix = "SIGNAL_API_"
@@ -21,8 +21,11 @@ from dataclasses import dataclass, field
 from enum import Enum
 
 import akshare as ak
+import numpy as np
 import pandas as pd
 
+from .price_history import PriceHistoryRing
+
 logger = logging.getLogger(__name__)
 
 
@@ -86,6 +89,13 @@ class ScannerConfig:
     # 扫描范围
     watch_list: Optional[List[str]] = None  # 自选监控池
     scan_interval: int = 3            # 扫描间隔(秒)
+    max_candidates: int = 50          # 每次扫描返回的Top N
+    
+    # 涨速 (按时间回溯, 与扫描间隔无关)
+    speed_window_1m: float = 60.0     # 1分钟涨速回溯秒数
+    speed_window_3m: float = 180.0    # 3分钟涨速回溯秒数
+    history_depth: int = 128          # 每只股票保留的采样点数(需覆盖 speed_window_3m)
+    speed_max_staleness: float = 30.0  # 回溯命中的采样最多早于窗口起点的秒数(更旧视为无历史)
 
 
 class AnomalyScanner:
@@ -99,10 +109,10 @@ class AnomalyScanner:
     
     def __init__(self, config: Optional[ScannerConfig] = None):
         self.config = config or ScannerConfig()
-        self._price_history: Dict[str, List[float]] = {}  # 历史价格(计算涨速)
+        self._price_history = PriceHistoryRing(depth=self.config.history_depth)  # 历史价格(计算涨速)
         self._last_scan_time: Optional[datetime] = None
         self._detected_codes: Set[str] = set()  # 已检测过的代码(避免重复推送)
-        
+    
     async def scan(self) -> List[AnomalyCandidate]:
         """
         执行全市场扫描
@@ -123,23 +133,17 @@ class AnomalyScanner:
             # 2. 预过滤
             df = self._prefilter(df)
             
-            # 3. 检测异动
-            candidates = []
-            for _, row in df.iterrows():
-                candidate = self._detect_anomaly(row)
-                if candidate and candidate.anomaly_types:
-                    candidates.append(candidate)
-            
-            # 4. 排序(按异动评分)
-            candidates.sort(key=lambda x: x.anomaly_score, reverse=True)
-            
-            # 5. 更新历史
-            self._update_price_history(df)
-            self._last_scan_time = datetime.now()
+            # 3. 检测异动 (向量化, 仅为Top N构建候选对象)
+            now = datetime.now()
+            candidates = self._detect_anomalies(df, now.timestamp())
             
-            logger.info(f"扫描完成: 全市场 {len(df)} 只 → 异动 {len(candidates)} 只")
-            return candidates[:50]  # 返回Top 50
+            # 4. 更新历史
+            self._update_price_history(df, now.timestamp())
+            self._last_scan_time = now
             
+            logger.info(f"扫描完成: 全市场 {len(df)} 只 → 异动Top {len(candidates)} 只")
+            return candidates
+        
         except Exception as e:
             logger.error(f"扫描失败: {e}")
             return []
@@ -170,7 +174,7 @@ class AnomalyScanner:
             })
             
             return df
-            
+        
         except Exception as e:
             logger.warning(f"获取实时行情失败: {e}")
             return None
@@ -200,100 +204,98 @@ class AnomalyScanner:
         
         return df[mask].copy()
     
-    def _detect_anomaly(self, row: pd.Series) -> Optional[AnomalyCandidate]:
-        """检测单只股票异动"""
-        code = str(row.get('code', ''))
-        name = str(row.get('name', ''))
-        price = float(row.get('price', 0))
-        change_pct = float(row.get('change_pct', 0))
-        volume_ratio = float(row.get('volume_ratio', 0))
-        turnover_rate = float(row.get('turnover_rate', 0))
-        amount = float(row.get('amount', 0))
-        
-        anomaly_types = []
-        score = 0.0
+    def _detect_anomalies(self, df: pd.DataFrame, now: Optional[float] = None) -> List[AnomalyCandidate]:
+        """
+        向量化检测异动
         
-        # 检测涨幅异动
-        if change_pct >= self.config.min_change_pct:
-            anomaly_types.append(AnomalyType.PRICE_SURGE)
-            score += min(change_pct / 10, 1) * 30  # 涨幅权重30
+        整列计算各异动掩码、评分与多重异动加成, 按评分排序后
+        只为Top N行构建 AnomalyCandidate 对象。
+        """
+        if df.empty:
+            return []
         
-        # 检测量比异动
-        if volume_ratio >= self.config.min_volume_ratio:
-            anomaly_types.append(AnomalyType.VOLUME_SPIKE)
-            score += min(volume_ratio / 10, 1) * 25  # 量比权重25
+        cfg = self.config
+        codes = df['code'].astype(str).to_numpy()
+        price = df['price'].to_numpy(dtype=float)
+        change_pct = df['change_pct'].to_numpy(dtype=float)
+        volume_ratio = df['volume_ratio'].to_numpy(dtype=float)
+        turnover_rate = df['turnover_rate'].to_numpy(dtype=float)
+        speed_1m, speed_3m = self._calculate_speeds(
+            codes, price, datetime.now().timestamp() if now is None else now
+        )
         
-        # 检测换手异动
-        if turnover_rate >= self.config.min_turnover_rate:
-            anomaly_types.append(AnomalyType.TURNOVER_HIGH)
-            score += min(turnover_rate / 20, 1) * 20  # 换手权重20
+        is_price = change_pct >= cfg.min_change_pct
+        is_volume = volume_ratio >= cfg.min_volume_ratio
+        is_turnover = turnover_rate >= cfg.min_turnover_rate
+        is_speed = speed_1m >= cfg.min_speed_1m
         
-        # 计算涨速
-        speed_1m, speed_3m = self._calculate_speed(code, price)
-        if speed_1m >= self.config.min_speed_1m:
-            anomaly_types.append(AnomalyType.SPEED_FAST)
-            score += min(speed_1m / 3, 1) * 25  # 涨速权重25
+        # 各项权重: 涨幅30 / 量比25 / 换手20 / 涨速25 (与逐行评分顺序一致)
+        score = np.zeros(len(df))
+        score += np.where(is_price, np.minimum(change_pct / 10, 1) * 30, 0.0)
+        score += np.where(is_volume, np.minimum(volume_ratio / 10, 1) * 25, 0.0)
+        score += np.where(is_turnover, np.minimum(turnover_rate / 20, 1) * 20, 0.0)
+        score += np.where(is_speed, np.minimum(speed_1m / 3, 1) * 25, 0.0)
         
         # 多重异动加成
-        if len(anomaly_types) >= 3:
-            anomaly_types.append(AnomalyType.COMBO)
-            score *= 1.2  # 20%加成
+        hits = is_price.astype(int) + is_volume + is_turnover + is_speed
+        is_combo = hits >= 3
+        score = np.where(is_combo, score * 1.2, score)
+        score = np.minimum(score, 100)
         
-        # 至少满足一个异动条件
-        if not anomaly_types:
-            return None
+        # 至少满足一个异动条件, 按评分降序(稳定排序保持原顺序)
+        rows = np.flatnonzero(hits > 0)
+        rows = rows[np.argsort(-score[rows], kind='stable')][:cfg.max_candidates]
         
-        return AnomalyCandidate(
-            code=code,
-            name=name,
-            price=price,
-            change_pct=change_pct,
-            volume_ratio=volume_ratio,
-            turnover_rate=turnover_rate,
-            amount=amount,
-            speed_1m=speed_1m,
-            speed_3m=speed_3m,
-            anomaly_types=anomaly_types,
-            anomaly_score=min(score, 100),
+        names = df['name'].astype(str).to_numpy() if 'name' in df.columns else np.full(len(df), '')
+        amount = df['amount'].to_numpy(dtype=float)
+        flags = (
+            (is_price, AnomalyType.PRICE_SURGE),
+            (is_volume, AnomalyType.VOLUME_SPIKE),
+            (is_turnover, AnomalyType.TURNOVER_HIGH),
+            (is_speed, AnomalyType.SPEED_FAST),
+            (is_combo, AnomalyType.COMBO),
         )
-    
-    def _calculate_speed(self, code: str, current_price: float) -> tuple:
-        """计算涨速"""
-        history = self._price_history.get(code, [])
-        
-        speed_1m = 0.0
-        speed_3m = 0.0
         
-        if history and current_price > 0:
-            # 1分钟涨速 (假设3秒扫描一次，20个点约1分钟)
-            if len(history) >= 1:
-                prev_price = history[-1]
-                if prev_price > 0:
-                    speed_1m = (current_price - prev_price) / prev_price * 100
-            
-            # 3分钟涨速 (60个点约3分钟)
-            if len(history) >= 3:
-                prev_price = history[-3]
-                if prev_price > 0:
-                    speed_3m = (current_price - prev_price) / prev_price * 100
+        candidates = []
+        for i in rows:
+            candidates.append(AnomalyCandidate(
+                code=codes[i],
+                name=names[i],
+                price=float(price[i]),
+                change_pct=float(change_pct[i]),
+                volume_ratio=float(volume_ratio[i]),
+                turnover_rate=float(turnover_rate[i]),
+                amount=float(amount[i]),
+                speed_1m=float(speed_1m[i]),
+                speed_3m=float(speed_3m[i]),
+                anomaly_types=[t for mask, t in flags if mask[i]],
+                anomaly_score=float(score[i]),
+            ))
+        return candidates
+    
+    def _calculate_speeds(self, codes: np.ndarray, prices: np.ndarray, now: float) -> tuple:
+        """
+        批量计算涨速, 返回 (speed_1m数组, speed_3m数组)
         
+        涨速 = 当前价相对 N 秒前(或之前最近一次采样)价格的涨幅%,
+        历史不足 N 秒, 或最近一次采样早于 N 秒前超过 speed_max_staleness
+        (如股票中途跌出预过滤) 时为 0。
+        """
+        cfg = self.config
+        rows = self._price_history.rows(codes, create=False)
+        speed_1m = self._price_history.speeds(rows, prices, cfg.speed_window_1m, now, cfg.speed_max_staleness)
+        speed_3m = self._price_history.speeds(rows, prices, cfg.speed_window_3m, now, cfg.speed_max_staleness)
         return speed_1m, speed_3m
     
-    def _update_price_history(self, df: pd.DataFrame):
-        """更新价格历史"""
-        for _, row in df.iterrows():
-            code = str(row.get('code', ''))
-            price = float(row.get('price', 0))
-            
-            if code and price > 0:
-                if code not in self._price_history:
-                    self._price_history[code] = []
-                
-                self._price_history[code].append(price)
-                
-                # 只保留最近60个点(约3分钟)
-                if len(self._price_history[code]) > 60:
-                    self._price_history[code] = self._price_history[code][-60:]
+    def _update_price_history(self, df: pd.DataFrame, now: Optional[float] = None):
+        """更新价格历史 (写入环形缓冲)"""
+        codes = df['code'].astype(str).to_numpy()
+        prices = df['price'].to_numpy(dtype=float)
+        valid = (codes != '') & (prices > 0)
+        rows = self._price_history.rows(codes[valid])
+        self._price_history.append(
+            rows, prices[valid], datetime.now().timestamp() if now is None else now
+        )
     
     def is_trading_time(self) -> bool:
         """判断是否交易时间"""
@@ -14,9 +14,9 @@ import shutil
 import logging
 import threading
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Iterator, Optional, List, Dict
 
 import duckdb
 import pandas as pd
@@ -238,6 +238,118 @@ class DuckDBManager:
             logger.error(f"Failed to load data for {symbol}: {e}")
             return pd.DataFrame()
     
+    def iter_minute_chunks(
+        self,
+        start_date: str,
+        end_date: str,
+        symbols: Optional[List[str]] = None,
+        chunk_days: int = 5
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream minute bars for many symbols in time-ordered chunks.
+        
+        Each chunk covers chunk_days calendar days across all requested
+        symbols, ordered by (datetime, symbol) and tagged with a 'symbol'
+        column, so a portfolio backtest never holds the full universe in memory.
+        The files are scanned once with the date range pushed down, and the
+        result is streamed in record batches that are cut at chunk boundaries.
+        
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD, inclusive)
+            symbols: Symbols to read (defaults to all stored symbols)
+            chunk_days: Calendar days per chunk
+        
+        Yields:
+            DataFrame per non-empty chunk.
+        """
+        symbols = symbols if symbols is not None else self.get_available_symbols()
+        for symbol in symbols:
+            self._validate_symbol(symbol)
+        files = [
+            str(self.market_data_dir / f"{s}.parquet") for s in symbols
+            if (self.market_data_dir / f"{s}.parquet").exists()
+        ]
+        if not files:
+            logger.warning("No data files found for chunked read")
+            return
+        
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
+        span = timedelta(days=chunk_days)
+        file_list = ", ".join(f"'{f}'" for f in files)
+        query = f"""
+            SELECT {self._symbol_columns(file_list)}
+            FROM read_parquet([{file_list}], filename=true, union_by_name=true)
+            WHERE datetime >= '{start:%Y-%m-%d}' AND datetime < '{end:%Y-%m-%d}'
+            ORDER BY datetime, symbol
+        """
+        
+        pending: List[pd.DataFrame] = []
+        pending_chunk = None
+        for batch in self.conn.execute(query).fetch_record_batch(100_000):
+            frame = batch.to_pandas()
+            chunk_ids = ((pd.to_datetime(frame['datetime']) - start) // span).to_numpy()
+            # Rows arrive in datetime order, so chunk ids never decrease
+            for chunk_id in pd.unique(chunk_ids):
+                if pending_chunk is not None and chunk_id != pending_chunk:
+                    yield pd.concat(pending, ignore_index=True)
+                    pending = []
+                pending_chunk = chunk_id
+                pending.append(frame[chunk_ids == chunk_id])
+        if pending:
+            yield pd.concat(pending, ignore_index=True)
+    
+    def _symbol_columns(self, file_list: str) -> str:
+        """
+        SELECT list tagging rows with their symbol.
+        
+        Files that already store a 'symbol' column keep it; the value is
+        only taken from the file name where it is missing.
+        """
+        columns = {
+            row[0] for row in self.conn.execute(
+                f"DESCRIBE SELECT * FROM read_parquet([{file_list}], union_by_name=true)"
+            ).fetchall()
+        }
+        from_name = "regexp_extract(filename, '([0-9]{6}\\.[A-Z]{2,3})\\.parquet$', 1)"
+        if 'symbol' in columns:
+            return f"* EXCLUDE (filename) REPLACE (coalesce(symbol, {from_name}) AS symbol)"
+        return f"* EXCLUDE (filename), {from_name} AS symbol"
+    
+    def load_latest_bars(self, symbols: List[str], limit: int = 240) -> pd.DataFrame:
+        """
+        Load the most recent minute bars for many symbols in one query.
+        
+        Args:
+            symbols: Symbols to read (missing files are skipped)
+            limit: Bars per symbol
+        
+        Returns:
+            DataFrame tagged with a 'symbol' column, ordered by (symbol, datetime).
+        """
+        for symbol in symbols:
+            self._validate_symbol(symbol)
+        files = [
+            str(self.market_data_dir / f"{s}.parquet") for s in symbols
+            if (self.market_data_dir / f"{s}.parquet").exists()
+        ]
+        if not files:
+            return pd.DataFrame()
+        
+        file_list = ", ".join(f"'{f}'" for f in files)
+        query = f"""
+            SELECT {self._symbol_columns(file_list)}
+            FROM read_parquet([{file_list}], filename=true, union_by_name=true)
+            QUALIFY row_number() OVER (PARTITION BY filename ORDER BY datetime DESC) <= {int(limit)}
+            ORDER BY symbol, datetime
+        """
+        try:
+            return self.conn.execute(query).fetchdf()
+        except Exception as e:
+            logger.error(f"Failed to load latest bars: {e}")
+            return pd.DataFrame()
+    
     def query(self, sql: str) -> pd.DataFrame:
         """
         Execute arbitrary SQL query on the data warehouse.
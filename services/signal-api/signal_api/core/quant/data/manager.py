@@ -26,6 +26,22 @@ from .rate_limiter import get_rate_limiter, RateLimitConfig
 logger = logging.getLogger(__name__)
 
 
+def to_ts_code(symbol: str) -> str:
+    """
+    Convert a 6-digit symbol to Tushare ts_code format (000001 -> 000001.SZ).
+    
+    Shanghai: 6xxxxx shares, 5xxxxx funds/ETFs, 900xxx B shares.
+    Beijing: 4xxxxx, 8xxxxx and 92xxxx. Everything else is Shenzhen.
+    """
+    if "." in symbol:
+        return symbol.upper()
+    if symbol.startswith(("4", "8", "92")):
+        return f"{symbol}.BJ"
+    if symbol.startswith(("5", "6", "9")):
+        return f"{symbol}.SH"
+    return f"{symbol}.SZ"
+
+
 @dataclass
 class DataManagerConfig:
     """Configuration for DataManager."""
@@ -350,12 +366,7 @@ class DataManager:
     
     def _to_ts_code(self, symbol: str) -> str:
         """Convert 6-digit symbol to Tushare ts_code format."""
-        if "." in symbol:
-            return symbol
-        if symbol.startswith("6"):
-            return f"{symbol}.SH"
-        else:
-            return f"{symbol}.SZ"
+        return to_ts_code(symbol)
     
     def _from_ts_code(self, ts_code: str) -> str:
         """Convert ts_code to 6-digit symbol."""
@@ -1,8 +1,10 @@
 # AI Quant Platform - Engines
-from .backtest import BacktestEngine, BacktestConfig, BacktestResult, Trade
+from .backtest import BacktestEngine, BacktestConfig, BacktestResult, Trade, WalkForwardFold
+from .portfolio import PortfolioBacktestEngine, PortfolioBacktestConfig
 from .realtime import RealtimeEngine, RealtimeConfig, EngineMode, ExecutionResult
 
 __all__ = [
-    "BacktestEngine", "BacktestConfig", "BacktestResult", "Trade",
+    "BacktestEngine", "BacktestConfig", "BacktestResult", "Trade", "WalkForwardFold",
+    "PortfolioBacktestEngine", "PortfolioBacktestConfig",
     "RealtimeEngine", "RealtimeConfig", "EngineMode", "ExecutionResult",
 ]
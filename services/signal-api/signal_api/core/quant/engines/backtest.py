@@ -4,16 +4,21 @@ Bar-by-bar simulation engine with parameter sweep and out-of-sample testing.
 
 Features:
 - Minute-level backtesting
+- Columnar execution mode (NumPy arrays + vectorized signal pre-filter)
 - Transaction cost modeling (commission, slippage)
 - Performance metrics calculation
-- Parameter sweep optimization
-- Walk-forward validation
+- Parameter sweep optimization (optionally on a process pool)
+- Walk-forward validation (single split or rolling/anchored folds)
 """
 
 import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple, Type
+from typing import Callable, Dict, List, Optional, Any, Tuple, Type
 from itertools import product
 import pandas as pd
 import numpy as np
@@ -67,6 +72,10 @@ class BacktestConfig:
     
     # Out-of-sample testing
     train_ratio: float = 0.8  # 80% training, 20% testing
+    
+    # Execution mode: columnar (NumPy arrays, vectorized signals) or
+    # the legacy per-row loop. Both produce identical trades and metrics.
+    vectorized: bool = True
 
 
 @dataclass
@@ -109,6 +118,21 @@ class BacktestResult:
         }
 
 
+@dataclass
+class WalkForwardFold:
+    """Train/test results for one walk-forward fold."""
+    fold: int
+    train: BacktestResult
+    test: BacktestResult
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fold": self.fold,
+            "train": self.train.to_dict(),
+            "test": self.test.to_dict()
+        }
+
+
 class BacktestEngine:
     """
     Bar-by-bar backtesting engine.
@@ -127,6 +151,8 @@ class BacktestEngine:
         self._equity_curve: List[Tuple[datetime, float]] = []
         self._high_watermark = self.config.initial_capital
         self._latest_prices: Dict[str, float] = {}
+        self._equity_dirty = True
+        self._cached_equity = self.config.initial_capital
         
         logger.info(f"BacktestEngine initialized with capital: {self.config.initial_capital:,.0f}")
     
@@ -138,12 +164,16 @@ class BacktestEngine:
         self._equity_curve = []
         self._high_watermark = self.config.initial_capital
         self._latest_prices = {}
+        self._equity_dirty = True
+        self._cached_equity = self.config.initial_capital
     
     def run(
         self,
         strategy: BaseStrategy,
         data: pd.DataFrame,
-        symbol: str = "BACKTEST"
+        symbol: str = "BACKTEST",
+        factors: Optional[pd.DataFrame] = None,
+        warmup: Optional[int] = None
     ) -> BacktestResult:
         """
         Run backtest on historical data.
@@ -152,6 +182,10 @@ class BacktestEngine:
             strategy: Strategy instance to test
             data: DataFrame with OHLCV data
             symbol: Symbol for the backtest
+            factors: Precomputed factor frame for these bars (skips calculate_factors)
+            warmup: Leading bars to skip before trading. Defaults to
+                strategy.config.lookback_days; pass 0 when factors already
+                cover the warm-up (e.g. sliced from a full-history frame)
         
         Returns:
             BacktestResult with performance metrics
@@ -162,15 +196,39 @@ class BacktestEngine:
         data = data.copy()
         if 'symbol' not in data.columns:
             data['symbol'] = symbol
-        strategy.set_data(data)
+        strategy.set_data(data, factors=factors, warmup=warmup)
+        start = strategy.config.lookback_days if warmup is None else warmup
         
         start_date = pd.to_datetime(data['datetime'].iloc[0])
         end_date = pd.to_datetime(data['datetime'].iloc[-1])
         
         logger.info(f"Running backtest: {strategy.name} on {symbol} ({start_date} to {end_date})")
         
-        # Bar-by-bar simulation
-        for i in range(strategy.config.lookback_days, len(data)):
+        if self.config.vectorized:
+            self._simulate_columnar(strategy, data, start)
+        else:
+            self._simulate_bars(strategy, data, start)
+        
+        # Close all remaining positions
+        if data.shape[0] > 0:
+            final_price = data.iloc[-1]['close']
+            final_time = pd.to_datetime(data.iloc[-1]['datetime'])
+            self._close_all_positions(final_price, final_time, "end_of_backtest")
+        
+        # Calculate metrics
+        result = self._calculate_metrics(strategy.name, start_date, end_date)
+        
+        logger.info(
+            f"Backtest complete: {result.total_trades} trades, "
+            f"Return={result.total_return:.2%}, "
+            f"Sharpe={result.sharpe_ratio:.2f}"
+        )
+        
+        return result
+    
+    def _simulate_bars(self, strategy: BaseStrategy, data: pd.DataFrame, start: int):
+        """Legacy row-by-row simulation loop from bar `start` onwards."""
+        for i in range(start, len(data)):
             row = data.iloc[i]
             current_time = pd.to_datetime(row['datetime'])
             current_price = row['close']
@@ -200,23 +258,53 @@ class BacktestEngine:
             # Update high watermark
             if equity > self._high_watermark:
                 self._high_watermark = equity
+    
+    def _simulate_columnar(self, strategy: BaseStrategy, data: pd.DataFrame, start: int):
+        """
+        Columnar simulation loop from bar `start` onwards.
         
-        # Close all remaining positions
-        if data.shape[0] > 0:
-            final_price = data.iloc[-1]['close']
-            final_time = pd.to_datetime(data.iloc[-1]['datetime'])
-            self._close_all_positions(final_price, final_time, "end_of_backtest")
-        
-        # Calculate metrics
-        result = self._calculate_metrics(strategy.name, start_date, end_date)
-        
-        logger.info(
-            f"Backtest complete: {result.total_trades} trades, "
-            f"Return={result.total_return:.2%}, "
-            f"Sharpe={result.sharpe_ratio:.2f}"
-        )
-        
-        return result
+        Pre-extracts datetime/close/symbol as arrays, asks the strategy for
+        all signals in one pass and only recomputes equity when a held
+        position's price or the position set changes. Event order per bar
+        matches _simulate_bars() exactly.
+        """
+        times = pd.to_datetime(data['datetime']).tolist()
+        closes = data['close'].tolist()
+        symbols = data['symbol'].tolist()
+        
+        signals = strategy.generate_signals(start)
+        min_confidence = strategy.config.min_confidence
+        self._equity_dirty = True
+        
+        for i in range(start, len(data)):
+            current_time = times[i]
+            current_price = closes[i]
+            current_symbol = symbols[i]
+            
+            self._latest_prices[current_symbol] = current_price
+            
+            if current_symbol in self._positions:
+                self._positions[current_symbol].current_price = current_price
+                self._equity_dirty = True
+                self._check_exits(current_price, current_time, current_symbol)
+            
+            signal = signals.get(i)
+            if signal is not None and signal.signal_type == SignalType.BUY:
+                if signal.confidence >= min_confidence:
+                    self._process_buy_signal(signal, current_price, current_time, signal.symbol)
+            
+            equity = self._current_equity()
+            self._equity_curve.append((current_time, equity))
+            
+            if equity > self._high_watermark:
+                self._high_watermark = equity
+    
+    def _current_equity(self) -> float:
+        """Return equity, recomputing only when positions or their prices changed."""
+        if self._equity_dirty:
+            self._cached_equity = self._calculate_equity()
+            self._equity_dirty = False
+        return self._cached_equity
     
     def _process_buy_signal(
         self,
@@ -254,6 +342,7 @@ class BacktestEngine:
         
         # Open position
         self._capital -= actual_cost
+        self._equity_dirty = True
         self._positions[symbol] = Position(
             symbol=symbol,
             entry_price=entry_price,
@@ -314,6 +403,7 @@ class BacktestEngine:
         
         # Return capital
         self._capital += sell_value - total_cost
+        self._equity_dirty = True
         
         # Record trade
         trade = Trade(
@@ -413,7 +503,10 @@ class BacktestEngine:
         param_grid: Dict[str, List[Any]],
         symbol: str = "BACKTEST",
         use_walk_forward: bool = True,
-        train_ratio: float = 0.7
+        train_ratio: float = 0.7,
+        n_jobs: int = 1,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None
     ) -> List[BacktestResult]:
         """
         Run backtest with multiple parameter combinations.
@@ -426,47 +519,36 @@ class BacktestEngine:
             symbol: Symbol for backtesting
             use_walk_forward: If True, use walk-forward validation (out-of-sample) to avoid overfitting
             train_ratio: Ratio of data used for training (only used if use_walk_forward=True)
+            n_jobs: Worker processes (1 = in-process, -1 = all cores). Workers
+                memory-map the data from a shared Arrow file once at startup.
+            progress_callback: Called with (completed, total) after each combination
+            cancel_event: When set, pending combinations are cancelled and the
+                results collected so far are returned
         
         Returns:
             List of BacktestResult sorted by out-of-sample Sharpe ratio (if walk-forward) or in-sample Sharpe
         """
-        results = []
-        
         # Generate all parameter combinations
         param_names = list(param_grid.keys())
         param_values = list(param_grid.values())
-        combinations = list(product(*param_values))
+        combinations = [dict(zip(param_names, combo)) for combo in product(*param_values)]
         
         mode_str = "walk-forward" if use_walk_forward else "in-sample (WARNING: may overfit)"
-        logger.info(f"Running parameter sweep: {len(combinations)} combinations ({mode_str})")
+        workers = _resolve_workers(n_jobs, len(combinations))
+        logger.info(
+            f"Running parameter sweep: {len(combinations)} combinations ({mode_str}, {workers} worker(s))"
+        )
         
-        for combo in combinations:
-            params = dict(zip(param_names, combo))
-            
-            try:
-                # Create config with parameters
-                config = config_class(**params)
-                strategy = strategy_class(config)
-                
-                if use_walk_forward:
-                    # Use walk-forward validation for out-of-sample performance
-                    train_result, test_result = self.run_walk_forward(
-                        strategy, data, symbol, train_ratio
-                    )
-                    # Use test (out-of-sample) result as the primary metric
-                    result = test_result
-                    result.parameters = params
-                    # Store training Sharpe for reference
-                    result.parameters['_train_sharpe'] = train_result.sharpe_ratio
-                else:
-                    # Traditional in-sample approach (warning about overfitting)
-                    result = self.run(strategy, data, symbol)
-                    result.parameters = params
-                
-                results.append(result)
-                
-            except Exception as e:
-                logger.warning(f"Sweep failed for params {params}: {e}")
+        task_args = (strategy_class, config_class, symbol, use_walk_forward, train_ratio)
+        if workers <= 1:
+            indexed = self._sweep_sequential(data, combinations, task_args, progress_callback, cancel_event)
+        else:
+            indexed = self._sweep_parallel(
+                data, combinations, task_args, workers, progress_callback, cancel_event
+            )
+        
+        # Restore grid order so the stable sort below is deterministic
+        results = [result for _, result in sorted(indexed, key=lambda item: item[0])]
         
         # Sort by Sharpe ratio (out-of-sample if walk-forward, in-sample otherwise)
         results.sort(key=lambda r: r.sharpe_ratio, reverse=True)
@@ -486,6 +568,78 @@ class BacktestEngine:
         
         return results
     
+    def _sweep_sequential(
+        self,
+        data: pd.DataFrame,
+        combinations: List[Dict[str, Any]],
+        task_args: Tuple,
+        progress_callback: Optional[Callable[[int, int], None]],
+        cancel_event: Optional[threading.Event]
+    ) -> List[Tuple[int, BacktestResult]]:
+        """Evaluate combinations one after another in this process."""
+        indexed = []
+        for idx, params in enumerate(combinations):
+            if cancel_event is not None and cancel_event.is_set():
+                logger.warning(f"Parameter sweep cancelled after {idx}/{len(combinations)} combinations")
+                break
+            result = _evaluate_params(self, data, params, *task_args)
+            if result is not None:
+                indexed.append((idx, result))
+            if progress_callback:
+                progress_callback(idx + 1, len(combinations))
+        return indexed
+    
+    def _sweep_parallel(
+        self,
+        data: pd.DataFrame,
+        combinations: List[Dict[str, Any]],
+        task_args: Tuple,
+        workers: int,
+        progress_callback: Optional[Callable[[int, int], None]],
+        cancel_event: Optional[threading.Event]
+    ) -> List[Tuple[int, BacktestResult]]:
+        """Evaluate combinations on a process pool sharing one memory-mapped data file."""
+        import pyarrow as pa
+        
+        fd, data_path = tempfile.mkstemp(prefix="sweep_", suffix=".arrow")
+        os.close(fd)
+        indexed = []
+        try:
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            with pa.OSFile(data_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_sweep_worker,
+                initargs=(data_path, self.config, task_args)
+            ) as executor:
+                futures = {
+                    executor.submit(_run_sweep_task, idx, params): idx
+                    for idx, params in enumerate(combinations)
+                }
+                completed = 0
+                for future in as_completed(futures):
+                    completed += 1
+                    idx, result = future.result()
+                    if result is not None:
+                        indexed.append((idx, result))
+                    if progress_callback:
+                        progress_callback(completed, len(combinations))
+                    if cancel_event is not None and cancel_event.is_set():
+                        logger.warning(
+                            f"Parameter sweep cancelled after {completed}/{len(combinations)} combinations"
+                        )
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        break
+        finally:
+            try:
+                os.remove(data_path)
+            except OSError:
+                pass
+        return indexed
+    
     def run_walk_forward(
         self,
         strategy: BaseStrategy,
@@ -506,16 +660,16 @@ class BacktestEngine:
             Tuple of (train_result, test_result)
         """
         split_idx = int(len(data) * train_ratio)
-        train_data = data.iloc[:split_idx].copy()
-        test_data = data.iloc[split_idx:].copy()
+        # run() copies its input, so plain slices are enough here
+        train_data = data.iloc[:split_idx]
+        test_data = data.iloc[split_idx:]
         
         logger.info(f"Walk-forward: Train={len(train_data)} bars, Test={len(test_data)} bars")
         
         # Train
         train_result = self.run(strategy, train_data, f"{symbol}_train")
         
-        # Test (reinitialize strategy)
-        strategy.set_data(test_data)
+        # Test (run() reinitializes the strategy with the test slice)
         test_result = self.run(strategy, test_data, f"{symbol}_test")
         
         logger.info(
@@ -525,3 +679,185 @@ class BacktestEngine:
         )
         
         return train_result, test_result
+    
+    def run_rolling_walk_forward(
+        self,
+        strategy: BaseStrategy,
+        data: pd.DataFrame,
+        n_folds: int = 5,
+        anchored: bool = False,
+        symbol: str = "BACKTEST",
+        n_jobs: int = -1
+    ) -> List[WalkForwardFold]:
+        """
+        Run multi-fold walk-forward validation.
+        
+        The history is split by time into n_folds + 1 equal segments. Fold k
+        tests on segment k + 1 and trains on segment k (rolling) or on
+        segments 0..k (anchored). Factors are computed once over the full
+        history and sliced per fold, so each fold sees properly warmed-up
+        indicators and no fold recomputes them.
+        
+        Args:
+            strategy: Strategy whose class and config are used for every fold
+            data: Historical data
+            n_folds: Number of train/test folds
+            anchored: If True, training windows all start at the first bar
+            symbol: Symbol for backtesting
+            n_jobs: Worker processes for running folds concurrently
+                (1 = in-process, -1 = all cores)
+        
+        Returns:
+            List of WalkForwardFold in fold order
+        """
+        if n_folds < 1:
+            raise ValueError(f"n_folds must be >= 1, got {n_folds}")
+        
+        data = data.copy()
+        if 'symbol' not in data.columns:
+            data['symbol'] = symbol
+        data = data.sort_values(['datetime', 'symbol'], kind='stable').reset_index(drop=True)
+        factors = strategy.calculate_factors(data)
+        
+        data_times = pd.to_datetime(data['datetime'])
+        factor_times = pd.to_datetime(factors['datetime'])
+        
+        # Segment boundaries on the time axis (shared by data and factors)
+        positions = np.linspace(0, len(data), n_folds + 2).astype(int)
+        bounds = [data_times.iloc[p] for p in positions[:-1]] + [None]
+        
+        def window(times: pd.Series, start, end) -> np.ndarray:
+            mask = times >= start
+            if end is not None:
+                mask &= times < end
+            return mask.to_numpy()
+        
+        tasks = []
+        for k in range(n_folds):
+            train_start = bounds[0] if anchored else bounds[k]
+            splits = []
+            for start, end in ((train_start, bounds[k + 1]), (bounds[k + 1], bounds[k + 2])):
+                splits.append((
+                    data[window(data_times, start, end)],
+                    factors[window(factor_times, start, end)]
+                ))
+            tasks.append((k, splits))
+        
+        logger.info(
+            f"Rolling walk-forward: {n_folds} folds ({'anchored' if anchored else 'rolling'}), "
+            f"{len(data)} bars"
+        )
+        
+        strategy_args = (type(strategy), strategy.config, symbol)
+        workers = _resolve_workers(n_jobs, n_folds)
+        if workers <= 1:
+            folds = [_run_fold(self.config, strategy_args, k, splits) for k, splits in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_run_fold, self.config, strategy_args, k, splits)
+                    for k, splits in tasks
+                ]
+                folds = [future.result() for future in futures]
+        
+        oos_sharpes = [f.test.sharpe_ratio for f in folds]
+        logger.info(
+            f"Rolling walk-forward complete: mean OOS Sharpe={np.mean(oos_sharpes):.2f}, "
+            f"min={np.min(oos_sharpes):.2f}"
+        )
+        
+        return folds
+
+
+# ---------------------------------------------------------------------------
+# Parameter sweep workers
+# ---------------------------------------------------------------------------
+
+# Per-process state populated by _init_sweep_worker()
+_worker_state: Dict[str, Any] = {}
+
+
+def _resolve_workers(n_jobs: int, n_tasks: int) -> int:
+    """Translate n_jobs (-1 = all cores) into a worker count."""
+    if n_jobs is None or n_jobs == 0:
+        n_jobs = 1
+    if n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    return max(1, min(n_jobs, n_tasks))
+
+
+def _evaluate_params(
+    engine: BacktestEngine,
+    data: pd.DataFrame,
+    params: Dict[str, Any],
+    strategy_class: Type[BaseStrategy],
+    config_class: Type[StrategyConfig],
+    symbol: str,
+    use_walk_forward: bool,
+    train_ratio: float
+) -> Optional[BacktestResult]:
+    """Run one sweep combination, returning None if it fails."""
+    params = dict(params)
+    try:
+        # Create config with parameters
+        config = config_class(**params)
+        strategy = strategy_class(config)
+        
+        if use_walk_forward:
+            # Use walk-forward validation for out-of-sample performance
+            train_result, test_result = engine.run_walk_forward(
+                strategy, data, symbol, train_ratio
+            )
+            # Use test (out-of-sample) result as the primary metric
+            result = test_result
+            result.parameters = params
+            # Store training Sharpe for reference
+            result.parameters['_train_sharpe'] = train_result.sharpe_ratio
+        else:
+            # Traditional in-sample approach (warning about overfitting)
+            result = engine.run(strategy, data, symbol)
+            result.parameters = params
+        
+        return result
+    
+    except Exception as e:
+        logger.warning(f"Sweep failed for params {params}: {e}")
+        return None
+
+
+def _run_fold(
+    config: BacktestConfig,
+    strategy_args: Tuple,
+    fold: int,
+    splits: List[Tuple[pd.DataFrame, pd.DataFrame]]
+) -> WalkForwardFold:
+    """Backtest one walk-forward fold on pre-sliced data and factors."""
+    strategy_class, strategy_config, symbol = strategy_args
+    engine = BacktestEngine(config)
+    results = []
+    for (data, factors), suffix in zip(splits, ("train", "test")):
+        strategy = strategy_class(strategy_config)
+        # Factors were computed over the full history, so no bar of the slice is warm-up
+        results.append(engine.run(
+            strategy, data, f"{symbol}_fold{fold}_{suffix}", factors=factors, warmup=0
+        ))
+    return WalkForwardFold(fold=fold, train=results[0], test=results[1])
+
+
+def _init_sweep_worker(data_path: str, config: BacktestConfig, task_args: Tuple):
+    """Load the shared data file once per worker process."""
+    import pyarrow as pa
+    
+    with pa.memory_map(data_path, "r") as source:
+        data = pa.ipc.open_file(source).read_all().to_pandas()
+    _worker_state["data"] = data
+    _worker_state["engine"] = BacktestEngine(config)
+    _worker_state["task_args"] = task_args
+
+
+def _run_sweep_task(idx: int, params: Dict[str, Any]) -> Tuple[int, Optional[BacktestResult]]:
+    """Evaluate a single combination inside a worker process."""
+    result = _evaluate_params(
+        _worker_state["engine"], _worker_state["data"], params, *_worker_state["task_args"]
+    )
+    return idx, result
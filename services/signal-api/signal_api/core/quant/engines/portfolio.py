@@ -0,0 +1,265 @@
+"""
+AI Quant Platform - Portfolio Backtest Engine
+Cross-sectional multi-symbol simulation with shared capital.
+
+Features:
+- One vectorized step per timestamp across all symbols
+- Shared cash, max-position and RiskManager position/sector limits
+- Per-symbol price map backed by a NumPy array
+- Chunked, time-ordered input (e.g. DuckDBManager.iter_minute_chunks)
+"""
+
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..strategies.base import BaseStrategy, Signal, SignalType
+from ..risk.manager import RiskManager, RiskConfig
+from .backtest import BacktestEngine, BacktestConfig, BacktestResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PortfolioBacktestConfig(BacktestConfig):
+    """Configuration for portfolio backtesting."""
+    max_positions: int = 20
+    position_size_pct: float = 0.05  # 5% of cash per new position
+    
+    # Bars per symbol carried between chunks so rolling factors stay warm
+    warmup_bars: int = 1200  # ~5 trading days of minute bars
+
+
+class PortfolioBacktestEngine(BacktestEngine):
+    """
+    Cross-sectional portfolio backtesting engine.
+    
+    Unlike BacktestEngine.run, which walks a single bar sequence, every
+    timestamp is processed as one step across all symbols: prices are
+    scattered into a per-symbol array, held positions are marked and
+    checked for exits, then that timestamp's buy signals are ranked by
+    confidence and filled against shared capital subject to RiskManager
+    position and sector limits.
+    """
+    
+    def __init__(
+        self,
+        config: Optional[PortfolioBacktestConfig] = None,
+        risk_config: Optional[RiskConfig] = None
+    ):
+        super().__init__(config or PortfolioBacktestConfig())
+        self.risk_config = risk_config or RiskConfig()
+        self._reset()
+    
+    def _reset(self):
+        """Reset engine state for new backtest."""
+        super()._reset()
+        self._risk = RiskManager(self.risk_config, self.config.initial_capital)
+        self._symbol_index: Dict[str, int] = {}
+        self._prices = np.full(1024, np.nan)
+        self._held = np.zeros(1024, dtype=bool)
+        self._sectors: Dict[str, str] = {}
+        self._rejections: Counter = Counter()
+    
+    def run(
+        self,
+        strategy: BaseStrategy,
+        data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        sectors: Optional[Dict[str, str]] = None
+    ) -> BacktestResult:
+        """
+        Run a portfolio backtest.
+        
+        Args:
+            strategy: Strategy instance evaluated on every symbol
+            data: Multi-symbol DataFrame with a 'symbol' column, or an iterable
+                of such frames in ascending time order (chunked reads)
+            sectors: Optional symbol -> sector map for concentration limits
+        
+        Returns:
+            BacktestResult for the whole portfolio
+        """
+        self._reset()
+        self._sectors = sectors or {}
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+        
+        warmup: Optional[pd.DataFrame] = None
+        start_date = end_date = None
+        last_time = None
+        current_date = None
+        
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            if 'symbol' not in chunk.columns:
+                raise ValueError("Portfolio backtest data requires a 'symbol' column")
+            
+            chunk = chunk.copy()
+            chunk['datetime'] = pd.to_datetime(chunk['datetime'])
+            n_warmup = 0 if warmup is None else len(warmup)
+            frame = chunk if warmup is None else pd.concat([warmup, chunk], ignore_index=True)
+            frame = frame.sort_values(['datetime', 'symbol'], kind='stable').reset_index(drop=True)
+            
+            strategy.set_data(frame)
+            signals = strategy.generate_signals(max(n_warmup, strategy.config.lookback_days))
+            
+            times = frame['datetime'].to_numpy()
+            closes = frame['close'].to_numpy(dtype=float)
+            codes = self._encode_symbols(frame['symbol'])
+            symbols = frame['symbol'].to_numpy()
+            
+            if start_date is None:
+                start_date = pd.Timestamp(times[n_warmup])
+            
+            # Timestamp boundaries within this chunk (skipping warm-up rows)
+            bounds = np.flatnonzero(np.diff(times[n_warmup:].astype('int64'))) + 1 + n_warmup
+            starts = np.concatenate(([n_warmup], bounds))
+            ends = np.concatenate((bounds, [len(frame)]))
+            
+            for a, b in zip(starts, ends):
+                current_time = pd.Timestamp(times[a])
+                if current_time.date() != current_date:
+                    current_date = current_time.date()
+                    self._risk.reset_daily(current_date)
+                self._step(current_time, codes[a:b], closes[a:b], symbols[a:b], signals, a, strategy)
+                last_time = current_time
+            
+            end_date = last_time
+            warmup = frame.iloc[n_warmup:].groupby('symbol', sort=False).tail(self.config.warmup_bars)
+            warmup = warmup.drop(columns=[c for c in warmup.columns if c not in chunk.columns])
+        
+        if start_date is None:
+            raise ValueError("Portfolio backtest received no data")
+        
+        for symbol in list(self._positions.keys()):
+            price = self._prices[self._symbol_index[symbol]]
+            self._close_position(symbol, price, last_time, "end_of_backtest")
+        
+        result = self._calculate_metrics(strategy.name, start_date, end_date)
+        result.parameters = {"symbols": len(self._symbol_index), "rejections": dict(self._rejections)}
+        
+        logger.info(
+            f"Portfolio backtest complete: {len(self._symbol_index)} symbols, "
+            f"{result.total_trades} trades, Return={result.total_return:.2%}, "
+            f"Sharpe={result.sharpe_ratio:.2f}"
+        )
+        
+        return result
+    
+    def _encode_symbols(self, symbols: pd.Series) -> np.ndarray:
+        """Map symbols to stable integer rows of the price/held arrays."""
+        for symbol in symbols.unique():
+            if symbol not in self._symbol_index:
+                self._symbol_index[symbol] = len(self._symbol_index)
+        
+        size = len(self._symbol_index)
+        if size > len(self._prices):
+            capacity = max(size, 2 * len(self._prices))
+            self._prices = np.concatenate((self._prices, np.full(capacity - len(self._prices), np.nan)))
+            self._held = np.concatenate((self._held, np.zeros(capacity - len(self._held), dtype=bool)))
+        
+        return symbols.map(self._symbol_index).to_numpy(dtype=np.int64)
+    
+    def _step(
+        self,
+        current_time: datetime,
+        codes: np.ndarray,
+        closes: np.ndarray,
+        symbols: np.ndarray,
+        signals: Dict[int, Signal],
+        offset: int,
+        strategy: BaseStrategy
+    ):
+        """Process one timestamp across all symbols that printed a bar."""
+        self._prices[codes] = closes
+        
+        # Mark and check exits only for held symbols present at this timestamp
+        touched = np.flatnonzero(self._held[codes])
+        if len(touched):
+            marks = {}
+            for j in touched:
+                symbol = symbols[j]
+                self._positions[symbol].current_price = closes[j]
+                self._check_exits(closes[j], current_time, symbol)
+                if symbol in self._positions:
+                    marks[symbol] = closes[j]
+            for symbol in self._risk.update_prices(marks):
+                self._close_position(symbol, marks[symbol], current_time, "risk_stop_loss")
+        
+        # Rank this timestamp's buy signals cross-sectionally
+        candidates = []
+        for j in range(len(codes)):
+            signal = signals.get(offset + j)
+            if (
+                signal is not None
+                and signal.signal_type == SignalType.BUY
+                and signal.confidence >= strategy.config.min_confidence
+            ):
+                candidates.append((j, signal))
+        candidates.sort(key=lambda item: (-item[1].confidence, symbols[item[0]]))
+        
+        for j, signal in candidates:
+            if len(self._positions) >= self.config.max_positions:
+                break
+            self._process_buy_signal(signal, closes[j], current_time, symbols[j])
+        
+        equity = self._calculate_equity()
+        self._equity_curve.append((current_time, equity))
+        if equity > self._high_watermark:
+            self._high_watermark = equity
+    
+    def _process_buy_signal(
+        self,
+        signal: Signal,
+        current_price: float,
+        current_time: datetime,
+        symbol: str
+    ):
+        """Apply RiskManager limits, then open the position with shared capital."""
+        if symbol in self._positions or len(self._positions) >= self.config.max_positions:
+            return
+        
+        sector = self._sectors.get(symbol, "")
+        check = self._risk.check_buy_signal(
+            symbol,
+            self._capital * self.config.position_size_pct,
+            sector=sector,
+            now=current_time
+        )
+        if not check.is_allowed:
+            self._rejections[check.action.value] += 1
+            return
+        
+        super()._process_buy_signal(signal, current_price, current_time, symbol)
+        
+        position = self._positions.get(symbol)
+        if position is not None:
+            position.sector = sector
+            self._risk.add_position(position)
+            self._held[self._symbol_index[symbol]] = True
+    
+    def _close_position(
+        self,
+        symbol: str,
+        exit_price: float,
+        exit_time: datetime,
+        reason: str
+    ):
+        """Close a position and release it from the risk manager."""
+        if symbol not in self._positions:
+            return
+        super()._close_position(symbol, exit_price, exit_time, reason)
+        self._risk.remove_position(symbol)
+        self._held[self._symbol_index[symbol]] = False
+    
+    def _calculate_equity(self) -> float:
+        """Calculate equity from cash and the per-symbol price array."""
+        position_value = 0.0
+        for symbol, pos in self._positions.items():
+            position_value += pos.quantity * self._prices[self._symbol_index[symbol]]
+        return self._capital + position_value
@@ -11,9 +11,10 @@ Features:
 
 import asyncio
 import logging
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime, time
-from typing import Dict, List, Optional, Callable, Any
+from datetime import date, datetime, time, timedelta
+from typing import Deque, Dict, List, Optional, Callable, Any, Tuple
 from enum import Enum
 import pandas as pd
 
@@ -67,6 +68,32 @@ class RealtimeConfig:
     # Simulation settings
     simulated_slippage_pct: float = 0.001  # 0.1%
     simulated_commission_rate: float = 0.0003  # 万三
+    
+    # Minute bars kept per symbol for strategies without streaming support
+    max_history_bars: int = 1200
+
+
+@dataclass
+class _MinuteBar:
+    """Minute bar being aggregated from realtime snapshots."""
+    minute: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+    
+    def to_bar(self, symbol: str) -> Dict[str, Any]:
+        return {
+            "symbol": symbol,
+            # Labelled by its closing minute, like the stored minute bars
+            "datetime": self.minute + timedelta(minutes=1),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume
+        }
 
 
 class RealtimeEngine:
@@ -105,6 +132,12 @@ class RealtimeEngine:
         # Data cache
         self._latest_prices: Dict[str, float] = {}
         self._latest_data: Optional[pd.DataFrame] = None
+        self._simulated_volumes: Dict[str, float] = {}
+        
+        # Snapshot -> minute bar aggregation
+        self._building_bars: Dict[str, _MinuteBar] = {}
+        self._day_volumes: Dict[str, Tuple[date, float]] = {}
+        self._bar_history: Dict[str, Deque[Dict[str, Any]]] = {}
         
         # Callbacks
         self._on_signal_callback: Optional[Callable[[Signal], None]] = None
@@ -247,22 +280,71 @@ class RealtimeEngine:
         
         # Then process new signals
         for symbol in symbols:
-            # Skip if we just executed a stop-loss for this symbol
-            if symbol in stop_loss_symbols:
-                continue
-            
             symbol_data = data[data.get('symbol', data.get('code', '')) == symbol]
             if symbol_data.empty:
                 continue
             
-            await self._process_symbol(symbol, symbol_data)
+            # Aggregate every snapshot, even when its bar is not evaluated now
+            bars = []
+            for snapshot in symbol_data.to_dict('records'):
+                bar = self._aggregate_snapshot(symbol, snapshot)
+                if bar is not None:
+                    bars.append(bar)
+            
+            # Skip if we just executed a stop-loss for this symbol
+            if not bars or symbol in stop_loss_symbols:
+                continue
+            
+            await self._process_symbol(symbol, bars)
+    
+    def _aggregate_snapshot(self, symbol: str, snapshot: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Fold one realtime snapshot into the symbol's current minute bar.
+        
+        Spot snapshots carry the day's cumulative volume and the day's
+        high/low, so they are not bars themselves. The bar volume is the
+        cumulative volume traded since the previous snapshot of the same day
+        (the first snapshot of a day only sets the baseline) and OHLC come
+        from the last price.
+        
+        Returns:
+            The finished bar when the first snapshot of a later minute arrives, else None
+        """
+        price = float(snapshot.get('price', snapshot.get('close', 0)))
+        if not price > 0:  # Suspended / no trade yet (NaN)
+            return None
+        
+        moment = pd.Timestamp(snapshot['datetime']).to_pydatetime()
+        cumulative = float(snapshot.get('volume', 0) or 0)
+        previous = self._day_volumes.get(symbol)
+        volume = 0.0
+        if previous is not None and previous[0] == moment.date():
+            volume = max(cumulative - previous[1], 0.0)
+        self._day_volumes[symbol] = (moment.date(), cumulative)
+        
+        minute = moment.replace(second=0, microsecond=0)
+        bar = self._building_bars.get(symbol)
+        finished = None
+        if bar is not None and bar.minute != minute:
+            finished = bar.to_bar(symbol)
+            bar = None
+        
+        if bar is None:
+            self._building_bars[symbol] = _MinuteBar(minute, price, price, price, price, volume)
+        else:
+            bar.high = max(bar.high, price)
+            bar.low = min(bar.low, price)
+            bar.close = price
+            bar.volume += volume
+        return finished
     
     async def _fetch_realtime_data(self, symbols: List[str]) -> pd.DataFrame:
         """
         Fetch realtime data from AkShare.
         
         In production, this would use akshare.stock_zh_a_spot_em() or similar.
-        For simulation, we generate mock data.
+        For simulation, we generate mock data shaped like those snapshots
+        (cumulative day volume).
         """
         if self.config.mode == EngineMode.SIMULATION:
             # Mock data for simulation
@@ -272,6 +354,8 @@ class RealtimeEngine:
                 base_price = self._latest_prices.get(symbol, 10.0)
                 # Random walk
                 price = base_price * (1 + np.random.randn() * 0.002)
+                volume = self._simulated_volumes.get(symbol, 0) + np.random.randint(10000, 100000)
+                self._simulated_volumes[symbol] = volume
                 data.append({
                     'symbol': symbol,
                     'datetime': datetime.now(),
@@ -280,8 +364,8 @@ class RealtimeEngine:
                     'low': price * 0.998,
                     'close': price,
                     'price': price,
-                    'volume': np.random.randint(10000, 100000),
-                    'amount': price * np.random.randint(10000, 100000)
+                    'volume': volume,
+                    'amount': price * volume
                 })
             return pd.DataFrame(data)
         else:
@@ -308,15 +392,25 @@ class RealtimeEngine:
                 logger.error(f"Failed to fetch AkShare data: {e}")
                 return pd.DataFrame()
     
-    async def _process_symbol(self, symbol: str, data: pd.DataFrame):
-        """Process a single symbol and generate signals."""
+    async def _process_symbol(self, symbol: str, bars: List[Dict[str, Any]]):
+        """Process a single symbol's newly finished minute bars and generate signals."""
         if not self.strategy:
             return
         
         # Update strategy data
         try:
-            self.strategy.set_data(data)
-            signal = self.strategy.get_latest_signal()
+            if self.strategy.supports_streaming:
+                # O(1) per bar: feed only the new bars into rolling state
+                signal = None
+                for bar in bars:
+                    signal = self.strategy.update_signal(bar)
+            else:
+                history = self._bar_history.get(symbol)
+                if history is None:
+                    history = self._bar_history[symbol] = deque(maxlen=self.config.max_history_bars)
+                history.extend(bars)
+                self.strategy.set_data(pd.DataFrame(history))
+                signal = self.strategy.get_latest_signal()
             
             if signal and signal.signal_type == SignalType.BUY:
                 if signal.confidence >= self.strategy.config.min_confidence:
@@ -0,0 +1,198 @@
+"""
+价格历史环形缓冲 - 涨速计算
+
+职责:
+- 以预分配的 NumPy 环形缓冲保存每只股票的 (价格, 时间戳) 序列
+- 按时间回溯 (如 "60秒前的价格"), 而不是按采样点个数回溯
+- 一次性向量化计算全部股票的涨速
+
+内存固定: 容量 × 深度 两个 float64 矩阵, 每次扫描只做原地写入;
+回溯按行二分查找有效窗口, 不再遍历整个矩阵。
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+
+class PriceHistoryRing:
+    """
+    环形价格历史
+    
+    每只股票占一行, 行内为长度 depth 的环形槽位。
+    symbol → 行号 映射在首次出现时分配, 容量不足时整体翻倍(极少发生)。
+    """
+    
+    def __init__(self, capacity: int = 8192, depth: int = 128):
+        self.depth = depth
+        self._index: Dict[str, int] = {}
+        self._allocate(capacity)
+    
+    def _allocate(self, capacity: int):
+        self._prices = np.full((capacity, self.depth), np.nan)
+        self._times = np.full((capacity, self.depth), np.nan)
+        self._head = np.zeros(capacity, dtype=np.int64)
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._rows = np.arange(capacity)
+        self._reserve(capacity)
+    
+    def _reserve(self, n: int):
+        """回溯查询用的预分配缓冲 (按查询行数, 不随 depth 放大)"""
+        if n <= len(getattr(self, '_out', ())):
+            return
+        self._base, self._start, self._lo, self._hi, self._mid, self._flat = (
+            np.empty(n, dtype=np.int64) for _ in range(6)
+        )
+        self._active = np.empty(n, dtype=bool)
+        self._hit = np.empty(n, dtype=bool)
+        self._found = np.empty(n)
+        self._out = np.empty(n)
+    
+    def _grow(self, capacity: int):
+        old = (self._prices, self._times, self._head, self._count)
+        n = len(old[2])
+        self._allocate(capacity)
+        self._prices[:n], self._times[:n], self._head[:n], self._count[:n] = old
+    
+    @property
+    def capacity(self) -> int:
+        return len(self._head)
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    def rows(self, codes: Iterable[str], create: bool = True) -> np.ndarray:
+        """
+        获取代码对应的行号
+        
+        Args:
+            codes: 股票代码序列
+            create: 为新代码分配行; False 时未知代码返回 -1
+        """
+        out = []
+        for code in codes:
+            row = self._index.get(code)
+            if row is None:
+                if not create:
+                    out.append(-1)
+                    continue
+                row = len(self._index)
+                if row >= self.capacity:
+                    self._grow(self.capacity * 2)
+                self._index[code] = row
+            out.append(row)
+        return np.asarray(out, dtype=np.int64)
+    
+    def append(self, rows: np.ndarray, prices: np.ndarray, timestamp: float):
+        """批量写入一次采样 (rows 内不应重复, timestamp 单调递增)"""
+        if len(rows) == 0:
+            return
+        slots = self._head[rows]
+        self._prices[rows, slots] = prices
+        self._times[rows, slots] = timestamp
+        self._head[rows] = (slots + 1) % self.depth
+        self._count[rows] = np.minimum(self._count[rows] + 1, self.depth)
+    
+    def lookback(
+        self,
+        seconds: float,
+        now: float,
+        rows: Optional[np.ndarray] = None,
+        max_staleness: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        指定行在 now - seconds 时刻(或之前最近一次)的价格
+        
+        每行的有效采样在环形槽位中按时间递增, 从 head 往前 count 个。
+        对所有行同时做 log2(depth) 步二分查找, 只读取有效窗口内的槽位,
+        中间结果写入预分配缓冲。
+        
+        Args:
+            seconds: 回溯秒数
+            now: 当前时间戳
+            rows: 行号数组, -1 表示未知代码; 默认全部已分配的行
+            max_staleness: 命中采样最多可早于 now - seconds 的秒数, 更旧的视为无历史
+        
+        Returns:
+            与 rows 等长的数组(内部缓冲, 下次调用时被覆盖), 无足够历史的行为 NaN
+        """
+        if rows is None:
+            rows = self._rows[:len(self._index)]
+        n = len(rows)
+        self._reserve(n)
+        target = now - seconds
+        depth = self.depth
+        
+        base, start = self._base[:n], self._start[:n]
+        lo, hi, mid = self._lo[:n], self._hi[:n], self._mid[:n]
+        flat, active, hit = self._flat[:n], self._active[:n], self._hit[:n]
+        found, out = self._found[:n], self._out[:n]
+        
+        np.maximum(rows, 0, out=base)
+        np.take(self._count, base, out=hi)
+        hi[rows < 0] = 0
+        np.take(self._head, base, out=start)
+        start -= hi
+        start %= depth
+        base *= depth
+        lo.fill(0)
+        
+        # 找第一个晚于 target 的采样位置 lo, 命中的是 lo - 1
+        times = self._times.reshape(-1)
+        for _ in range(depth.bit_length()):
+            np.less(lo, hi, out=active)
+            if not active.any():
+                break
+            np.add(lo, hi, out=mid)
+            mid //= 2
+            np.add(start, mid, out=flat)
+            flat %= depth
+            flat += base
+            np.take(times, flat, out=found)
+            np.less_equal(found, target, out=hit)  # NaN 比较为 False
+            hit &= active
+            mid += 1
+            np.copyto(lo, mid, where=hit)
+            mid -= 1
+            np.logical_xor(active, hit, out=active)
+            np.copyto(hi, mid, where=active)
+        
+        np.greater(lo, 0, out=hit)
+        lo -= 1
+        np.maximum(lo, 0, out=lo)
+        np.add(start, lo, out=flat)
+        flat %= depth
+        flat += base
+        np.take(self._prices.reshape(-1), flat, out=out)
+        if max_staleness is not None:
+            np.take(times, flat, out=found)
+            hit &= found >= target - max_staleness
+        out[~hit] = np.nan
+        return out
+    
+    def speeds(
+        self,
+        rows: np.ndarray,
+        prices: np.ndarray,
+        seconds: float,
+        now: float,
+        max_staleness: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        向量化涨速 (%) = (当前价 - seconds 秒前价格) / seconds 秒前价格 × 100
+        
+        无历史、历史过旧、未知代码(行号 -1)或价格非正时为 0。
+        """
+        prev = self.lookback(seconds, now, rows, max_staleness)
+        valid = (prev > 0) & (prices > 0)
+        out = np.zeros(len(rows))
+        np.divide(prices - prev, prev, out=out, where=valid)
+        return out * 100
+    
+    def clear(self):
+        """清空全部历史 (新交易日调用), 保留已分配的缓冲"""
+        self._index.clear()
+        self._prices.fill(np.nan)
+        self._times.fill(np.nan)
+        self._head.fill(0)
+        self._count.fill(0)
@@ -142,10 +142,15 @@ class RiskManager:
         
         logger.info(f"RiskManager initialized with capital: {initial_capital:,.0f}")
     
-    def reset_daily(self):
-        """Reset daily counters at market open."""
+    def reset_daily(self, trading_date: Optional[date] = None):
+        """
+        Reset daily counters at market open.
+        
+        Args:
+            trading_date: Session date (defaults to today; backtests pass the simulated date)
+        """
         with self._lock:
-            today = date.today()
+            today = trading_date or date.today()
             if self.trading_date != today:
                 self.trading_date = today
                 self.daily_high_watermark = self.current_capital
@@ -233,7 +238,8 @@ class RiskManager:
         self,
         symbol: str,
         proposed_value: float,
-        sector: str = ""
+        sector: str = "",
+        now: Optional[datetime] = None
     ) -> RiskCheckResult:
         """
         Check if a buy signal should be allowed.
@@ -242,6 +248,7 @@ class RiskManager:
             symbol: Stock symbol
             proposed_value: Proposed position value
             sector: Stock sector for concentration check
+            now: Signal time for throttling (defaults to wall clock; backtests pass bar time)
         
         Returns:
             RiskCheckResult with action and message.
@@ -299,7 +306,7 @@ class RiskManager:
                     )
             
             # Check signal throttling using sliding window
-            now = datetime.now()
+            now = now or datetime.now()
             cutoff = now - timedelta(seconds=1)
             
             # Clean old timestamps
@@ -342,14 +349,14 @@ class RiskManager:
             if not position.symbol:
                 raise ValueError("Position must have a valid symbol")
             self.positions[position.symbol] = position
-            logger.info(f"Position added: {position.symbol} @ {position.entry_price:.2f} x {position.quantity}")
+            logger.debug(f"Position added: {position.symbol} @ {position.entry_price:.2f} x {position.quantity}")
     
     def remove_position(self, symbol: str) -> Optional[Position]:
         """Remove a closed position."""
         with self._lock:
             if symbol in self.positions:
                 position = self.positions.pop(symbol)
-                logger.info(f"Position closed: {symbol}, PnL: {position.pnl_percent:.2%}")
+                logger.debug(f"Position closed: {symbol}, PnL: {position.pnl_percent:.2%}")
                 return position
             return None
     
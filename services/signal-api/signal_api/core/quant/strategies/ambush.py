@@ -15,12 +15,14 @@ Exit Criteria:
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Any, Dict, Optional
 import pandas as pd
 import numpy as np
 import logging
 
+from . import kernels
 from .base import BaseStrategy, StrategyConfig, Signal, SignalType
+from .streaming import LagBuffer, RollingExtreme, RollingMoments
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +51,21 @@ class AmbushConfig(StrategyConfig):
     obv_divergence_threshold: float = 0.1  # 10% divergence
 
 
+class _AmbushStreamState:
+    """Per-symbol O(1) rolling state for AmbushStrategy.update()."""
+    
+    def __init__(self, washout_days: int):
+        self.bars = 0
+        self.volume = RollingMoments(20)
+        self.close = RollingMoments(20)
+        self.washout = LagBuffer(washout_days)
+        self.obv = 0.0
+        self.prev_close: Optional[float] = None
+        self.obv_window = LagBuffer(washout_days - 1)
+        self.low5 = RollingExtreme(5, mode="min")
+        self.high5 = RollingExtreme(5, mode="max")
+
+
 class AmbushStrategy(BaseStrategy):
     """
     Ambush Strategy (潜伏策略)
@@ -64,6 +81,9 @@ class AmbushStrategy(BaseStrategy):
     def __init__(self, config: Optional[AmbushConfig] = None):
         super().__init__(config or AmbushConfig())
         self.config: AmbushConfig = self.config  # Type hint
+        
+        # Incremental state for live mode, keyed by symbol
+        self._stream: Dict[str, _AmbushStreamState] = {}
     
     @staticmethod
     def _calculate_obv(close: pd.Series, volume: pd.Series) -> pd.Series:
@@ -72,18 +92,7 @@ class AmbushStrategy(BaseStrategy):
         
         OBV = Previous OBV + (Volume if close > prev_close, -Volume if close < prev_close, 0 if equal)
         """
-        obv = pd.Series(0.0, index=close.index)
-        price_change = close.diff()
-        
-        for i in range(1, len(close)):
-            if price_change.iloc[i] > 0:
-                obv.iloc[i] = obv.iloc[i-1] + volume.iloc[i]
-            elif price_change.iloc[i] < 0:
-                obv.iloc[i] = obv.iloc[i-1] - volume.iloc[i]
-            else:
-                obv.iloc[i] = obv.iloc[i-1]
-        
-        return obv
+        return pd.Series(kernels.obv(close.to_numpy(), volume.to_numpy()), index=close.index)
     
     def calculate_factors(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -96,67 +105,169 @@ class AmbushStrategy(BaseStrategy):
         - washout_pct: % decline over washout period
         - obv: On-Balance Volume
         - obv_divergence: OBV trend vs price trend
+        
+        All factors are computed per symbol with grouped NumPy kernels on
+        a symbol-contiguous layout, so the full market is one pass.
         """
         df = df.copy()
         
         if 'symbol' not in df.columns:
             df['symbol'] = 'UNKNOWN'
-            
-        def calc_stock_factors(group):
-            # Volume Ratio
-            group['volume_ma20'] = group['volume'].rolling(20, min_periods=20).mean()
-            group['volume_ratio'] = group['volume'] / (group['volume_ma20'] + 1e-9)
-            
-            # Intraday Range
-            group['intraday_range'] = (group['high'] - group['low']) / (group['close'] + 1e-9)
-            
-            # Bollinger Bands
-            group['sma20'] = group['close'].rolling(20, min_periods=20).mean()
-            group['std20'] = group['close'].rolling(20, min_periods=20).std()
-            group['bb_upper'] = group['sma20'] + 2 * group['std20']
-            group['bb_lower'] = group['sma20'] - 2 * group['std20']
-            group['bb_width'] = (group['bb_upper'] - group['bb_lower']) / (group['sma20'] + 1e-9)
-            
-            # Washout
-            washout_days = self.config.washout_days
-            group['price_change_n'] = group['close'].pct_change(washout_days)
-            
-            # OBV - vectorized
-            price_diff = group['close'].diff()
-            direction = np.zeros(len(group))
-            direction[price_diff > 0] = 1
-            direction[price_diff < 0] = -1
-            group['obv'] = (direction * group['volume']).cumsum()
-            
-            # Slopes
-            group['obv_slope'] = group['obv'].rolling(washout_days, min_periods=washout_days).apply(
-                lambda x: np.polyfit(range(len(x)), x, 1)[0] if len(x) >= washout_days else 0,
-                raw=True
-            )
-            group['price_slope'] = group['close'].rolling(washout_days, min_periods=washout_days).apply(
-                lambda x: np.polyfit(range(len(x)), x, 1)[0] if len(x) >= washout_days else 0,
-                raw=True
-            )
-            
-            # OBV Divergence
-            group['obv_divergence'] = (
-                (group['obv_slope'] > 0) & (group['price_slope'] < 0)
-            ).astype(int)
-            
-            # Relative position
-            group['price_min5'] = group['low'].rolling(5, min_periods=5).min()
-            group['price_max5'] = group['high'].rolling(5, min_periods=5).max()
-            group['relative_pos'] = (group['close'] - group['price_min5']) / (group['price_max5'] - group['price_min5'] + 1e-9)
-            
-            return group
-            
-        df = df.groupby('symbol', group_keys=False).apply(calc_stock_factors)
+        
+        # Symbol-contiguous layout; stable sort keeps each symbol's bar order
+        df = df.sort_values('symbol', kind='stable')
+        _, pos = kernels.group_bounds(df['symbol'].to_numpy())
+        close = df['close'].to_numpy(dtype=float)
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        volume = df['volume'].to_numpy(dtype=float)
+        washout_days = self.config.washout_days
+        
+        # Volume Ratio
+        df['volume_ma20'] = kernels.rolling_mean(volume, 20, pos)
+        df['volume_ratio'] = volume / (df['volume_ma20'] + 1e-9)
+        
+        # Intraday Range
+        df['intraday_range'] = (high - low) / (close + 1e-9)
+        
+        # Bollinger Bands
+        df['sma20'] = kernels.rolling_mean(close, 20, pos)
+        df['std20'] = kernels.rolling_std(close, 20, pos)
+        df['bb_upper'] = df['sma20'] + 2 * df['std20']
+        df['bb_lower'] = df['sma20'] - 2 * df['std20']
+        df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / (df['sma20'] + 1e-9)
+        
+        # Washout
+        df['price_change_n'] = kernels.pct_change(close, washout_days, pos)
+        
+        # OBV (restarted per symbol)
+        obv = kernels.grouped_obv(close, volume, df['symbol'].to_numpy())
+        df['obv'] = obv
+        
+        # Slopes
+        df['obv_slope'] = kernels.rolling_slope(obv, washout_days, pos)
+        df['price_slope'] = kernels.rolling_slope(close, washout_days, pos)
+        
+        # OBV Divergence
+        df['obv_divergence'] = (
+            (df['obv_slope'] > 0) & (df['price_slope'] < 0)
+        ).astype(int)
+        
+        # Relative position
+        df['price_min5'] = kernels.rolling_min(low, 5, pos)
+        df['price_max5'] = kernels.rolling_max(high, 5, pos)
+        df['relative_pos'] = (df['close'] - df['price_min5']) / (df['price_max5'] - df['price_min5'] + 1e-9)
         
         # Sort by datetime to ensure alignment with engine
-        df = df.sort_values(['datetime', 'symbol']).reset_index(drop=True)
+        df = df.sort_values(['datetime', 'symbol'], kind='stable').reset_index(drop=True)
         
         return df
     
+    @staticmethod
+    def _window_slope(values) -> float:
+        """Least-squares slope of a full window against x = 0..n-1."""
+        n = len(values)
+        x_mean = (n - 1) / 2
+        sxx = sum((k - x_mean) ** 2 for k in range(n))
+        return sum((k - x_mean) * v for k, v in enumerate(values)) / sxx
+    
+    def update(self, bar: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Incrementally update ambush factors with one bar.
+        
+        Keeps per-symbol rolling state (volume MA, Bollinger SMA/STD, running
+        OBV, washout lag, slope windows and 5-bar high/low), so each bar costs
+        O(1) regardless of history length.
+        """
+        symbol = bar.get('symbol', 'UNKNOWN')
+        state = self._stream.get(symbol)
+        if state is None:
+            state = self._stream[symbol] = _AmbushStreamState(self.config.washout_days)
+        
+        close = float(bar['close'])
+        high = float(bar['high'])
+        low = float(bar['low'])
+        volume = float(bar['volume'])
+        n = self.config.washout_days
+        
+        if state.prev_close is not None:
+            if close > state.prev_close:
+                state.obv += volume
+            elif close < state.prev_close:
+                state.obv -= volume
+        state.prev_close = close
+        
+        state.bars += 1
+        state.volume.push(volume)
+        state.close.push(close)
+        state.washout.push(close)
+        state.obv_window.push(state.obv)
+        state.low5.push(low)
+        state.high5.push(high)
+        
+        volume_ma20 = state.volume.mean
+        sma20 = state.close.mean
+        std20 = state.close.std
+        bb_upper = sma20 + 2 * std20
+        bb_lower = sma20 - 2 * std20
+        
+        full = len(state.washout.values) >= n
+        closes = list(state.washout.values)[-n:]
+        obv_slope = self._window_slope(list(state.obv_window.values)) if full else np.nan
+        price_slope = self._window_slope(closes) if full else np.nan
+        price_min5 = state.low5.value
+        price_max5 = state.high5.value
+        
+        return {
+            **bar,
+            'symbol': symbol,
+            'bars': state.bars,
+            'volume_ma20': volume_ma20,
+            'volume_ratio': volume / (volume_ma20 + 1e-9),
+            'intraday_range': (high - low) / (close + 1e-9),
+            'sma20': sma20,
+            'std20': std20,
+            'bb_upper': bb_upper,
+            'bb_lower': bb_lower,
+            'bb_width': (bb_upper - bb_lower) / (sma20 + 1e-9),
+            'price_change_n': close / state.washout.lagged() - 1,
+            'obv': state.obv,
+            'obv_slope': obv_slope,
+            'price_slope': price_slope,
+            'obv_divergence': int(obv_slope > 0 and price_slope < 0),
+            'price_min5': price_min5,
+            'price_max5': price_max5,
+            'relative_pos': (close - price_min5) / (price_max5 - price_min5 + 1e-9),
+        }
+    
+    def reset_stream(self, symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self._stream.clear()
+        else:
+            self._stream.pop(symbol, None)
+    
+    def signal_candidates(self) -> np.ndarray:
+        """
+        Vectorized pre-filter matching the check count in generate_signal().
+        
+        Evaluates the five factor checks column-wise and keeps bars where at
+        least three pass on non-NaN volume ratio and band width.
+        """
+        f = self._factors
+        washout = f['price_change_n'].fillna(0).abs()
+        passed = (
+            f['volume_ratio'].between(self.config.volume_ratio_min, self.config.volume_ratio_max).astype(int)
+            + (f['bb_width'] < self.config.bollinger_squeeze_threshold).astype(int)
+            + (f['intraday_range'] < self.config.max_intraday_range).astype(int)
+            + washout.between(self.config.min_washout_pct, self.config.max_washout_pct).astype(int)
+            + (f['obv_divergence'] == 1).astype(int)
+        )
+        mask = (
+            f['volume_ratio'].notna() & f['bb_width'].notna() & (passed >= 3)
+        ).to_numpy(dtype=bool)
+        mask[:self.data_warmup] = False
+        return mask
+    
     def generate_signal(self, index: int) -> Optional[Signal]:
         """
         Generate buy signal if ambush conditions are met.
@@ -167,11 +278,14 @@ class AmbushStrategy(BaseStrategy):
         3. Price in washout zone (declined but not crashed)
         4. OBV divergence (smart money accumulating)
         """
-        if self._factors is None or index < self.config.lookback_days:
+        if self._factors is None or index < self.data_warmup:
             return None
         
         row = self._factors.iloc[index]
-        
+        return self.evaluate_row(row, self._data.iloc[index].get('symbol', 'UNKNOWN'))
+    
+    def evaluate_row(self, row: Any, symbol: str) -> Optional[Signal]:
+        """Evaluate ambush conditions on one factor row (batch or streaming)."""
         # Check for NaN values
         if pd.isna(row['volume_ratio']) or pd.isna(row['bb_width']):
             return None
@@ -227,7 +341,7 @@ class AmbushStrategy(BaseStrategy):
             reasons.append("OBV背离")
         
         return Signal(
-            symbol=self._data.iloc[index].get('symbol', 'UNKNOWN'),
+            symbol=symbol,
             signal_type=SignalType.BUY,
             confidence=round(base_confidence, 2),
             price=row['close'],
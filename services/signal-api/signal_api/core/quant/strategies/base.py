@@ -13,6 +13,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from enum import Enum
+import numpy as np
 import pandas as pd
 import logging
 
@@ -98,6 +99,11 @@ class BaseStrategy(ABC):
     2. set_data() is called with historical price data
     3. calculate_factors() computes all indicators
     4. generate_signal() is called for each bar/tick
+    
+    Live mode:
+    Strategies that implement update() keep O(1) rolling state per symbol;
+    update_signal() ingests one bar and evaluates it without recomputing
+    factors over the whole history.
     """
     
     def __init__(self, config: Optional[StrategyConfig] = None):
@@ -113,6 +119,7 @@ class BaseStrategy(ABC):
         self._data: Optional[pd.DataFrame] = None
         self._factors: Optional[pd.DataFrame] = None
         self._is_initialized: bool = False
+        self._data_warmup: Optional[int] = None
         
         logger.info(f"Strategy '{self.config.name}' initialized")
     
@@ -126,12 +133,21 @@ class BaseStrategy(ABC):
         """Check if strategy has data and is ready to generate signals."""
         return self._is_initialized and self._data is not None
     
-    def set_data(self, df: pd.DataFrame) -> None:
+    def set_data(
+        self,
+        df: pd.DataFrame,
+        factors: Optional[pd.DataFrame] = None,
+        warmup: Optional[int] = None
+    ) -> None:
         """
         Set historical price data for the strategy.
         
         Args:
             df: DataFrame with columns ['datetime', 'open', 'high', 'low', 'close', 'volume', 'amount']
+            factors: Precomputed output of calculate_factors() for the same bars
+                (e.g. a slice of a full-history factor frame). Skips recomputation.
+            warmup: Leading bars to skip before evaluating signals. Defaults to
+                warmup_bars; pass 0 when factors were warmed up on earlier history.
         
         Raises:
             ValueError: If required columns are missing.
@@ -142,10 +158,20 @@ class BaseStrategy(ABC):
             raise ValueError(f"Missing required columns: {missing}")
         
         self._data = df.copy()
-        self._data = self._data.sort_values('datetime').reset_index(drop=True)
+        # Same (datetime, symbol) order as calculate_factors(), so row i of both is the same bar
+        sort_keys = ['datetime', 'symbol'] if 'symbol' in self._data.columns else ['datetime']
+        self._data = self._data.sort_values(sort_keys, kind='stable').reset_index(drop=True)
         
         # Calculate factors
-        self._factors = self.calculate_factors(self._data)
+        if factors is not None:
+            if len(factors) != len(self._data):
+                raise ValueError(
+                    f"Factor frame has {len(factors)} rows, expected {len(self._data)}"
+                )
+            self._factors = factors.reset_index(drop=True)
+        else:
+            self._factors = self.calculate_factors(self._data)
+        self._data_warmup = warmup
         self._is_initialized = True
         
         logger.info(f"Strategy '{self.name}' loaded {len(df)} bars")
@@ -176,6 +202,102 @@ class BaseStrategy(ABC):
         """
         pass
     
+    @property
+    def warmup_bars(self) -> int:
+        """Bars required before generate_signal()/update_signal() evaluate."""
+        return self.config.lookback_days
+    
+    @property
+    def data_warmup(self) -> int:
+        """Leading bars of the loaded data that generate_signal() skips."""
+        return self.warmup_bars if self._data_warmup is None else self._data_warmup
+    
+    @property
+    def supports_streaming(self) -> bool:
+        """Whether the strategy implements incremental update()."""
+        return type(self).update is not BaseStrategy.update
+    
+    def update(self, bar: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ingest one new bar and return the latest factor row for its symbol.
+        
+        Args:
+            bar: Dict with 'symbol', 'datetime', 'open', 'high', 'low', 'close', 'volume'
+        
+        Returns:
+            Dict with the bar fields, the same factor columns as calculate_factors()
+            and 'bars' (number of bars seen for the symbol)
+        """
+        raise NotImplementedError(f"{self.name} does not support incremental updates")
+    
+    def reset_stream(self, symbol: Optional[str] = None) -> None:
+        """Drop incremental state for one symbol (or all symbols)."""
+        pass
+    
+    def evaluate_row(self, row: Any, symbol: str) -> Optional[Signal]:
+        """
+        Evaluate signal conditions on a single factor row.
+        
+        Args:
+            row: Factor row (DataFrame row or dict from update())
+            symbol: Symbol the row belongs to
+        
+        Returns:
+            Signal if conditions are met, None otherwise
+        """
+        raise NotImplementedError(f"{self.name} does not support row evaluation")
+    
+    def update_signal(self, bar: Dict[str, Any]) -> Optional[Signal]:
+        """
+        Ingest one bar and generate a signal from the updated factors.
+        
+        Args:
+            bar: New bar for one symbol (see update())
+        
+        Returns:
+            Signal if conditions are met, None otherwise
+        """
+        row = self.update(bar)
+        # Mirrors the `index < warmup` gate of generate_signal()
+        if row.get('bars', 0) <= self.warmup_bars:
+            return None
+        return self.evaluate_row(row, row.get('symbol', 'UNKNOWN'))
+    
+    def signal_candidates(self) -> np.ndarray:
+        """
+        Boolean mask of bars where generate_signal() may return a signal.
+        
+        Subclasses override this with whole-column factor checks so that
+        generate_signal() only runs on the few bars that can trigger. The
+        mask must be a superset of the bars that actually produce signals.
+        The default marks every bar as a candidate.
+        
+        Returns:
+            Boolean array aligned with the factors DataFrame
+        """
+        return np.ones(len(self._factors), dtype=bool)
+    
+    def generate_signals(self, start: int = 0) -> Dict[int, Signal]:
+        """
+        Generate signals for all bars at once.
+        
+        Args:
+            start: First bar index to evaluate
+        
+        Returns:
+            Dict mapping bar index to Signal, only for bars that produced one
+        """
+        if not self.is_ready:
+            raise RuntimeError("Strategy not initialized. Call set_data() first.")
+        
+        mask = np.asarray(self.signal_candidates(), dtype=bool)
+        signals: Dict[int, Signal] = {}
+        for i in np.flatnonzero(mask[start:]) + start:
+            signal = self.generate_signal(int(i))
+            if signal is not None:
+                signals[int(i)] = signal
+        return signals
+    
     def scan(self) -> List[Signal]:
         """
         Scan all bars and collect signals.
@@ -186,11 +308,10 @@ class BaseStrategy(ABC):
         if not self.is_ready:
             raise RuntimeError("Strategy not initialized. Call set_data() first.")
         
-        signals = []
-        for i in range(len(self._data)):
-            signal = self.generate_signal(i)
-            if signal and signal.confidence >= self.config.min_confidence:
-                signals.append(signal)
+        signals = [
+            signal for signal in self.generate_signals().values()
+            if signal.confidence >= self.config.min_confidence
+        ]
         
         logger.info(f"Strategy '{self.name}' generated {len(signals)} signals")
         return signals
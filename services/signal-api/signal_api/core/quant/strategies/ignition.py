@@ -14,14 +14,16 @@ Exit Criteria:
 3. EOD if no follow-through
 """
 
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, time
-from typing import Optional, Dict
+from typing import Any, Dict, Optional
 import pandas as pd
 import numpy as np
 import logging
 
 from .base import BaseStrategy, StrategyConfig, Signal, SignalType
+from .streaming import LagBuffer, RollingMoments
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +50,21 @@ class IgnitionConfig(StrategyConfig):
     stop_loss_pct: float = 0.03  # 3%
 
 
+class _IgnitionStreamState:
+    """Per-symbol O(1) rolling state for IgnitionStrategy.update()."""
+    
+    def __init__(self):
+        self.bars = 0
+        self.volume = RollingMoments(20)
+        self.close = RollingMoments(20)
+        self.momentum = LagBuffer(5)
+        self.date = None
+        self.day_volume = 0.0
+        self.day_pv = 0.0
+        self.day_high = -np.inf
+        self.prior_day_highs = deque(maxlen=4)
+
+
 class IgnitionStrategy(BaseStrategy):
     """
     Ignition Strategy (点火策略)
@@ -67,6 +84,13 @@ class IgnitionStrategy(BaseStrategy):
         # Parse time boundaries
         self._start_time = datetime.strptime(self.config.preferred_start_time, "%H:%M").time()
         self._end_time = datetime.strptime(self.config.preferred_end_time, "%H:%M").time()
+        
+        # Incremental state for live mode, keyed by symbol
+        self._stream: Dict[str, _IgnitionStreamState] = {}
+    
+    @property
+    def warmup_bars(self) -> int:
+        return 20
     
     def calculate_factors(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -128,13 +152,83 @@ class IgnitionStrategy(BaseStrategy):
         df = df.groupby('symbol', group_keys=False).apply(calc_stock_factors)
         
         # Sort by datetime to ensure alignment with engine (CRITICAL for multi-stock)
-        df = df.sort_values(['datetime', 'symbol']).reset_index(drop=True)
+        df = df.sort_values(['datetime', 'symbol'], kind='stable').reset_index(drop=True)
         
         # Clean up
         df.drop(columns=['pv', 'cumulative_pv', 'cumulative_vol'], inplace=True, errors='ignore')
         
         return df
     
+    def update(self, bar: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Incrementally update ignition factors with one minute bar.
+        
+        Keeps per-symbol rolling state (20-bar volume MA, SMA/STD, 5-bar
+        momentum, day cumulative volume/VWAP and 5-day high) so each bar
+        costs O(1). Unlike the batch path, high5 uses today's high so far
+        rather than the full-day high.
+        """
+        symbol = bar.get('symbol', 'UNKNOWN')
+        state = self._stream.get(symbol)
+        if state is None:
+            state = self._stream[symbol] = _IgnitionStreamState()
+        
+        ts = pd.Timestamp(bar['datetime'])
+        close = float(bar['close'])
+        volume = float(bar['volume'])
+        high = float(bar['high'])
+        
+        # Roll the session
+        if ts.date() != state.date:
+            if state.date is not None:
+                state.prior_day_highs.append(state.day_high)
+            state.date = ts.date()
+            state.day_volume = 0.0
+            state.day_pv = 0.0
+            state.day_high = -np.inf
+        
+        state.bars += 1
+        state.volume.push(volume)
+        state.close.push(close)
+        state.momentum.push(close)
+        state.day_volume += volume
+        state.day_pv += close * volume
+        state.day_high = max(state.day_high, high)
+        
+        volume_ma20 = state.volume.mean
+        sma20 = state.close.mean
+        std20 = state.close.std
+        bb_upper = sma20 + 2 * std20
+        high5 = max([state.day_high, *state.prior_day_highs])
+        vwap = state.day_pv / (state.day_volume + 1e-9)
+        
+        return {
+            **bar,
+            'symbol': symbol,
+            'datetime': ts,
+            'time': ts.time(),
+            'date': ts.date(),
+            'bars': state.bars,
+            'volume_ma20': volume_ma20,
+            'minute_volume_ratio': volume / (volume_ma20 + 1e-9),
+            'daily_volume': state.day_volume,
+            'high5': high5,
+            'price_vs_high5': (close - high5) / (high5 + 1e-9),
+            'sma20': sma20,
+            'std20': std20,
+            'bb_upper': bb_upper,
+            'price_vs_bb': (close - bb_upper) / (bb_upper + 1e-9),
+            'momentum5': close / state.momentum.lagged() - 1,
+            'vwap': vwap,
+            'price_vs_vwap': (close - vwap) / (vwap + 1e-9),
+        }
+    
+    def reset_stream(self, symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self._stream.clear()
+        else:
+            self._stream.pop(symbol, None)
+    
     def _is_preferred_time(self, t: time) -> bool:
         """Check if current time is in preferred trading window."""
         if t is None or pd.isna(t):
@@ -145,6 +239,22 @@ class IgnitionStrategy(BaseStrategy):
         end_minutes = self._end_time.hour * 60 + self._end_time.minute
         return start_minutes <= t_minutes <= end_minutes
     
+    def signal_candidates(self) -> np.ndarray:
+        """
+        Vectorized pre-filter matching the hard requirements of generate_signal().
+        
+        A bar can only trigger with a volume surge and a price breakout on
+        non-NaN factors, so these checks are evaluated column-wise.
+        """
+        f = self._factors
+        mask = (
+            f['minute_volume_ratio'].notna() & f['bb_upper'].notna()
+            & (f['minute_volume_ratio'] >= self.config.minute_volume_ratio_min)
+            & ((f['price_vs_bb'] > 0) | (f['price_vs_high5'] >= 0))
+        ).to_numpy(dtype=bool)
+        mask[:self.data_warmup] = False
+        return mask
+    
     def generate_signal(self, index: int) -> Optional[Signal]:
         """
         Generate buy signal if ignition conditions are met.
@@ -155,11 +265,14 @@ class IgnitionStrategy(BaseStrategy):
         3. In preferred time window
         4. Positive momentum
         """
-        if self._factors is None or index < 20:  # Need 20 bars minimum
+        if self._factors is None or index < self.data_warmup:  # Need 20 bars minimum
             return None
         
         row = self._factors.iloc[index]
-        
+        return self.evaluate_row(row, self._data.iloc[index].get('symbol', 'UNKNOWN'))
+    
+    def evaluate_row(self, row: Any, symbol: str) -> Optional[Signal]:
+        """Evaluate ignition conditions on one factor row (batch or streaming)."""
         # Check for NaN values
         if pd.isna(row['minute_volume_ratio']) or pd.isna(row['bb_upper']):
             return None
@@ -218,7 +331,7 @@ class IgnitionStrategy(BaseStrategy):
             reasons.append("黄金时段")
         
         return Signal(
-            symbol=self._data.iloc[index].get('symbol', 'UNKNOWN'),
+            symbol=symbol,
             signal_type=SignalType.BUY,
             confidence=round(base_confidence, 2),
             price=row['close'],
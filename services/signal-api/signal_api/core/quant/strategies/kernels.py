@@ -0,0 +1,155 @@
+"""
+AI Quant Platform - Factor Kernels
+Vectorized NumPy kernels for strategy factor calculation.
+
+Features:
+- Sign-based cumulative OBV
+- Closed-form rolling linear-regression slope
+- Rolling mean/std/min/max and pct-change
+- Grouped variants for multi-symbol arrays (no groupby().apply)
+
+Grouped kernels expect rows sorted so each group is contiguous and in
+time order within the group (e.g. sorted by ['symbol', 'datetime']).
+Windows that would cross a group boundary yield NaN, matching
+pandas rolling(window, min_periods=window) per group.
+"""
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Output rows per block when reducing sliding windows (bounds temp memory)
+_BLOCK_ROWS = 1 << 16
+
+
+def group_bounds(groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find contiguous group segments.
+    
+    Args:
+        groups: Group label per row (contiguous runs)
+    
+    Returns:
+        Tuple of (segment start indices, position of each row within its segment)
+    """
+    groups = np.asarray(groups)
+    n = len(groups)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    change = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+    starts = np.concatenate(([0], change))
+    lengths = np.diff(np.concatenate((starts, [n])))
+    positions = np.arange(n) - np.repeat(starts, lengths)
+    return starts, positions
+
+
+def _rolling_reduce(
+    values: np.ndarray,
+    window: int,
+    reducer: Callable[[np.ndarray], np.ndarray],
+    positions: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Apply reducer to every full trailing window; NaN where the window is incomplete."""
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    out = np.full(n, np.nan)
+    if window < 1 or n < window:
+        return out
+    
+    views = sliding_window_view(values, window)
+    for start in range(0, len(views), _BLOCK_ROWS):
+        block = views[start:start + _BLOCK_ROWS]
+        out[start + window - 1:start + window - 1 + len(block)] = reducer(block)
+    
+    if positions is not None:
+        out[positions < window - 1] = np.nan
+    return out
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """
+    On-Balance Volume.
+    
+    OBV[t] = OBV[t-1] + sign(close[t] - close[t-1]) * volume[t], OBV[0] = 0
+    """
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    direction = np.zeros(len(close))
+    if len(close) > 1:
+        direction[1:] = np.sign(np.nan_to_num(np.diff(close)))
+    return np.cumsum(direction * volume)
+
+
+def grouped_obv(close: np.ndarray, volume: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """OBV restarted at zero for every group."""
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    starts, _ = group_bounds(groups)
+    
+    direction = np.zeros(len(close))
+    if len(close) > 1:
+        direction[1:] = np.sign(np.nan_to_num(np.diff(close)))
+    direction[starts] = 0.0
+    flow = direction * volume
+    
+    # Per-segment cumsum keeps each symbol's running total exact
+    ends = np.concatenate((starts[1:], [len(close)]))
+    out = np.empty(len(close))
+    for a, b in zip(starts, ends):
+        np.cumsum(flow[a:b], out=out[a:b])
+    return out
+
+
+def rolling_slope(values: np.ndarray, window: int, positions: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Rolling least-squares slope against x = 0..window-1.
+    
+    Closed form: slope = sum((x - x_mean) * y) / sum((x - x_mean)^2),
+    identical to np.polyfit(range(window), y, 1)[0] per window.
+    """
+    x = np.arange(window, dtype=float)
+    xc = x - x.mean()
+    denom = float((xc * xc).sum())
+    if denom == 0:
+        return np.full(len(values), np.nan)
+    weights = xc / denom
+    return _rolling_reduce(values, window, lambda v: v @ weights, positions)
+
+
+def grouped_rolling_slope(values: np.ndarray, window: int, groups: np.ndarray) -> np.ndarray:
+    """Rolling slope computed independently within each group."""
+    _, positions = group_bounds(groups)
+    return rolling_slope(values, window, positions)
+
+
+def rolling_mean(values: np.ndarray, window: int, positions: Optional[np.ndarray] = None) -> np.ndarray:
+    """Trailing mean over full windows."""
+    return _rolling_reduce(values, window, lambda v: v.mean(axis=1), positions)
+
+
+def rolling_std(values: np.ndarray, window: int, positions: Optional[np.ndarray] = None) -> np.ndarray:
+    """Trailing sample standard deviation (ddof=1) over full windows."""
+    return _rolling_reduce(values, window, lambda v: v.std(axis=1, ddof=1), positions)
+
+
+def rolling_min(values: np.ndarray, window: int, positions: Optional[np.ndarray] = None) -> np.ndarray:
+    """Trailing minimum over full windows."""
+    return _rolling_reduce(values, window, lambda v: v.min(axis=1), positions)
+
+
+def rolling_max(values: np.ndarray, window: int, positions: Optional[np.ndarray] = None) -> np.ndarray:
+    """Trailing maximum over full windows."""
+    return _rolling_reduce(values, window, lambda v: v.max(axis=1), positions)
+
+
+def pct_change(values: np.ndarray, periods: int, positions: Optional[np.ndarray] = None) -> np.ndarray:
+    """values[t] / values[t - periods] - 1, NaN where no prior value exists (in-group)."""
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[periods:] = values[periods:] / values[:-periods] - 1
+    if positions is not None:
+        out[positions < periods] = np.nan
+    return out
@@ -0,0 +1,127 @@
+"""
+AI Quant Platform - Streaming Factor State
+O(1) rolling state used by strategies' incremental update() path.
+
+Features:
+- Rolling mean / sample std with running (shifted) sums
+- Rolling max / min with monotonic deques
+- Fixed-length lag buffer
+"""
+
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+import math
+
+# Recompute running sums from the buffer every N pushes to cancel float drift
+_RESUM_INTERVAL = 4096
+
+
+class RollingMoments:
+    """Rolling mean and sample standard deviation over the last `window` values."""
+    
+    def __init__(self, window: int):
+        self.window = window
+        self._values: Deque[float] = deque()
+        self._shift: Optional[float] = None
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._pushes = 0
+    
+    def push(self, value: float) -> None:
+        """Add a value, evicting the oldest once the window is full."""
+        if self._shift is None:
+            self._shift = value
+        self._values.append(value)
+        d = value - self._shift
+        self._sum += d
+        self._sumsq += d * d
+        
+        if len(self._values) > self.window:
+            old = self._values.popleft() - self._shift
+            self._sum -= old
+            self._sumsq -= old * old
+        
+        self._pushes += 1
+        if self._pushes % _RESUM_INTERVAL == 0:
+            self._resum()
+    
+    def _resum(self) -> None:
+        self._shift = self._values[-1]
+        self._sum = sum(v - self._shift for v in self._values)
+        self._sumsq = sum((v - self._shift) ** 2 for v in self._values)
+    
+    @property
+    def full(self) -> bool:
+        return len(self._values) >= self.window
+    
+    @property
+    def mean(self) -> float:
+        """Mean of a full window, NaN while warming up."""
+        if not self.full:
+            return math.nan
+        return self._shift + self._sum / self.window
+    
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1) of a full window, NaN while warming up."""
+        n = self.window
+        if not self.full or n < 2:
+            return math.nan
+        var = (self._sumsq - self._sum * self._sum / n) / (n - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class RollingExtreme:
+    """Rolling max (or min) over the last `window` values using a monotonic deque."""
+    
+    def __init__(self, window: int, mode: str = "max"):
+        self.window = window
+        self._is_max = mode == "max"
+        self._deque: Deque[Tuple[int, float]] = deque()
+        self._count = 0
+    
+    def push(self, value: float) -> None:
+        """Add a value in amortized O(1)."""
+        if self._is_max:
+            while self._deque and self._deque[-1][1] <= value:
+                self._deque.pop()
+        else:
+            while self._deque and self._deque[-1][1] >= value:
+                self._deque.pop()
+        self._deque.append((self._count, value))
+        self._count += 1
+        while self._deque[0][0] <= self._count - 1 - self.window:
+            self._deque.popleft()
+    
+    @property
+    def full(self) -> bool:
+        return self._count >= self.window
+    
+    @property
+    def value(self) -> float:
+        """Extreme of a full window, NaN while warming up."""
+        if not self.full:
+            return math.nan
+        return self._deque[0][1]
+
+
+class LagBuffer:
+    """Keeps the last `lag + 1` values so lagged() returns the value from `lag` pushes ago."""
+    
+    def __init__(self, lag: int):
+        self.lag = lag
+        self._values: Deque[float] = deque(maxlen=lag + 1)
+    
+    def push(self, value: float) -> None:
+        self._values.append(value)
+    
+    @property
+    def values(self) -> Deque[float]:
+        return self._values
+    
+    def lagged(self) -> float:
+        """Value from `lag` pushes ago, NaN if not yet available."""
+        if len(self._values) <= self.lag:
+            return math.nan
+        return self._values[0]
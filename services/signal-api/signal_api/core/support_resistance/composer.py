@@ -6,8 +6,11 @@ Support/Resistance Composer - 多引擎融合与 Confluence 评分
 2. Confluence 评分：多信号重叠自动加权
 3. 智能去重：相近价格合并并提升评分
 """
-from typing import List, Optional, Dict, Set
+from typing import List, Optional, Dict, Set, Sequence
 import os
+
+import numpy as np
+
 from .models import SRLevel, SRAnalysis, SRRequestPayload, SRResponse, SRType, SRRating, SRSource
 from .basic_rules import BasicRulesEngine
 from .tdx_engine import TDXEngine
@@ -36,9 +39,23 @@ class SRComposer:
         self.confluence_tolerance = 0.005  # 0.5% 价差视为重叠
         self.max_levels_output = 12  # 最多输出的线条数量
 
-    def calculate(self, payload: SRRequestPayload) -> SRResponse:
+    def config_key(self) -> tuple:
+        """
+        影响计算结果的配置项，用作结果缓存键的一部分
+        """
+        return (
+            self.enable_tdx,
+            self.enable_volume_profile,
+            self.enable_vwap,
+            self.confluence_tolerance,
+            self.max_levels_output,
+        )
+
+    def calculate(self, payload: SRRequestPayload, tdx_levels: Optional[List[SRLevel]] = None) -> SRResponse:
         """
         主计算入口：融合所有引擎并进行 Confluence 评分
+
+        tdx_levels: calculate_tdx_batch 预先算好的 TDX 线，为 None 时逐只计算
         """
         all_levels: List[SRLevel] = []
 
@@ -57,32 +74,39 @@ class SRComposer:
 
         # 3. 运行 TDX Engine
         if self.enable_tdx and payload.prices:
-            tdx_levels = self.tdx_engine.calculate(
-                prices=payload.prices,
-                highs=payload.highs,
-                lows=payload.lows,
-                volumes=payload.volumes,
-                timestamps=payload.timestamps
-            )
+            if tdx_levels is None:
+                tdx_levels = self.tdx_engine.calculate(
+                    prices=payload.prices,
+                    highs=payload.highs,
+                    lows=payload.lows,
+                    volumes=payload.volumes,
+                    timestamps=payload.timestamps
+                )
             all_levels.extend(tdx_levels)
 
         # 4. 运行 Volume Profile
         if self.enable_volume_profile and payload.prices and payload.volumes:
+            # 带时间戳时按股票增量维护当日成交量分布
             vp_levels = self.volume_profile_engine.calculate(
                 prices=payload.prices,
                 volumes=payload.volumes,
                 highs=payload.highs,
-                lows=payload.lows
+                lows=payload.lows,
+                symbol=payload.symbol,
+                timestamps=payload.timestamps
             )
             all_levels.extend(vp_levels)
 
         # 5. 运行 VWAP
         if self.enable_vwap and payload.prices:
+            # 带时间戳时按股票维护当日会话 VWAP，只增量并入新 K 线
             vwap_levels = self.vwap_engine.calculate(
                 prices=payload.prices,
                 volumes=payload.volumes,
                 highs=payload.highs,
-                lows=payload.lows
+                lows=payload.lows,
+                symbol=payload.symbol,
+                timestamps=payload.timestamps
             )
             all_levels.extend(vwap_levels)
 
@@ -115,6 +139,38 @@ class SRComposer:
             }
         )
 
+    def calculate_tdx_batch(self, payloads: Sequence[SRRequestPayload]) -> List[Optional[List[SRLevel]]]:
+        """
+        一次矩阵运算算出多只股票的 TDX 线 (TDXEngine.calculate_batch)
+
+        K 线较短的股票在左侧用 NaN 补齐；结果依次传给 calculate(payload, tdx_levels=...)。
+        TDX 关闭或高低量序列与收盘价不等长的股票返回 None，由 calculate 逐只处理。
+        """
+        results: List[Optional[List[SRLevel]]] = [None] * len(payloads)
+        if not self.enable_tdx:
+            return results
+
+        rows = [
+            i for i, p in enumerate(payloads)
+            if p.prices and all(not s or len(s) == len(p.prices) for s in (p.highs, p.lows, p.volumes))
+        ]
+        if not rows:
+            return results
+
+        width = max(len(payloads[i].prices) for i in rows)
+        prices, highs, lows, volumes = (np.full((len(rows), width), np.nan) for _ in range(4))
+        for r, i in enumerate(rows):
+            p = payloads[i]
+            start = width - len(p.prices)
+            prices[r, start:] = p.prices
+            highs[r, start:] = p.highs or p.prices
+            lows[r, start:] = p.lows or p.prices
+            volumes[r, start:] = p.volumes or 1.0
+
+        for i, levels in zip(rows, self.tdx_engine.calculate_batch(prices, highs, lows, volumes)):
+            results[i] = levels
+        return results
+
     def _apply_confluence(self, levels: List[SRLevel], current_price: float) -> List[SRLevel]:
         """
         Confluence 融合评分算法
@@ -59,3 +59,15 @@ class SRResponse(BaseModel):
     levels: List[SRLevel]
     analysis: Optional[SRAnalysis] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
+
+class SRBatchRequest(BaseModel):
+    payloads: List[SRRequestPayload] = Field(default_factory=list, description="Caller-supplied bars, one payload per symbol")
+    symbols: List[str] = Field(default_factory=list, description="Symbols whose minute bars are read from the local DuckDB store")
+    bars: int = Field(240, ge=10, le=5000, description="Minute bars per symbol when reading from DuckDB")
+
+class SRBatchResponse(BaseModel):
+    success: bool
+    results: Dict[str, SRResponse] = Field(default_factory=dict)
+    missing: List[str] = Field(default_factory=list, description="Symbols without local bars or that failed to compute")
+    duplicates: List[str] = Field(default_factory=list, description="Repeated symbols; only the first occurrence is calculated")
+    metadata: Dict[str, Any] = Field(default_factory=dict)
@@ -1,6 +1,5 @@
 from typing import List, Optional, Tuple, Dict
 import numpy as np
-from collections import defaultdict
 from .models import SRLevel, SRType, SRRating, SRSource
 
 class TDXEngine:
@@ -12,6 +11,11 @@ class TDXEngine:
     3. 根据触及次数、成交量、时间衰减计算强度
     """
 
+    # 窗口大小：前后各看 5 根 K 线
+    PIVOT_WINDOW = 5
+    # 聚类阈值：价格的 0.5%
+    CLUSTER_THRESHOLD_PCT = 0.005
+
     def calculate(self,
                   prices: List[float],
                   highs: Optional[List[float]],
@@ -23,40 +27,92 @@ class TDXEngine:
             return []
 
         # 准备数据
-        p_highs = np.array(highs if highs else prices)
-        p_lows = np.array(lows if lows else prices)
-        p_vols = np.array(volumes) if volumes else np.ones(len(prices))
+        p_highs = np.asarray(highs if highs else prices, dtype=float)
+        p_lows = np.asarray(lows if lows else prices, dtype=float)
+        p_vols = np.asarray(volumes, dtype=float) if volumes else np.ones(len(prices))
 
         # 1. 识别局部高低点 (Pivots)
-        # 窗口大小：前后各看 5 根 K 线
-        window = 5
+        window = self.PIVOT_WINDOW
         pivot_highs = self._find_pivots(p_highs, window, is_high=True)
         pivot_lows = self._find_pivots(p_lows, window, is_high=False)
 
         # 2. 聚类合并 (Clustering)
         # 将价格接近的点合并。阈值为价格的 0.5%
-        clusters = self._cluster_pivots(pivot_highs, pivot_lows, p_vols, threshold_pct=0.005)
+        clusters = self._cluster_pivots(
+            p_highs[pivot_highs], p_lows[pivot_lows],
+            p_vols[pivot_highs], p_vols[pivot_lows],
+            threshold_pct=self.CLUSTER_THRESHOLD_PCT
+        )
 
         # 3. 转换为 SRLevel 对象
-        levels = []
-        current_price = prices[-1]
-
-        for cluster in clusters:
-            # 基础强度计算
-            # 基础分 50 + 次数 * 10 + 成交量加成
-            strength = 50 + (cluster['count'] - 1) * 10
-
-            # 成交量加成 (归一化后的相对量)
-            avg_vol_ratio = cluster['avg_vol'] / (np.mean(p_vols) if len(p_vols) > 0 else 1)
-            if avg_vol_ratio > 1.5:
-                strength += 10
-            if avg_vol_ratio > 3.0:
-                strength += 10
+        mean_vol = np.mean(p_vols) if len(p_vols) > 0 else 1
+        return self._build_levels(clusters, prices[-1], mean_vol)
+
+    def calculate_batch(self,
+                        prices: np.ndarray,
+                        highs: Optional[np.ndarray] = None,
+                        lows: Optional[np.ndarray] = None,
+                        volumes: Optional[np.ndarray] = None) -> List[List[SRLevel]]:
+        """
+        批量计算多只股票的支撑压力线
 
-            # 时间衰减：最近的点权重更高 (简单模拟)
-            # 这里暂时不做的太复杂
+        输入为 (股票数, K线数) 的二维数组，一次性对整个矩阵识别高低点；
+        历史较短的股票可在左侧用 NaN 补齐 (含 NaN 的窗口不会产生高低点)。
+        每行结果与对该行调用 calculate 一致。
+        """
+        p_prices = np.atleast_2d(np.asarray(prices, dtype=float))
+        p_highs = p_prices if highs is None else np.atleast_2d(np.asarray(highs, dtype=float))
+        p_lows = p_prices if lows is None else np.atleast_2d(np.asarray(lows, dtype=float))
+        p_vols = np.ones_like(p_prices) if volumes is None else np.atleast_2d(np.asarray(volumes, dtype=float))
+
+        window = self.PIVOT_WINDOW
+        high_mask = self._pivot_mask(p_highs, window, is_high=True)
+        low_mask = self._pivot_mask(p_lows, window, is_high=False)
+        valid_counts = np.count_nonzero(~np.isnan(p_prices), axis=1)
+
+        results = []
+        for row in range(len(p_prices)):
+            if valid_counts[row] < 10:
+                results.append([])
+                continue
+            pivot_highs = np.flatnonzero(high_mask[row])
+            pivot_lows = np.flatnonzero(low_mask[row])
+            clusters = self._cluster_pivots(
+                p_highs[row, pivot_highs], p_lows[row, pivot_lows],
+                p_vols[row, pivot_highs], p_vols[row, pivot_lows],
+                threshold_pct=self.CLUSTER_THRESHOLD_PCT
+            )
+            vols = p_vols[row, ~np.isnan(p_prices[row])]
+            results.append(self._build_levels(clusters, p_prices[row, -1], np.mean(vols)))
+        return results
+
+    def _cluster_strength(self, cluster: Dict, mean_vol: float) -> float:
+        # 基础强度计算
+        # 基础分 50 + 次数 * 10 + 成交量加成
+        strength = 50 + (cluster['count'] - 1) * 10
+
+        # 成交量加成 (归一化后的相对量)
+        avg_vol_ratio = cluster['avg_vol'] / mean_vol
+        if avg_vol_ratio > 1.5:
+            strength += 10
+        if avg_vol_ratio > 3.0:
+            strength += 10
+
+        # 时间衰减：最近的点权重更高 (简单模拟)
+        # 这里暂时不做的太复杂
+
+        return min(strength, 95) # 上限 95
+
+    def _build_levels(self, clusters: List[Dict], current_price: float, mean_vol: float, top_n: int = 5) -> List[SRLevel]:
+        # 选取最强的 N 个，避免线条过多 (稳定排序，同强度保持价格顺序)
+        # 先算强度再选，只为入选的聚类构建 SRLevel
+        strengths = [self._cluster_strength(cluster, mean_vol) for cluster in clusters]
+        top = sorted(range(len(clusters)), key=lambda i: strengths[i], reverse=True)[:top_n]
 
-            strength = min(strength, 95) # 上限 95
+        levels = []
+        for i in top:
+            cluster = clusters[i]
+            strength = strengths[i]
 
             # 评级
             rating = SRRating.C
@@ -97,93 +153,108 @@ class TDXEngine:
                 description=f"TDX聚类(触及{cluster['count']}次)"
             ))
 
-        # 选取最强的 N 个，避免线条过多
-        levels.sort(key=lambda x: x.strength, reverse=True)
-        return levels[:5] # 只返回最强的 5 条
+        return levels
 
-    def _find_pivots(self, data: np.ndarray, window: int, is_high: bool) -> List[Dict]:
+    def _find_pivots(self, data: np.ndarray, window: int, is_high: bool) -> np.ndarray:
         """
-        寻找局部极值点
+        寻找局部极值点，返回下标数组
         """
-        pivots = []
-        n = len(data)
-
-        for i in range(window, n - window):
-            segment = data[i-window : i+window+1]
-            current = data[i]
+        return np.flatnonzero(self._pivot_mask(data[np.newaxis, :], window, is_high)[0])
 
-            if is_high:
-                if current == max(segment):
-                    pivots.append({'index': i, 'price': current, 'type': 'high'})
-            else:
-                if current == min(segment):
-                    pivots.append({'index': i, 'price': current, 'type': 'low'})
-
-        return pivots
+    def _pivot_mask(self, data: np.ndarray, window: int, is_high: bool) -> np.ndarray:
+        """
+        二维局部极值掩码：data[:, i] 等于 [i-window, i+window] 窗口内的最大(小)值
 
-    def _cluster_pivots(self, highs: List[Dict], lows: List[Dict], volumes: np.ndarray, threshold_pct: float) -> List[Dict]:
+        每行首尾 window 根 K 线不判断。
         """
-        简单的聚类算法
+        rows, n = data.shape
+        size = 2 * window + 1
+        mask = np.zeros((rows, n), dtype=bool)
+        if n < size:
+            return mask
+
+        extreme = _sliding_extreme(data, size, np.maximum if is_high else np.minimum)
+        mask[:, window:n - window] = data[:, window:n - window] == extreme
+        return mask
+
+    def _cluster_pivots(self,
+                        high_prices: np.ndarray,
+                        low_prices: np.ndarray,
+                        high_vols: np.ndarray,
+                        low_vols: np.ndarray,
+                        threshold_pct: float) -> List[Dict]:
         """
-        all_points = highs + lows
-        if not all_points:
-            return []
-
-        # 按价格排序
-        all_points.sort(key=lambda x: x['price'])
-
-        clusters = []
-        if not all_points:
+        按价格排序后单次扫描聚类：
+        与当前聚类均价的偏离不超过阈值则并入，否则开启新聚类
+        """
+        points = np.concatenate((high_prices, low_prices))
+        if len(points) == 0:
             return []
 
-        current_cluster = {
-            'prices': [all_points[0]['price']],
-            'vols': [volumes[all_points[0]['index']]],
-            'types': [all_points[0]['type']]
-        }
+        vols = np.concatenate((high_vols, low_vols))
+        is_high = np.concatenate((np.ones(len(high_prices), dtype=np.int64), np.zeros(len(low_prices), dtype=np.int64)))
 
-        for i in range(1, len(all_points)):
-            point = all_points[i]
-            prev_price = current_cluster['prices'][-1] # 用最后一个加入的，或者用平均值
-            avg_cluster_price = sum(current_cluster['prices']) / len(current_cluster['prices'])
+        # 按价格排序 (稳定排序：同价时高点在前)
+        order = np.argsort(points, kind='stable')
+        sorted_prices = points[order]
 
+        starts = [0]
+        totals = []
+        total = float(sorted_prices[0])
+        count = 1
+        for i, price in enumerate(sorted_prices[1:].tolist(), start=1):
+            avg_cluster_price = total / count
             # 检查是否在阈值内
-            if abs(point['price'] - avg_cluster_price) / avg_cluster_price <= threshold_pct:
-                current_cluster['prices'].append(point['price'])
-                current_cluster['vols'].append(volumes[point['index']])
-                current_cluster['types'].append(point['type'])
+            if abs(price - avg_cluster_price) / avg_cluster_price <= threshold_pct:
+                total += price
+                count += 1
             else:
-                # 结束当前聚类，保存
-                clusters.append(self._finalize_cluster(current_cluster))
-                # 开启新聚类
-                current_cluster = {
-                    'prices': [point['price']],
-                    'vols': [volumes[point['index']]],
-                    'types': [point['type']]
-                }
-
-        # 添加最后一个
-        clusters.append(self._finalize_cluster(current_cluster))
+                totals.append(total)
+                starts.append(i)
+                total = price
+                count = 1
+        totals.append(total)
+
+        starts = np.asarray(starts)
+        counts = np.diff(np.append(starts, len(sorted_prices)))
+        cluster_prices = np.asarray(totals) / counts
+        vol_sums = np.add.reduceat(vols[order], starts)
+        high_counts = np.add.reduceat(is_high[order], starts)
+
+        clusters = []
+        for price, count, vol_sum, high_count in zip(cluster_prices, counts.tolist(), vol_sums.tolist(), high_counts.tolist()):
+            source_type = 'mixed'
+            if high_count == count:
+                source_type = 'high'
+            elif high_count == 0:
+                source_type = 'low'
+
+            clusters.append({
+                'price': price,
+                'count': count,
+                'avg_vol': vol_sum / count,
+                'source_type': source_type
+            })
 
         return clusters
 
-    def _finalize_cluster(self, cluster_data: Dict) -> Dict:
-        count = len(cluster_data['prices'])
-        avg_price = sum(cluster_data['prices']) / count
-        avg_vol = sum(cluster_data['vols']) / count
-
-        high_count = cluster_data['types'].count('high')
-        low_count = cluster_data['types'].count('low')
-
-        source_type = 'mixed'
-        if high_count > 0 and low_count == 0:
-            source_type = 'high'
-        elif low_count > 0 and high_count == 0:
-            source_type = 'low'
-
-        return {
-            'price': avg_price,
-            'count': count,
-            'avg_vol': avg_vol,
-            'source_type': source_type
-        }
+
+def _sliding_extreme(data: np.ndarray, size: int, op: np.ufunc) -> np.ndarray:
+    """
+    每行长度为 size 的滑动窗口最大/最小值 (van Herk/Gil-Werman, O(n))
+
+    按 size 分块做前缀/后缀累积极值，任一窗口恰好跨越相邻两块，
+    其极值 = op(左块后缀, 右块前缀)。返回形状 (rows, n - size + 1)。
+    """
+    rows, n = data.shape
+    n_blocks = -(-n // size)
+    fill = -np.inf if op is np.maximum else np.inf
+    padded = np.full((rows, n_blocks * size), fill)
+    padded[:, :n] = data
+    blocks = padded.reshape(rows, n_blocks, size)
+
+    prefix = op.accumulate(blocks, axis=2).reshape(rows, -1)
+    suffix = op.accumulate(blocks[:, :, ::-1], axis=2)[:, :, ::-1].reshape(rows, -1)
+
+    m = n - size + 1
+    return op(suffix[:, :m], prefix[:, size - 1:size - 1 + m])
@@ -6,12 +6,165 @@ Volume Profile Engine - 成交量分布分析
 - VAH/VAL (Value Area High/Low): 成交量 70% 区间的上下沿
 - HVN (High Volume Node): 成交量密集节点，强支撑/压力区
 - LVN (Low Volume Node): 成交量稀疏节点，快速突破区
+
+分布直方图基于 NumPy 数组：每根 K 线的成交量用差分数组 + 累加和
+均匀分摊到其覆盖的价格区间；POC / Value Area / HVN / LVN 均由同一直方图计算。
+带时间戳的请求按股票增量维护当日分布，每次只并入新 K 线。
 """
-from typing import List, Optional, Dict, Tuple
-from collections import defaultdict
-import statistics
+import copy
+import threading
+from bisect import bisect_left
+from datetime import date, datetime, time as dt_time
+from typing import List, Optional, Dict, Sequence, Tuple, Union
+import numpy as np
 from .models import SRLevel, SRType, SRRating, SRSource
 
+_UNTOUCHED = np.iinfo(np.int64).max
+
+
+class VolumeProfile:
+    """
+    可增量更新的成交量分布
+
+    保存全部 K 线 (收盘/成交量/高/低) 及当前价格范围下的直方图。
+    新 K 线落在已有价格范围内时 O(bins) 原地累加；
+    突破范围(创新高/新低)时标记失效，下次查询按新范围整体向量化重建。
+    结果与对全部 K 线一次性计算一致。
+    """
+
+    def __init__(self, num_bins: int = 50, capacity: int = 256):
+        self.num_bins = num_bins
+        self._bars = np.empty((capacity, 4))  # close, volume, low, high (无高低价时为 NaN)
+        self._size = 0
+        self.price_min = np.inf
+        self.price_max = -np.inf
+        self._hist = np.zeros(num_bins)
+        self._first = np.full(num_bins, _UNTOUCHED)  # 各区间首次被覆盖的K线序号
+        self._dirty = True
+        self.session: Optional[date] = None
+        self.last_timestamp: Optional[Union[int, float]] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_price(self) -> Optional[float]:
+        return float(self._bars[self._size - 1, 0]) if self._size else None
+
+    @property
+    def bin_size(self) -> float:
+        return (self.price_max - self.price_min) / self.num_bins
+
+    def reset(self, session: Optional[date] = None) -> None:
+        """清空 (新交易日调用)"""
+        self._size = 0
+        self.price_min = np.inf
+        self.price_max = -np.inf
+        self._dirty = True
+        self.session = session
+        self.last_timestamp = None
+
+    def copy(self) -> "VolumeProfile":
+        """独立副本 (在副本上叠加仍在变化的最后一根 K 线)"""
+        clone = copy.copy(self)
+        clone._bars = self._bars.copy()
+        clone._hist = self._hist.copy()
+        clone._first = self._first.copy()
+        return clone
+
+    def add_bar(self,
+                price: float,
+                volume: float = 1.0,
+                high: Optional[float] = None,
+                low: Optional[float] = None) -> None:
+        """追加一根 K 线"""
+        self.add_bars([price], [volume], None if high is None else [high], None if low is None else [low])
+
+    def add_bars(self,
+                 prices,
+                 volumes,
+                 highs=None,
+                 lows=None) -> None:
+        """批量追加 K 线"""
+        prices = np.asarray(prices, dtype=float)
+        n = len(prices)
+        if n == 0:
+            return
+        bars = np.empty((n, 4))
+        bars[:, 0] = prices
+        bars[:, 1] = volumes
+        bars[:, 2] = np.nan if lows is None else np.asarray(lows, dtype=float)
+        bars[:, 3] = np.nan if highs is None else np.asarray(highs, dtype=float)
+
+        if self._size + n > len(self._bars):
+            grown = np.empty((max(2 * len(self._bars), self._size + n), 4))
+            grown[:self._size] = self._bars[:self._size]
+            self._bars = grown
+        self._bars[self._size:self._size + n] = bars
+        offset = self._size
+        self._size += n
+
+        new_min = min(self.price_min, float(np.nanmin(bars[:, [0, 2, 3]])))
+        new_max = max(self.price_max, float(np.nanmax(bars[:, [0, 2, 3]])))
+        if new_min != self.price_min or new_max != self.price_max:
+            self.price_min, self.price_max = new_min, new_max
+            self._dirty = True
+        elif not self._dirty:
+            self._accumulate(bars, offset)
+
+    def histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        返回 (各区间成交量, 有 K 线覆盖的区间下标)
+
+        区间下标按首次被覆盖的顺序排列 (先按K线序号、再按价格)，
+        同量区间据此保持稳定顺序。
+        """
+        if self._dirty:
+            self._hist = np.zeros(self.num_bins)
+            self._first = np.full(self.num_bins, _UNTOUCHED)
+            if self._size and self.price_max > self.price_min:
+                self._accumulate(self._bars[:self._size], 0)
+            self._dirty = False
+
+        bins = np.flatnonzero(self._first < _UNTOUCHED)
+        bins = bins[np.argsort(self._first[bins], kind='stable')]
+        return self._hist, bins
+
+    def _accumulate(self, bars: np.ndarray, offset: int) -> None:
+        """把 K 线成交量累加进直方图 (差分数组 + 累加和)"""
+        nb = self.num_bins
+        bin_size = self.bin_size
+        if bin_size <= 0:
+            return
+        close, volume, low, high = bars.T
+
+        # 有高低价且有振幅：在整个K线范围内均匀分配成交量
+        spread = (high - low) > 0  # NaN 比较为 False
+        low_bin = ((low[spread] - self.price_min) / bin_size).astype(np.int64)
+        high_bin = ((high[spread] - self.price_min) / bin_size).astype(np.int64)
+        vol_per_bin = volume[spread] / np.maximum(1, high_bin - low_bin + 1)
+        start = np.clip(low_bin, 0, nb)
+        stop = np.clip(high_bin + 1, 0, nb)
+
+        diff = np.zeros(nb + 1)
+        np.add.at(diff, start, vol_per_bin)
+        np.subtract.at(diff, stop, vol_per_bin)
+
+        # 单价K线 / 只有收盘价：直接分配
+        point_bin = ((close[~spread] - self.price_min) / bin_size).astype(np.int64)
+        in_range = (point_bin >= 0) & (point_bin < nb)
+        point_bin = point_bin[in_range]
+
+        self._hist += np.cumsum(diff[:nb])
+        np.add.at(self._hist, point_bin, volume[~spread][in_range])
+
+        # 记录各区间首次被覆盖的K线序号
+        index = np.arange(offset, offset + len(bars))
+        lengths = np.maximum(stop - start, 0)
+        covered = np.arange(lengths.sum()) + np.repeat(start - (np.cumsum(lengths) - lengths), lengths)
+        np.minimum.at(self._first, covered, np.repeat(index[spread], lengths))
+        np.minimum.at(self._first, point_bin, index[~spread][in_range])
+
 
 class VolumeProfileEngine:
     """
@@ -27,12 +180,17 @@ class VolumeProfileEngine:
         """
         self.num_bins = num_bins
         self.value_area_pct = value_area_pct
+        self._live: Dict[str, VolumeProfile] = {}
+        # SRComposer 在线程池中运行，同一股票的日内分布同步需串行
+        self._lock = threading.Lock()
 
     def calculate(self,
                   prices: List[float],
                   volumes: Optional[List[float]] = None,
                   highs: Optional[List[float]] = None,
-                  lows: Optional[List[float]] = None) -> List[SRLevel]:
+                  lows: Optional[List[float]] = None,
+                  symbol: Optional[str] = None,
+                  timestamps: Optional[Sequence[int]] = None) -> List[SRLevel]:
         """
         计算 Volume Profile 支撑压力线
 
@@ -41,45 +199,160 @@ class VolumeProfileEngine:
             volumes: 成交量序列 (如果没有则假设均匀分布)
             highs: 最高价序列 (用于更精确的分布计算)
             lows: 最低价序列
+            symbol: 股票代码；与 timestamps 同时提供时按增量维护的日内分布计算
+            timestamps: 每根 K 线的 Unix 时间戳 (升序)
 
         Returns:
             List[SRLevel]: 支撑压力线列表
         """
+        if symbol and timestamps and prices and len(timestamps) == len(prices):
+            levels = self._calculate_session(symbol, prices, volumes, highs, lows, timestamps)
+            if levels is not None:
+                return levels
+
         if not prices or len(prices) < 5:
             return []
 
-        # 如果没有成交量数据，使用均匀分布
-        if not volumes:
-            volumes = [1.0] * len(prices)
+        profile = self._build_profile(prices, volumes, highs, lows)
+        return self._levels_from_profile(profile, prices[-1])
 
-        # 计算价格范围
-        all_prices = prices.copy()
-        if highs:
-            all_prices.extend(highs)
-        if lows:
-            all_prices.extend(lows)
+    def update(self,
+               symbol: str,
+               price: float,
+               volume: float = 1.0,
+               high: Optional[float] = None,
+               low: Optional[float] = None,
+               timestamp: Optional[Union[int, float, datetime]] = None) -> None:
+        """
+        推送一根新的分钟 K 线，增量维护该股票的日内成交量分布
 
-        price_min = min(all_prices)
-        price_max = max(all_prices)
+        Args:
+            timestamp: Unix 时间戳或 datetime；跨交易日时自动清空分布
+        """
+        profile = self._live.get(symbol)
+        if profile is None:
+            profile = self._live[symbol] = VolumeProfile(self.num_bins)
 
-        if price_max <= price_min:
+        if timestamp is not None:
+            moment = timestamp if isinstance(timestamp, datetime) else datetime.fromtimestamp(timestamp)
+            if profile.session != moment.date():
+                profile.reset(moment.date())
+            profile.last_timestamp = timestamp
+
+        profile.add_bar(price, volume, high, low)
+
+    def calculate_live(self, symbol: str, current_price: Optional[float] = None) -> List[SRLevel]:
+        """
+        基于增量维护的日内分布计算支撑压力线 (无需重传整日数据)
+
+        Args:
+            symbol: 股票代码
+            current_price: 当前价，默认取最后一根 K 线收盘价
+        """
+        profile = self._live.get(symbol)
+        if profile is None or len(profile) < 5:
             return []
+        if current_price is None:
+            current_price = profile.last_price
+        return self._levels_from_profile(profile, current_price)
+
+    def reset_live(self, symbol: Optional[str] = None) -> None:
+        """清空日内分布 (新交易日调用)，不传 symbol 则清空全部"""
+        if symbol is None:
+            self._live.clear()
+        else:
+            self._live.pop(symbol, None)
+
+    def _calculate_session(self,
+                           symbol: str,
+                           prices: Sequence[float],
+                           volumes: Optional[Sequence[float]],
+                           highs: Optional[Sequence[float]],
+                           lows: Optional[Sequence[float]],
+                           timestamps: Sequence[int]) -> Optional[List[SRLevel]]:
+        """
+        按最后一个交易日的 K 线维护日内分布并计算
 
-        # 构建成交量分布
-        profile = self._build_profile(prices, volumes, highs, lows, price_min, price_max)
+        已收盘的 K 线 (除最后一根) 增量并入 _live 中该股票的分布，每次只处理
+        上次之后的新 K 线；最后一根可能仍在变化，只在分布副本上叠加。
+        传入序列与已并入的 K 线不一致时按该序列重建。
+        当日 K 线不足 5 根时返回 None，由调用方按整段序列计算。
+        """
+        n = len(prices)
+        session_date = datetime.fromtimestamp(timestamps[-1]).date()
+        start = bisect_left(timestamps, datetime.combine(session_date, dt_time.min).timestamp())
+        if n - start < 5:
+            return None
+
+        # 与 _build_profile 相同的补齐规则：(收盘, 成交量, 低, 高)
+        bars = np.full((n - start, 4), np.nan)
+        bars[:, 0] = prices[start:]
+        bars[:, 1] = 1.0
+        if volumes:
+            m = min(n, len(volumes))
+            bars[:max(m - start, 0), 1] = volumes[start:m]
+        if lows and len(lows) >= n:
+            bars[:, 2] = lows[start:n]
+        if highs and len(highs) >= n:
+            bars[:, 3] = highs[start:n]
+        closed = len(bars) - 1
+
+        with self._lock:
+            profile = self._live.get(symbol)
+            resume = self._resume_index(profile, session_date, timestamps[start:], bars, closed)
+            if resume is None:
+                profile = self._live[symbol] = VolumeProfile(self.num_bins, capacity=n - start)
+                profile.reset(session_date)
+                resume = 0
+            if resume < closed:
+                new = bars[resume:closed]
+                profile.add_bars(new[:, 0], new[:, 1], new[:, 3], new[:, 2])
+                profile.last_timestamp = timestamps[start + closed - 1]
+            # 在共享分布上建好直方图，之后的新 K 线只要不创新高/新低就原地累加
+            profile.histogram()
+            live = profile.copy()
+
+        live.add_bars(*bars[closed:, [0, 1, 3, 2]].T)
+        return self._levels_from_profile(live, prices[-1])
+
+    @staticmethod
+    def _resume_index(profile: Optional[VolumeProfile],
+                      session_date: date,
+                      timestamps: Sequence[int],
+                      bars: np.ndarray,
+                      closed: int) -> Optional[int]:
+        """
+        分布与传入序列一致时返回下一根待并入 K 线的下标，否则返回 None
+
+        已并入的 K 线逐一与传入序列比对，任一根被改写都会触发重建。
+        """
+        if profile is None or profile.session != session_date or profile.last_timestamp is None:
+            return None
+        folded = len(profile)
+        if (folded > closed
+                or timestamps[folded - 1] != profile.last_timestamp
+                or not np.array_equal(profile._bars[:folded], bars[:folded], equal_nan=True)):
+            return None
+        return folded
 
-        if not profile:
+    def _levels_from_profile(self, profile: VolumeProfile, current_price: float) -> List[SRLevel]:
+        if profile.price_max <= profile.price_min:
+            return []
+
+        hist, bins = profile.histogram()
+        if len(bins) == 0:
             return []
 
         # 计算核心指标
-        poc_price = self._calculate_poc(profile, price_min)
-        val_price, vah_price = self._calculate_value_area(profile, price_min)
-        hvn_levels = self._find_hvn(profile, price_min)
-        lvn_levels = self._find_lvn(profile, price_min)
+        price_min = profile.price_min
+        bin_size = profile.bin_size
+        poc_price = self._calculate_poc(hist, bins, price_min, bin_size)
+        val_price, vah_price = self._calculate_value_area(hist, bins, price_min, bin_size)
+        hvn_levels = self._find_hvn(hist, bins, price_min, bin_size)
+        lvn_levels = self._find_lvn(hist, bins, price_min, bin_size)
 
         # 构建 SRLevel 列表
         levels: List[SRLevel] = []
-        current_price = prices[-1]
 
         # POC - 最强的支撑/压力位
         if poc_price:
@@ -139,7 +412,7 @@ class VolumeProfileEngine:
             levels.append(SRLevel(
                 price=round(hvn['price'], 3),
                 type=hvn_type,
-                strength=65.0 + hvn['volume_ratio'] * 10,
+                strength=min(65.0 + hvn['volume_ratio'] * 10, 95.0),
                 rating=SRRating.A if hvn['volume_ratio'] > 1.5 else SRRating.B,
                 source=[SRSource.DYNAMIC],
                 visual_style={
@@ -155,152 +428,140 @@ class VolumeProfileEngine:
 
     def _build_profile(self,
                        prices: List[float],
-                       volumes: List[float],
+                       volumes: Optional[List[float]],
                        highs: Optional[List[float]],
-                       lows: Optional[List[float]],
-                       price_min: float,
-                       price_max: float) -> Dict[int, float]:
+                       lows: Optional[List[float]]) -> VolumeProfile:
         """
         构建成交量分布直方图
         """
-        bin_size = (price_max - price_min) / self.num_bins
-        if bin_size <= 0:
-            return {}
-
-        profile: Dict[int, float] = defaultdict(float)
-
-        for i in range(len(prices)):
-            volume = volumes[i] if i < len(volumes) else 1.0
-
-            # 如果有高低价，在整个K线范围内分配成交量
-            if highs and lows and i < len(highs) and i < len(lows):
-                low = lows[i]
-                high = highs[i]
-                bar_range = high - low
-                if bar_range > 0:
-                    # 将成交量均匀分配到K线覆盖的所有bins
-                    low_bin = int((low - price_min) / bin_size)
-                    high_bin = int((high - price_min) / bin_size)
-                    bins_covered = max(1, high_bin - low_bin + 1)
-                    vol_per_bin = volume / bins_covered
-                    for b in range(low_bin, high_bin + 1):
-                        if 0 <= b < self.num_bins:
-                            profile[b] += vol_per_bin
-                else:
-                    # 单价K线
-                    bin_idx = int((prices[i] - price_min) / bin_size)
-                    if 0 <= bin_idx < self.num_bins:
-                        profile[bin_idx] += volume
-            else:
-                # 只有收盘价，直接分配
-                bin_idx = int((prices[i] - price_min) / bin_size)
-                if 0 <= bin_idx < self.num_bins:
-                    profile[bin_idx] += volume
-
-        self._bin_size = bin_size
-        self._price_min = price_min
-        return dict(profile)
-
-    def _calculate_poc(self, profile: Dict[int, float], price_min: float) -> Optional[float]:
+        n = len(prices)
+        # 如果没有成交量数据，使用均匀分布
+        vols = np.ones(n)
+        if volumes:
+            m = min(n, len(volumes))
+            vols[:m] = volumes[:m]
+
+        # 高低价都齐全时在K线范围内分摊；价格范围包含全部高低价
+        profile = VolumeProfile(self.num_bins, capacity=n)
+        profile.add_bars(
+            prices, vols,
+            highs[:n] if highs and len(highs) >= n else None,
+            lows[:n] if lows and len(lows) >= n else None
+        )
+        return profile
+
+    @staticmethod
+    def _bin_price(bin_idx: int, price_min: float, bin_size: float) -> float:
+        return price_min + (bin_idx + 0.5) * bin_size
+
+    def _calculate_poc(self,
+                       hist: np.ndarray,
+                       bins: np.ndarray,
+                       price_min: float,
+                       bin_size: float) -> Optional[float]:
         """
         计算 POC (Point of Control) - 成交量最高的价格
         """
-        if not profile:
+        if len(bins) == 0:
             return None
 
-        poc_bin = max(profile, key=profile.get)
-        poc_price = price_min + (poc_bin + 0.5) * self._bin_size
-        return poc_price
+        # 同量时取最先形成的区间
+        poc_bin = int(bins[np.argmax(hist[bins])])
+        return self._bin_price(poc_bin, price_min, bin_size)
 
-    def _calculate_value_area(self, profile: Dict[int, float], price_min: float) -> Tuple[Optional[float], Optional[float]]:
+    def _calculate_value_area(self,
+                              hist: np.ndarray,
+                              bins: np.ndarray,
+                              price_min: float,
+                              bin_size: float) -> Tuple[Optional[float], Optional[float]]:
         """
         计算 Value Area (成交量 70% 区间)
         使用从 POC 向两侧扩展的方法
         """
-        if not profile:
+        if len(bins) == 0:
             return None, None
 
-        total_volume = sum(profile.values())
-        target_volume = total_volume * self.value_area_pct
+        volumes = np.zeros(len(hist))
+        volumes[bins] = hist[bins]
+        target_volume = hist[bins].sum() * self.value_area_pct
 
-        poc_bin = max(profile, key=profile.get)
-        included_bins = {poc_bin}
-        current_volume = profile[poc_bin]
-
-        all_bins = sorted(profile.keys())
-        min_bin = min(all_bins)
-        max_bin = max(all_bins)
+        poc_bin = int(bins[np.argmax(hist[bins])])
+        min_bin, max_bin = int(bins.min()), int(bins.max())
+        vol = volumes.tolist()
 
+        lower = upper = poc_bin
+        current_volume = vol[poc_bin]
         while current_volume < target_volume:
-            # 找到相邻但未包含的 bins
-            candidates = []
-
-            # 向下扩展
-            lower_bound = min(included_bins)
-            if lower_bound - 1 >= min_bin and lower_bound - 1 not in included_bins:
-                candidates.append((lower_bound - 1, profile.get(lower_bound - 1, 0)))
-
-            # 向上扩展
-            upper_bound = max(included_bins)
-            if upper_bound + 1 <= max_bin and upper_bound + 1 not in included_bins:
-                candidates.append((upper_bound + 1, profile.get(upper_bound + 1, 0)))
-
-            if not candidates:
+            can_lower = lower - 1 >= min_bin
+            can_upper = upper + 1 <= max_bin
+            if not (can_lower or can_upper):
                 break
 
-            # 选择成交量更大的方向
-            best_bin = max(candidates, key=lambda x: x[1])[0]
-            included_bins.add(best_bin)
-            current_volume += profile.get(best_bin, 0)
+            # 选择成交量更大的方向 (相同时向下)
+            if can_lower and (not can_upper or vol[lower - 1] >= vol[upper + 1]):
+                lower -= 1
+                current_volume += vol[lower]
+            else:
+                upper += 1
+                current_volume += vol[upper]
 
-        val_price = price_min + (min(included_bins) + 0.5) * self._bin_size
-        vah_price = price_min + (max(included_bins) + 0.5) * self._bin_size
+        val_price = self._bin_price(lower, price_min, bin_size)
+        vah_price = self._bin_price(upper, price_min, bin_size)
 
         return val_price, vah_price
 
-    def _find_hvn(self, profile: Dict[int, float], price_min: float) -> List[Dict]:
+    def _volume_nodes(self,
+                      hist: np.ndarray,
+                      bins: np.ndarray,
+                      price_min: float,
+                      bin_size: float,
+                      mask_fn) -> List[Dict]:
+        if len(bins) == 0:
+            return []
+
+        volumes = hist[bins]
+        avg_volume = volumes.sum() / len(bins)
+        selected = mask_fn(volumes, avg_volume)
+        return [
+            {
+                'price': self._bin_price(int(b), price_min, bin_size),
+                'volume': volume,
+                'volume_ratio': volume / avg_volume
+            }
+            for b, volume in zip(bins[selected], volumes[selected])
+        ]
+
+    def _find_hvn(self,
+                  hist: np.ndarray,
+                  bins: np.ndarray,
+                  price_min: float,
+                  bin_size: float) -> List[Dict]:
         """
         找出 High Volume Nodes (成交量密集节点)
         超过平均成交量 1.5 倍的价格区间
         """
-        if not profile:
-            return []
-
-        avg_volume = sum(profile.values()) / len(profile)
-        hvn_threshold = avg_volume * 1.5
-
-        hvn_levels = []
-        for bin_idx, volume in profile.items():
-            if volume >= hvn_threshold:
-                hvn_levels.append({
-                    'price': price_min + (bin_idx + 0.5) * self._bin_size,
-                    'volume': volume,
-                    'volume_ratio': volume / avg_volume
-                })
+        hvn_levels = self._volume_nodes(
+            hist, bins, price_min, bin_size,
+            lambda volumes, avg: volumes >= avg * 1.5
+        )
 
         # 按成交量排序
         hvn_levels.sort(key=lambda x: x['volume'], reverse=True)
         return hvn_levels
 
-    def _find_lvn(self, profile: Dict[int, float], price_min: float) -> List[Dict]:
+    def _find_lvn(self,
+                  hist: np.ndarray,
+                  bins: np.ndarray,
+                  price_min: float,
+                  bin_size: float) -> List[Dict]:
         """
         找出 Low Volume Nodes (成交量稀疏节点)
         低于平均成交量 0.5 倍的价格区间
         """
-        if not profile:
-            return []
-
-        avg_volume = sum(profile.values()) / len(profile)
-        lvn_threshold = avg_volume * 0.5
-
-        lvn_levels = []
-        for bin_idx, volume in profile.items():
-            if 0 < volume < lvn_threshold:
-                lvn_levels.append({
-                    'price': price_min + (bin_idx + 0.5) * self._bin_size,
-                    'volume': volume,
-                    'volume_ratio': volume / avg_volume
-                })
+        lvn_levels = self._volume_nodes(
+            hist, bins, price_min, bin_size,
+            lambda volumes, avg: (volumes > 0) & (volumes < avg * 0.5)
+        )
 
         # 按成交量排序（升序，最稀疏的在前）
         lvn_levels.sort(key=lambda x: x['volume'])
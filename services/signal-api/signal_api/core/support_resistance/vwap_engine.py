@@ -4,22 +4,129 @@ VWAP Engine - 成交量加权平均价
 VWAP (Volume Weighted Average Price) 是机构交易员最常用的参考价格。
 - VWAP 本身是动态支撑/压力
 - ±1σ 和 ±2σ 标准差带提供额外的支撑压力区间
+- 盘中可按股票维护会话累加器 (SessionVWAP)，每根 K 线 O(1) 更新
 """
-from typing import List, Optional
-import statistics
+import copy
+import math
+import threading
+from bisect import bisect_left
+from datetime import date, datetime, time as dt_time
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
 from .models import SRLevel, SRType, SRRating, SRSource
 
 
+class SessionVWAP:
+    """
+    单只股票的会话 VWAP 累加器
+
+    维护累计 PV、累计 V，以及典型价偏离当时 VWAP 的 Welford 方差，
+    每根 K 线 O(1) 更新；结果与对整段 K 线调用 VWAPEngine.calculate 一致。
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, session: Optional[date] = None) -> None:
+        """会话开盘时清零"""
+        self.session = session
+        self.count = 0
+        self.cumulative_pv = 0.0
+        self.cumulative_volume = 0.0
+        self.vwap = 0.0
+        self.last_price = 0.0
+        self.last_timestamp: Optional[Union[int, float]] = None
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self,
+               price: float,
+               volume: float = 1.0,
+               high: Optional[float] = None,
+               low: Optional[float] = None) -> float:
+        """
+        推送一根 K 线，返回最新 VWAP
+        """
+        # 典型价格 (Typical Price = (H + L + C) / 3)
+        typical = (high + low + price) / 3 if high is not None and low is not None else price
+
+        self.cumulative_pv += typical * volume
+        self.cumulative_volume += volume
+        self.vwap = self.cumulative_pv / self.cumulative_volume if self.cumulative_volume > 0 else typical
+        self.last_price = price
+
+        # Welford: 偏离 = 典型价 - 当时的 VWAP
+        deviation = typical - self.vwap
+        self.count += 1
+        delta = deviation - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (deviation - self._mean)
+        return self.vwap
+
+    @property
+    def std_dev(self) -> float:
+        """偏离的样本标准差"""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1))
+
+
 class VWAPEngine:
     """
     Level 2: VWAP 成交量加权平均价系统
     """
 
+    def __init__(self):
+        self._sessions: Dict[str, SessionVWAP] = {}
+        # SRComposer 在线程池中运行，同一股票的会话同步需串行
+        self._lock = threading.Lock()
+
+    def update(self,
+               symbol: str,
+               price: float,
+               volume: float = 1.0,
+               high: Optional[float] = None,
+               low: Optional[float] = None,
+               timestamp: Optional[Union[int, float, datetime]] = None) -> float:
+        """
+        推送一根分钟 K 线，维护该股票的会话 VWAP
+
+        Args:
+            timestamp: Unix 时间戳或 datetime；跨交易日时自动重置会话
+
+        Returns:
+            最新 VWAP
+        """
+        session_vwap = self._sessions.get(symbol)
+        if session_vwap is None:
+            session_vwap = self._sessions[symbol] = SessionVWAP()
+
+        if timestamp is not None:
+            moment = timestamp if isinstance(timestamp, datetime) else datetime.fromtimestamp(timestamp)
+            if session_vwap.session != moment.date():
+                session_vwap.reset(moment.date())
+            session_vwap.last_timestamp = timestamp
+
+        return session_vwap.update(price, volume, high, low)
+
+    def get_session(self, symbol: str) -> Optional[SessionVWAP]:
+        """获取会话累加器 (不存在返回 None)"""
+        return self._sessions.get(symbol)
+
+    def reset_sessions(self, symbol: Optional[str] = None) -> None:
+        """重置会话 (新交易日调用)，不传 symbol 则清空全部"""
+        if symbol is None:
+            self._sessions.clear()
+        else:
+            self._sessions.pop(symbol, None)
+
     def calculate(self,
                   prices: List[float],
                   volumes: Optional[List[float]] = None,
                   highs: Optional[List[float]] = None,
-                  lows: Optional[List[float]] = None) -> List[SRLevel]:
+                  lows: Optional[List[float]] = None,
+                  symbol: Optional[str] = None,
+                  timestamps: Optional[Sequence[int]] = None) -> List[SRLevel]:
         """
         计算 VWAP 及其标准差带
 
@@ -28,41 +135,125 @@ class VWAPEngine:
             volumes: 成交量序列
             highs: 最高价序列
             lows: 最低价序列
+            symbol: 股票代码；与 timestamps 同时提供时按会话累加器计算
+            timestamps: 每根 K 线的 Unix 时间戳 (升序)
 
         Returns:
             List[SRLevel]: VWAP 相关的支撑压力线
         """
+        if symbol and timestamps and len(timestamps) == len(prices):
+            levels = self._calculate_session(symbol, prices, volumes, highs, lows, timestamps)
+            if levels is not None:
+                return levels
+
         if not prices or len(prices) < 5:
             return []
 
+        vols, typical_prices = self._normalize(prices, volumes, highs, lows)
+        n = len(prices)
+
+        # 计算 VWAP
+        vwap_values = self._calculate_vwap_series(typical_prices, vols)
+
+        # 计算标准差
+        deviations = typical_prices - vwap_values
+        std_dev = float(np.std(deviations, ddof=1)) if n > 1 else 0
+
+        return self._build_levels(float(vwap_values[-1]), std_dev, prices[-1])
+
+    @staticmethod
+    def _normalize(prices: Sequence[float],
+                   volumes: Optional[Sequence[float]],
+                   highs: Optional[Sequence[float]],
+                   lows: Optional[Sequence[float]]):
+        """成交量 (缺失按 1 补齐) 与典型价格数组"""
         # 如果没有成交量，使用均匀分布
-        vols = volumes if volumes else [1.0] * len(prices)
+        n = len(prices)
+        vols = np.ones(n)
+        if volumes:
+            m = min(n, len(volumes))
+            vols[:m] = volumes[:m]
 
         # 计算典型价格 (Typical Price = (H + L + C) / 3)
-        if highs and lows and len(highs) == len(prices) and len(lows) == len(prices):
-            typical_prices = [
-                (highs[i] + lows[i] + prices[i]) / 3
-                for i in range(len(prices))
-            ]
+        p_prices = np.asarray(prices, dtype=float)
+        if highs and lows and len(highs) == n and len(lows) == n:
+            typical_prices = (np.asarray(highs, dtype=float) + np.asarray(lows, dtype=float) + p_prices) / 3
         else:
-            typical_prices = prices
+            typical_prices = p_prices
+        return vols, typical_prices
 
-        # 计算 VWAP
-        vwap_values = self._calculate_vwap_series(typical_prices, vols)
+    def _calculate_session(self,
+                           symbol: str,
+                           prices: Sequence[float],
+                           volumes: Optional[Sequence[float]],
+                           highs: Optional[Sequence[float]],
+                           lows: Optional[Sequence[float]],
+                           timestamps: Sequence[int]) -> Optional[List[SRLevel]]:
+        """
+        按最后一个交易日的 K 线维护会话累加器并计算
 
-        if not vwap_values:
-            return []
+        已收盘的 K 线 (除最后一根) 通过 update() 增量并入会话，每次只处理
+        上次之后的新 K 线；最后一根可能仍在变化，只在会话副本上叠加。
+        传入序列与会话不一致 (缺失/改写了已并入的 K 线) 时按该序列重建会话。
+        当日 K 线不足 5 根时返回 None，由调用方按整段序列计算。
+        """
+        n = len(prices)
+        session_date = datetime.fromtimestamp(timestamps[-1]).date()
+        start = bisect_left(timestamps, datetime.combine(session_date, dt_time.min).timestamp())
+        if n - start < 5:
+            return None
 
-        current_vwap = vwap_values[-1]
-        current_price = prices[-1]
+        use_hl = bool(highs and lows and len(highs) == n and len(lows) == n)
+        vols, typical_prices = self._normalize(prices, volumes, highs, lows)
+        closed_end = n - 1
 
-        # 计算标准差
-        deviations = [
-            typical_prices[i] - vwap_values[i]
-            for i in range(len(typical_prices))
-        ]
-        std_dev = statistics.stdev(deviations) if len(deviations) > 1 else 0
+        def bar(i: int):
+            return (prices[i], float(vols[i]),
+                    highs[i] if use_hl else None, lows[i] if use_hl else None)
+
+        with self._lock:
+            resume = self._resume_index(self._sessions.get(symbol), session_date, prices,
+                                        timestamps, typical_prices, vols, start, closed_end)
+            if resume is None:
+                self._sessions[symbol] = SessionVWAP()
+                resume = start
+            for i in range(resume, closed_end):
+                self.update(symbol, *bar(i), timestamp=timestamps[i])
+            live = copy.copy(self._sessions[symbol])
+
+        live.update(*bar(closed_end))
+        return self._build_levels(live.vwap, live.std_dev, prices[-1])
+
+    @staticmethod
+    def _resume_index(session: Optional[SessionVWAP],
+                      session_date: date,
+                      prices: Sequence[float],
+                      timestamps: Sequence[int],
+                      typical_prices: np.ndarray,
+                      volumes: np.ndarray,
+                      start: int,
+                      closed_end: int) -> Optional[int]:
+        """
+        会话与传入序列一致时返回下一根待并入 K 线的下标，否则返回 None
+
+        除对齐最后并入的 K 线外，还用向量化求和核对累计 PV / V，
+        已并入区间内任一 K 线被改写都会触发重建。
+        """
+        if session is None or session.session != session_date or session.last_timestamp is None:
+            return None
+        j = bisect_left(timestamps, session.last_timestamp, start, closed_end)
+        if (j >= closed_end
+                or timestamps[j] != session.last_timestamp
+                or prices[j] != session.last_price
+                or j - start + 1 != session.count):
+            return None
+        folded = slice(start, j + 1)
+        if not (np.isclose(volumes[folded].sum(), session.cumulative_volume, rtol=1e-9)
+                and np.isclose(np.dot(typical_prices[folded], volumes[folded]), session.cumulative_pv, rtol=1e-9)):
+            return None
+        return j + 1
 
+    def _build_levels(self, current_vwap: float, std_dev: float, current_price: float) -> List[SRLevel]:
         # 构建 SRLevel 列表
         levels: List[SRLevel] = []
 
@@ -158,30 +349,17 @@ class VWAPEngine:
         return levels
 
     def _calculate_vwap_series(self,
-                               typical_prices: List[float],
-                               volumes: List[float]) -> List[float]:
+                               typical_prices: np.ndarray,
+                               volumes: np.ndarray) -> np.ndarray:
         """
         计算 VWAP 序列
 
         VWAP = Σ(Typical Price × Volume) / Σ(Volume)
         """
-        if not typical_prices or not volumes:
-            return []
-
-        vwap_values = []
-        cumulative_pv = 0.0
-        cumulative_volume = 0.0
-
-        for i in range(len(typical_prices)):
-            vol = volumes[i] if i < len(volumes) else 1.0
-            cumulative_pv += typical_prices[i] * vol
-            cumulative_volume += vol
-
-            if cumulative_volume > 0:
-                vwap_values.append(cumulative_pv / cumulative_volume)
-            else:
-                vwap_values.append(typical_prices[i])
-
+        cumulative_pv = np.cumsum(typical_prices * volumes)
+        cumulative_volume = np.cumsum(volumes)
+        vwap_values = typical_prices.copy()
+        np.divide(cumulative_pv, cumulative_volume, out=vwap_values, where=cumulative_volume > 0)
         return vwap_values
 
     def get_vwap_analysis(self, current_price: float, vwap: float, std_dev: float) -> dict:
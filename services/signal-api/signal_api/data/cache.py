@@ -0,0 +1,198 @@
+"""
+行情数据缓存 - Signal-API
+单飞 (single-flight) + 有界 LRU/TTL 缓存
+
+- 相同 key 的并发请求共享同一个进行中的上游请求
+- 结果按调用方给定的 TTL 缓存, 超出容量按 LRU 淘汰
+- 命中/未命中计数上报 PerformanceMonitor.record_cache
+- StreamEntryCache: 按消息 ID 缓存已解析的 Redis Stream 条目
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from ..core.quant.monitor import get_monitor
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightCache:
+    """
+    单飞 + LRU/TTL 缓存
+    
+    Usage:
+        cache = SingleFlightCache("minute_data")
+        data = await cache.get_or_load(key, lambda: fetch(code), ttl=60)
+    
+    loader 返回 None (所有数据源失败) 时不缓存, 下一次请求会重新拉取。
+    上游请求运行在独立任务中, 单个调用方取消/超时不会影响其他等待者。
+    """
+    
+    def __init__(self, name: str, max_entries: int = 1024):
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        # 加入进行中请求的调用方: 未命中缓存, 但也未触发上游请求
+        self.coalesced = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """读取未过期的缓存值 (不计入命中统计)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """写入缓存, 超出容量时淘汰最久未使用的条目"""
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float
+    ) -> Any:
+        """
+        命中缓存直接返回, 否则加入(或发起)该 key 的进行中请求
+        
+        Args:
+            key: 缓存键
+            loader: 无参协程工厂, 仅在没有进行中请求时调用
+            ttl: 结果缓存秒数
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            self._report()
+            return value
+        
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, loader, ttl))
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+        self._report()
+        return await asyncio.shield(task)
+    
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        try:
+            value = await loader()
+            if value is not None:
+                self.set(key, value, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+    
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """删除指定 key, 不传则清空"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+    
+    def _report(self) -> None:
+        # 合并的请求同样避免了一次上游拉取, 按命中上报
+        get_monitor().record_cache(self.name, self.hits + self.coalesced, self.misses)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """缓存统计 (hit_rate: 未触发上游请求的调用占比)"""
+        total = self.hits + self.coalesced + self.misses
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.coalesced) / total * 100, 2) if total else 0.0,
+        }
+
+
+_MISSING = object()
+
+
+class StreamEntryCache:
+    """
+    已解析 Stream 条目缓存 (按 stream + 消息 ID)
+    
+    Stream 条目写入后不可变, 因此不设 TTL, 仅按 LRU 限制条目数。
+    解析失败的条目同样缓存 (值为 None), 重复的列表请求不再反复
+    json.loads / model_validate 同一批消息。
+    """
+    
+    def __init__(self, name: str = "stream_entries", max_entries: int = 10000):
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_or_parse(
+        self,
+        stream: str,
+        message_id: str,
+        fields: Dict[str, str],
+        parse: Callable[[Dict[str, str]], Optional[Any]]
+    ) -> Optional[Any]:
+        """
+        返回缓存的解析结果, 未命中时调用 parse(fields) 并缓存
+        
+        Args:
+            stream: Stream 名称
+            message_id: 消息 ID
+            fields: 消息字段
+            parse: 解析函数, 无效条目返回 None
+        """
+        key = (stream, message_id)
+        value = self._entries.get(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value
+        
+        self.misses += 1
+        value = parse(fields)
+        self._entries[key] = value
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+    
+    def report(self) -> None:
+        """上报命中统计 (每次列表请求调用一次, 而非每条消息)"""
+        get_monitor().record_cache(self.name, self.hits, self.misses)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """缓存统计"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total * 100, 2) if total else 0.0,
+        }
@@ -15,6 +15,9 @@ from typing import Any, Dict, List, Optional
 
 import aiohttp
 
+from .cache import SingleFlightCache
+from .http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -99,68 +102,66 @@ class EastMoneyDataSource(StockDataSource):
             "Referer": "https://quote.eastmoney.com/"
         }
         
-        # 禁用代理的连接器
-        connector = aiohttp.TCPConnector(ssl=False)
-        
         try:
-            async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
-                async with session.get(
-                    self.TRENDS_URL, 
-                    params=params, 
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    if response.status != 200:
-                        logger.warning(f"东方财富分时API返回 {response.status}")
-                        return None
-                    
-                    data = await response.json()
-                    
-                    if data.get("rc") != 0 or not data.get("data"):
-                        logger.warning(f"东方财富分时API返回错误: {data.get('rc')}")
-                        return None
-                    
-                    api_data = data["data"]
-                    stock_name = api_data.get("name", f"股票{clean_code}")
-                    preclose = float(api_data.get("preClose", 0))
-                    trends = api_data.get("trends", [])
-                    
-                    if not trends:
-                        logger.warning(f"东方财富分时数据为空: {stock_code}")
-                        return None
-                    
-                    minute_data = []
-                    for trend in trends:
-                        parts = trend.split(",")
-                        if len(parts) >= 8:
-                            datetime_str = parts[0]  # 格式: 2024-01-01 09:30
-                            price = float(parts[2])  # 收盘价
-                            volume = int(parts[5])   # 成交量
-                            amount = float(parts[6]) # 成交额
-                            avg_price = float(parts[7])  # 均价
-                            
-                            # 提取时间 HH:MM
-                            time_str = datetime_str.split(" ")[1] if " " in datetime_str else datetime_str[-5:]
-                            
-                            minute_data.append({
-                                "time": time_str,
-                                "price": price,
-                                "volume": volume,
-                                "amount": amount,
-                                "avg_price": avg_price
-                            })
-                    
-                    if minute_data:
-                        logger.info(f"✅ 东方财富获取分时数据成功: {clean_code} - {len(minute_data)}条")
-                        return {
-                            "code": clean_code,
-                            "name": stock_name,
-                            "minute_data": minute_data,
-                            "yesterday_close": preclose,
-                            "data_source": "eastmoney"
-                        }
-                    
+            async with get_http_client().get(
+                self.TRENDS_URL,
+                params=params,
+                headers=headers,
+                ssl=False,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                if response.status != 200:
+                    logger.warning(f"东方财富分时API返回 {response.status}")
                     return None
-                    
+                
+                data = await response.json()
+                
+                if data.get("rc") != 0 or not data.get("data"):
+                    logger.warning(f"东方财富分时API返回错误: {data.get('rc')}")
+                    return None
+                
+                api_data = data["data"]
+                stock_name = api_data.get("name", f"股票{clean_code}")
+                preclose = float(api_data.get("preClose", 0))
+                trends = api_data.get("trends", [])
+                
+                if not trends:
+                    logger.warning(f"东方财富分时数据为空: {stock_code}")
+                    return None
+                
+                minute_data = []
+                for trend in trends:
+                    parts = trend.split(",")
+                    if len(parts) >= 8:
+                        datetime_str = parts[0]  # 格式: 2024-01-01 09:30
+                        price = float(parts[2])  # 收盘价
+                        volume = int(parts[5])   # 成交量
+                        amount = float(parts[6]) # 成交额
+                        avg_price = float(parts[7])  # 均价
+                        
+                        # 提取时间 HH:MM
+                        time_str = datetime_str.split(" ")[1] if " " in datetime_str else datetime_str[-5:]
+                        
+                        minute_data.append({
+                            "time": time_str,
+                            "price": price,
+                            "volume": volume,
+                            "amount": amount,
+                            "avg_price": avg_price
+                        })
+                
+                if minute_data:
+                    logger.info(f"✅ 东方财富获取分时数据成功: {clean_code} - {len(minute_data)}条")
+                    return {
+                        "code": clean_code,
+                        "name": stock_name,
+                        "minute_data": minute_data,
+                        "yesterday_close": preclose,
+                        "data_source": "eastmoney"
+                    }
+                
+                return None
+                
         except asyncio.TimeoutError:
             logger.warning(f"东方财富分时API超时: {stock_code}")
             return None
@@ -194,68 +195,68 @@ class EastMoneyDataSource(StockDataSource):
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Referer": "https://quote.eastmoney.com/"
         }
-        connector = aiohttp.TCPConnector(ssl=False)
         
         try:
-            async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
-                async with session.get(
-                    self.KLINE_URL,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    if response.status != 200:
-                        logger.warning(f"东方财富K线API返回 {response.status}")
-                        return None
-                    
-                    data = await response.json()
-                    
-                    if data.get("rc") != 0 or not data.get("data"):
-                        logger.warning(f"东方财富K线API返回错误: {data.get('rc')}")
-                        return None
-                    
-                    api_data = data["data"]
-                    stock_name = api_data.get("name", f"股票{clean_code}")
-                    klines_raw = api_data.get("klines", [])
-                    
-                    if not klines_raw:
-                        logger.warning(f"东方财富K线数据为空: {stock_code}")
-                        return None
-                    
-                    klines = []
-                    yesterday_close = None
-                    
-                    for i, kline in enumerate(klines_raw):
-                        parts = kline.split(",")
-                        if len(parts) >= 7:
-                            kline_data = {
-                                "date": parts[0],
-                                "open": float(parts[1]),
-                                "close": float(parts[2]),
-                                "high": float(parts[3]),
-                                "low": float(parts[4]),
-                                "volume": int(float(parts[5])),
-                                "amount": float(parts[6])
-                            }
-                            
-                            # 第一条用于获取昨收，不加入返回
-                            if i == 0 and len(klines_raw) > limit:
-                                yesterday_close = kline_data["close"]
-                            else:
-                                klines.append(kline_data)
-                    
-                    if klines:
-                        logger.info(f"✅ 东方财富获取K线数据成功: {clean_code} - {len(klines)}条")
-                        return {
-                            "code": clean_code,
-                            "name": stock_name,
-                            "period": period,
-                            "klines": klines,
-                            "yesterday_close": yesterday_close,
-                            "data_source": "eastmoney"
-                        }
-                    
+            async with get_http_client().get(
+                self.KLINE_URL,
+                params=params,
+                headers=headers,
+                ssl=False,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                if response.status != 200:
+                    logger.warning(f"东方财富K线API返回 {response.status}")
                     return None
-                    
+                
+                data = await response.json()
+                
+                if data.get("rc") != 0 or not data.get("data"):
+                    logger.warning(f"东方财富K线API返回错误: {data.get('rc')}")
+                    return None
+                
+                api_data = data["data"]
+                stock_name = api_data.get("name", f"股票{clean_code}")
+                klines_raw = api_data.get("klines", [])
+                
+                if not klines_raw:
+                    logger.warning(f"东方财富K线数据为空: {stock_code}")
+                    return None
+                
+                klines = []
+                yesterday_close = None
+                
+                for i, kline in enumerate(klines_raw):
+                    parts = kline.split(",")
+                    if len(parts) >= 7:
+                        kline_data = {
+                            "date": parts[0],
+                            "open": float(parts[1]),
+                            "close": float(parts[2]),
+                            "high": float(parts[3]),
+                            "low": float(parts[4]),
+                            "volume": int(float(parts[5])),
+                            "amount": float(parts[6])
+                        }
+                        
+                        # 第一条用于获取昨收，不加入返回
+                        if i == 0 and len(klines_raw) > limit:
+                            yesterday_close = kline_data["close"]
+                        else:
+                            klines.append(kline_data)
+                
+                if klines:
+                    logger.info(f"✅ 东方财富获取K线数据成功: {clean_code} - {len(klines)}条")
+                    return {
+                        "code": clean_code,
+                        "name": stock_name,
+                        "period": period,
+                        "klines": klines,
+                        "yesterday_close": yesterday_close,
+                        "data_source": "eastmoney"
+                    }
+                
+                return None
+                
         except asyncio.TimeoutError:
             logger.warning(f"东方财富K线API超时: {stock_code}")
             return None
@@ -297,98 +298,98 @@ class TencentDataSource(StockDataSource):
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         }
-        connector = aiohttp.TCPConnector(ssl=False)
         
         try:
-            async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
-                async with session.get(
-                    self.MINUTE_URL,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    if response.status != 200:
-                        logger.warning(f"腾讯分时API返回 {response.status}")
-                        return None
-                    
-                    # 腾讯API可能返回text/html, 需要处理
-                    data = await response.json(content_type=None)
-                    
-                    if data.get("code") != 0:
-                        logger.warning(f"腾讯分时API返回错误: {data.get('code')}")
-                        return None
-                    
-                    stock_data = data.get("data", {}).get(code, {})
-                    if not stock_data:
-                        return None
-                    
-                    qt_data = stock_data.get("qt", {}).get(code, [])
-                    minute_raw = stock_data.get("data", {}).get("data", [])
-                    
-                    # 获取昨收
-                    preclose = float(qt_data[4]) if len(qt_data) > 4 else 0
-                    stock_name = qt_data[1] if len(qt_data) > 1 else f"股票{clean_code}"
-                    
-                    if not minute_raw:
-                        return None
-                    
-                    minute_data = []
-                    last_cumulative_volume = 0
-                    last_cumulative_amount = 0.0
-                    
-                    for item in minute_raw:
-                        parts = item.split(" ") if isinstance(item, str) else []
-                        if len(parts) >= 3:
-                            price = float(parts[1])
-                            
-                            # Tencent data provides CUMULATIVE volume (lots) and amount
-                            current_cumulative_vol_lots = int(parts[2])
-                            current_cumulative_vol = current_cumulative_vol_lots * 100 
-                            
-                            # Amount is also cumulative
-                            current_cumulative_amount = float(parts[3]) if len(parts) > 3 else 0.0
-                            
-                            # Calculate incremental volume and amount for this minute
-                            minute_vol = current_cumulative_vol - last_cumulative_volume
-                            minute_amount = current_cumulative_amount - last_cumulative_amount
-                            
-                            # Handle edge case where values might decrease/reset
-                            if minute_vol < 0: minute_vol = current_cumulative_vol
-                            if minute_amount < 0: minute_amount = current_cumulative_amount
-                                
-                            # Update last cumulative
-                            last_cumulative_volume = current_cumulative_vol
-                            last_cumulative_amount = current_cumulative_amount
-                            
-                            # Calculate VWAP using cumulative values
-                            # avg_price = cumulative_amount / cumulative_volume
-                            avg_price = current_cumulative_amount / current_cumulative_vol if current_cumulative_vol > 0 else price
-                            
-                            # Format time from HHMM to HH:MM
-                            time_str = parts[0]
-                            if len(time_str) == 4 and ":" not in time_str:
-                                time_str = f"{time_str[:2]}:{time_str[2:]}"
-                            
-                            minute_data.append({
-                                "time": time_str,
-                                "price": price,
-                                "volume": minute_vol, 
-                                "amount": minute_amount, 
-                                "avg_price": round(avg_price, 3)
-                            })
-                    
-                            
-                    if minute_data:
-                        logger.info(f"✅ 腾讯获取分时数据成功: {clean_code} - {len(minute_data)}条")
-                        return {
-                            "code": clean_code,
-                            "name": stock_name,
-                            "minute_data": minute_data,
-                            "yesterday_close": preclose,
-                            "data_source": "tencent"
-                        }
-                    
+            async with get_http_client().get(
+                self.MINUTE_URL,
+                params=params,
+                headers=headers,
+                ssl=False,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                if response.status != 200:
+                    logger.warning(f"腾讯分时API返回 {response.status}")
                     return None
-                    
+                
+                # 腾讯API可能返回text/html, 需要处理
+                data = await response.json(content_type=None)
+                
+                if data.get("code") != 0:
+                    logger.warning(f"腾讯分时API返回错误: {data.get('code')}")
+                    return None
+                
+                stock_data = data.get("data", {}).get(code, {})
+                if not stock_data:
+                    return None
+                
+                qt_data = stock_data.get("qt", {}).get(code, [])
+                minute_raw = stock_data.get("data", {}).get("data", [])
+                
+                # 获取昨收
+                preclose = float(qt_data[4]) if len(qt_data) > 4 else 0
+                stock_name = qt_data[1] if len(qt_data) > 1 else f"股票{clean_code}"
+                
+                if not minute_raw:
+                    return None
+                
+                minute_data = []
+                last_cumulative_volume = 0
+                last_cumulative_amount = 0.0
+                
+                for item in minute_raw:
+                    parts = item.split(" ") if isinstance(item, str) else []
+                    if len(parts) >= 3:
+                        price = float(parts[1])
+                        
+                        # Tencent data provides CUMULATIVE volume (lots) and amount
+                        current_cumulative_vol_lots = int(parts[2])
+                        current_cumulative_vol = current_cumulative_vol_lots * 100 
+                        
+                        # Amount is also cumulative
+                        current_cumulative_amount = float(parts[3]) if len(parts) > 3 else 0.0
+                        
+                        # Calculate incremental volume and amount for this minute
+                        minute_vol = current_cumulative_vol - last_cumulative_volume
+                        minute_amount = current_cumulative_amount - last_cumulative_amount
+                        
+                        # Handle edge case where values might decrease/reset
+                        if minute_vol < 0: minute_vol = current_cumulative_vol
+                        if minute_amount < 0: minute_amount = current_cumulative_amount
+                            
+                        # Update last cumulative
+                        last_cumulative_volume = current_cumulative_vol
+                        last_cumulative_amount = current_cumulative_amount
+                        
+                        # Calculate VWAP using cumulative values
+                        # avg_price = cumulative_amount / cumulative_volume
+                        avg_price = current_cumulative_amount / current_cumulative_vol if current_cumulative_vol > 0 else price
+                        
+                        # Format time from HHMM to HH:MM
+                        time_str = parts[0]
+                        if len(time_str) == 4 and ":" not in time_str:
+                            time_str = f"{time_str[:2]}:{time_str[2:]}"
+                        
+                        minute_data.append({
+                            "time": time_str,
+                            "price": price,
+                            "volume": minute_vol, 
+                            "amount": minute_amount, 
+                            "avg_price": round(avg_price, 3)
+                        })
+                
+                        
+                if minute_data:
+                    logger.info(f"✅ 腾讯获取分时数据成功: {clean_code} - {len(minute_data)}条")
+                    return {
+                        "code": clean_code,
+                        "name": stock_name,
+                        "minute_data": minute_data,
+                        "yesterday_close": preclose,
+                        "data_source": "tencent"
+                    }
+                
+                return None
+                
         except asyncio.TimeoutError:
             logger.warning(f"腾讯分时API超时: {stock_code}")
             return None
@@ -530,71 +531,71 @@ class TencentDataSource(StockDataSource):
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         }
-        connector = aiohttp.TCPConnector(ssl=False)
         
         try:
-            async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
-                async with session.get(
-                    self.KLINE_URL,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    if response.status != 200:
-                        logger.warning(f"腾讯K线API返回 {response.status}")
-                        return None
-                    
-                    data = await response.json(content_type=None)
+            async with get_http_client().get(
+                self.KLINE_URL,
+                params=params,
+                headers=headers,
+                ssl=False,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                if response.status != 200:
+                    logger.warning(f"腾讯K线API返回 {response.status}")
+                    return None
+                
+                data = await response.json(content_type=None)
+                
+                if data.get("code") != 0:
+                    return None
                     
-                    if data.get("code") != 0:
-                        return None
-                        
-                    # 解析数据结构: data.data.{code}.qfq{day} or data.data.{code}.{day}
-                    stock_data = data.get("data", {}).get(code, {})
+                # 解析数据结构: data.data.{code}.qfq{day} or data.data.{code}.{day}
+                stock_data = data.get("data", {}).get(code, {})
+                
+                # 尝试获取前复权数据
+                kline_key = f"qfq{t_period}"
+                klines = stock_data.get(kline_key)
+                
+                # 如果没有复权数据，尝试获取原始数据
+                if not klines:
+                    klines = stock_data.get(t_period)
                     
-                    # 尝试获取前复权数据
-                    kline_key = f"qfq{t_period}"
-                    klines = stock_data.get(kline_key)
+                if not klines:
+                    return None
                     
-                    # 如果没有复权数据，尝试获取原始数据
-                    if not klines:
-                        klines = stock_data.get(t_period)
-                        
-                    if not klines:
-                        return None
+                # 提取股票名称
+                name = stock_data.get("qt", {}).get(code, [])[1] if stock_data.get("qt") else f"股票{clean_code}"
+                
+                result_klines = []
+                for item in klines:
+                    # 格式: [date, open, close, high, low, volume, ...]
+                    if len(item) >= 6:
+                        result_klines.append({
+                            "date": item[0],
+                            "open": float(item[1]),
+                            "close": float(item[2]),
+                            "high": float(item[3]),
+                            "low": float(item[4]),
+                            "volume": float(item[5])
+                        })
                         
-                    # 提取股票名称
-                    name = stock_data.get("qt", {}).get(code, [])[1] if stock_data.get("qt") else f"股票{clean_code}"
-                    
-                    result_klines = []
-                    for item in klines:
-                        # 格式: [date, open, close, high, low, volume, ...]
-                        if len(item) >= 6:
-                            result_klines.append({
-                                "date": item[0],
-                                "open": float(item[1]),
-                                "close": float(item[2]),
-                                "high": float(item[3]),
-                                "low": float(item[4]),
-                                "volume": float(item[5])
-                            })
-                            
-                    # 获取昨收 (从qt获取或者计算)
-                    yesterday_close = float(stock_data.get("qt", {}).get(code, [])[4]) if stock_data.get("qt") else None
-                    if yesterday_close is None and len(result_klines) > 1:
-                        yesterday_close = result_klines[-2]["close"]
+                # 获取昨收 (从qt获取或者计算)
+                yesterday_close = float(stock_data.get("qt", {}).get(code, [])[4]) if stock_data.get("qt") else None
+                if yesterday_close is None and len(result_klines) > 1:
+                    yesterday_close = result_klines[-2]["close"]
 
-                    if result_klines:
-                         logger.info(f"✅ 腾讯获取K线数据成功: {clean_code} - {len(result_klines)}条")
-                         return {
-                            "code": clean_code,
-                            "name": name,
-                            "period": period,
-                            "klines": result_klines,
-                            "yesterday_close": yesterday_close,
-                            "data_source": "tencent"
-                        }
-                    return None
-                    
+                if result_klines:
+                     logger.info(f"✅ 腾讯获取K线数据成功: {clean_code} - {len(result_klines)}条")
+                     return {
+                        "code": clean_code,
+                        "name": name,
+                        "period": period,
+                        "klines": result_klines,
+                        "yesterday_close": yesterday_close,
+                        "data_source": "tencent"
+                    }
+                return None
+                
         except Exception as e:
             logger.warning(f"腾讯K线API异常: {stock_code} -> {e}")
             return None
@@ -765,25 +766,123 @@ class AkShareDataSource(StockDataSource):
             return None
 
 
+# 缓存 TTL (秒)
+QUOTE_TTL_TRADING = 3.0       # 交易时段实时行情
+QUOTE_TTL_CLOSED = 60.0       # 非交易时段实时行情
+MINUTE_TTL = 60.0             # 分时 / 分钟级K线
+DAILY_TTL_TRADING = 60.0      # 交易时段日线及以上(当日K线仍在变化)
+
+MARKET_OPEN = dt_time(9, 30)
+LUNCH_BREAK_START = dt_time(11, 30)
+LUNCH_BREAK_END = dt_time(13, 0)
+MARKET_CLOSE = dt_time(15, 0)
+INTRADAY_PERIODS = {"1min", "5min", "15min", "30min", "60min"}
+
+
+def is_trading_hours(now: Optional[datetime] = None) -> bool:
+    """判断是否交易时段 (9:30-11:30, 13:00-15:00, 工作日)"""
+    now = now or datetime.now()
+    if now.weekday() >= 5:
+        return False
+    t = now.time()
+    return MARKET_OPEN <= t <= LUNCH_BREAK_START or LUNCH_BREAK_END <= t <= MARKET_CLOSE
+
+
+def seconds_until_next_open(now: Optional[datetime] = None) -> float:
+    """
+    距下一个交易日开盘 (9:30) 的秒数
+    
+    只跳过周末, 不识别交易所节假日: 节假日当天 9:30 缓存会提前过期,
+    多拉取一次上游数据, 不会返回过期数据。
+    """
+    now = now or datetime.now()
+    candidate = datetime.combine(now.date(), MARKET_OPEN)
+    if now >= candidate:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return (candidate - now).total_seconds()
+
+
+def daily_kline_ttl(now: Optional[datetime] = None) -> float:
+    """
+    日线及以上K线的缓存秒数
+    
+    - 交易时段: DAILY_TTL_TRADING (当日K线仍在变化)
+    - 午间休市: 缓存到 13:00 复盘
+    - 开盘前 / 收盘后 / 周末: 缓存到下一交易日开盘
+    """
+    now = now or datetime.now()
+    if is_trading_hours(now):
+        return DAILY_TTL_TRADING
+    if now.weekday() < 5 and LUNCH_BREAK_START < now.time() < LUNCH_BREAK_END:
+        return (datetime.combine(now.date(), LUNCH_BREAK_END) - now).total_seconds()
+    return seconds_until_next_open(now)
+
+
 class StockDataManager:
     """
     股票数据管理器 - 统一数据获取入口
     
     实现 fallback 链:
     东方财富 -> 腾讯 -> AkShare -> 快照
+    
+    三类数据各有一个单飞 + LRU/TTL 缓存, 同一股票的并发请求共享一次上游拉取:
+    - 实时行情: 交易时段 3s, 非交易时段 60s
+    - 分时 / 分钟级K线: 60s
+    - 日线及以上: 交易时段 60s, 午间休市缓存到 13:00, 收盘后缓存到下一交易日开盘
     """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 1024):
         self.eastmoney = EastMoneyDataSource(timeout=3.0)
         self.tencent = TencentDataSource(timeout=3.0)
         self.akshare = AkShareDataSource()
         self._snapshot: Optional[Dict[str, Any]] = None
+        self._minute_cache = SingleFlightCache("minute_data", cache_size)
+        self._kline_cache = SingleFlightCache("kline_data", cache_size)
+        self._quote_cache = SingleFlightCache("realtime_quote", cache_size)
     
     def set_snapshot(self, snapshot: Dict[str, Any]) -> None:
         """设置快照数据 (用于最终fallback)"""
         self._snapshot = snapshot
     
+    def _kline_ttl(self, period: str) -> float:
+        if period in INTRADAY_PERIODS:
+            return MINUTE_TTL
+        return daily_kline_ttl()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """各类数据缓存统计"""
+        return {
+            cache.name: cache.get_stats()
+            for cache in (self._minute_cache, self._kline_cache, self._quote_cache)
+        }
+    
     async def get_minute_data(self, stock_code: str) -> Dict[str, Any]:
+        """获取分时数据 (单飞 + 缓存)"""
+        return await self._minute_cache.get_or_load(
+            stock_code.lower(),
+            lambda: self._fetch_minute_data(stock_code),
+            ttl=MINUTE_TTL
+        )
+    
+    async def get_kline_data(self, stock_code: str, period: str = "daily", limit: int = 100) -> Dict[str, Any]:
+        """获取K线数据 (单飞 + 缓存)"""
+        return await self._kline_cache.get_or_load(
+            (stock_code.lower(), period, limit),
+            lambda: self._fetch_kline_data(stock_code, period, limit),
+            ttl=self._kline_ttl(period)
+        )
+    
+    async def get_realtime_quote(self, stock_code: str) -> Optional[Dict[str, Any]]:
+        """获取实时行情数据 (单飞 + 缓存)"""
+        return await self._quote_cache.get_or_load(
+            stock_code.lower(),
+            lambda: self._fetch_realtime_quote(stock_code),
+            ttl=QUOTE_TTL_TRADING if is_trading_hours() else QUOTE_TTL_CLOSED
+        )
+    
+    async def _fetch_minute_data(self, stock_code: str) -> Dict[str, Any]:
         """
         获取分时数据 (带 fallback)
         
@@ -827,7 +926,7 @@ class StockDataManager:
         # 4. 所有数据源失败，返回None (将回退到Snapshot)
         return None
     
-    async def get_kline_data(self, stock_code: str, period: str = "daily", limit: int = 100) -> Dict[str, Any]:
+    async def _fetch_kline_data(self, stock_code: str, period: str = "daily", limit: int = 100) -> Dict[str, Any]:
         """
         获取K线数据 (带 fallback)
         
@@ -873,7 +972,7 @@ class StockDataManager:
         # 4. 所有数据源失败，返回None (回退到快照或空)
         return None
     
-    async def get_realtime_quote(self, stock_code: str) -> Optional[Dict[str, Any]]:
+    async def _fetch_realtime_quote(self, stock_code: str) -> Optional[Dict[str, Any]]:
         """
         获取实时行情数据 (带 fallback)
         
@@ -0,0 +1,180 @@
+"""
+共享HTTP客户端 - Signal-API
+为东方财富、腾讯等外部行情接口提供连接复用的 aiohttp 会话
+
+- 单一 ClientSession + TCPConnector, 随 FastAPI lifespan 启停
+- 每主机连接数上限、keep-alive、DNS 缓存
+- 按主机统计请求数/状态码/耗时/进行中请求数 (Prometheus + get_stats)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+try:
+    from prometheus_client import Counter, Histogram  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    class _DummyMetric:
+        def labels(self, **kwargs):  # type: ignore[no-untyped-def]
+            return self
+        def inc(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+            return None
+        def observe(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+            return None
+    Counter = lambda *a, **k: _DummyMetric()  # type: ignore[assignment]
+    Histogram = lambda *a, **k: _DummyMetric()  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+HTTP_REQUESTS = Counter(
+    "signal_api_upstream_requests_total",
+    "Upstream HTTP requests",
+    ["host", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "signal_api_upstream_request_seconds",
+    "Upstream HTTP request latency (until response headers)",
+    ["host"],
+)
+
+
+class HttpClientPool:
+    """
+    连接池化的 aiohttp 客户端
+    
+    所有外部行情请求共享同一个会话, 避免每次请求重新建立 TCP/TLS 连接。
+    lifespan 外(脚本/测试)首次请求时自动创建会话。
+    """
+    
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"requests": 0, "errors": 0, "in_flight": 0, "total_seconds": 0.0}
+        )
+    
+    @property
+    def started(self) -> bool:
+        return self._session is not None and not self._session.closed
+    
+    async def start(self) -> aiohttp.ClientSession:
+        """创建共享会话 (幂等)"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self.started:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                    use_dns_cache=True,
+                )
+                # trust_env=False: 不走系统代理, 直连行情接口
+                self._session = aiohttp.ClientSession(connector=connector, trust_env=False)
+                logger.info(
+                    f"HTTP client pool started (limit={self.limit}, per_host={self.limit_per_host})"
+                )
+        return self._session
+    
+    async def close(self) -> None:
+        """关闭会话并释放所有连接"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP client pool closed")
+        self._session = None
+    
+    async def session(self) -> aiohttp.ClientSession:
+        """获取共享会话, 未启动时自动启动"""
+        if self.started:
+            return self._session
+        return await self.start()
+    
+    @asynccontextmanager
+    async def get(self, url: str, **kwargs: Any) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        发起 GET 请求并记录指标
+        
+        用法与 session.get 相同:
+            async with client.get(url, params=..., headers=..., timeout=...) as response:
+                data = await response.json()
+        """
+        session = await self.session()
+        host = urlsplit(url).hostname or ""
+        stats = self._stats[host]
+        stats["requests"] += 1
+        # 进行中的请求各占用一个连接，自行计数而不读取 connector 私有属性
+        stats["in_flight"] += 1
+        start = time.perf_counter()
+        responded = False
+        try:
+            async with session.get(url, **kwargs) as response:
+                responded = True
+                elapsed = time.perf_counter() - start
+                stats["total_seconds"] += elapsed
+                HTTP_LATENCY.labels(host=host).observe(elapsed)
+                HTTP_REQUESTS.labels(host=host, status=str(response.status)).inc()
+                yield response
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            stats["errors"] += 1
+            if not responded:
+                HTTP_REQUESTS.labels(host=host, status=type(e).__name__).inc()
+            raise
+        finally:
+            stats["in_flight"] -= 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """连接池与各主机请求统计"""
+        hosts = {}
+        for host, s in self._stats.items():
+            hosts[host] = {
+                "requests": int(s["requests"]),
+                "errors": int(s["errors"]),
+                "in_flight": int(s["in_flight"]),
+                "avg_ms": round(s["total_seconds"] / s["requests"] * 1000, 2) if s["requests"] else 0.0,
+            }
+        return {
+            "started": self.started,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "in_flight": sum(int(s["in_flight"]) for s in self._stats.values()),
+            "hosts": hosts,
+        }
+
+
+# 全局HTTP客户端实例
+_http_client: Optional[HttpClientPool] = None
+
+
+def get_http_client() -> HttpClientPool:
+    """获取全局HTTP客户端实例"""
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClientPool()
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """关闭全局HTTP客户端 (应用关闭时调用)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.close()
+        _http_client = None
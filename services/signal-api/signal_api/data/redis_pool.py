@@ -0,0 +1,164 @@
+"""
+共享 Redis 连接池 - Signal-API
+OpportunityRepository / SignalRepository 共用的 redis.asyncio 客户端
+
+- 单一 ConnectionPool, 随 FastAPI lifespan 启停
+- 连接数上限由 REDIS_MAX_CONNECTIONS 控制; 连接用尽时排队等待 (最多 REDIS_POOL_TIMEOUT 秒)
+- 连接池大小 (已建立/使用中/空闲) 通过 Prometheus 与 get_stats 暴露
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional, Set
+
+import redis.asyncio as aioredis
+
+try:
+    from prometheus_client import Gauge  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    class _DummyGauge:
+        def labels(self, **kwargs):  # type: ignore[no-untyped-def]
+            return self
+        def set_function(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+            return None
+    Gauge = lambda *a, **k: _DummyGauge()  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+REDIS_POOL_CONNECTIONS = Gauge(
+    "signal_api_redis_pool_connections",
+    "Connections held by the shared Redis pool",
+    ["state"],
+)
+
+
+class CountingConnectionPool(aioredis.BlockingConnectionPool):
+    """
+    自行统计连接数的 BlockingConnectionPool
+
+    连接用尽时等待其他请求归还 (最多 timeout 秒), 而不是立即报 "Too many connections"。
+    只重写 redis-py 公开的扩展点 (make_connection / get_connection / release),
+    不读取 _in_use_connections 等私有属性。
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.created_connections = 0
+        self._leased: Set[Any] = set()
+
+    def reset(self) -> None:
+        super().reset()
+        self.created_connections = 0
+        self._leased = set()
+
+    @property
+    def in_use_connections(self) -> int:
+        return len(self._leased)
+
+    def make_connection(self):
+        connection = super().make_connection()
+        self.created_connections += 1
+        return connection
+
+    async def get_connection(self, *args: Any, **kwargs: Any):
+        connection = await super().get_connection(*args, **kwargs)
+        self._leased.add(connection)
+        return connection
+
+    async def release(self, connection) -> None:
+        # get_connection 建连失败时父类会直接 release, 此时连接尚未登记
+        self._leased.discard(connection)
+        await super().release(connection)
+
+
+class RedisPool:
+    """
+    共享 Redis 连接池
+
+    每次依赖注入都复用同一个客户端, 不再为每个 HTTP 请求新建客户端与连接池。
+    lifespan 外(脚本/测试)首次使用时自动创建。
+    """
+
+    def __init__(self, url: str, max_connections: int = 50, timeout: float = 5.0):
+        self.url = url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._pool: Optional[CountingConnectionPool] = None
+        self._client: Optional[aioredis.Redis] = None
+
+    @property
+    def started(self) -> bool:
+        return self._client is not None
+
+    def start(self) -> aioredis.Redis:
+        """创建连接池与客户端 (幂等, 连接在首次命令时建立)"""
+        if self._client is None:
+            self._pool = CountingConnectionPool.from_url(
+                self.url,
+                max_connections=self.max_connections,
+                timeout=self.timeout,
+                encoding="utf-8",
+                decode_responses=True,
+            )
+            self._client = aioredis.Redis(connection_pool=self._pool)
+            logger.info(f"Redis pool started (max_connections={self.max_connections})")
+        return self._client
+
+    def client(self) -> aioredis.Redis:
+        """获取共享客户端, 未启动时自动启动"""
+        return self._client if self._client is not None else self.start()
+
+    async def close(self) -> None:
+        """关闭客户端并断开池中所有连接"""
+        if self._client is not None:
+            await self._client.aclose()
+            await self._pool.disconnect()
+            logger.info("Redis pool closed")
+        self._client = None
+        self._pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """连接池大小统计"""
+        pool = self._pool
+        created = pool.created_connections if pool else 0
+        in_use = pool.in_use_connections if pool else 0
+        return {
+            "started": self.started,
+            "max_connections": self.max_connections,
+            "created_connections": created,
+            "in_use_connections": in_use,
+            "available_connections": created - in_use,
+        }
+
+
+# 全局 Redis 连接池实例
+_redis_pool: Optional[RedisPool] = None
+
+
+def get_redis_pool() -> RedisPool:
+    """获取全局 Redis 连接池实例"""
+    global _redis_pool
+    if _redis_pool is None:
+        from ..config import get_settings
+        settings = get_settings()
+        _redis_pool = RedisPool(settings.redis_url, settings.redis_max_connections, settings.redis_pool_timeout)
+    return _redis_pool
+
+
+async def close_redis_pool() -> None:
+    """关闭全局 Redis 连接池 (应用关闭时调用)"""
+    global _redis_pool
+    if _redis_pool is not None:
+        await _redis_pool.close()
+        _redis_pool = None
+
+
+def _pool_gauge(key: str):
+    def read() -> float:
+        return float(_redis_pool.get_stats()[key]) if _redis_pool is not None else 0.0
+    return read
+
+
+REDIS_POOL_CONNECTIONS.labels(state="in_use").set_function(_pool_gauge("in_use_connections"))
+REDIS_POOL_CONNECTIONS.labels(state="available").set_function(_pool_gauge("available_connections"))
@@ -7,24 +7,36 @@ from functools import lru_cache
 import redis.asyncio as aioredis
 
 from .config import SignalApiSettings, get_settings
+from .data.cache import StreamEntryCache
+from .data.redis_pool import get_redis_pool
 from .repository import OpportunityRepository
+from .signal_repository import SignalRepository
 
 
-@lru_cache()
 def get_redis_client() -> aioredis.Redis:
+    """Shared client backed by the app-lifespan Redis pool."""
+    return get_redis_pool().client()
+
+
+@lru_cache()
+def get_entry_cache() -> StreamEntryCache:
+    """Parsed stream entries shared by all repositories, keyed by stream ID."""
     settings = get_settings()
-    return aioredis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True)
+    return StreamEntryCache(max_entries=settings.stream_entry_cache_size)
 
 
 def get_repository() -> OpportunityRepository:
     settings = get_settings()
     redis_client = get_redis_client()
-    return OpportunityRepository(redis_client, settings.opportunity_stream, settings.max_records)
+    return OpportunityRepository(
+        redis_client, settings.opportunity_stream, settings.max_records, entry_cache=get_entry_cache()
+    )
 
 
 def get_signal_repository() -> SignalRepository:
     """Dependency for SignalRepository."""
-    from .signal_repository import SignalRepository
     settings = get_settings()
     redis_client = get_redis_client()
-    return SignalRepository(redis_client, "dfp:strategy_signals", settings.max_records)
+    return SignalRepository(
+        redis_client, "dfp:strategy_signals", settings.max_records, entry_cache=get_entry_cache()
+    )
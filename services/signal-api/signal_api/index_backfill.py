@@ -0,0 +1,113 @@
+"""One-shot backfill of the signal / opportunity indexes for pre-index stream entries.
+
+Writers only index what they XADD after upgrading, so entries already in the
+streams are invisible to the indexed lookups until this has run. Every step
+is idempotent and safe to run next to live writers; once a stream is covered
+its ``index_ready_key`` is set and signal-api stops falling back to scans.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Mapping, Optional
+
+import redis.asyncio as aioredis
+from data_contracts.signal_index import (
+    STATS_BUCKET_SECONDS,
+    STATS_WINDOW_BUCKETS,
+    index_ready_key,
+    index_signal_id,
+    latest_opportunity_key,
+    signal_counter_fields,
+    stats_bucket,
+    stats_key,
+    stream_id_millis,
+)
+
+
+def _decode(fields: Mapping[str, str]) -> Optional[Dict[str, Any]]:
+    try:
+        document = json.loads(fields["payload"])
+    except Exception:
+        return None
+    return document if isinstance(document, dict) else None
+
+
+async def backfill_signal_index(redis: aioredis.Redis, stream: str, page_size: int = 1000) -> int:
+    """Index every entry of the signal stream and rebuild the closed stats buckets.
+
+    Index members are plain ZADDs, so entries the writers already indexed are
+    unaffected. Finished minutes inside the stats window are recomputed from
+    the stream and overwritten; the current minute is left to the writers.
+
+    Returns the number of signals indexed.
+    """
+
+    now_millis = int(time.time() * 1000)
+    current = stats_bucket(now_millis)
+    counters: Dict[int, Counter] = defaultdict(Counter)
+    indexed = 0
+    cursor = "-"
+    while True:
+        entries = await redis.xrange(stream, min=cursor, max="+", count=page_size)
+        if not entries:
+            break
+        pipe = redis.pipeline(transaction=False)
+        for message_id, fields in entries:
+            signal = _decode(fields)
+            if signal is None:
+                continue
+            index_signal_id(pipe, stream, message_id, signal)
+            bucket = stats_bucket(stream_id_millis(message_id))
+            if current - STATS_WINDOW_BUCKETS < bucket < current:
+                counters[bucket].update(signal_counter_fields(signal))
+            indexed += 1
+        await pipe.execute()
+        cursor = f"({entries[-1][0]}"
+        if len(entries) < page_size:
+            break
+
+    pipe = redis.pipeline(transaction=False)
+    for bucket, fields in counters.items():
+        key = stats_key(stream, bucket)
+        # Same expiry the writers give the bucket, measured from its own minute
+        ttl = (bucket + STATS_WINDOW_BUCKETS + 1) * STATS_BUCKET_SECONDS - now_millis // 1000
+        pipe.delete(key)
+        pipe.hset(key, mapping={field: str(value) for field, value in fields.items()})
+        pipe.expire(key, ttl)
+    pipe.set(index_ready_key(stream), 1)
+    await pipe.execute()
+    return indexed
+
+
+async def backfill_opportunity_index(redis: aioredis.Redis, stream: str, page_size: int = 1000) -> int:
+    """Fill the latest-opportunity hash from the stream, newest entry first.
+
+    Uses HSETNX, so symbols the aggregator has already written since upgrading
+    keep their newer value. Returns the number of symbols added.
+    """
+
+    key = latest_opportunity_key(stream)
+    seen = set()
+    added = 0
+    cursor = "+"
+    while True:
+        entries = await redis.xrevrange(stream, max=cursor, min="-", count=page_size)
+        if not entries:
+            break
+        pipe = redis.pipeline(transaction=False)
+        for _message_id, fields in entries:
+            opportunity = _decode(fields)
+            if opportunity is None or not opportunity.get("symbol") or opportunity["symbol"] in seen:
+                continue
+            seen.add(opportunity["symbol"])
+            pipe.hsetnx(key, opportunity["symbol"], fields["payload"])
+        added += sum(await pipe.execute())
+        cursor = f"({entries[-1][0]}"
+        if len(entries) < page_size:
+            break
+
+    await redis.set(index_ready_key(stream), 1)
+    return added
@@ -3,38 +3,71 @@
 from __future__ import annotations
 
 import json
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import redis.asyncio as aioredis
+from data_contracts.signal_index import index_ready_key, latest_opportunity_key
 
+from .data.cache import StreamEntryCache
 from .models import Opportunity
 
 
 class OpportunityRepository:
-    def __init__(self, redis_client: aioredis.Redis, stream: str, max_records: int) -> None:
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        stream: str,
+        max_records: int,
+        entry_cache: Optional[StreamEntryCache] = None,
+    ) -> None:
         self.redis = redis_client
         self.stream = stream
         self.max_records = max_records
+        self.entry_cache = entry_cache
 
     async def list_opportunities(self, limit: Optional[int] = None, state: Optional[str] = None) -> List[Opportunity]:
         limit = min(limit or self.max_records, self.max_records)
         result = await self.redis.xrevrange(self.stream, count=limit)
         opportunities: List[Opportunity] = []
-        for _message_id, payload in result:
-            data = payload.get("payload")
-            if not data:
-                continue
-            try:
-                obj = json.loads(data)
-                if state and obj.get("state") != state:
-                    continue
-                opportunities.append(Opportunity.model_validate(obj))
-            except Exception:
+        for message_id, payload in result:
+            if self.entry_cache is None:
+                opportunity = self._parse(payload)
+            else:
+                opportunity = self.entry_cache.get_or_parse(self.stream, message_id, payload, self._parse)
+            if opportunity is None or (state and opportunity.state != state):
                 continue
+            opportunities.append(opportunity)
+        if self.entry_cache is not None:
+            self.entry_cache.report()
         return opportunities
 
+    @staticmethod
+    def _parse(payload: Dict[str, str]) -> Optional[Opportunity]:
+        data = payload.get("payload")
+        if not data:
+            return None
+        try:
+            return Opportunity.model_validate(json.loads(data))
+        except Exception:
+            return None
+
     async def get_opportunity(self, symbol: str) -> Optional[Opportunity]:
-        # Fetch more records to increase chance of finding symbol
+        # Latest opportunity per symbol, maintained by opportunity-aggregator on write
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hget(latest_opportunity_key(self.stream), symbol)
+        pipe.exists(index_ready_key(self.stream))
+        data, ready = await pipe.execute()
+        if data:
+            try:
+                return Opportunity.model_validate_json(data)
+            except Exception:
+                return None
+        if ready:
+            return None
+        # Index not backfilled yet: the symbol may only appear in older stream entries
+        return await self._scan_opportunity(symbol)
+
+    async def _scan_opportunity(self, symbol: str) -> Optional[Opportunity]:
         result = await self.redis.xrevrange(self.stream, count=self.max_records)
         for _message_id, payload in result:
             data = payload.get("payload")
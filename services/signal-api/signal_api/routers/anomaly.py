@@ -6,6 +6,8 @@ import os
 import asyncio
 from datetime import datetime, timedelta
 
+from ..data.http_client import get_http_client
+
 router = APIRouter(
     prefix="/api/anomaly",
     tags=["anomaly"],
@@ -40,42 +42,35 @@ async def fetch_eastmoney_sectors(sector_type: str = "concept", retry_count: int
         "Referer": "http://quote.eastmoney.com/"
     }
     
-    # Create session outside retry loop
     timeout = aiohttp.ClientTimeout(total=10)
-    connector = aiohttp.TCPConnector(force_close=True)
-    
-    try:
-        async with aiohttp.ClientSession(timeout=timeout, connector=connector, trust_env=False) as session:
-            for attempt in range(retry_count):
-                try:
-                    async with session.get(url, params=params, headers=headers) as response:
-                        if response.status == 200:
-                            text = await response.text()
-                            if not text or text.strip() == "":
-                                logger.warning(f"EastMoney {sector_type} API returned empty response (attempt {attempt + 1}/{retry_count})")
-                                if attempt < retry_count - 1:
-                                    await asyncio.sleep(1 * (attempt + 1))  # Exponential backoff
-                                    continue
-                                return []
-                            
-                            data = await response.json()
-                            if 'data' in data and data['data'] and 'diff' in data['data']:
-                                logger.info(f"Successfully fetched {len(data['data']['diff'])} {sector_type} sectors from EastMoney")
-                                return data['data']['diff']
-                            else:
-                                logger.warning(f"EastMoney {sector_type} API returned invalid format (attempt {attempt + 1}/{retry_count})")
-                        else:
-                            logger.warning(f"EastMoney API returned {response.status} for {sector_type} (attempt {attempt + 1}/{retry_count})")
-                        
+    for attempt in range(retry_count):
+        try:
+            async with get_http_client().get(url, params=params, headers=headers, timeout=timeout) as response:
+                if response.status == 200:
+                    text = await response.text()
+                    if not text or text.strip() == "":
+                        logger.warning(f"EastMoney {sector_type} API returned empty response (attempt {attempt + 1}/{retry_count})")
                         if attempt < retry_count - 1:
-                            await asyncio.sleep(1 * (attempt + 1))
-                            
-                except Exception as e:
-                    logger.error(f"Failed to fetch EastMoney sectors ({sector_type}, attempt {attempt + 1}/{retry_count}): {e}")
-                    if attempt < retry_count - 1:
-                        await asyncio.sleep(1 * (attempt + 1))
-    except Exception as e:
-        logger.error(f"Failed to create session for {sector_type}: {e}")
+                            await asyncio.sleep(1 * (attempt + 1))  # Exponential backoff
+                            continue
+                        return []
+                    
+                    data = await response.json()
+                    if 'data' in data and data['data'] and 'diff' in data['data']:
+                        logger.info(f"Successfully fetched {len(data['data']['diff'])} {sector_type} sectors from EastMoney")
+                        return data['data']['diff']
+                    else:
+                        logger.warning(f"EastMoney {sector_type} API returned invalid format (attempt {attempt + 1}/{retry_count})")
+                else:
+                    logger.warning(f"EastMoney API returned {response.status} for {sector_type} (attempt {attempt + 1}/{retry_count})")
+                
+                if attempt < retry_count - 1:
+                    await asyncio.sleep(1 * (attempt + 1))
+                    
+        except Exception as e:
+            logger.error(f"Failed to fetch EastMoney sectors ({sector_type}, attempt {attempt + 1}/{retry_count}): {e}")
+            if attempt < retry_count - 1:
+                await asyncio.sleep(1 * (attempt + 1))
     
     return []
 
@@ -116,40 +111,37 @@ async def get_hot_sectors(limit: int = 20):
                 headers = {"Referer": "http://quote.eastmoney.com/"}
                 
                 timeout = aiohttp.ClientTimeout(total=10)
-                connector = aiohttp.TCPConnector(force_close=True)
-                
-                async with aiohttp.ClientSession(timeout=timeout, connector=connector, trust_env=False) as session:
-                    async with session.get(url, params=params, headers=headers) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if 'data' in data and data['data'] and 'pool' in data['data']:
-                                pool = data['data']['pool']
-                                if pool:
-                                    # Aggregate by Industry (hybk)
-                                    sector_map = {}
-                                    for item in pool:
-                                        industry = item.get('hybk', '其他')
-                                        if not industry: continue
-                                        
-                                        if industry not in sector_map:
-                                            sector_map[industry] = {"count": 0, "consecutive_sum": 0, "stocks": []}
-                                        
-                                        sector_map[industry]["count"] += 1
-                                        sector_map[industry]["consecutive_sum"] += item.get('lbc', 1)
-                                        sector_map[industry]["stocks"].append(item.get('n', ''))
+                async with get_http_client().get(url, params=params, headers=headers, timeout=timeout) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        if 'data' in data and data['data'] and 'pool' in data['data']:
+                            pool = data['data']['pool']
+                            if pool:
+                                # Aggregate by Industry (hybk)
+                                sector_map = {}
+                                for item in pool:
+                                    industry = item.get('hybk', '其他')
+                                    if not industry: continue
+                                    
+                                    if industry not in sector_map:
+                                        sector_map[industry] = {"count": 0, "consecutive_sum": 0, "stocks": []}
                                     
-                                    # Convert to list
-                                    for name, stats in sector_map.items():
-                                        limit_up_sectors.append({
-                                            "sector_name": name,
-                                            "avg_change": 10.0, # All are limit up roughly
-                                            "stock_count": stats["count"],
-                                            "hot_score": stats["consecutive_sum"] * 10 + stats["count"] * 5,
-                                            "trend": "up",
-                                            "category": "概念",
-                                            "description": f"连板{stats['consecutive_sum']}次"
-                                        })
-                                    break
+                                    sector_map[industry]["count"] += 1
+                                    sector_map[industry]["consecutive_sum"] += item.get('lbc', 1)
+                                    sector_map[industry]["stocks"].append(item.get('n', ''))
+                                
+                                # Convert to list
+                                for name, stats in sector_map.items():
+                                    limit_up_sectors.append({
+                                        "sector_name": name,
+                                        "avg_change": 10.0, # All are limit up roughly
+                                        "stock_count": stats["count"],
+                                        "hot_score": stats["consecutive_sum"] * 10 + stats["count"] * 5,
+                                        "trend": "up",
+                                        "category": "概念",
+                                        "description": f"连板{stats['consecutive_sum']}次"
+                                    })
+                                break
             
             if limit_up_sectors:
                 limit_up_sectors.sort(key=lambda x: x['hot_score'], reverse=True)
@@ -333,15 +325,12 @@ async def fetch_sector_stock_list(sector_code: str, limit: int = 200) -> List[Di
     }
     
     timeout = aiohttp.ClientTimeout(total=5)
-    connector = aiohttp.TCPConnector(force_close=True)
-    
     try:
-        async with aiohttp.ClientSession(timeout=timeout, connector=connector, trust_env=False) as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if 'data' in data and data['data'] and 'diff' in data['data']:
-                        return data['data']['diff']
+        async with get_http_client().get(url, params=params, timeout=timeout) as response:
+            if response.status == 200:
+                data = await response.json()
+                if 'data' in data and data['data'] and 'diff' in data['data']:
+                    return data['data']['diff']
     except Exception as e:
         logger.error(f"Failed to fetch stocks for sector {sector_code}: {e}")
     
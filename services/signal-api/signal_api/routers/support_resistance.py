@@ -1,6 +1,18 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Hashable, List, Optional
+
+import pandas as pd
 from fastapi import APIRouter, HTTPException
-from ..core.support_resistance.models import SRRequestPayload, SRResponse
+from ..core.support_resistance.models import SRLevel, SRRequestPayload, SRResponse, SRBatchRequest, SRBatchResponse
 from ..core.support_resistance.composer import SRComposer
+from ..data.cache import SingleFlightCache
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/api/support-resistance",
@@ -9,6 +21,94 @@ router = APIRouter(
 
 composer = SRComposer()
 
+# 引擎计算放到工作线程池，避免阻塞事件循环
+SR_WORKERS = int(os.getenv("SR_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 结果按 (股票, 最后一根K线, 引擎配置) 缓存；键已包含最新K线，TTL 仅用于回收内存
+SR_CACHE_TTL = float(os.getenv("SR_CACHE_TTL", "600"))
+# 本地 DuckDB/Parquet 行情目录
+QUANT_DATA_ROOT = os.getenv("QUANT_DATA_ROOT", "./quant_data")
+
+_executor = ThreadPoolExecutor(max_workers=SR_WORKERS, thread_name_prefix="sr-worker")
+_result_cache = SingleFlightCache("support_resistance", max_entries=4096)
+_duckdb = None
+
+
+def _get_duckdb():
+    """延迟创建 DuckDBManager (duckdb 为可选依赖)"""
+    global _duckdb
+    if _duckdb is None:
+        from ..core.quant.data.duckdb_manager import DuckDBManager
+        _duckdb = DuckDBManager(QUANT_DATA_ROOT)
+    return _duckdb
+
+
+def _cache_key(payload: SRRequestPayload) -> Optional[Hashable]:
+    """
+    结果缓存键：股票 + 最后一根K线 + 引擎配置
+
+    最后一根K线在盘中仍会变化，因此同时带上其收盘价和成交量；
+    没有时间戳的请求无法判断K线是否相同，不缓存。
+    """
+    if not payload.timestamps or not payload.prices:
+        return None
+    return (
+        payload.symbol,
+        payload.period,
+        payload.timestamps[-1],
+        len(payload.prices),
+        payload.prices[-1],
+        payload.volumes[-1] if payload.volumes else None,
+        payload.prev_close,
+        payload.today_open,
+        payload.today_high,
+        payload.today_low,
+        composer.config_key(),
+    )
+
+
+async def _calculate(payload: SRRequestPayload, tdx_levels: Optional[List[SRLevel]] = None) -> SRResponse:
+    """在线程池中计算，命中缓存或同键并发请求时直接复用结果"""
+    loop = asyncio.get_running_loop()
+    compute = partial(composer.calculate, payload, tdx_levels)
+    key = _cache_key(payload)
+    if key is None:
+        return await loop.run_in_executor(_executor, compute)
+    return await _result_cache.get_or_load(
+        key,
+        lambda: loop.run_in_executor(_executor, compute),
+        ttl=SR_CACHE_TTL
+    )
+
+
+def _payloads_from_bars(df: pd.DataFrame, symbols: Dict[str, str]) -> List[SRRequestPayload]:
+    """
+    将 DuckDB 读出的分钟K线转换为请求体
+
+    今开/最高/最低取最后一个交易日，昨收取窗口内前一交易日的收盘价。
+    """
+    payloads = []
+    for ts_code, bars in df.groupby("symbol", sort=False):
+        moments = pd.to_datetime(bars["datetime"])
+        dates = moments.dt.date
+        today = bars[dates == dates.iloc[-1]]
+        previous = bars[dates < dates.iloc[-1]]
+        payloads.append(SRRequestPayload(
+            symbol=symbols.get(ts_code, ts_code),
+            prices=bars["close"].astype(float).tolist(),
+            highs=bars["high"].astype(float).tolist(),
+            lows=bars["low"].astype(float).tolist(),
+            opens=bars["open"].astype(float).tolist(),
+            volumes=bars["volume"].astype(float).tolist(),
+            timestamps=(moments.astype("int64") // 10**9).tolist(),
+            period="1m",
+            prev_close=float(previous["close"].iloc[-1]) if len(previous) else None,
+            today_open=float(today["open"].iloc[0]),
+            today_high=float(today["high"].max()),
+            today_low=float(today["low"].min())
+        ))
+    return payloads
+
+
 @router.post("/tdx/calculate", response_model=SRResponse)
 async def calculate_tdx_sr(payload: SRRequestPayload):
     """
@@ -16,10 +116,102 @@ async def calculate_tdx_sr(payload: SRRequestPayload):
     实际上是通用接口，根据配置融合了 Basic Rules 和 TDX 算法。
     """
     try:
-        result = composer.calculate(payload)
-        return result
+        return await _calculate(payload)
     except Exception as e:
-        # Log error in production
-        print(f"Error calculating SR: {e}")
-        # Return fallback or 500
+        logger.error(f"Error calculating SR for {payload.symbol}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/batch", response_model=SRBatchResponse)
+async def calculate_batch_sr(request: SRBatchRequest):
+    """
+    批量计算自选股的支撑压力线 (一次往返)
+
+    - payloads: 调用方自带K线
+    - symbols: 由服务端从本地 DuckDB 读取最近 bars 根分钟K线
+
+    结果按股票代码返回，同一只股票重复出现时只计算第一次 (payloads 优先)，
+    其余记入 duplicates。未命中缓存的股票先用 TDX 矩阵批量算法一次算出 TDX 线。
+    """
+    start = time.perf_counter()
+    payloads: List[SRRequestPayload] = []
+    duplicates: List[str] = []
+    seen = set()
+    for payload in request.payloads:
+        if payload.symbol in seen:
+            duplicates.append(payload.symbol)
+            continue
+        seen.add(payload.symbol)
+        payloads.append(payload)
+    missing: List[str] = []
+    symbols: Dict[str, str] = {}
+
+    if request.symbols:
+        try:
+            from ..core.quant.data.manager import to_ts_code
+        except ImportError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        for s in request.symbols:
+            ts_code = to_ts_code(s)
+            if s in seen or ts_code in symbols:
+                duplicates.append(s)
+                continue
+            seen.add(s)
+            symbols[ts_code] = s
+
+    if symbols:
+        try:
+            loop = asyncio.get_running_loop()
+            bars = await loop.run_in_executor(
+                _executor, _get_duckdb().load_latest_bars, list(symbols), request.bars
+            )
+        except (ImportError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not bars.empty:
+            payloads.extend(_payloads_from_bars(bars, symbols))
+        loaded = set(bars["symbol"]) if not bars.empty else set()
+        missing.extend(s for ts_code, s in symbols.items() if ts_code not in loaded)
+
+    requested = len(payloads) + len(missing)
+    hits_before = _result_cache.hits
+
+    # 只为缓存中没有的股票做一次 TDX 矩阵计算
+    keys = [_cache_key(p) for p in payloads]
+    cold = [i for i, key in enumerate(keys) if key is None or _result_cache.get(key) is None]
+    tdx_levels: Dict[int, Optional[List[SRLevel]]] = {}
+    if cold:
+        loop = asyncio.get_running_loop()
+        batch = await loop.run_in_executor(_executor, composer.calculate_tdx_batch, [payloads[i] for i in cold])
+        tdx_levels = dict(zip(cold, batch))
+
+    responses = await asyncio.gather(
+        *(_calculate(p, tdx_levels.get(i)) for i, p in enumerate(payloads)), return_exceptions=True
+    )
+
+    results: Dict[str, SRResponse] = {}
+    for payload, response in zip(payloads, responses):
+        if isinstance(response, Exception):
+            logger.error(f"Error calculating SR for {payload.symbol}: {response}")
+            missing.append(payload.symbol)
+        else:
+            results[payload.symbol] = response
+
+    return SRBatchResponse(
+        success=True,
+        results=results,
+        missing=missing,
+        duplicates=duplicates,
+        metadata={
+            "requested": requested,
+            "calculated": len(results),
+            "cache_hits": _result_cache.hits - hits_before,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            "workers": SR_WORKERS
+        }
+    )
+
+
+@router.get("/cache/stats")
+async def get_sr_cache_stats():
+    """支撑压力结果缓存统计"""
+    return _result_cache.get_stats()
@@ -3,21 +3,53 @@
 from __future__ import annotations
 
 import json
+import time
 from collections import Counter
-from typing import List, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 import redis.asyncio as aioredis
-
+from data_contracts.signal_index import (
+    STATS_BUCKET_SECONDS,
+    STATS_WINDOW_BUCKETS,
+    index_ready_key,
+    signal_counter_fields,
+    stats_bucket,
+    stats_key,
+    strategy_index_key,
+    symbol_index_key,
+)
+
+from .data.cache import StreamEntryCache
 from .models import StrategySignalResponse
 
+StreamEntry = Tuple[str, Dict[str, str]]
 
-class SignalRepository:
-    """Repository for accessing dfp:strategy_signals Redis stream."""
 
-    def __init__(self, redis_client: aioredis.Redis, stream: str = "dfp:strategy_signals", max_records: int = 1000) -> None:
+class SignalRepository:
+    """Repository for accessing dfp:strategy_signals Redis stream.
+
+    Strategy and symbol filters read the sorted-set indexes maintained by
+    strategy-engine, and stats come from its rolling per-minute counters
+    (see ``data_contracts.signal_index``); the stream itself is only paged
+    for unindexed listings. Until ``scripts/backfill_signal_index.py`` has
+    covered entries written before the index existed, both fall back to
+    bounded stream scans. Parsed entries are shared across requests via
+    ``entry_cache``, keyed by stream ID.
+    """
+
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        stream: str = "dfp:strategy_signals",
+        max_records: int = 1000,
+        max_scan: int = 10000,
+        entry_cache: Optional[StreamEntryCache] = None,
+    ) -> None:
         self.redis = redis_client
         self.stream = stream
         self.max_records = max_records
+        self.max_scan = max_scan
+        self.entry_cache = entry_cache
 
     async def list_signals(
         self,
@@ -38,82 +70,148 @@ class SignalRepository:
             min_confidence: Minimum confidence threshold (0.0 to 1.0)
 
         Returns:
-            List of strategy signals matching the filters
+            List of strategy signals matching the filters (newest first)
         """
         limit = min(limit or self.max_records, self.max_records)
+        page_size = max(limit, 50)
 
-        # Fetch from Redis stream (reverse order - newest first)
-        result = await self.redis.xrevrange(self.stream, count=limit * 2)  # Fetch extra for filtering
+        index_key: Optional[str] = None
+        if (symbol or strategy) and await self.redis.exists(index_ready_key(self.stream)):
+            if symbol:
+                index_key = symbol_index_key(self.stream, symbol)
+            else:
+                index_key = strategy_index_key(self.stream, strategy)
 
         signals: List[StrategySignalResponse] = []
-
-        for message_id, payload in result:
-            data = payload.get("payload")
-            if not data:
-                continue
-
-            try:
-                obj = json.loads(data)
-
-                # Apply filters
-                if strategy and obj.get("strategy") != strategy:
+        scanned = 0
+        cursor = "+"
+        # Page until enough matches are found, so matches past the first page are not missed
+        while len(signals) < limit and scanned < self.max_scan:
+            if index_key is not None:
+                entries, exhausted = await self._index_page(index_key, scanned, page_size)
+            else:
+                entries = await self.redis.xrevrange(self.stream, max=cursor, count=page_size)
+                exhausted = len(entries) < page_size
+                if entries:
+                    cursor = f"({entries[-1][0]}"
+            scanned += page_size
+
+            for message_id, payload in entries:
+                signal = self._parse_entry(message_id, payload)
+                if signal is None:
                     continue
-
-                if symbol and obj.get("symbol") != symbol:
+                if strategy and signal.strategy != strategy:
                     continue
-
-                if signal_type and obj.get("signal_type") != signal_type:
+                if symbol and signal.symbol != symbol:
                     continue
-
-                if min_confidence is not None and obj.get("confidence", 0) < min_confidence:
+                if signal_type and signal.signal_type != signal_type:
+                    continue
+                if min_confidence is not None and signal.confidence < min_confidence:
                     continue
-
-                # Parse and add to results
-                signal = StrategySignalResponse.model_validate(obj)
                 signals.append(signal)
-
-                # Stop if we have enough
                 if len(signals) >= limit:
                     break
 
-            except Exception as e:
-                # Log but don't fail on invalid data
-                continue
+            if exhausted:
+                break
 
+        if self.entry_cache is not None:
+            self.entry_cache.report()
         return signals
 
+    async def _index_page(self, key: str, start: int, count: int) -> Tuple[List[StreamEntry], bool]:
+        """Load one page of stream entries referenced by an index, newest first.
+
+        Returns the entries and whether the index has nothing older to offer.
+        """
+
+        message_ids: Sequence[str] = await self.redis.zrevrange(key, start, start + count - 1)
+        if not message_ids:
+            return [], True
+
+        pipe = self.redis.pipeline(transaction=False)
+        for message_id in message_ids:
+            pipe.xrange(self.stream, min=message_id, max=message_id, count=1)
+        results = await pipe.execute()
+
+        entries: List[StreamEntry] = []
+        for result in results:
+            if not result:
+                # The stream is trimmed oldest first, so every older ID is gone too
+                return entries, True
+            entries.append(result[0])
+        return entries, len(message_ids) < count
+
+    def _parse_entry(self, message_id: str, payload: Dict[str, str]) -> Optional[StrategySignalResponse]:
+        if self.entry_cache is None:
+            return self._parse(payload)
+        return self.entry_cache.get_or_parse(self.stream, message_id, payload, self._parse)
+
+    @staticmethod
+    def _parse(payload: Dict[str, str]) -> Optional[StrategySignalResponse]:
+        data = payload.get("payload")
+        if not data:
+            return None
+        try:
+            return StrategySignalResponse.model_validate(json.loads(data))
+        except Exception:
+            return None
+
     async def get_signal_stats(self) -> dict:
         """
         Get statistics about recent signals.
 
+        Sums the per-minute counters of the rolling window instead of
+        decoding stream entries; before the backfill has run, the window is
+        counted from at most ``max_scan`` stream entries instead.
+
         Returns:
             Dictionary with signal counts, strategies, types, etc.
         """
-        # Fetch recent signals
-        result = await self.redis.xrevrange(self.stream, count=500)
+        now_millis = int(time.time() * 1000)
+        current = stats_bucket(now_millis)
+        first = current - STATS_WINDOW_BUCKETS + 1
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.exists(index_ready_key(self.stream))
+        for bucket in range(first, current + 1):
+            pipe.hgetall(stats_key(self.stream, bucket))
+        ready, *buckets = await pipe.execute()
+        if not ready:
+            buckets = await self._scan_counters(first * STATS_BUCKET_SECONDS * 1000)
+        return self._summarize(buckets)
+
+    async def _scan_counters(self, since_millis: int) -> List[Dict[str, float]]:
+        entries = await self.redis.xrevrange(self.stream, min=str(since_millis), count=self.max_scan)
+        counters: List[Dict[str, float]] = []
+        for _message_id, payload in entries:
+            try:
+                counters.append(signal_counter_fields(json.loads(payload["payload"])))
+            except Exception:
+                continue
+        return counters
 
+    @staticmethod
+    def _summarize(buckets: Iterable[Optional[Mapping[str, object]]]) -> dict:
         strategy_counts = Counter()
         signal_type_counts = Counter()
         symbol_counts = Counter()
         total_signals = 0
         total_confidence = 0.0
 
-        for message_id, payload in result:
-            data = payload.get("payload")
-            if not data:
-                continue
-
-            try:
-                obj = json.loads(data)
-                total_signals += 1
-
-                strategy_counts[obj.get("strategy", "unknown")] += 1
-                signal_type_counts[obj.get("signal_type", "unknown")] += 1
-                symbol_counts[obj.get("symbol", "unknown")] += 1
-                total_confidence += obj.get("confidence", 0)
-
-            except Exception:
-                continue
+        for counters in buckets:
+            for field, value in (counters or {}).items():
+                if field == "total":
+                    total_signals += int(value)
+                elif field == "confidence":
+                    total_confidence += float(value)
+                else:
+                    kind, _, name = field.partition(":")
+                    if kind == "strategy":
+                        strategy_counts[name] += int(value)
+                    elif kind == "type":
+                        signal_type_counts[name] += int(value)
+                    elif kind == "symbol":
+                        symbol_counts[name] += int(value)
 
         avg_confidence = total_confidence / total_signals if total_signals > 0 else 0
 
@@ -123,4 +221,5 @@ class SignalRepository:
             "strategies": dict(strategy_counts.most_common(10)),
             "signal_types": dict(signal_type_counts.most_common(10)),
             "top_symbols": dict(symbol_counts.most_common(20)),
+            "window_seconds": STATS_BUCKET_SECONDS * STATS_WINDOW_BUCKETS,
         }
@@ -0,0 +1,106 @@
+"""Anomaly scanner detection tests."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("akshare")
+
+from signal_api.core.quant.anomaly_scanner import AnomalyScanner, AnomalyType, ScannerConfig
+
+
+def _snapshot(prices: dict) -> pd.DataFrame:
+    codes = list(prices)
+    return pd.DataFrame(
+        {
+            "code": codes,
+            "name": [f"stock {code}" for code in codes],
+            "price": [prices[code] for code in codes],
+            "change_pct": 6.0,
+            "volume_ratio": 1.0,
+            "turnover_rate": 1.0,
+            "amount": 2e8,
+        }
+    )
+
+
+def test_scanner_speeds_use_time_lookback_and_drop_stale_history() -> None:
+    scanner = AnomalyScanner(ScannerConfig(min_speed_1m=1.0, speed_max_staleness=30.0))
+    # "600000" is sampled every 3s; "000001" once at t=0, then drops out of the prefilter
+    scanner._update_price_history(_snapshot({"600000": 10.0, "000001": 20.0}), 0.0)
+    for k in range(1, 60):
+        scanner._update_price_history(_snapshot({"600000": 10.0 + 0.01 * k}), 3.0 * k)
+
+    candidates = scanner._detect_anomalies(_snapshot({"600000": 11.0, "000001": 21.0, "300750": 50.0}), 180.0)
+    by_code = {c.code: c for c in candidates}
+
+    # 60s back from t=180 is the t=120 sample (10.40); 180s back is t=0 (10.00)
+    assert by_code["600000"].speed_1m == pytest.approx((11.0 / 10.40 - 1) * 100)
+    assert by_code["600000"].speed_3m == pytest.approx(10.0)
+    assert AnomalyType.SPEED_FAST in by_code["600000"].anomaly_types
+    # The only 000001 sample is 120s older than the 1m window start: no 1m speed
+    assert by_code["000001"].speed_1m == 0.0
+    assert by_code["000001"].speed_3m == pytest.approx(5.0)
+    # Never sampled
+    assert by_code["300750"].speed_1m == 0.0 and by_code["300750"].speed_3m == 0.0
+    assert np.isfinite([c.anomaly_score for c in candidates]).all()
+
+
+def _row_candidates(scanner: AnomalyScanner, df: pd.DataFrame, now: float):
+    """The per-row iterrows detection that _detect_anomalies replaced."""
+    cfg = scanner.config
+    speeds_1m, speeds_3m = scanner._calculate_speeds(
+        df["code"].astype(str).to_numpy(), df["price"].to_numpy(dtype=float), now
+    )
+    found = []
+    for i, (_, row) in enumerate(df.iterrows()):
+        types = []
+        score = 0.0
+        if row["change_pct"] >= cfg.min_change_pct:
+            types.append(AnomalyType.PRICE_SURGE)
+            score += min(row["change_pct"] / 10, 1) * 30
+        if row["volume_ratio"] >= cfg.min_volume_ratio:
+            types.append(AnomalyType.VOLUME_SPIKE)
+            score += min(row["volume_ratio"] / 10, 1) * 25
+        if row["turnover_rate"] >= cfg.min_turnover_rate:
+            types.append(AnomalyType.TURNOVER_HIGH)
+            score += min(row["turnover_rate"] / 20, 1) * 20
+        if speeds_1m[i] >= cfg.min_speed_1m:
+            types.append(AnomalyType.SPEED_FAST)
+            score += min(speeds_1m[i] / 3, 1) * 25
+        if len(types) >= 3:
+            types.append(AnomalyType.COMBO)
+            score *= 1.2
+        if types:
+            found.append((str(row["code"]), types, min(score, 100), speeds_1m[i], speeds_3m[i]))
+    found.sort(key=lambda item: item[2], reverse=True)
+    return found[: cfg.max_candidates]
+
+
+def test_vectorized_detection_matches_row_logic() -> None:
+    rng = np.random.default_rng(42)
+    n = 400
+    df = pd.DataFrame(
+        {
+            "code": [f"{600000 + i:06d}" for i in range(n)],
+            "name": [f"stock {i}" for i in range(n)],
+            "price": rng.uniform(5, 50, n).round(2),
+            # Rounded so thresholds and score ties are hit exactly
+            "change_pct": rng.choice([0.0, 3.0, 5.0, 7.5, 9.9, 12.0], n),
+            "volume_ratio": rng.choice([0.5, 2.9, 3.0, 6.0, 15.0], n),
+            "turnover_rate": rng.choice([0.0, 3.0, 10.0, 25.0], n),
+            "amount": rng.uniform(1e7, 1e9, n),
+        }
+    )
+    scanner = AnomalyScanner(ScannerConfig(max_candidates=60))
+    past = df.assign(price=df["price"] / rng.choice([1.0, 1.01, 1.02, 1.05], n))
+    scanner._update_price_history(past.iloc[::2], 0.0)
+
+    expected = _row_candidates(scanner, df, 90.0)
+    candidates = scanner._detect_anomalies(df, 90.0)
+
+    assert len(expected) == 60
+    assert any(AnomalyType.SPEED_FAST in types for _, types, _, _, _ in expected)
+    assert [(c.code, c.anomaly_types, c.anomaly_score, c.speed_1m, c.speed_3m) for c in candidates] == expected
@@ -0,0 +1,204 @@
+"""Backtest engine regression tests."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signal_api.core.quant.data.duckdb_manager import DuckDBManager
+from signal_api.core.quant.engines.backtest import BacktestConfig, BacktestEngine
+from signal_api.core.quant.engines.portfolio import PortfolioBacktestConfig, PortfolioBacktestEngine
+from signal_api.core.quant.risk.manager import RiskConfig
+from signal_api.core.quant.strategies import (
+    AmbushConfig,
+    AmbushStrategy,
+    IgnitionConfig,
+    IgnitionStrategy,
+    Signal,
+    SignalType,
+)
+
+
+def _make_bars(n: int, freq: str, seed: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    return pd.DataFrame(
+        {
+            "datetime": pd.date_range("2024-01-02 09:30", periods=n, freq=freq),
+            "open": close,
+            "high": close * 1.003,
+            "low": close * 0.997,
+            "close": close,
+            "volume": rng.lognormal(8, 1, n),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "strategy_factory, freq, bars",
+    [
+        (lambda: IgnitionStrategy(IgnitionConfig(min_confidence=0.5, minute_volume_ratio_min=2.0)), "min", 3000),
+        (lambda: AmbushStrategy(AmbushConfig(min_confidence=0.3)), "D", 1500),
+    ],
+)
+def test_columnar_mode_matches_bar_loop(strategy_factory, freq: str, bars: int) -> None:
+    data = _make_bars(bars, freq)
+
+    legacy = BacktestEngine(BacktestConfig(vectorized=False)).run(strategy_factory(), data)
+    columnar = BacktestEngine(BacktestConfig(vectorized=True)).run(strategy_factory(), data)
+
+    assert legacy.total_trades > 0
+    assert [t.to_dict() for t in columnar.trades] == [t.to_dict() for t in legacy.trades]
+    assert columnar.equity_curve == legacy.equity_curve
+    assert columnar.to_dict() == legacy.to_dict()
+
+
+def test_parallel_sweep_matches_sequential_order() -> None:
+    data = _make_bars(2000, "min")
+    grid = {"minute_volume_ratio_min": [1.5, 2.0], "min_confidence": [0.5, 0.6]}
+
+    def summarize(results):
+        return [(r.parameters, r.to_dict()) for r in results]
+
+    sequential = BacktestEngine().run_parameter_sweep(IgnitionStrategy, IgnitionConfig, data, grid)
+    progress = []
+    parallel = BacktestEngine().run_parameter_sweep(
+        IgnitionStrategy,
+        IgnitionConfig,
+        data,
+        grid,
+        n_jobs=2,
+        progress_callback=lambda done, total: progress.append((done, total)),
+    )
+
+    assert summarize(parallel) == summarize(sequential)
+    assert progress[-1] == (4, 4)
+
+
+def test_rolling_walk_forward_folds() -> None:
+    data = _make_bars(600, "D")
+    folds = BacktestEngine().run_rolling_walk_forward(
+        AmbushStrategy(AmbushConfig(min_confidence=0.3)), data, n_folds=3, anchored=True, n_jobs=1
+    )
+
+    assert [fold.fold for fold in folds] == [0, 1, 2]
+    assert all(fold.train.start_date == data["datetime"].iloc[0] for fold in folds)
+    for prev, cur in zip(folds, folds[1:]):
+        assert cur.test.start_date > prev.test.start_date
+        assert cur.train.end_date < cur.test.start_date
+
+
+
+class _AlwaysBuyStrategy(AmbushStrategy):
+    """Buys on every bar past the data warm-up."""
+
+    def signal_candidates(self) -> np.ndarray:
+        mask = np.ones(len(self._factors), dtype=bool)
+        mask[:self.data_warmup] = False
+        return mask
+
+    def evaluate_row(self, row, symbol: str):
+        return Signal(symbol, SignalType.BUY, 1.0, row["close"], row["datetime"])
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_rolling_walk_forward_trades_from_first_test_bar(vectorized: bool) -> None:
+    data = _make_bars(400, "D")
+    folds = BacktestEngine(BacktestConfig(vectorized=vectorized)).run_rolling_walk_forward(
+        _AlwaysBuyStrategy(), data, n_folds=3, n_jobs=1
+    )
+
+    # Factors come from the full history, so no test slice re-spends lookback_days on warm-up
+    for fold in folds:
+        assert fold.test.trades[0].entry_time == fold.test.start_date
+        assert fold.test.equity_curve[0][0] == fold.test.start_date
+
+def test_portfolio_engine_respects_sector_limit() -> None:
+    frames = []
+    for k in range(6):
+        bars = _make_bars(1200, "min", seed=k)
+        bars["symbol"] = f"{600000 + k:06d}.SH"
+        frames.append(bars)
+    data = pd.concat(frames, ignore_index=True)
+
+    engine = PortfolioBacktestEngine(
+        PortfolioBacktestConfig(warmup_bars=300), RiskConfig(max_sector_stocks=1, max_concurrent_signals=10)
+    )
+    result = engine.run(
+        IgnitionStrategy(IgnitionConfig(min_confidence=0.5)),
+        data,
+        sectors={symbol: "bank" for symbol in data["symbol"].unique()},
+    )
+
+    assert result.total_trades > 0
+    assert result.parameters["symbols"] == 6
+    # With one stock allowed per sector, holding periods never overlap
+    trades = sorted(result.trades, key=lambda t: t.entry_time)
+    for prev, cur in zip(trades, trades[1:]):
+        assert cur.entry_time >= prev.exit_time
+
+
+def test_streaming_update_matches_batch_signals() -> None:
+    data = _make_bars(600, "D")
+    data["symbol"] = "sh600000"
+
+    batch = AmbushStrategy(AmbushConfig(min_confidence=0.3))
+    batch.set_data(data)
+    expected = {i: s.confidence for i, s in batch.generate_signals().items()}
+
+    live = AmbushStrategy(AmbushConfig(min_confidence=0.3))
+    streamed = {}
+    for i, bar in enumerate(data.to_dict("records")):
+        signal = live.update_signal(bar)
+        if signal is not None:
+            streamed[i] = signal.confidence
+
+    assert expected
+    assert streamed == expected
+
+
+def _make_universe(symbols: int, n: int, seed: int = 0) -> pd.DataFrame:
+    frames = []
+    for k in range(symbols):
+        bars = _make_bars(n, "min", seed=seed + k)
+        bars["symbol"] = f"{600000 + k:06d}.SH"
+        bars[["open", "high", "low", "close"]] *= k + 1  # distinct price level per symbol
+        frames.append(bars)
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_multi_symbol_signals_are_attributed_to_their_own_bars() -> None:
+    data = _make_universe(5, 1200)
+    shuffled = data.sample(frac=1.0, random_state=7)
+    strategy = IgnitionStrategy(IgnitionConfig(min_confidence=0.5, minute_volume_ratio_min=2.0))
+
+    strategy.set_data(shuffled)
+    signals = strategy.generate_signals(strategy.warmup_bars)
+
+    closes = data.set_index(["datetime", "symbol"])["close"]
+    assert len(signals) > 10
+    for index, signal in signals.items():
+        assert strategy._data.at[index, "symbol"] == signal.symbol
+        assert closes[(signal.timestamp, signal.symbol)] == pytest.approx(signal.price)
+
+
+def test_minute_chunks_keep_stored_symbol_and_split_by_day(tmp_path) -> None:
+    store = DuckDBManager(str(tmp_path))
+    data = _make_universe(2, 3 * 240)
+    data["datetime"] = data["datetime"] + pd.to_timedelta(data.index % 720 // 240, unit="D")
+    data["amount"] = data["close"] * data["volume"]
+    for symbol, bars in data.groupby("symbol"):
+        if symbol.startswith("600000"):
+            # Files written with a symbol column must not grow a duplicate one
+            bars.to_parquet(store.market_data_dir / f"{symbol}.parquet", index=False)
+        else:
+            store.save_minute_data(symbol, bars.drop(columns=["symbol"]))
+
+    chunks = list(store.iter_minute_chunks("2024-01-02", "2024-01-04", chunk_days=1))
+
+    assert [chunk["datetime"].dt.date.nunique() for chunk in chunks] == [1, 1, 1]
+    assert all(list(chunk.columns).count("symbol") == 1 and "symbol_1" not in chunk for chunk in chunks)
+    combined = pd.concat(chunks, ignore_index=True)
+    expected = data.sort_values(["datetime", "symbol"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(combined[expected.columns], expected, check_dtype=False)
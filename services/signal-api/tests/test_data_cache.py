@@ -0,0 +1,67 @@
+"""Single-flight quote cache tests."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+from signal_api.core.quant.monitor import get_monitor
+from signal_api.data.cache import SingleFlightCache
+from signal_api.data.data_sources import DAILY_TTL_TRADING, StockDataManager, daily_kline_ttl
+
+
+def test_concurrent_requests_share_one_fetch() -> None:
+    manager = StockDataManager()
+    calls = []
+
+    async def fake_fetch(stock_code: str):
+        calls.append(stock_code)
+        await asyncio.sleep(0.01)
+        return {"code": stock_code, "minute_data": [{"price": 1.0}]}
+
+    manager._fetch_minute_data = fake_fetch  # type: ignore[method-assign]
+
+    async def run():
+        first = await asyncio.gather(*(manager.get_minute_data("sh600000") for _ in range(10)))
+        second = await manager.get_minute_data("sh600000")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert calls == ["sh600000"]
+    assert all(r is first[0] for r in first) and second is first[0]
+    stats = manager.get_cache_stats()["minute_data"]
+    # Joiners of the in-flight fetch are coalesced, not misses
+    assert stats == {"entries": 1, "inflight": 0, "hits": 1, "coalesced": 9, "misses": 1, "hit_rate": 90.91}
+    assert get_monitor().get_stats()["counters"]["minute_data_cache_hits"] == 10
+
+
+def test_failures_not_cached_and_lru_bounded() -> None:
+    cache = SingleFlightCache("test", max_entries=2)
+    results = iter([None, "ok"])
+
+    async def run():
+        assert await cache.get_or_load("a", lambda: asyncio.sleep(0, next(results)), ttl=60) is None
+        assert await cache.get_or_load("a", lambda: asyncio.sleep(0, next(results)), ttl=60) == "ok"
+        for key in ("b", "c"):
+            await cache.get_or_load(key, lambda: asyncio.sleep(0, key), ttl=60)
+
+    asyncio.run(run())
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "b" and cache.get("c") == "c"
+    cache.set("d", "d", ttl=0)
+    assert cache.get("d") is None
+
+
+def test_daily_kline_ttl_follows_trading_sessions() -> None:
+    # 2024-03-08 is a Friday
+    assert daily_kline_ttl(datetime(2024, 3, 8, 10, 0)) == DAILY_TTL_TRADING
+    # Lunch break: cached only until the 13:00 reopen, not the next morning
+    assert daily_kline_ttl(datetime(2024, 3, 8, 12, 0)) == 3600
+    # Pre-open: until today's 09:30
+    assert daily_kline_ttl(datetime(2024, 3, 8, 9, 0)) == 1800
+    # Post-close on Friday: until Monday 09:30
+    assert daily_kline_ttl(datetime(2024, 3, 8, 16, 0)) == (2 * 24 + 17.5) * 3600
+    # Weekend
+    assert daily_kline_ttl(datetime(2024, 3, 9, 12, 0)) == (24 + 21.5) * 3600
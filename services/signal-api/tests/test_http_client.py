@@ -0,0 +1,53 @@
+"""Shared upstream HTTP client tests against a local aiohttp server."""
+
+from __future__ import annotations
+
+import asyncio
+
+from aiohttp import web
+
+from signal_api.data.http_client import HttpClientPool
+
+
+async def _serve_and_fetch(pool: HttpClientPool) -> list:
+    peers = []
+    in_flight = []
+
+    async def handler(request: web.Request) -> web.Response:
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/quote", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        for _ in range(3):
+            async with pool.get(f"http://127.0.0.1:{port}/quote") as response:
+                assert (await response.json()) == {"ok": True}
+                in_flight.append(pool.get_stats()["in_flight"])
+        in_flight.append(pool.get_stats()["in_flight"])
+    finally:
+        await pool.close()
+        await runner.cleanup()
+    assert in_flight == [1, 1, 1, 0]
+    return peers
+
+
+def test_requests_reuse_pooled_connection() -> None:
+    pool = HttpClientPool()
+    peers = asyncio.run(_serve_and_fetch(pool))
+
+    # Keep-alive: every request arrives on the same client socket
+    assert len(peers) == 3
+    assert len(set(peers)) == 1
+
+    stats = pool.get_stats()
+    assert stats["started"] is False
+    assert stats["hosts"]["127.0.0.1"]["requests"] == 3
+    assert stats["hosts"]["127.0.0.1"]["errors"] == 0
+    assert stats["hosts"]["127.0.0.1"]["in_flight"] == 0
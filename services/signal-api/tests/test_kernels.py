@@ -0,0 +1,44 @@
+"""Factor kernel tests against the pandas/NumPy reference implementations."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from signal_api.core.quant.strategies import kernels
+
+
+def test_rolling_slope_matches_polyfit() -> None:
+    values = np.random.default_rng(0).normal(size=50).cumsum()
+    expected = (
+        pd.Series(values)
+        .rolling(5, min_periods=5)
+        .apply(lambda x: np.polyfit(range(len(x)), x, 1)[0], raw=True)
+        .to_numpy()
+    )
+
+    np.testing.assert_allclose(kernels.rolling_slope(values, 5), expected, equal_nan=True)
+
+
+def test_grouped_kernels_restart_per_symbol() -> None:
+    rng = np.random.default_rng(1)
+    frame = pd.DataFrame(
+        {
+            "symbol": np.repeat(["a", "b", "c"], 30),
+            "close": rng.normal(10, 0.1, 90),
+            "volume": rng.integers(100, 1000, 90).astype(float),
+        }
+    )
+    groups = frame["symbol"].to_numpy()
+    _, positions = kernels.group_bounds(groups)
+
+    expected_obv = frame.groupby("symbol", group_keys=False).apply(
+        lambda g: (np.sign(g["close"].diff().fillna(0)) * g["volume"]).cumsum()
+    )
+    expected_std = frame.groupby("symbol")["close"].transform(lambda s: s.rolling(20, min_periods=20).std())
+
+    np.testing.assert_allclose(kernels.grouped_obv(frame["close"], frame["volume"], groups), expected_obv)
+    np.testing.assert_allclose(
+        kernels.rolling_std(frame["close"].to_numpy(), 20, positions), expected_std, equal_nan=True
+    )
+    assert np.isnan(kernels.grouped_rolling_slope(frame["close"].to_numpy(), 5, groups)[30:34]).all()
@@ -0,0 +1,29 @@
+"""Ring-buffer price history tests."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from signal_api.core.quant.price_history import PriceHistoryRing
+
+
+def test_speeds_use_time_based_lookback() -> None:
+    ring = PriceHistoryRing(capacity=2, depth=8)
+    rows = ring.rows(["a", "b", "c"])
+    assert ring.capacity >= 3
+
+    for k in range(6):
+        ring.append(rows, np.array([10.0 + k, 20.0, 30.0]), timestamp=30.0 * k)
+
+    # now=170: 60s ago -> sample at t=90 (13.0); 180s ago -> no sample old enough
+    prices = np.array([15.0, 20.0, 33.0])
+    np.testing.assert_allclose(ring.speeds(rows, prices, 60, 170.0), [(15 / 13 - 1) * 100, 0.0, 10.0])
+    np.testing.assert_allclose(ring.speeds(rows, prices, 180, 170.0), [0.0, 0.0, 0.0])
+
+    unknown = ring.rows(["zz"], create=False)
+    assert unknown.tolist() == [-1]
+    assert ring.speeds(unknown, np.array([5.0]), 60, 170.0).tolist() == [0.0]
+
+    ring.clear()
+    assert len(ring) == 0
+    assert np.isnan(ring.lookback(0, 1e9)).all()
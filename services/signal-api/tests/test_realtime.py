@@ -0,0 +1,87 @@
+"""Realtime engine snapshot aggregation tests."""
+
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signal_api.core.quant.engines.realtime import RealtimeEngine
+from signal_api.core.quant.strategies import IgnitionConfig, IgnitionStrategy
+
+
+def _minute_bars(days: int, minutes: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for day in range(days):
+        starts = pd.date_range(f"2024-03-{7 + day} 09:30", periods=minutes, freq="min")
+        close = np.round(10 * np.exp(np.cumsum(rng.normal(0, 0.003, minutes))), 2)
+        frames.append(pd.DataFrame({
+            "start": starts,
+            "open": close,
+            "high": close + 0.02,
+            "low": close - 0.02,
+            "close": close,
+            # Split evenly over three snapshots below
+            "volume": 3.0 * rng.integers(100, 5000, minutes),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _snapshots(bars: pd.DataFrame):
+    """Spot snapshots as AkShare returns them: last price, day cumulative volume, day high/low."""
+    day, cumulative, day_high, day_low = None, 0.0, -np.inf, np.inf
+    for bar in bars.itertuples():
+        if bar.start.date() != day:
+            day, cumulative, day_high, day_low = bar.start.date(), 0.0, -np.inf, np.inf
+        for second, price, traded in ((5, bar.open, 0.0), (20, bar.high, bar.volume / 3),
+                                      (35, bar.low, bar.volume / 3), (50, bar.close, bar.volume / 3)):
+            cumulative += traded
+            day_high, day_low = max(day_high, price), min(day_low, price)
+            yield pd.DataFrame([{
+                "symbol": "600000",
+                "datetime": bar.start + pd.Timedelta(seconds=second),
+                "price": price,
+                "close": price,
+                "high": day_high,
+                "low": day_low,
+                "volume": cumulative,
+            }])
+
+
+def test_snapshots_feed_streaming_ignition_as_minute_bars() -> None:
+    bars = _minute_bars(days=2, minutes=60)
+    strategy = IgnitionStrategy(IgnitionConfig(min_confidence=0.5))
+    engine = RealtimeEngine(strategy=strategy)
+    rows = []
+    update = strategy.update
+    strategy.update = lambda bar: rows.append(update(bar)) or rows[-1]
+
+    async def feed():
+        for snapshot in _snapshots(bars):
+            async def fetch(symbols, data=snapshot):
+                return data
+
+            engine._fetch_realtime_data = fetch
+            await engine._tick(["600000"])
+
+    asyncio.run(feed())
+
+    # Every minute is fed once when the next minute starts; the last is still forming
+    expected = bars.iloc[:-1]
+    fed = pd.DataFrame(rows)
+    assert fed["datetime"].tolist() == (expected["start"] + pd.Timedelta(minutes=1)).tolist()
+    for column in ("open", "high", "low", "close"):
+        assert fed[column].tolist() == expected[column].tolist()
+    assert fed["volume"].to_numpy() == pytest.approx(expected["volume"].to_numpy())
+
+    # Same factors as streaming the real minute bars directly
+    reference = IgnitionStrategy(IgnitionConfig(min_confidence=0.5))
+    direct = pd.DataFrame([
+        reference.update({**bar, "symbol": "600000", "datetime": bar["start"] + pd.Timedelta(minutes=1)})
+        for bar in expected.to_dict("records")
+    ])
+    for column in ("minute_volume_ratio", "daily_volume", "high5", "price_vs_vwap"):
+        np.testing.assert_allclose(fed[column].to_numpy(), direct[column].to_numpy(), rtol=1e-9, equal_nan=True)
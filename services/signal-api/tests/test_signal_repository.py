@@ -0,0 +1,389 @@
+"""Indexed signal and opportunity lookups."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from data_contracts import index_opportunity, index_signal
+from redis.exceptions import ConnectionError as RedisConnectionError
+from data_contracts.signal_index import index_ready_key, latest_opportunity_key
+
+from signal_api.data.cache import StreamEntryCache
+from signal_api.data.redis_pool import RedisPool
+from signal_api.index_backfill import backfill_opportunity_index, backfill_signal_index
+from signal_api.repository import OpportunityRepository
+from signal_api.signal_repository import SignalRepository
+
+STREAM = "dfp:strategy_signals"
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.calls: List = []
+
+    def __getattr__(self, command: str):
+        method = getattr(self.redis, command)
+        return lambda *args, **kwargs: self.calls.append((method, args, kwargs))
+
+    async def execute(self) -> List[object]:
+        return [await method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    """Just enough of the redis.asyncio API for the repositories and index writers."""
+
+    def __init__(self) -> None:
+        self.streams: Dict[str, List] = {}
+        self.zsets: Dict[str, Dict[str, float]] = {}
+        self.hashes: Dict[str, Dict[str, str]] = {}
+        self.strings: Dict[str, str] = {}
+        self.commands: List[str] = []
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def xadd(self, name: str, fields: Dict[str, str], message_id: str) -> str:
+        self.streams.setdefault(name, []).append((message_id, fields))
+        return message_id
+
+    async def xrevrange(self, name: str, max: str = "+", min: str = "-", count: int | None = None) -> List:
+        self.commands.append("xrevrange")
+        return list(reversed(_in_range(self.streams.get(name, []), min, max)))[:count]
+
+    async def xrange(self, name: str, min: str = "-", max: str = "+", count: int | None = None) -> List:
+        return _in_range(self.streams.get(name, []), min, max)[:count]
+
+    async def exists(self, key: str) -> int:
+        return int(key in self.strings or key in self.hashes or key in self.zsets)
+
+    async def set(self, key: str, value: object) -> bool:
+        self.strings[key] = str(value)
+        return True
+
+    async def delete(self, key: str) -> int:
+        return int(self.hashes.pop(key, None) is not None)
+
+    async def zadd(self, key: str, mapping: Dict[str, float]) -> int:
+        self.zsets.setdefault(key, {}).update(mapping)
+        return 1
+
+    async def zremrangebyrank(self, key: str, start: int, end: int) -> int:
+        members = sorted(self.zsets.get(key, {}).items(), key=lambda item: (item[1], _key(item[0])))
+        for member, _score in members[start : len(members) + end + 1]:
+            del self.zsets[key][member]
+        return 0
+
+    async def zrevrange(self, key: str, start: int, end: int) -> List[str]:
+        members = sorted(self.zsets.get(key, {}), key=_key, reverse=True)
+        return members[start : end + 1]
+
+    async def hset(self, key: str, field: str | None = None, value: str | None = None, mapping=None) -> int:
+        values = dict(mapping or {})
+        if field is not None:
+            values[field] = value
+        self.hashes.setdefault(key, {}).update(values)
+        return len(values)
+
+    async def hsetnx(self, key: str, field: str, value: str) -> int:
+        if field in self.hashes.get(key, {}):
+            return 0
+        self.hashes.setdefault(key, {})[field] = value
+        return 1
+
+    async def hget(self, key: str, field: str) -> str | None:
+        self.commands.append("hget")
+        return self.hashes.get(key, {}).get(field)
+
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        return dict(self.hashes.get(key, {}))
+
+    async def hincrby(self, key: str, field: str, amount: int) -> int:
+        counters = self.hashes.setdefault(key, {})
+        counters[field] = str(int(counters.get(field, 0)) + amount)
+        return int(counters[field])
+
+    async def hincrbyfloat(self, key: str, field: str, amount: float) -> float:
+        counters = self.hashes.setdefault(key, {})
+        counters[field] = str(float(counters.get(field, 0)) + amount)
+        return float(counters[field])
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        return True
+
+
+def _key(message_id: str):
+    millis, _, seq = message_id.partition("-")
+    return int(millis), int(seq or 0)
+
+
+def _in_range(entries: List, low: str, high: str) -> List:
+    def above(message_id: str) -> bool:
+        if low == "-":
+            return True
+        if low.startswith("("):
+            return _key(message_id) > _key(low[1:])
+        return _key(message_id) >= _key(low)
+
+    def below(message_id: str) -> bool:
+        if high == "+":
+            return True
+        if high.startswith("("):
+            return _key(message_id) < _key(high[1:])
+        return _key(message_id) <= _key(high)
+
+    return [e for e in entries if above(e[0]) and below(e[0])]
+
+
+def make_signal(strategy: str, symbol: str, confidence: float = 0.8) -> Dict[str, object]:
+    return {
+        "strategy": strategy,
+        "symbol": symbol,
+        "signal_type": f"{strategy}_signal",
+        "confidence": confidence,
+        "strength_score": 50.0,
+        "reasons": [],
+        "triggered_at": datetime.utcnow().isoformat(),
+        "window": "5s",
+        "metadata": {},
+    }
+
+
+async def write_signals(
+    redis: FakeRedis, signals: List[Dict[str, object]], indexed: bool = True, millis: int | None = None
+) -> None:
+    """XADD ``signals``; ``indexed=False`` mimics entries written before the writers indexed."""
+
+    now = millis or int(time.time() * 1000)
+    for seq, signal in enumerate(signals):
+        message_id = f"{now}-{seq}"
+        await redis.xadd(STREAM, {"payload": json.dumps(signal)}, message_id)
+        if indexed:
+            pipe = redis.pipeline()
+            index_signal(pipe, STREAM, message_id, signal)
+            await pipe.execute()
+    if indexed:
+        await redis.set(index_ready_key(STREAM), 1)
+
+
+def make_opportunity(symbol: str, state: str) -> Dict[str, object]:
+    now = datetime.utcnow().isoformat()
+    return {
+        "id": f"op-{symbol}",
+        "symbol": symbol,
+        "state": state,
+        "created_at": now,
+        "updated_at": now,
+        "confidence": 0.8,
+        "strength_score": 70.0,
+    }
+
+
+def test_strategy_filter_finds_matches_past_the_first_page() -> None:
+    redis = FakeRedis()
+    # One old rare signal buried under many newer ones
+    signals = [make_signal("rare", "sh600000")] + [make_signal("busy", f"sz{i:06d}") for i in range(300)]
+    asyncio.run(write_signals(redis, signals))
+    repository = SignalRepository(redis, STREAM, max_records=100)
+
+    rare = asyncio.run(repository.list_signals(limit=10, strategy="rare"))
+    by_symbol = asyncio.run(repository.list_signals(limit=10, symbol="sz000299"))
+    # Unindexed filter pages through the stream instead of a fixed over-fetch window
+    low = asyncio.run(repository.list_signals(limit=5, signal_type="rare_signal"))
+
+    assert [s.symbol for s in rare] == ["sh600000"]
+    assert [s.strategy for s in by_symbol] == ["busy"]
+    assert [s.strategy for s in low] == ["rare"]
+    assert redis.commands.count("xrevrange") == 7
+
+
+def test_trimmed_entries_end_index_listing() -> None:
+    redis = FakeRedis()
+    asyncio.run(write_signals(redis, [make_signal("rapid", "sh600000") for _ in range(3)]))
+    redis.streams[STREAM] = redis.streams[STREAM][2:]
+    repository = SignalRepository(redis, STREAM)
+
+    signals = asyncio.run(repository.list_signals(limit=10, strategy="rapid"))
+
+    assert len(signals) == 1
+
+
+def test_signal_stats_come_from_rolling_counters() -> None:
+    redis = FakeRedis()
+    asyncio.run(
+        write_signals(
+            redis,
+            [make_signal("rapid", "sh600000", 0.5), make_signal("rapid", "sh600000", 1.0), make_signal("anomaly", "sz000001", 0.6)],
+        )
+    )
+    repository = SignalRepository(redis, STREAM)
+
+    stats = asyncio.run(repository.get_signal_stats())
+
+    assert stats["total_signals"] == 3
+    assert stats["average_confidence"] == 0.7
+    assert stats["strategies"] == {"rapid": 2, "anomaly": 1}
+    assert stats["signal_types"] == {"rapid_signal": 2, "anomaly_signal": 1}
+    assert stats["top_symbols"] == {"sh600000": 2, "sz000001": 1}
+    assert redis.commands == []
+
+
+def test_get_opportunity_reads_latest_hash() -> None:
+    redis = FakeRedis()
+    for state in ("NEW", "ACTIVE"):
+        pipe = redis.pipeline()
+        index_opportunity(pipe, "dfp:opportunities", "sh600000", json.dumps(make_opportunity("sh600000", state)))
+        asyncio.run(pipe.execute())
+    asyncio.run(redis.set(index_ready_key("dfp:opportunities"), 1))
+    repository = OpportunityRepository(redis, "dfp:opportunities", max_records=200)
+
+    found = asyncio.run(repository.get_opportunity("sh600000"))
+    missing = asyncio.run(repository.get_opportunity("sz000001"))
+
+    assert found is not None and found.state == "ACTIVE"
+    assert missing is None
+    assert redis.commands == ["hget", "hget"]
+
+
+def test_unindexed_entries_fall_back_to_stream_scans_until_backfilled() -> None:
+    redis = FakeRedis()
+    # Minute-old signals written before strategy-engine maintained the index
+    old_millis = int(time.time() * 1000) - 60_000
+    signals = [make_signal("rapid", "sh600000", 0.5), make_signal("anomaly", "sz000001", 1.0)]
+    asyncio.run(write_signals(redis, signals, indexed=False, millis=old_millis))
+    for seq, state in enumerate(("NEW", "ACTIVE")):
+        payload = json.dumps(make_opportunity("sh600000", state))
+        asyncio.run(redis.xadd("dfp:opportunities", {"payload": payload}, f"{old_millis}-{seq}"))
+    signal_repository = SignalRepository(redis, STREAM)
+    opportunity_repository = OpportunityRepository(redis, "dfp:opportunities", max_records=200)
+
+    def read():
+        return (
+            asyncio.run(signal_repository.list_signals(limit=10, strategy="rapid")),
+            asyncio.run(signal_repository.get_signal_stats()),
+            asyncio.run(opportunity_repository.get_opportunity("sh600000")),
+        )
+
+    scanned_signals, scanned_stats, scanned_opportunity = read()
+
+    assert [s.symbol for s in scanned_signals] == ["sh600000"]
+    assert scanned_stats["total_signals"] == 2 and scanned_stats["average_confidence"] == 0.75
+    assert scanned_opportunity is not None and scanned_opportunity.state == "ACTIVE"
+    assert redis.commands.count("xrevrange") == 3
+
+    assert asyncio.run(backfill_signal_index(redis, STREAM, page_size=1)) == 2
+    assert asyncio.run(backfill_opportunity_index(redis, "dfp:opportunities", page_size=1)) == 1
+    # Running again is harmless
+    asyncio.run(backfill_signal_index(redis, STREAM))
+    asyncio.run(backfill_opportunity_index(redis, "dfp:opportunities"))
+    redis.commands.clear()
+
+    assert read() == (scanned_signals, scanned_stats, scanned_opportunity)
+    assert "xrevrange" not in redis.commands
+    assert json.loads(redis.hashes[latest_opportunity_key("dfp:opportunities")]["sh600000"])["state"] == "ACTIVE"
+
+
+def test_entry_cache_parses_each_stream_entry_once(monkeypatch) -> None:
+    redis = FakeRedis()
+    asyncio.run(write_signals(redis, [make_signal("rapid", f"sh60000{i}") for i in range(5)]))
+    redis.streams[STREAM].append(("1-0", {"payload": "not json"}))
+    cache = StreamEntryCache(max_entries=100)
+    parses = []
+    original = SignalRepository._parse
+    monkeypatch.setattr(SignalRepository, "_parse", staticmethod(lambda fields: parses.append(1) or original(fields)))
+
+    first = asyncio.run(SignalRepository(redis, STREAM, entry_cache=cache).list_signals(limit=10))
+    second = asyncio.run(SignalRepository(redis, STREAM, entry_cache=cache).list_signals(limit=10))
+
+    assert len(first) == 5 and second == first
+    assert len(parses) == 6
+    assert cache.get_stats() == {"entries": 6, "max_entries": 100, "hits": 6, "misses": 6, "hit_rate": 50.0}
+
+
+def test_redis_pool_is_shared_and_reports_size() -> None:
+    pool = RedisPool("redis://localhost:6379/0", max_connections=8)
+
+    async def run():
+        client = pool.client()
+        assert pool.client() is client
+        stats = pool.get_stats()
+        await pool.close()
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert stats == {
+        "started": True,
+        "max_connections": 8,
+        "created_connections": 0,
+        "in_use_connections": 0,
+        "available_connections": 0,
+    }
+    assert pool.get_stats()["started"] is False
+
+
+class FakeConnection:
+    """Connection stand-in: connects without a server, never has pending data."""
+
+    def __init__(self, **kwargs) -> None:  # noqa: ANN003
+        pass
+
+    async def connect(self) -> None:
+        pass
+
+    async def can_read_destructive(self) -> bool:
+        return False
+
+    async def disconnect(self) -> None:
+        pass
+
+
+def test_redis_pool_counts_connections_it_hands_out() -> None:
+    pool = RedisPool("redis://localhost:6379/0", max_connections=8)
+    pool.client()
+    pool._pool.connection_class = FakeConnection
+
+    async def run():
+        first = await pool._pool.get_connection("GET")
+        second = await pool._pool.get_connection("GET")
+        busy = pool.get_stats()
+        await pool._pool.release(first)
+        reused = await pool._pool.get_connection("GET")
+        await pool._pool.release(second)
+        return busy, reused is first, pool.get_stats()
+
+    busy, reused, stats = asyncio.run(run())
+
+    assert (busy["created_connections"], busy["in_use_connections"], busy["available_connections"]) == (2, 2, 0)
+    assert reused
+    assert (stats["created_connections"], stats["in_use_connections"], stats["available_connections"]) == (2, 1, 1)
+
+
+def test_redis_pool_queues_requests_when_exhausted() -> None:
+    pool = RedisPool("redis://localhost:6379/0", max_connections=1, timeout=0.2)
+    pool.client()
+    pool._pool.connection_class = FakeConnection
+
+    async def run():
+        held = await pool._pool.get_connection("GET")
+        waiter = asyncio.ensure_future(pool._pool.get_connection("GET"))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        await pool._pool.release(held)
+        handed_over = await waiter
+        try:
+            await pool._pool.get_connection("GET")
+        except RedisConnectionError as exc:
+            return handed_over is held, str(exc)
+        return handed_over is held, None
+
+    reused, error = asyncio.run(run())
+
+    # A waiting request gets the released connection; one past the timeout fails
+    assert reused
+    assert error == "No connection available."
+    assert pool.get_stats()["created_connections"] == 1
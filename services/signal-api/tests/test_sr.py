@@ -1,7 +1,12 @@
 import unittest
+from datetime import datetime
+from unittest import mock
 import numpy as np
+from signal_api.core.support_resistance.composer import SRComposer
 from signal_api.core.support_resistance.tdx_engine import TDXEngine
-from signal_api.core.support_resistance.models import SRType
+from signal_api.core.support_resistance.volume_profile import VolumeProfile, VolumeProfileEngine
+from signal_api.core.support_resistance.vwap_engine import VWAPEngine
+from signal_api.core.support_resistance.models import SRRequestPayload, SRType
 
 class TestTDXEngine(unittest.TestCase):
     def setUp(self):
@@ -50,5 +55,229 @@ class TestTDXEngine(unittest.TestCase):
             # 多次触及，强度应该较高
             self.assertTrue(level_100.strength > 50)
 
+    def test_pivots_match_window_scan(self):
+        """向量化极值点与逐窗口扫描一致 (含平台重复值)"""
+        rng = np.random.default_rng(7)
+        data = np.round(10 + rng.normal(0, 0.1, 300).cumsum(), 1)
+
+        for is_high in (True, False):
+            pick = max if is_high else min
+            expected = [i for i in range(5, len(data) - 5) if data[i] == pick(data[i-5:i+6])]
+            self.assertEqual(self.engine._find_pivots(data, 5, is_high).tolist(), expected)
+
+    def test_batch_matches_single(self):
+        """批量接口逐行结果与单只计算一致"""
+        rng = np.random.default_rng(3)
+        closes = np.round(10 + rng.normal(0, 0.1, (4, 200)).cumsum(axis=1), 2)
+        highs = closes + 0.03
+        lows = closes - 0.03
+        volumes = rng.integers(100, 1000, closes.shape).astype(float)
+        # 第二只股票历史较短, 左侧 NaN 补齐
+        closes[1, :120] = highs[1, :120] = lows[1, :120] = volumes[1, :120] = np.nan
+
+        batch = self.engine.calculate_batch(closes, highs, lows, volumes)
+
+        for row in range(len(closes)):
+            valid = ~np.isnan(closes[row])
+            single = self.engine.calculate(
+                closes[row, valid].tolist(), highs[row, valid].tolist(),
+                lows[row, valid].tolist(), volumes[row, valid].tolist()
+            )
+            self.assertEqual(batch[row], single)
+
+
+class TestVolumeProfileEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = VolumeProfileEngine()
+
+    def test_poc_at_heaviest_bin(self):
+        """成交量最大的价格区间为 POC"""
+        prices = [10.0, 10.5, 11.0, 10.5, 10.5, 10.5, 12.0]
+        volumes = [100, 100, 100, 5000, 5000, 100, 100]
+
+        levels = self.engine.calculate(prices, volumes)
+
+        poc = next(l for l in levels if l.description.startswith("POC"))
+        self.assertAlmostEqual(poc.price, 10.5, delta=2.0 / 50)
+
+    def test_live_profile_matches_full_rebuild(self):
+        """逐根增量更新与整日一次性计算结果一致"""
+        rng = np.random.default_rng(5)
+        closes = 10 + rng.normal(0, 0.05, 240).cumsum()
+        highs = closes + rng.random(240) * 0.05
+        lows = closes - rng.random(240) * 0.05
+        volumes = rng.integers(100, 1000, 240).astype(float)
+
+        for i in range(240):
+            self.engine.update("sh600000", closes[i], volumes[i], highs[i], lows[i])
+            if i >= 4 and i % 40 == 0:
+                expected = self.engine.calculate(
+                    closes[:i + 1].tolist(), volumes[:i + 1].tolist(),
+                    highs[:i + 1].tolist(), lows[:i + 1].tolist()
+                )
+                live = self.engine.calculate_live("sh600000")
+                self.assertEqual([l.price for l in live], [l.price for l in expected])
+                self.assertEqual([l.description for l in live], [l.description for l in expected])
+
+        self.engine.reset_live("sh600000")
+        self.assertEqual(self.engine.calculate_live("sh600000"), [])
+
+
+class TestVWAPEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = VWAPEngine()
+
+    def test_session_matches_full_series(self):
+        """会话累加器与整段序列计算的 VWAP 及标准差带一致"""
+        rng = np.random.default_rng(11)
+        closes = 10 + rng.normal(0, 0.05, 240).cumsum()
+        highs = closes + rng.random(240) * 0.05
+        lows = closes - rng.random(240) * 0.05
+        volumes = rng.integers(100, 1000, 240).astype(float)
+
+        for i in range(239):
+            self.engine.update("sz000001", closes[i], volumes[i], highs[i], lows[i])
+        session = self.engine.get_session("sz000001")
+        session.update(closes[-1], volumes[-1], highs[-1], lows[-1])
+
+        expected = self.engine.calculate(
+            closes.tolist(), volumes.tolist(), highs.tolist(), lows.tolist()
+        )
+        live = self.engine._build_levels(session.vwap, session.std_dev, closes[-1])
+        self.assertEqual([(l.price, l.type) for l in live], [(l.price, l.type) for l in expected])
+
+    def test_session_resets_on_new_day(self):
+        """跨交易日自动重置会话"""
+        day1 = 1700000000
+        for i in range(10):
+            self.engine.update("sz000001", 10.0 + i, timestamp=day1 + i * 60)
+        self.engine.update("sz000001", 20.0, timestamp=day1 + 86400)
+
+        session = self.engine.get_session("sz000001")
+        self.assertEqual(session.count, 1)
+        self.assertEqual(session.vwap, 20.0)
+
+    def test_session_series_reconciles_with_passed_bars(self):
+        """传入序列与会话不一致时按序列重建，而不是返回旧会话"""
+        timestamps, closes, volumes = _session_bars(2)
+        today = slice(240, None)
+        self.engine.calculate(closes[:300], volumes[:300], symbol="sz000001", timestamps=timestamps[:300])
+
+        revised = list(closes)
+        revised[250] += 0.5
+        levels = self.engine.calculate(revised, volumes, symbol="sz000001", timestamps=timestamps)
+        expected = self.engine.calculate(revised[today], volumes[today])
+        self.assertEqual([l.price for l in levels], [l.price for l in expected])
+
+        # 没有时间戳无法对齐会话，按传入序列计算
+        plain = self.engine.calculate(closes[:100], volumes[:100], symbol="sz000001")
+        self.assertEqual([l.price for l in plain], [l.price for l in self.engine.calculate(closes[:100], volumes[:100])])
+
+
+def _session_bars(days: int):
+    """两个交易日的分钟K线 (每日 240 根)"""
+    rng = np.random.default_rng(13)
+    timestamps = []
+    for day in range(days):
+        open_ts = datetime(2024, 3, 7 + day, 9, 31).timestamp()
+        timestamps.extend(int(open_ts) + i * 60 for i in range(240))
+    closes = np.round(10 + rng.normal(0, 0.02, len(timestamps)).cumsum(), 2).tolist()
+    volumes = rng.integers(100, 1000, len(timestamps)).astype(float).tolist()
+    return timestamps, closes, volumes
+
+
+class TestSRComposerVWAP(unittest.TestCase):
+    def test_composer_feeds_session_incrementally(self):
+        """SRComposer 按股票增量维护当日 VWAP 会话"""
+        composer = SRComposer()
+        composer.enable_tdx = composer.enable_volume_profile = False
+        timestamps, closes, volumes = _session_bars(2)
+        engine = composer.vwap_engine
+        fed, outputs = [], []
+        update, calculate = engine.update, engine.calculate
+        engine.update = lambda *args, **kwargs: fed.append(args[1]) or update(*args, **kwargs)
+        engine.calculate = lambda *args, **kwargs: outputs.append(calculate(*args, **kwargs)) or outputs[-1]
+
+        for end in (300, 301, 480):
+            payload = SRRequestPayload(symbol="sz000001", prices=closes[:end], volumes=volumes[:end],
+                                       timestamps=timestamps[:end])
+            composer.calculate(payload)
+
+            # 当日会话 VWAP 与只用当日K线的整段计算一致
+            expected = VWAPEngine().calculate(closes[240:end], volumes[240:end])
+            self.assertEqual([l.price for l in outputs[-1]], [l.price for l in expected])
+            # 已收盘 K 线全部并入会话，最后一根仍在变化不并入
+            self.assertEqual(engine.get_session("sz000001").count, end - 240 - 1)
+
+        # 每根 K 线只并入一次
+        self.assertEqual(len(fed), 480 - 240 - 1)
+
+
+class TestSRComposerVolumeProfile(unittest.TestCase):
+    def test_composer_maintains_intraday_profile(self):
+        """SRComposer 按股票增量维护当日成交量分布"""
+        composer = SRComposer()
+        composer.enable_tdx = composer.enable_vwap = False
+        timestamps, closes, volumes = _session_bars(2)
+        highs = [round(c + 0.02, 2) for c in closes]
+        lows = [round(c - 0.02, 2) for c in closes]
+        engine = composer.volume_profile_engine
+        outputs = []
+        calculate = engine.calculate
+        engine.calculate = lambda *args, **kwargs: outputs.append(calculate(*args, **kwargs)) or outputs[-1]
+
+        def run(volumes, end):
+            composer.calculate(SRRequestPayload(symbol="sz000001", prices=closes[:end], volumes=volumes[:end],
+                                                highs=highs[:end], lows=lows[:end], timestamps=timestamps[:end]))
+            # 与只用当日K线的整段计算一致
+            expected = VolumeProfileEngine().calculate(closes[240:end], volumes[240:end], highs[240:end], lows[240:end])
+            self.assertTrue(expected)
+            self.assertEqual([(l.price, l.description) for l in outputs[-1]],
+                             [(l.price, l.description) for l in expected])
+            return engine._live["sz000001"]
+
+        profile = run(volumes, 300)
+        for end in (301, 480):
+            # 已收盘 K 线并入同一份日内分布，最后一根仍在变化不并入
+            self.assertIs(run(volumes, end), profile)
+            self.assertEqual(len(profile), end - 240 - 1)
+
+        # 已并入的 K 线被改写时按传入序列重建
+        revised = list(volumes)
+        revised[250] += 5000
+        rebuilt = run(revised, 480)
+        self.assertIsNot(rebuilt, profile)
+        self.assertEqual(len(rebuilt), 480 - 240 - 1)
+
+    def test_refresh_accumulates_only_new_bars(self):
+        """区间内的新 K 线只累加新增部分，不重建整日分布"""
+        engine = VolumeProfileEngine()
+        timestamps = [int(datetime(2024, 3, 7, 9, 31).timestamp()) + i * 60 for i in range(240)]
+        rng = np.random.default_rng(17)
+        closes = np.round(10 + rng.uniform(-0.5, 0.5, 240), 2).tolist()
+        # 开盘两根定下全天高低，之后的 K 线都在区间内
+        closes[0], closes[1] = 9.0, 11.0
+        volumes = rng.integers(100, 1000, 240).astype(float).tolist()
+
+        accumulated = []
+        accumulate = VolumeProfile._accumulate
+
+        def spy(profile, bars, offset):
+            accumulated.append((profile, len(bars)))
+            return accumulate(profile, bars, offset)
+
+        with mock.patch.object(VolumeProfile, "_accumulate", spy):
+            engine.calculate(closes[:200], volumes[:200], symbol="sh600000", timestamps=timestamps[:200])
+            shared = engine._live["sh600000"]
+            for end in range(210, 241, 10):
+                accumulated.clear()
+                levels = engine.calculate(closes[:end], volumes[:end], symbol="sh600000", timestamps=timestamps[:end])
+                self.assertEqual([rows for p, rows in accumulated if p is shared], [10])
+                self.assertIs(engine._live["sh600000"], shared)
+                self.assertFalse(shared._dirty)
+                expected = VolumeProfileEngine().calculate(closes[:end], volumes[:end])
+                self.assertEqual([l.price for l in levels], [l.price for l in expected])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,115 @@
+"""Batch support/resistance endpoint tests."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from signal_api.core.quant.data.duckdb_manager import DuckDBManager
+from signal_api.routers import support_resistance
+
+
+def _bars(seed: int, n: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 10 + rng.normal(0, 0.05, n).cumsum()
+    return pd.DataFrame({
+        "datetime": pd.date_range("2024-01-02 09:30", periods=n, freq="min"),
+        "open": close,
+        "high": close + 0.02,
+        "low": close - 0.02,
+        "close": close,
+        "volume": rng.integers(100, 1000, n).astype(float),
+        "amount": close * 100,
+    })
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(support_resistance.router)
+    return TestClient(app)
+
+
+def test_batch_payloads_match_single_and_are_memoized() -> None:
+    client = _client()
+    bars = _bars(1)
+    payloads = [
+        {
+            "symbol": f"00000{i}",
+            "prices": bars["close"].tolist()[i:],
+            "highs": bars["high"].tolist()[i:],
+            "lows": bars["low"].tolist()[i:],
+            "volumes": bars["volume"].tolist()[i:],
+            "timestamps": list(range(i, len(bars))),
+        }
+        for i in range(3)
+    ]
+
+    first = client.post("/api/support-resistance/batch", json={"payloads": payloads}).json()
+    second = client.post("/api/support-resistance/batch", json={"payloads": payloads}).json()
+    single = client.post("/api/support-resistance/tdx/calculate", json=payloads[0]).json()
+
+    assert first["metadata"]["calculated"] == 3
+    assert second["metadata"]["cache_hits"] == 3
+    assert first["results"] == second["results"]
+    assert first["results"]["000000"] == single
+
+
+def test_batch_reads_latest_bars_from_duckdb(tmp_path, monkeypatch) -> None:
+    store = DuckDBManager(str(tmp_path))
+    store.save_minute_data("000001.SZ", _bars(2))
+    store.save_minute_data("600000.SH", _bars(3))
+    monkeypatch.setattr(support_resistance, "_duckdb", store)
+
+    latest = store.load_latest_bars(["000001.SZ", "600000.SH"], limit=50)
+    assert latest.groupby("symbol").size().to_dict() == {"000001.SZ": 50, "600000.SH": 50}
+    assert latest.groupby("symbol")["datetime"].is_monotonic_increasing.all()
+
+    response = _client().post(
+        "/api/support-resistance/batch",
+        json={"symbols": ["000001", "600000", "000002"], "bars": 50},
+    ).json()
+
+    assert sorted(response["results"]) == ["000001", "600000"]
+    assert response["missing"] == ["000002"]
+    assert all(r["levels"] for r in response["results"].values())
+
+
+def test_to_ts_code_routes_exchanges() -> None:
+    from signal_api.core.quant.data.manager import to_ts_code
+
+    assert [to_ts_code(s) for s in ["600000", "510300", "900901", "000001", "300750", "159915"]] == [
+        "600000.SH", "510300.SH", "900901.SH", "000001.SZ", "300750.SZ", "159915.SZ"
+    ]
+    assert [to_ts_code(s) for s in ["430047", "830799", "920002", "000001.sz"]] == [
+        "430047.BJ", "830799.BJ", "920002.BJ", "000001.SZ"
+    ]
+
+
+def test_batch_reports_duplicates_and_computes_tdx_once(monkeypatch) -> None:
+    bars = _bars(4)
+    payload = {
+        "symbol": "600519",
+        "prices": bars["close"].tolist(),
+        "highs": bars["high"].tolist(),
+        "lows": bars["low"].tolist(),
+        "volumes": bars["volume"].tolist(),
+    }
+    other = dict(payload, symbol="000858", prices=bars["close"].tolist()[50:], highs=None, lows=None, volumes=None)
+    calls = []
+    batch = support_resistance.composer.calculate_tdx_batch
+    monkeypatch.setattr(
+        support_resistance.composer, "calculate_tdx_batch", lambda payloads: calls.append(len(payloads)) or batch(payloads)
+    )
+
+    response = _client().post(
+        "/api/support-resistance/batch",
+        json={"payloads": [payload, dict(payload, prices=payload["prices"][::-1]), other], "symbols": ["600519"]},
+    ).json()
+    single = _client().post("/api/support-resistance/tdx/calculate", json=other).json()
+
+    assert sorted(response["results"]) == ["000858", "600519"]
+    assert response["duplicates"] == ["600519", "600519"]
+    assert calls == [2]
+    assert response["results"]["000858"] == single
@@ -4,22 +4,26 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import multiprocessing
 import signal
 from contextlib import AsyncExitStack
+from typing import List, Optional
 
 from strategy_engine.config import StrategyEngineSettings, get_settings
-from strategy_engine.service import StrategyEngineService, build_redis_client
+from strategy_engine.service import StrategyEngineService, build_redis_client, worker_shards
 
 
-async def main() -> None:
+async def main(consumer_name: Optional[str] = None, shards: Optional[List[int]] = None) -> None:
     settings: StrategyEngineSettings = get_settings()
+    if consumer_name:
+        settings = settings.model_copy(update={"consumer_name": consumer_name})
     logging.basicConfig(level=settings.log_level)
 
     async with AsyncExitStack() as stack:
         redis_client = await build_redis_client(settings)
         stack.push_async_callback(redis_client.close)
 
-        service = StrategyEngineService(settings=settings, redis_client=redis_client)
+        service = StrategyEngineService(settings=settings, redis_client=redis_client, shards=shards)
         task = asyncio.create_task(service.start())
         stack.push_async_callback(_cancel_task, task)
 
@@ -47,8 +51,55 @@ async def _cancel_task(task: asyncio.Task[None]) -> None:
         pass
 
 
-if __name__ == "__main__":
+def _run_worker(consumer_name: Optional[str] = None, shards: Optional[List[int]] = None) -> None:
     try:
-        asyncio.run(main())
+        asyncio.run(main(consumer_name, shards))
     except KeyboardInterrupt:
         pass
+
+
+def run() -> None:
+    """Run one worker, or ``workers`` processes that split the feature stream shards."""
+
+    settings = get_settings()
+    if settings.workers <= 1 or settings.feature_transport != "stream":
+        _run_worker()
+        return
+
+    logging.basicConfig(level=settings.log_level)
+    logger = logging.getLogger(__name__)
+    context = multiprocessing.get_context("spawn")
+    processes = []
+    for index in range(settings.workers):
+        shards = worker_shards(settings.feature_stream_shards, settings.workers, index)
+        if not shards:
+            logger.warning("Worker %d has no feature stream shard; raise FEATURE_STREAM_SHARDS", index)
+            continue
+        processes.append(
+            context.Process(
+                target=_run_worker,
+                args=(f"{settings.consumer_name}-{index}", shards),
+                name=f"strategy-engine-{index}",
+            )
+        )
+    for process in processes:
+        process.start()
+    logger.info("Started %d strategy worker processes", len(processes))
+
+    def _terminate(_signum: int, _frame: object) -> None:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Workers receive SIGINT themselves and shut down gracefully
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    run()
@@ -8,6 +8,8 @@ import logging
 from typing import Any, Dict, List
 from datetime import datetime
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -114,10 +116,155 @@ class AnomalyDetectionStrategy:
         signals = [s for s in signals if s['confidence'] >= self.min_confidence]
 
         if signals:
-            logger.info(f"Generated {len(signals)} signals for {symbol}")
+            logger.debug(f"Generated {len(signals)} signals for {symbol}")
 
         return signals
 
+    def analyze_batch(self, columns: Dict[str, np.ndarray]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        批量版本的 analyze_sync: 用向量掩码一次计算整批快照
+
+        Args:
+            columns: 与 analyze_sync 快照字典同名的列数组
+                (symbol, price, price_change_rate, volume, volume_ratio, change_speed, window)
+
+        Returns:
+            行号 -> 该行信号列表 (与逐行调用 analyze_sync 的结果一致), 只包含有信号的行
+        """
+        symbols = columns['symbol']
+        price = columns['price']
+        price_change_rate = columns['price_change_rate']
+        change_speed = columns['change_speed']
+        volume = columns['volume']
+        volume_ratio = columns['volume_ratio']
+
+        # 风控检查 (按不同代码去重后判断)
+        blocked = {
+            symbol for symbol in set(symbols.tolist())
+            if any(word in symbol.upper() for word in self.blacklist_sectors)
+        }
+        allowed = np.array([symbol not in blocked for symbol in symbols], dtype=bool)
+
+        # 1. 涨速异动
+        speed_metric = np.where(change_speed > 0, change_speed, price_change_rate)
+        speed_mask = allowed & (speed_metric >= self.speed_threshold)
+        speed_conf = np.minimum(self.speed_confidence_base + (speed_metric - self.speed_threshold) * 5, 1.0)
+        speed_strength = np.minimum(speed_metric / self.speed_threshold * 50, 100)
+
+        # 2. 放量异动
+        volume_mask = allowed & (volume_ratio >= self.volume_threshold)
+        volume_conf = np.minimum(self.volume_confidence_base + (volume_ratio - self.volume_threshold) * 0.1, 1.0)
+        volume_strength = np.minimum(volume_ratio / self.volume_threshold * 40, 100)
+
+        # 3. 大单异动
+        turnover = np.where(price > 0, volume * price, 0)
+        big_mask = allowed & (turnover >= self.big_order_threshold)
+        big_conf = np.minimum(0.65 + (turnover / self.big_order_threshold - 1) * 0.1, 1.0)
+        big_strength = np.minimum(turnover / self.big_order_threshold * 30, 100)
+
+        # 4. 资金流入
+        inflow = volume * price * 0.6
+        capital_mask = (
+            allowed & (volume_ratio > 1.5) & (price_change_rate > 0.01)
+            & (inflow >= self.capital_inflow_threshold)
+        )
+        capital_conf = np.minimum(0.68 + price_change_rate * 10, 0.95)
+        capital_strength = np.minimum((inflow / self.capital_inflow_threshold) * 35, 100)
+
+        # 多信号加成
+        count = speed_mask.astype(np.int64) + volume_mask + big_mask + capital_mask
+        bonus = np.where(count > 1, self.multi_signal_bonus * (count - 1), 0.0)
+        detections = []
+        for mask, conf in (
+            (speed_mask, speed_conf), (volume_mask, volume_conf),
+            (big_mask, big_conf), (capital_mask, capital_conf),
+        ):
+            conf = np.where(count > 1, np.minimum(conf + bonus, 1.0), conf)
+            # 过滤低置信度信号
+            detections.append((mask & (conf >= self.min_confidence), conf))
+
+        triggered_at = datetime.utcnow().isoformat()
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        hit_rows = np.flatnonzero(np.logical_or.reduce([mask for mask, _ in detections]))
+        for row in hit_rows.tolist():
+            symbol = symbols[row]
+            window = columns['window'][row]
+            signals = []
+            (s_mask, s_conf), (v_mask, v_conf), (b_mask, b_conf), (c_mask, c_conf) = detections
+            if s_mask[row]:
+                metric = float(speed_metric[row])
+                signals.append({
+                    'strategy': 'anomaly_detection',
+                    'symbol': symbol,
+                    'signal_type': 'speed_up',
+                    'confidence': float(s_conf[row]),
+                    'strength_score': float(speed_strength[row]),
+                    'reasons': [f"涨速异动: {metric:.2%}"],
+                    'triggered_at': triggered_at,
+                    'window': window,
+                    'metadata': {
+                        'price': float(price[row]),
+                        'price_change_rate': float(price_change_rate[row]),
+                        'change_speed': float(change_speed[row])
+                    }
+                })
+            if v_mask[row]:
+                ratio = float(volume_ratio[row])
+                signals.append({
+                    'strategy': 'anomaly_detection',
+                    'symbol': symbol,
+                    'signal_type': 'volume_surge',
+                    'confidence': float(v_conf[row]),
+                    'strength_score': float(volume_strength[row]),
+                    'reasons': [f"放量异动: 量比{ratio:.1f}倍"],
+                    'triggered_at': triggered_at,
+                    'window': window,
+                    'metadata': {
+                        'volume': int(volume[row]),
+                        'volume_ratio': ratio
+                    }
+                })
+            if b_mask[row]:
+                value = float(turnover[row])
+                signals.append({
+                    'strategy': 'anomaly_detection',
+                    'symbol': symbol,
+                    'signal_type': 'big_order',
+                    'confidence': float(b_conf[row]),
+                    'strength_score': float(big_strength[row]),
+                    'reasons': [f"大单异动: {value/10000:.0f}万元"],
+                    'triggered_at': triggered_at,
+                    'window': window,
+                    'metadata': {
+                        'turnover': value,
+                        'volume': int(volume[row]),
+                        'price': float(price[row])
+                    }
+                })
+            if c_mask[row]:
+                value = float(inflow[row])
+                signals.append({
+                    'strategy': 'anomaly_detection',
+                    'symbol': symbol,
+                    'signal_type': 'capital_inflow',
+                    'confidence': float(c_conf[row]),
+                    'strength_score': float(capital_strength[row]),
+                    'reasons': [f"资金流入: {value/10000:.0f}万元"],
+                    'triggered_at': triggered_at,
+                    'window': window,
+                    'metadata': {
+                        'estimated_inflow': value,
+                        'volume_ratio': float(volume_ratio[row]),
+                        'price_change_rate': float(price_change_rate[row])
+                    }
+                })
+            results[row] = signals
+
+        if results:
+            logger.debug(f"Generated signals for {len(results)} of {len(symbols)} snapshots")
+
+        return results
+
     def _pass_risk_control(self, snapshot: Dict[str, Any]) -> bool:
         """风险控制检查"""
         symbol = snapshot.get('symbol', '')
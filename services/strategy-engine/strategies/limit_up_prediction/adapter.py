@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
 
 from strategy_engine.strategies.base import Strategy
+from strategy_engine.frame import FeatureFrame
 from strategy_engine.models import FeatureSnapshot, StrategySignal
 
 from .strategy import LimitUpPredictionStrategy
@@ -50,6 +53,32 @@ class LimitUpPredictionStrategyAdapter(Strategy):
         # Return the first (and only) signal
         return self._signal_to_strategy_signal(signals[0])
 
+    def evaluate_batch(self, frame: FeatureFrame) -> List[Tuple[int, StrategySignal]]:
+        """Vectorized evaluate(): one analyze_batch call for the whole frame."""
+        results = []
+        for row, signals in self.strategy.analyze_batch(self._frame_to_columns(frame)).items():
+            # Return the first (and only) signal
+            results.append((row, self._signal_to_strategy_signal(signals[0])))
+        return results
+
+    def _frame_to_columns(self, frame: FeatureFrame) -> Dict[str, np.ndarray]:
+        """Column version of _feature_to_snapshot."""
+        change_percent = frame['change_percent']
+        volume = frame['volume_sum']
+        price_change_rate = np.where(
+            np.isnan(change_percent) | (change_percent == 0), 0.0, change_percent / 100
+        )
+        return {
+            'symbol': frame['symbol'],
+            'price': frame['price'],
+            'price_change_rate': price_change_rate,
+            'volume': volume,
+            'volume_ratio': volume / np.maximum(frame['avg_price'] * 100, 1),  # Estimate
+            'avg_price': frame['avg_price'],
+            'change_speed': price_change_rate,
+            'window': frame['window']
+        }
+
     def _feature_to_snapshot(self, feature: FeatureSnapshot) -> Dict[str, Any]:
         """Convert FeatureSnapshot to snapshot dict format."""
         return {
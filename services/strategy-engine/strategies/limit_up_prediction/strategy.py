@@ -143,10 +143,148 @@ class LimitUpPredictionStrategy:
             }
         }
 
-        logger.info(f"Generated limit-up prediction signal for {symbol}: prob={probability:.2f}, conf={confidence:.2f}")
+        logger.debug(f"Generated limit-up prediction signal for {symbol}: prob={probability:.2f}, conf={confidence:.2f}")
 
         return [result]
 
+    def analyze_batch(self, columns: Dict[str, np.ndarray]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        批量版本的 analyze_sync: 用向量掩码一次计算整批快照
+
+        Args:
+            columns: 与 analyze_sync 快照字典同名的列数组
+
+        Returns:
+            行号 -> 该行信号列表 (与逐行调用 analyze_sync 的结果一致), 只包含有信号的行
+        """
+        symbols = columns['symbol']
+        change_rate = columns['price_change_rate'] * 100
+        volume_ratio = columns['volume_ratio']
+        change_speed = columns['change_speed'] * 100
+
+        # 风险控制 + 涨停板限制 (按不同代码去重后判断)
+        unique_symbols = set(symbols.tolist())
+        blocked = {
+            symbol for symbol in unique_symbols
+            if any(word in symbol.upper() for word in self.blacklist_sectors)
+        }
+        limits = {symbol: self._get_limit_threshold(symbol) for symbol in unique_symbols}
+        allowed = np.array([symbol not in blocked for symbol in symbols], dtype=bool)
+        allowed &= change_rate >= self.min_change_percent
+        limit = np.array([limits[symbol] for symbol in symbols], dtype=np.float64)
+
+        # 1. 涨幅强度 (tier 4 = 0.20 分, 不计入信号)
+        change_ratio = change_rate / limit
+        change_tier = np.select(
+            [
+                change_ratio >= self.near_limit_ratio,
+                change_ratio >= 0.6,
+                change_ratio >= self.strong_change_ratio,
+                change_ratio >= 0.25,
+            ],
+            [0, 1, 2, 3],
+            default=4,
+        )
+        change_score = np.array([0.95, 0.80, 0.60, 0.40, 0.0])[change_tier]
+        change_hit = change_tier < 4
+
+        # 2. 成交量异动
+        volume_tier = np.select(
+            [
+                volume_ratio >= self.huge_volume_ratio,
+                volume_ratio >= self.strong_volume_ratio,
+                volume_ratio >= self.volume_surge_ratio,
+            ],
+            [0, 1, 2],
+            default=3,
+        )
+        volume_score = np.array([0.90, 0.70, 0.50, 0.0])[volume_tier]
+        volume_hit = volume_tier < 3
+
+        # 3. 动量
+        momentum_tier = np.select(
+            [
+                change_speed > self.momentum_threshold * 2,
+                change_speed > self.momentum_threshold,
+                change_speed > 0,
+            ],
+            [0, 1, 2],
+            default=3,
+        )
+        momentum_score = np.array([0.85, 0.65, 0.45, 0.0])[momentum_tier]
+        momentum_hit = momentum_tier < 3
+
+        # 4. 时间因素 (整批相同)
+        time_score, time_signal, time_window = self._evaluate_time_factor()
+        time_hit = time_signal is not None
+
+        # 综合概率 (与 _calculate_probability 相同的累加顺序)
+        count = change_hit.astype(np.int64) + volume_hit + momentum_hit + int(time_hit)
+        total = np.where(change_hit, change_score, 0.0) + np.where(volume_hit, volume_score, 0.0)
+        total = total + np.where(momentum_hit, momentum_score, 0.0)
+        if time_hit:
+            total = total + time_score
+        max_score = np.maximum.reduce([
+            np.where(change_hit, change_score, -np.inf),
+            np.where(volume_hit, volume_score, -np.inf),
+            np.where(momentum_hit, momentum_score, -np.inf),
+            np.full(len(symbols), time_score if time_hit else -np.inf),
+        ])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_score = total / count
+        signal_bonus = np.minimum(count * 0.05, 0.15)
+        distance = limit - change_rate
+        distance_bonus = np.select(
+            [distance < 2.0, distance < 4.0, distance < 6.0], [0.15, 0.10, 0.05], default=0.0
+        )
+        probability = np.minimum(
+            (avg_score * 0.6 + max_score * 0.4) + signal_bonus + distance_bonus, 1.0
+        )
+
+        candidates = allowed & (count > 0) & (count >= self.min_signal_count)
+        hit_rows = np.flatnonzero(candidates & (probability >= self.min_probability))
+
+        triggered_at = datetime.now().isoformat()
+        change_texts = ["即将涨停", "强势拉升", "稳步上涨", "开始拉升"]
+        volume_texts = ["巨量突破", "明显放量", "温和放量"]
+        momentum_texts = ["加速拉升", "快速拉升", "逐步加速"]
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        for row in hit_rows.tolist():
+            reasons = []
+            if change_hit[row]:
+                reasons.append(f"{change_texts[change_tier[row]]}({change_rate[row]:.1f}%)")
+            if volume_hit[row]:
+                reasons.append(f"{volume_texts[volume_tier[row]]}(量比{volume_ratio[row]:.1f})")
+            if momentum_hit[row]:
+                reasons.append(f"{momentum_texts[momentum_tier[row]]}(涨速{change_speed[row]:.2f}%/min)")
+            if time_hit:
+                reasons.append(time_signal)
+
+            prob = float(probability[row])
+            results[row] = [{
+                'strategy': 'limit_up_prediction',
+                'symbol': symbols[row],
+                'signal_type': 'limit_up_potential',
+                'confidence': min(prob * 1.1, 1.0),
+                'strength_score': float(avg_score[row]) * 100,
+                'reasons': reasons,
+                'triggered_at': triggered_at,
+                'window': columns['window'][row],
+                'metadata': {
+                    'probability': prob,
+                    'current_change_percent': float(change_rate[row]),
+                    'limit_percent': float(limit[row]),
+                    'distance_to_limit': float(distance[row]),
+                    'time_window': time_window,
+                    'signal_count': int(count[row])
+                }
+            }]
+
+        if results:
+            logger.debug(f"Generated limit-up prediction signals for {len(results)} of {len(symbols)} snapshots")
+
+        return results
+
     def _pass_risk_control(self, snapshot: Dict[str, Any]) -> bool:
         """风险控制检查"""
         symbol = snapshot.get('symbol', '')
@@ -6,7 +6,7 @@ import json
 import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -28,9 +28,22 @@ class StrategyEngineSettings(BaseSettings):
     log_level: str = Field("INFO", alias="LOG_LEVEL")
     redis_url: str = Field("redis://localhost:6379/0", alias="REDIS_URL")
     feature_channel: str = Field("dfp:features", alias="FEATURE_CHANNEL")
+    feature_transport: Literal["stream", "pubsub"] = Field("stream", alias="FEATURE_TRANSPORT")
+    feature_stream: str = Field("dfp:features:stream", alias="FEATURE_STREAM")
+    feature_stream_shards: int = Field(1, ge=1, alias="FEATURE_STREAM_SHARDS")
+    consumer_group: str = Field("strategy-engine", alias="CONSUMER_GROUP")
+    consumer_name: str = Field("strategy-worker-1", alias="CONSUMER_NAME")
+    read_count: int = Field(100, ge=1, alias="READ_COUNT")
+    block_ms: int = Field(1000, ge=1, alias="BLOCK_MS")
+    claim_min_idle_ms: int = Field(30_000, ge=0, alias="CLAIM_MIN_IDLE_MS")
+    claim_interval_seconds: float = Field(5.0, gt=0, alias="CLAIM_INTERVAL_SECONDS")
+    workers: int = Field(1, ge=1, alias="WORKERS")
     signal_stream: str = Field("dfp:strategy_signals", alias="SIGNAL_STREAM")
     max_stream_length: Optional[int] = Field(None, alias="MAX_STREAM_LENGTH")
     approximate_trim: bool = Field(True, alias="APPROXIMATE_TRIM")
+    batch_max_messages: int = Field(100, ge=1, alias="BATCH_MAX_MESSAGES")
+    strategy_workers: int = Field(4, ge=1, alias="STRATEGY_WORKERS")
+    strategy_timeout_seconds: float = Field(1.0, gt=0, alias="STRATEGY_TIMEOUT_SECONDS")
     strategies: List[StrategyConfig] = Field(default_factory=list)
 
     class Config:
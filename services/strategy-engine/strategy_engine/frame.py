@@ -0,0 +1,95 @@
+"""Columnar batches of feature snapshots."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from .models import FeatureSnapshot
+
+logger = logging.getLogger(__name__)
+
+FLOAT_COLUMNS = ("price", "change_percent", "avg_price", "max_price", "min_price", "turnover_sum")
+INT_COLUMNS = ("volume_sum", "sample_size")
+
+
+class FeatureFrame:
+    """A batch of feature snapshots stored column by column.
+
+    Numeric fields are NumPy arrays (``change_percent`` uses NaN for
+    missing values), ``symbol`` and ``window`` are object arrays. Building
+    a frame does not validate every row with Pydantic; ``snapshot(i)``
+    does that lazily for the rows a strategy actually needs as models.
+    """
+
+    def __init__(self, records: Sequence[Mapping[str, Any]], columns: Dict[str, np.ndarray]) -> None:
+        self.records = records
+        self.columns = columns
+        self._snapshots: Dict[int, FeatureSnapshot] = {}
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]]) -> "FeatureFrame":
+        """Build a frame from decoded JSON snapshots, dropping rows that fail validation."""
+
+        try:
+            return cls(records, cls._build_columns(records))
+        except (KeyError, TypeError, ValueError):
+            pass
+
+        # Slow path: find and drop the malformed rows
+        valid: List[Mapping[str, Any]] = []
+        for record in records:
+            try:
+                FeatureSnapshot.model_validate(record)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Invalid feature snapshot: %s", exc)
+                continue
+            valid.append(record)
+        return cls(valid, cls._build_columns(valid))
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Sequence[FeatureSnapshot]) -> "FeatureFrame":
+        frame = cls.from_records([snapshot.model_dump() for snapshot in snapshots])
+        frame._snapshots = dict(enumerate(snapshots))
+        return frame
+
+    @staticmethod
+    def _build_columns(records: Sequence[Mapping[str, Any]]) -> Dict[str, np.ndarray]:
+        columns: Dict[str, np.ndarray] = {
+            "symbol": np.array([str(r["symbol"]) for r in records], dtype=object),
+            "window": np.array([r["window"] for r in records], dtype=object),
+        }
+        for name in FLOAT_COLUMNS:
+            columns[name] = np.array(
+                [np.nan if r.get(name) is None else r[name] for r in records], dtype=np.float64
+            )
+        for name in INT_COLUMNS:
+            columns[name] = np.array([r[name] for r in records], dtype=np.int64)
+        if not all("timestamp" in r for r in records):
+            raise KeyError("timestamp")
+        # Same constraints as the FeatureSnapshot contract (NaN fails every comparison)
+        if len(records) and not (
+            (~np.isnan(columns["price"])).all()
+            and (columns["volume_sum"] >= 0).all()
+            and (columns["sample_size"] >= 1).all()
+            and all((columns[name] >= 0).all() for name in FLOAT_COLUMNS[2:])
+        ):
+            raise ValueError("Invalid feature values")
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def snapshot(self, row: int) -> FeatureSnapshot:
+        snapshot = self._snapshots.get(row)
+        if snapshot is None:
+            snapshot = self._snapshots[row] = FeatureSnapshot.model_validate(self.records[row])
+        return snapshot
+
+    def snapshots(self) -> List[FeatureSnapshot]:
+        return [self.snapshot(row) for row in range(len(self))]
@@ -2,90 +2,89 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import logging
+from typing import Any, Dict, Optional
 
 from strategy_sdk import BaseStrategy, Signal, SignalType, StrategyRegistry
 
 from .models import FeatureSnapshot, StrategySignal
 from .strategies.base import Strategy
 
+logger = logging.getLogger(__name__)
+
 
 class SDKStrategyAdapter(Strategy):
-    """Adapter to wrap SDK BaseStrategy for use in strategy-engine."""
+    """Adapter to wrap SDK BaseStrategy for use in strategy-engine.
+
+    SDK strategies are async, so the engine awaits ``evaluate_async`` on
+    its own event loop; the synchronous ``evaluate`` is only a convenience
+    for scripts and tests that run without a loop.
+    """
+
+    is_async = True
 
     def __init__(self, sdk_strategy: BaseStrategy, name: str, **parameters) -> None:
         super().__init__(name=name, **parameters)
         self.sdk_strategy = sdk_strategy
+        self._initialized = False
 
     def evaluate(self, feature: FeatureSnapshot) -> Optional[StrategySignal]:
+        """Evaluate outside of any event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.evaluate_async(feature))
+        raise RuntimeError(f"SDK strategy {self.name} must be awaited via evaluate_async() inside an event loop")
+
+    async def evaluate_async(self, feature: FeatureSnapshot) -> Optional[StrategySignal]:
         """Evaluate using SDK strategy and convert to engine signal."""
-        import asyncio
-        import logging
+        if not self._initialized:
+            await self.on_start()
+
+        try:
+            sdk_signals = await self.sdk_strategy.analyze(self._to_market_data(feature))
+        except Exception as e:
+            # Log error and return None (no signal generated)
+            logger.error(f"Error evaluating SDK strategy {self.name}: {e}", exc_info=True)
+            return None
 
-        logger = logging.getLogger(__name__)
+        # Check if we got any signals
+        if not sdk_signals:
+            return None
+
+        # Take the first signal (SDK strategies return a list)
+        return self._to_strategy_signal(feature, sdk_signals[0])
 
+    def _to_market_data(self, feature: FeatureSnapshot) -> Dict[str, Any]:
         # Convert FeatureSnapshot to SDK's expected format
         # SDK strategies expect different field names matching market data
-        market_data = {
+        return {
             "code": feature.symbol,
             "name": feature.symbol,  # Use symbol as name for now
             "price": feature.price,
-            "price_change_rate": getattr(feature, "change_percent", 0.0) / 100.0 if hasattr(feature, "change_percent") and feature.change_percent else 0.0,
-            "volume": getattr(feature, "volume_sum", 0),
+            "price_change_rate": feature.change_percent / 100.0 if feature.change_percent else 0.0,
+            "volume": feature.volume_sum,
             "volume_ratio": 2.5,  # Mock value - would come from real-time features
             "money_flow_5min": 10000000,  # Mock value - would come from real-time features
             "turnover_rate": 3.0,  # Mock value - would come from real-time features
-            "timestamp": feature.timestamp.isoformat() if hasattr(feature.timestamp, 'isoformat') else str(feature.timestamp),
+            "timestamp": feature.timestamp.isoformat(),
         }
 
-        # Execute async SDK strategy in a new event loop
-        # This is necessary because strategy-engine's evaluate() is synchronous
-        # but SDK strategies are async
-        try:
-            # Check if there's already a running event loop
-            try:
-                loop = asyncio.get_running_loop()
-                # We're in an async context but evaluate() is called synchronously
-                # This shouldn't happen in normal operation
-                logger.warning("Unexpected: evaluate() called within running event loop")
-                return None
-            except RuntimeError:
-                # No running loop - this is the expected case
-                # Create a new event loop for this synchronous call
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    # Run the async analyze() method
-                    sdk_signals = loop.run_until_complete(self.sdk_strategy.analyze(market_data))
-                finally:
-                    loop.close()
-                    asyncio.set_event_loop(None)
-
-            # Check if we got any signals
-            if not sdk_signals or len(sdk_signals) == 0:
-                return None
-
-            # Take the first signal (SDK strategies return a list)
-            sdk_signal = sdk_signals[0]
-
-            # Convert SDK Signal to StrategySignal
-            # Map SDK signal fields to engine signal fields
-            return StrategySignal(
-                strategy=self.name,  # 'strategy' not 'strategy_name'
-                symbol=feature.symbol,
-                signal_type=self._convert_signal_type(sdk_signal.type),
-                confidence=sdk_signal.confidence,
-                strength_score=sdk_signal.confidence,  # Use confidence as strength
-                reasons=[sdk_signal.reason] if hasattr(sdk_signal, 'reason') and sdk_signal.reason else [],
-                triggered_at=feature.timestamp,  # 'triggered_at' not 'timestamp'
-                window=feature.window,  # Pass through the window from feature
-                metadata=sdk_signal.metadata if hasattr(sdk_signal, 'metadata') else {},
-            )
-
-        except Exception as e:
-            # Log error and return None (no signal generated)
-            logger.error(f"Error evaluating SDK strategy {self.name}: {e}", exc_info=True)
-            return None
+    def _to_strategy_signal(self, feature: FeatureSnapshot, sdk_signal: Signal) -> StrategySignal:
+        # Convert SDK Signal to StrategySignal
+        # Map SDK signal fields to engine signal fields
+        return StrategySignal(
+            strategy=self.name,  # 'strategy' not 'strategy_name'
+            symbol=feature.symbol,
+            signal_type=self._convert_signal_type(sdk_signal.type),
+            confidence=sdk_signal.confidence,
+            strength_score=sdk_signal.confidence,  # Use confidence as strength
+            reasons=[sdk_signal.reason] if sdk_signal.reason else [],
+            triggered_at=feature.timestamp,  # 'triggered_at' not 'timestamp'
+            window=feature.window,  # Pass through the window from feature
+            metadata=sdk_signal.metadata or {},
+        )
 
     def _convert_signal_type(self, sdk_type: SignalType) -> str:
         """Convert SDK SignalType to string."""
@@ -93,24 +92,23 @@ class SDKStrategyAdapter(Strategy):
 
     def on_load(self) -> None:
         """Hook called when strategy is loaded."""
-        import asyncio
-        import logging
-
-        logger = logging.getLogger(__name__)
-
-        # SDK strategies need to be initialized with config
-        # Run the async initialize() method if it exists
+        # Inside a running loop (the engine service) initialization is
+        # deferred to on_start(); standalone loading initializes right away
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.on_start())
+
+    async def on_start(self) -> None:
+        """Run the SDK strategy's async initialize() once."""
+        if self._initialized:
+            return
+        self._initialized = True
         if hasattr(self.sdk_strategy, 'initialize'):
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    # Initialize with parameters passed to adapter
-                    loop.run_until_complete(self.sdk_strategy.initialize(self.parameters))
-                    logger.info(f"SDK strategy {self.name} initialized successfully")
-                finally:
-                    loop.close()
-                    asyncio.set_event_loop(None)
+                # Initialize with parameters passed to adapter
+                await self.sdk_strategy.initialize(self.parameters)
+                logger.info(f"SDK strategy {self.name} initialized successfully")
             except Exception as e:
                 logger.error(f"Error initializing SDK strategy {self.name}: {e}", exc_info=True)
 
@@ -5,31 +5,207 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import redis.asyncio as aioredis
+from data_contracts import index_signal, shard_stream
 
 from .config import StrategyConfig, StrategyEngineSettings
+from .frame import FeatureFrame
 from .loader import load_strategies, unload_strategies
-from .models import FeatureSnapshot, StrategySignal
+from .metrics import LatencyHistogram
+from .models import StrategySignal
+from .strategies.base import Strategy
 
 logger = logging.getLogger(__name__)
 
+StreamEntry = Tuple[str, str, Optional[Dict[str, str]]]
+
+
+def worker_shards(total_shards: int, workers: int, index: int) -> List[int]:
+    """Feature stream shards consumed by worker ``index`` of ``workers``."""
+
+    return [shard for shard in range(total_shards) if shard % workers == index]
+
 
 class StrategyEngineService:
-    """Subscribe to feature snapshots and emit strategy signals."""
+    """Consume feature snapshots and emit strategy signals.
+
+    Features are read from the symbol-sharded feature streams with
+    XREADGROUP (``feature_transport="stream"``), or from the legacy pub/sub
+    channel. A stream worker owns ``shards`` (all of them by default), first
+    replays its own pending entries, and acks each batch in the same
+    pipeline that appends the batch's signals. Entries of a batch whose
+    pipeline fails stay pending; every ``claim_interval_seconds`` the worker
+    takes over entries of its shards idle for ``claim_min_idle_ms`` with
+    XAUTOCLAIM, which covers both those and the PEL of dead consumers.
 
-    def __init__(self, settings: StrategyEngineSettings, redis_client: aioredis.Redis) -> None:
+    Each batch is turned into one ``FeatureFrame`` (columnar, not
+    validated row by row) and evaluated by all strategies concurrently:
+    async strategies (``is_async``) are awaited on the event loop, one task
+    per snapshot, while each sync strategy gets one ``evaluate_batch`` call
+    on the thread pool. A strategy that does not finish the batch within
+    ``strategy_timeout_seconds`` contributes no signals for the unfinished
+    snapshots and is counted as a timeout.
+    """
+
+    def __init__(
+        self,
+        settings: StrategyEngineSettings,
+        redis_client: aioredis.Redis,
+        shards: Optional[Sequence[int]] = None,
+    ) -> None:
         self.settings = settings
         self.redis = redis_client
+        total = settings.feature_stream_shards
+        self.shards = list(shards) if shards is not None else list(range(total))
+        self.streams = [shard_stream(settings.feature_stream, shard, total) for shard in self.shards]
+        # Streams still replaying this consumer's pending entries, with the replay cursor
+        self._recovering: Dict[str, str] = {stream: "0" for stream in self.streams}
+        self._last_claim = 0.0
         self.strategies = load_strategies(self._ensure_strategies(settings))
         self._shutdown = asyncio.Event()
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.strategy_workers, thread_name_prefix="strategy"
+        )
+        self._latency: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name in self.strategies}
+
+    def metrics(self) -> Dict[str, Dict[str, object]]:
+        """Evaluation latency histogram per strategy."""
+
+        return {name: histogram.as_dict() for name, histogram in self._latency.items()}
 
     async def start(self) -> None:
         if not self.strategies:
             logger.warning("No strategies loaded; strategy engine will remain idle")
+        for strategy in self.strategies.values():
+            try:
+                await strategy.on_start()
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Strategy %s failed to start: %s", strategy.name, exc)
+
+        try:
+            if self.settings.feature_transport == "pubsub":
+                await self._consume_pubsub()
+            else:
+                await self._consume_streams()
+        finally:
+            unload_strategies(self.strategies)
+            self._executor.shutdown(wait=False)
+
+    async def stop(self) -> None:
+        self._shutdown.set()
+
+    async def _consume_streams(self) -> None:
+        await self._ensure_consumer_groups()
+        logger.info(
+            "Consuming feature streams %s as %s/%s",
+            ", ".join(self.streams),
+            self.settings.consumer_group,
+            self.settings.consumer_name,
+        )
+        while not self._shutdown.is_set():
+            try:
+                # Own pending entries are replayed first; reclaiming them too would run them twice
+                if not self._recovering and time.monotonic() - self._last_claim >= self.settings.claim_interval_seconds:
+                    self._last_claim = time.monotonic()
+                    await self._reclaim_pending()
+                entries = await self._read_stream_batch()
+                if entries:
+                    await self._process_entries(entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Strategy engine loop error: %s", exc)
+                await asyncio.sleep(1)
 
+    async def _ensure_consumer_groups(self) -> None:
+        for stream in self.streams:
+            try:
+                # Start from the oldest retained entry so a new group catches up
+                await self.redis.xgroup_create(
+                    name=stream, groupname=self.settings.consumer_group, id="0", mkstream=True
+                )
+            except aioredis.ResponseError as exc:
+                if "BUSYGROUP" not in str(exc):
+                    raise
+
+    async def _read_stream_batch(self) -> List[StreamEntry]:
+        if self._recovering:
+            result = await self.redis.xreadgroup(
+                groupname=self.settings.consumer_group,
+                consumername=self.settings.consumer_name,
+                streams=dict(self._recovering),
+                count=self.settings.read_count,
+            )
+            entries = self._flatten(result)
+            replayed = {stream for stream, _id, _fields in entries}
+            for stream in list(self._recovering):
+                if stream in replayed:
+                    self._recovering[stream] = [e[1] for e in entries if e[0] == stream][-1]
+                else:
+                    del self._recovering[stream]
+            if entries:
+                return entries
+
+        result = await self.redis.xreadgroup(
+            groupname=self.settings.consumer_group,
+            consumername=self.settings.consumer_name,
+            streams={stream: ">" for stream in self.streams},
+            count=self.settings.read_count,
+            block=self.settings.block_ms,
+        )
+        return self._flatten(result)
+
+    async def _reclaim_pending(self) -> None:
+        """Take over entries of this worker's shards left pending by dead consumers or failed batches."""
+
+        for stream in self.streams:
+            start_id = "0-0"
+            while not self._shutdown.is_set():
+                response = await self.redis.xautoclaim(
+                    name=stream,
+                    groupname=self.settings.consumer_group,
+                    consumername=self.settings.consumer_name,
+                    min_idle_time=self.settings.claim_min_idle_ms,
+                    start_id=start_id,
+                    count=self.settings.read_count,
+                )
+                start_id, messages = response[0], response[1]
+
+                entries: List[StreamEntry] = [
+                    (stream, message_id, fields) for message_id, fields in filter(None, messages)
+                ]
+                if entries:
+                    logger.info("Reclaimed %d pending entries from %s", len(entries), stream)
+                    await self._process_entries(entries)
+
+                if start_id in ("0-0", b"0-0"):
+                    break
+
+    @staticmethod
+    def _flatten(result: Optional[list]) -> List[StreamEntry]:
+        entries: List[StreamEntry] = []
+        for stream, messages in result or []:
+            if isinstance(stream, bytes):
+                stream = stream.decode("utf-8")
+            entries.extend((stream, message_id, fields) for message_id, fields in messages)
+        return entries
+
+    async def _process_entries(self, entries: Sequence[StreamEntry]) -> None:
+        # Entries trimmed from the stream while pending come back without fields
+        payloads = [fields["payload"] for _stream, _id, fields in entries if fields and fields.get("payload")]
+        signals = await self._handle_payloads(payloads) if payloads else []
+
+        acks: Dict[str, List[str]] = {}
+        for stream, message_id, _fields in entries:
+            acks.setdefault(stream, []).append(message_id)
+        await self._emit_signals(signals, acks)
+
+    async def _consume_pubsub(self) -> None:
         pubsub = self.redis.pubsub()
         await pubsub.subscribe(self.settings.feature_channel)
         logger.info("Subscribed to feature channel %s", self.settings.feature_channel)
@@ -40,73 +216,163 @@ class StrategyEngineService:
                 if not message:
                     continue
 
-                logger.info("📨 Received message type: %s", message.get("type"))
-
-                payload = message.get("data")
-                if isinstance(payload, bytes):
-                    payload = payload.decode("utf-8")
+                # Drain whatever else is already buffered so one pass covers many messages
+                payloads = [message.get("data")]
+                while len(payloads) < self.settings.batch_max_messages:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0)
+                    if not message:
+                        break
+                    payloads.append(message.get("data"))
 
-                logger.info("📦 Processing payload: %s...", str(payload)[:100])
-                await self._handle_payload(str(payload))
+                signals = await self._handle_payloads(
+                    [p.decode("utf-8") if isinstance(p, bytes) else str(p) for p in payloads]
+                )
+                if signals:
+                    await self._emit_signals(signals)
         finally:
             await pubsub.unsubscribe(self.settings.feature_channel)
             await pubsub.close()
-            unload_strategies(self.strategies)
-
-    async def stop(self) -> None:
-        self._shutdown.set()
 
     async def _handle_payload(self, payload: str) -> None:
-        try:
-            data = json.loads(payload)
-            logger.info("✅ Parsed JSON payload successfully")
-        except json.JSONDecodeError as exc:
-            logger.error("Invalid feature payload: %s", exc)
-            return
-
-        if isinstance(data, dict):
-            snapshots = [FeatureSnapshot.model_validate(data)]
-        else:
-            snapshots = [FeatureSnapshot.model_validate(item) for item in data]
-
-        logger.info("📊 Processing %d feature snapshot(s)", len(snapshots))
-
-        signals: List[StrategySignal] = []
-        for snapshot in snapshots:
-            logger.info("🔍 Evaluating snapshot for %s with %d strategies", snapshot.symbol, len(self.strategies))
-            for strategy in self.strategies.values():
-                try:
-                    signal = strategy.evaluate(snapshot)
-                    if signal:
-                        logger.info("✨ Strategy %s generated signal for %s", strategy.name, snapshot.symbol)
-                        signals.append(signal)
-                    else:
-                        logger.info("⚪ Strategy %s did not trigger for %s", strategy.name, snapshot.symbol)
-                except Exception as exc:  # noqa: BLE001
-                    logger.exception("Strategy %s failed: %s", strategy.name, exc)
-
+        signals = await self._handle_payloads([payload])
         if signals:
-            logger.info("📤 Emitting %d signal(s)", len(signals))
             await self._emit_signals(signals)
-        else:
-            logger.info("⚠️  No signals generated from this batch")
 
-    async def _emit_signals(self, signals: List[StrategySignal]) -> None:
-        for signal in signals:
+    async def _handle_payloads(self, payloads: Sequence[str]) -> List[StrategySignal]:
+        """Evaluate the snapshots of all payloads as one frame."""
+
+        records: List[Dict[str, object]] = []
+        for payload in payloads:
             try:
-                payload = json.dumps(signal.model_dump(mode='json'))
-                kwargs = {}
-                if self.settings.max_stream_length is not None:
-                    kwargs["maxlen"] = self.settings.max_stream_length
-                    kwargs["approximate"] = self.settings.approximate_trim
-                stream_id = await self.redis.xadd(
-                    name=self.settings.signal_stream,
-                    fields={"payload": payload},
-                    **kwargs,
-                )
-                logger.info("✅ Emitted signal to %s (ID: %s)", self.settings.signal_stream, stream_id)
-            except Exception as exc:
-                logger.exception("Failed to emit signal for %s: %s", signal.symbol, exc)
+                data = json.loads(payload)
+            except json.JSONDecodeError as exc:
+                logger.error("Invalid feature payload: %s", exc)
+                continue
+            if isinstance(data, dict):
+                records.append(data)
+            elif isinstance(data, list):
+                records.extend(item for item in data if isinstance(item, dict))
+
+        frame = FeatureFrame.from_records(records)
+        if not len(frame):
+            return []
+
+        signals = await self._evaluate(frame)
+        logger.debug("Evaluated %d snapshot(s), %d signal(s)", len(frame), len(signals))
+        return signals
+
+    async def _evaluate(self, frame: FeatureFrame) -> List[StrategySignal]:
+        """Run every strategy over the frame; signals keep snapshot-then-strategy order."""
+
+        results = await asyncio.gather(
+            *(
+                self._evaluate_async(strategy, frame)
+                if strategy.is_async
+                else self._evaluate_sync(strategy, frame)
+                for strategy in self.strategies.values()
+            )
+        )
+        by_row: Dict[int, List[StrategySignal]] = {}
+        for per_strategy in results:
+            for row, signal in per_strategy:
+                by_row.setdefault(row, []).append(signal)
+        return [signal for row in sorted(by_row) for signal in by_row[row]]
+
+    async def _evaluate_async(self, strategy: Strategy, frame: FeatureFrame) -> List[Tuple[int, StrategySignal]]:
+        histogram = self._latency[strategy.name]
+
+        async def timed(row: int) -> Optional[StrategySignal]:
+            started = time.perf_counter()
+            try:
+                return await strategy.evaluate_async(frame.snapshot(row))
+            except Exception as exc:  # noqa: BLE001
+                histogram.errors += 1
+                logger.exception("Strategy %s failed: %s", strategy.name, exc)
+                return None
+            finally:
+                histogram.observe(time.perf_counter() - started)
+
+        tasks = [asyncio.ensure_future(timed(row)) for row in range(len(frame))]
+        done, pending = await asyncio.wait(tasks, timeout=self.settings.strategy_timeout_seconds)
+        if pending:
+            for task in pending:
+                task.cancel()
+            histogram.timeouts += len(pending)
+            logger.warning("Strategy %s timed out on %d snapshot(s)", strategy.name, len(pending))
+        return [
+            (row, task.result())
+            for row, task in enumerate(tasks)
+            if task in done and task.result() is not None
+        ]
+
+    async def _evaluate_sync(self, strategy: Strategy, frame: FeatureFrame) -> List[Tuple[int, StrategySignal]]:
+        histogram = self._latency[strategy.name]
+
+        def run() -> Tuple[List[Tuple[int, StrategySignal]], float]:
+            started = time.perf_counter()
+            return strategy.evaluate_batch(frame), time.perf_counter() - started
+
+        loop = asyncio.get_running_loop()
+        try:
+            signals, duration = await asyncio.wait_for(
+                loop.run_in_executor(self._executor, run),
+                timeout=self.settings.strategy_timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            # The worker thread cannot be interrupted; its result is discarded
+            histogram.timeouts += 1
+            logger.warning("Strategy %s timed out on a batch of %d snapshot(s)", strategy.name, len(frame))
+            return []
+        except Exception as exc:  # noqa: BLE001
+            histogram.errors += 1
+            logger.exception("Strategy %s failed: %s", strategy.name, exc)
+            return []
+
+        histogram.observe(duration)
+        return signals
+
+    async def _emit_signals(
+        self, signals: List[StrategySignal], acks: Optional[Dict[str, List[str]]] = None
+    ) -> bool:
+        """Append signals and ack the source entries in one non-transactional pipeline.
+
+        The signal-api lookup indexes need the IDs assigned by XADD, so they
+        are updated in a second pipeline once the signals are written.
+        """
+
+        kwargs = {}
+        if self.settings.max_stream_length is not None:
+            kwargs["maxlen"] = self.settings.max_stream_length
+            kwargs["approximate"] = self.settings.approximate_trim
+
+        documents = [signal.model_dump(mode='json') for signal in signals]
+        pipe = self.redis.pipeline(transaction=False)
+        for document in documents:
+            pipe.xadd(self.settings.signal_stream, {"payload": json.dumps(document)}, **kwargs)
+        for stream, message_ids in (acks or {}).items():
+            pipe.xack(stream, self.settings.consumer_group, *message_ids)
+        try:
+            results = await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Failed to emit %d signal(s): %s", len(signals), exc)
+            return False
+        logger.debug("Emitted %d signal(s) to %s", len(signals), self.settings.signal_stream)
+
+        if documents:
+            await self._index_signals(results[: len(documents)], documents)
+        return True
+
+    async def _index_signals(self, message_ids: Sequence[str], documents: Sequence[Dict[str, object]]) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        for message_id, document in zip(message_ids, documents):
+            if isinstance(message_id, bytes):
+                message_id = message_id.decode("utf-8")
+            index_signal(pipe, self.settings.signal_stream, message_id, document)
+        try:
+            await pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            # The signals are already written; only the lookup indexes lag behind
+            logger.exception("Failed to index %d signal(s): %s", len(documents), exc)
 
     def _ensure_strategies(self, settings: StrategyEngineSettings) -> List[StrategyConfig]:
         if settings.strategies:
@@ -3,13 +3,28 @@
 from __future__ import annotations
 
 import abc
-from typing import Optional
+import logging
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from ..models import FeatureSnapshot, StrategySignal
 
+if TYPE_CHECKING:  # pragma: no cover
+    from ..frame import FeatureFrame
+
+logger = logging.getLogger(__name__)
+
 
 class Strategy(abc.ABC):
-    """Abstract base class for strategy plugins."""
+    """Abstract base class for strategy plugins.
+
+    Synchronous strategies implement ``evaluate`` and are run on the
+    engine's thread pool, one ``evaluate_batch`` call per snapshot batch;
+    strategies that can work on whole columns override ``evaluate_batch``.
+    Strategies with native async logic set ``is_async = True`` and override
+    ``evaluate_async``; the engine awaits them on its event loop.
+    """
+
+    is_async: bool = False
 
     def __init__(self, name: str, **parameters) -> None:
         self.name = name
@@ -19,8 +34,34 @@ class Strategy(abc.ABC):
     def evaluate(self, feature: FeatureSnapshot) -> Optional[StrategySignal]:
         """Return strategy signal for the given feature snapshot if triggered."""
 
+    def evaluate_batch(self, frame: "FeatureFrame") -> List[Tuple[int, StrategySignal]]:
+        """Return ``(row, signal)`` pairs, in row order, for the triggered rows of ``frame``.
+
+        The default evaluates row by row, skipping rows that raise;
+        override with vector masks.
+        """
+
+        signals: List[Tuple[int, StrategySignal]] = []
+        for row in range(len(frame)):
+            try:
+                signal = self.evaluate(frame.snapshot(row))
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Strategy %s failed: %s", self.name, exc)
+                continue
+            if signal is not None:
+                signals.append((row, signal))
+        return signals
+
+    async def evaluate_async(self, feature: FeatureSnapshot) -> Optional[StrategySignal]:
+        """Async variant of ``evaluate``; only called when ``is_async`` is set."""
+
+        return self.evaluate(feature)
+
     def on_load(self) -> None:
         """Hook called when the strategy is instantiated."""
 
     def on_unload(self) -> None:
         """Hook called when the strategy is unloaded."""
+
+    async def on_start(self) -> None:
+        """Async hook awaited on the engine's event loop before the first evaluation."""
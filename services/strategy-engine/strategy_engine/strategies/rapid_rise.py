@@ -3,11 +3,16 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
 
 from ..models import FeatureSnapshot, StrategySignal
 from .base import Strategy
 
+if TYPE_CHECKING:  # pragma: no cover
+    from ..frame import FeatureFrame
+
 
 class RapidRiseStrategy(Strategy):
     """Detect rapid price increases within a window."""
@@ -27,22 +32,62 @@ class RapidRiseStrategy(Strategy):
 
         confidence = min(0.5 + change_percent / 10, 0.95)
         strength = min(change_percent * 10 + feature.volume_sum / self.min_volume * 10, 100)
+        return self._signal(
+            feature.symbol, feature.window, change_percent, feature.volume_sum,
+            confidence, strength, feature.price, feature.avg_price,
+        )
+
+    def evaluate_batch(self, frame: "FeatureFrame") -> List[Tuple[int, StrategySignal]]:
+        change_percent = np.nan_to_num(frame["change_percent"], nan=0.0)
+        volume = frame["volume_sum"]
+        rows = np.flatnonzero((change_percent >= self.min_change) & (volume >= self.min_volume))
+        if not len(rows):
+            return []
+
+        change_percent = change_percent[rows]
+        volume = volume[rows]
+        confidence = np.minimum(0.5 + change_percent / 10, 0.95)
+        strength = np.minimum(change_percent * 10 + volume / self.min_volume * 10, 100)
+        symbols, windows = frame["symbol"][rows], frame["window"][rows]
+        prices, avg_prices = frame["price"][rows], frame["avg_price"][rows]
+        return [
+            (
+                int(row),
+                self._signal(
+                    symbols[i], windows[i], float(change_percent[i]), int(volume[i]),
+                    float(confidence[i]), float(strength[i]), float(prices[i]), float(avg_prices[i]),
+                ),
+            )
+            for i, row in enumerate(rows)
+        ]
+
+    def _signal(
+        self,
+        symbol: str,
+        window: str,
+        change_percent: float,
+        volume: int,
+        confidence: float,
+        strength: float,
+        price: float,
+        avg_price: float,
+    ) -> StrategySignal:
         reasons = [
             f"涨幅 {change_percent:.2f}%",
-            f"成交量 {feature.volume_sum}" ,
+            f"成交量 {volume}" ,
         ]
 
         return StrategySignal(
             strategy=self.name,
-            symbol=feature.symbol,
+            symbol=symbol,
             signal_type="rapid_rise",
             confidence=confidence,
             strength_score=strength,
             reasons=reasons,
             triggered_at=datetime.utcnow(),
-            window=feature.window,
+            window=window,
             metadata={
-                "price": feature.price,
-                "avg_price": feature.avg_price,
+                "price": price,
+                "avg_price": avg_price,
             },
         )
@@ -0,0 +1,282 @@
+"""Tests for concurrent strategy evaluation."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pytest
+from strategy_sdk import BaseStrategy, Signal, SignalType
+
+from strategy_engine.config import StrategyEngineSettings
+from strategy_engine.frame import FeatureFrame
+from strategy_engine.metrics import LatencyHistogram
+from strategy_engine.models import FeatureSnapshot, StrategySignal
+from strategy_engine.sdk_adapter import SDKStrategyAdapter
+from strategy_engine.service import StrategyEngineService, worker_shards
+from strategy_engine.strategies.base import Strategy
+from strategy_engine.strategies.rapid_rise import RapidRiseStrategy
+
+
+def make_snapshot(symbol: str, change_percent: float) -> FeatureSnapshot:
+    return FeatureSnapshot(
+        symbol=symbol,
+        window="5s",
+        timestamp=datetime.utcnow(),
+        price=10.0,
+        change_percent=change_percent,
+        volume_sum=200000,
+        avg_price=9.8,
+        max_price=10.1,
+        min_price=9.5,
+        turnover_sum=2000000.0,
+        sample_size=5,
+    )
+
+
+class SlowStrategy(Strategy):
+    def evaluate(self, feature: FeatureSnapshot) -> Optional[StrategySignal]:
+        time.sleep(0.2)
+        return None
+
+
+class EchoSDKStrategy(BaseStrategy):
+    name = "echo"
+    version = "1.0.0"
+    author = "tests"
+
+    def __init__(self, delay: float = 0.0) -> None:
+        super().__init__()
+        self.delay = delay
+        self.initialized_with: Optional[Dict] = None
+
+    async def initialize(self, config: Dict) -> None:
+        self.initialized_with = config
+
+    async def analyze(self, features: Dict) -> List[Signal]:
+        await asyncio.sleep(self.delay)
+        return [
+            Signal(
+                type=SignalType.ANOMALY,
+                stock_code=features["code"],
+                stock_name=features["name"],
+                confidence=0.8,
+                timestamp=0,
+                reason="echo",
+            )
+        ]
+
+
+class DummyPipeline:
+    def __init__(self, redis: "DummyRedis") -> None:
+        self.redis = redis
+        self.commands: List[tuple] = []
+
+    def xadd(self, name: str, fields: Dict[str, str], **kwargs) -> None:
+        self.commands.append(("xadd", name, json.loads(fields["payload"])["symbol"]))
+
+    def xack(self, name: str, group: str, *ids: str) -> None:
+        self.commands.append(("xack", name, ids))
+
+    def __getattr__(self, command: str):
+        # Index updates: record the command and its key
+        return lambda key, *args, **kwargs: self.commands.append((command, key))
+
+    async def execute(self) -> List[object]:
+        self.redis.pipelines.append(self.commands)
+        return [f"1700000000000-{i}" if c[0] == "xadd" else 1 for i, c in enumerate(self.commands)]
+
+
+class DummyRedis:
+    def __init__(self, replies: List[list], claims: Optional[Dict[str, List[list]]] = None) -> None:
+        self.replies = replies
+        self.claims = claims or {}
+        self.reads: List[Dict[str, str]] = []
+        self.claimed: List[tuple] = []
+        self.pipelines: List[List[tuple]] = []
+
+    async def xreadgroup(self, **kwargs) -> list:
+        self.reads.append(kwargs["streams"])
+        return self.replies.pop(0)
+
+    async def xautoclaim(self, **kwargs) -> list:
+        self.claimed.append((kwargs["name"], kwargs["start_id"], kwargs["min_idle_time"]))
+        return self.claims[kwargs["name"]].pop(0)
+
+    def pipeline(self, transaction: bool = True) -> DummyPipeline:
+        return DummyPipeline(self)
+
+
+def make_service(strategies: Dict[str, Strategy], redis=None, shards=None, **settings) -> StrategyEngineService:
+    service = StrategyEngineService(StrategyEngineSettings(**settings), redis_client=redis, shards=shards)
+    service.strategies = strategies
+    service._latency = {name: LatencyHistogram() for name in strategies}
+    return service
+
+
+@pytest.mark.asyncio
+async def test_evaluate_mixes_sync_and_sdk_strategies() -> None:
+    sdk = SDKStrategyAdapter(EchoSDKStrategy(delay=0.05), name="echo", threshold=1)
+    service = make_service(
+        {
+            "rapid": RapidRiseStrategy(name="rapid", min_change=2.0, min_volume=1000),
+            "echo": sdk,
+        }
+    )
+    await sdk.on_start()
+    snapshots = [make_snapshot(f"sh60000{i}", 3.0 if i % 2 else 0.5) for i in range(10)]
+
+    started = time.perf_counter()
+    signals = await service._evaluate(FeatureFrame.from_snapshots(snapshots))
+    elapsed = time.perf_counter() - started
+
+    # SDK calls overlap instead of running one event loop per snapshot
+    assert elapsed < 0.3
+    assert sdk.sdk_strategy.initialized_with == {"threshold": 1}
+    assert [(s.symbol, s.strategy) for s in signals[:3]] == [
+        ("sh600000", "echo"),
+        ("sh600001", "rapid"),
+        ("sh600001", "echo"),
+    ]
+    assert len(signals) == 15
+    metrics = service.metrics()
+    assert metrics["echo"]["count"] == 10
+    # Sync strategies are timed once per batch
+    assert metrics["rapid"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_strategy_timeouts_are_counted() -> None:
+    service = make_service(
+        {
+            "slow": SlowStrategy(name="slow"),
+            "sdk-slow": SDKStrategyAdapter(EchoSDKStrategy(delay=1.0), name="sdk-slow"),
+        },
+        strategy_timeout_seconds=0.05,
+    )
+
+    frame = FeatureFrame.from_snapshots([make_snapshot("sh600000", 5.0), make_snapshot("sh600001", 5.0)])
+    signals = await service._evaluate(frame)
+
+    assert signals == []
+    metrics = service.metrics()
+    assert metrics["slow"]["timeouts"] == 1
+    assert metrics["sdk-slow"]["timeouts"] == 2
+
+
+def test_latency_histogram_buckets() -> None:
+    histogram = LatencyHistogram()
+    for seconds in (0.0004, 0.0009, 0.003, 2.0):
+        histogram.observe(seconds)
+
+    data = histogram.as_dict()
+    assert data["count"] == 4
+    assert data["buckets"]["le_0.5ms"] == 1
+    assert data["buckets"]["le_1ms"] == 1
+    assert data["buckets"]["le_5ms"] == 1
+    assert data["buckets"]["le_inf"] == 1
+    assert data["p50_ms"] == 1
+    assert data["max_ms"] == 2000.0
+
+
+@pytest.mark.asyncio
+async def test_handle_payloads_builds_one_frame_and_skips_bad_rows() -> None:
+    service = make_service({"rapid": RapidRiseStrategy(name="rapid", min_change=2.0, min_volume=1000)})
+    good = make_snapshot("sh600000", 3.0).model_dump(mode="json")
+    bad = dict(good, symbol="sh600001", sample_size=0)
+    signals = await service._handle_payloads(
+        [json.dumps(good), "not json", json.dumps([bad, dict(good, symbol="sz000001")])]
+    )
+
+    assert [signal.symbol for signal in signals] == ["sh600000", "sz000001"]
+
+
+def _entry(message_id: str, *symbols: str) -> tuple:
+    payload = [make_snapshot(symbol, 3.0).model_dump(mode="json") for symbol in symbols]
+    return (message_id, {"payload": json.dumps(payload)})
+
+
+@pytest.mark.asyncio
+async def test_stream_batch_replays_pending_then_emits_and_acks_in_one_pipeline() -> None:
+    redis = DummyRedis(
+        [
+            [("dfp:features:stream:1", [_entry("1-0", "sh600000"), ("1-1", None)]), ("dfp:features:stream:3", [])],
+            [("dfp:features:stream:1", [])],
+            [("dfp:features:stream:1", [_entry("2-0", "sz000001", "sh600001")]), ("dfp:features:stream:3", [_entry("2-1")])],
+        ]
+    )
+    service = make_service(
+        {"rapid": RapidRiseStrategy(name="rapid", min_change=2.0, min_volume=1000)},
+        redis=redis,
+        shards=[1, 3],
+        feature_stream_shards=4,
+    )
+
+    for _ in range(2):
+        await service._process_entries(await service._read_stream_batch())
+
+    assert redis.reads == [
+        {"dfp:features:stream:1": "0", "dfp:features:stream:3": "0"},
+        {"dfp:features:stream:1": "1-1"},
+        {"dfp:features:stream:1": ">", "dfp:features:stream:3": ">"},
+    ]
+    # Each batch: signals + acks in one pipeline, then the signal-api index update
+    assert len(redis.pipelines) == 4
+    assert redis.pipelines[0] == [
+        ("xadd", "dfp:strategy_signals", "sh600000"),
+        ("xack", "dfp:features:stream:1", ("1-0", "1-1")),
+    ]
+    assert redis.pipelines[2] == [
+        ("xadd", "dfp:strategy_signals", "sz000001"),
+        ("xadd", "dfp:strategy_signals", "sh600001"),
+        ("xack", "dfp:features:stream:1", ("2-0",)),
+        ("xack", "dfp:features:stream:3", ("2-1",)),
+    ]
+    indexed = [key for command, key in redis.pipelines[3] if command == "zadd"]
+    assert indexed == [
+        "dfp:strategy_signals:idx:strategy:rapid",
+        "dfp:strategy_signals:idx:symbol:sz000001",
+        "dfp:strategy_signals:idx:strategy:rapid",
+        "dfp:strategy_signals:idx:symbol:sh600001",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reclaim_pages_through_xautoclaim_per_shard_and_acks() -> None:
+    redis = DummyRedis(
+        [],
+        claims={
+            "dfp:features:stream:1": [["5-0", [_entry("3-0", "sh600000"), None]], ["0-0", [("4-0", None)]]],
+            "dfp:features:stream:3": [["0-0", []]],
+        },
+    )
+    service = make_service(
+        {"rapid": RapidRiseStrategy(name="rapid", min_change=2.0, min_volume=1000)},
+        redis=redis,
+        shards=[1, 3],
+        feature_stream_shards=4,
+        claim_min_idle_ms=1000,
+    )
+
+    await service._reclaim_pending()
+
+    assert redis.claimed == [
+        ("dfp:features:stream:1", "0-0", 1000),
+        ("dfp:features:stream:1", "5-0", 1000),
+        ("dfp:features:stream:3", "0-0", 1000),
+    ]
+    assert redis.pipelines[0] == [
+        ("xadd", "dfp:strategy_signals", "sh600000"),
+        ("xack", "dfp:features:stream:1", ("3-0",)),
+    ]
+    # Trimmed entries are acked without evaluation
+    assert redis.pipelines[2] == [("xack", "dfp:features:stream:1", ("4-0",))]
+
+
+def test_worker_shards_cover_every_shard_once() -> None:
+    assignments = [worker_shards(8, 3, index) for index in range(3)]
+
+    assert assignments == [[0, 3, 6], [1, 4, 7], [2, 5]]
@@ -4,6 +4,12 @@ from __future__ import annotations
 
 from datetime import datetime
 
+import numpy as np
+import pytest
+
+from strategies.anomaly_detection.adapter import AnomalyDetectionStrategyAdapter
+from strategies.limit_up_prediction.adapter import LimitUpPredictionStrategyAdapter
+from strategy_engine.frame import FeatureFrame
 from strategy_engine.models import FeatureSnapshot
 from strategy_engine.strategies.rapid_rise import RapidRiseStrategy
 
@@ -40,3 +46,64 @@ def test_strategy_ignore_low_volume():
     snapshot = make_snapshot(change_percent=3.0, volume=1000)
 
     assert strategy.evaluate(snapshot) is None
+
+
+def test_evaluate_batch_matches_evaluate():
+    strategy = RapidRiseStrategy(name="rapid", min_change=2.0, min_volume=1500)
+    snapshots = [make_snapshot(change_percent=c, volume=v) for c, v in [(2.5, 2000), (1.0, 5000), (3.0, 1000), (4.0, 1500)]]
+
+    batch = strategy.evaluate_batch(FeatureFrame.from_snapshots(snapshots))
+
+    assert [row for row, _ in batch] == [0, 3]
+    for row, signal in batch:
+        expected = strategy.evaluate(snapshots[row])
+        assert signal.model_dump(exclude={"triggered_at"}) == expected.model_dump(exclude={"triggered_at"})
+
+
+def random_snapshots(count: int, seed: int = 7) -> list[FeatureSnapshot]:
+    rng = np.random.default_rng(seed)
+    boards = ["sh600", "sz000", "sz300", "sh688"]
+    now = datetime.utcnow()
+    snapshots = []
+    for i in range(count):
+        price = float(rng.uniform(2, 80))
+        volume = int(rng.choice([0, rng.integers(1, 5_000_000)]))
+        # Rounded changes so board limits and thresholds are hit exactly; None is a missing value
+        change = None if rng.random() < 0.05 else float(rng.choice([0.0, round(rng.uniform(-5, 21), 1)]))
+        snapshots.append(
+            FeatureSnapshot(
+                symbol=f"{boards[i % len(boards)]}{i % 1000:03d}",
+                window=str(rng.choice(["5s", "1m"])),
+                timestamp=now,
+                price=price,
+                change_percent=change,
+                volume_sum=volume,
+                avg_price=float(rng.choice([0.0, price * rng.uniform(0.95, 1.05)])),
+                max_price=price * 1.01,
+                min_price=price * 0.99,
+                turnover_sum=volume * price,
+                sample_size=int(rng.integers(1, 30)),
+            )
+        )
+    return snapshots
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        AnomalyDetectionStrategyAdapter(name="anomaly", min_confidence=0.6),
+        LimitUpPredictionStrategyAdapter(name="limit_up", min_confidence=0.5),
+    ],
+    ids=["anomaly_detection", "limit_up_prediction"],
+)
+def test_adapter_evaluate_batch_matches_per_row_evaluate(strategy):
+    snapshots = random_snapshots(5000)
+
+    batch = strategy.evaluate_batch(FeatureFrame.from_snapshots(snapshots))
+    expected = [(row, strategy.evaluate(snapshot)) for row, snapshot in enumerate(snapshots)]
+    expected = [(row, signal) for row, signal in expected if signal is not None]
+
+    assert len(expected) > 100
+    assert [row for row, _ in batch] == [row for row, _ in expected]
+    for (_, signal), (_, reference) in zip(batch, expected):
+        assert signal.model_dump(exclude={"triggered_at"}) == reference.model_dump(exclude={"triggered_at"})